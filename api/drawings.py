@@ -1,36 +1,39 @@
-from flask import Blueprint, jsonify, request
-from services.drawing_service import DrawingService
-from core.state import move_drawing_up, move_drawing_down, copy_drawing, get_current_project
+from flask import Blueprint, jsonify, request, Response
+from services.drawing_service import get_drawing_service
+from services.simulation_service import SimulationService
+from services.async_runtime import get_async_runtime_stats
+from services.worker_pool import get_worker_pool_stats
+from core.state import (
+    move_drawing_up, move_drawing_down, copy_drawing, get_current_project,
+    find_drawings_using_image, recently_run_drawings, get_cache_stats
+)
+from core.log import get_logger, set_debug, debug_enabled
+from core.patch import RevisionConflict
+from core.trace import ExecutionTrace, get_trace
 from typing import Dict, Any
 
 drawings_bp = Blueprint('drawings', __name__, url_prefix='/api')
-drawing_service = DrawingService()
+drawing_service = get_drawing_service()
+simulation_service = SimulationService()
+log = get_logger(__name__)
 
 @drawings_bp.route('/drawings', methods=['GET'])
 def list_drawings():
     """Get list of all drawings in the current project"""
     try:
         project_id = get_current_project()
-        print(f"DEBUG: get_current_project() returned: {project_id}")
-
         if not project_id:
-            print("DEBUG: No active project found")
+            log.debug(None, "list drawings without active project")
             return jsonify({"error": "No active project"}), 400
 
-        print(f"DEBUG: Getting drawings for project: {project_id}")
         drawings_list = drawing_service.list_project_drawings(project_id)
-        print(f"DEBUG: Got {len(drawings_list)} drawings")
-
-        for drawing in drawings_list:
-            print(f"DEBUG: Drawing - Name: {drawing.get('name')}, ID: {drawing.get('id', '')[:8]}..., Order: {drawing.get('order', 'None')}")
+        log.debug(None, "list drawings", project=project_id, count=len(drawings_list))
 
         return jsonify({
             "drawings": drawings_list
         })
     except Exception as e:
-        print(f"ERROR in list_drawings: {e}")
-        import traceback
-        print(f"ERROR traceback: {traceback.format_exc()}")
+        log.error("list drawings failed", exc_info=True, error=str(e))
         return jsonify({"error": str(e)}), 500
 
 @drawings_bp.route('/drawings', methods=['POST'])
@@ -66,8 +69,9 @@ def get_drawing(drawing_id: str):
             "name": drawing["name"],
             "nodes": drawing.get("nodes", []),
             "boundary": drawing.get("boundary"),
+            "revision": drawing.get("revision", 0),
             "created_at": drawing.get("created_at"),
-            "last_executed": drawing.get("last_executed"),
+            "last_executed": drawing_service.get_last_executed(drawing_id) or drawing.get("last_executed"),
             "execution_state": {
                 "is_running": drawing["execution_state"]["is_running"],
                 "current_node": drawing["execution_state"]["current_node"],
@@ -84,14 +88,38 @@ def get_drawing(drawing_id: str):
 
 @drawings_bp.route('/drawings/<drawing_id>', methods=['PUT'])
 def update_drawing(drawing_id: str):
-    """Update a drawing"""
+    """Update a drawing; ?flush=1 (explicit save) writes it to disk before returning"""
     data = request.get_json()
+    flush = request.args.get('flush', '').lower() in ('1', 'true')
     
     try:
-        success = drawing_service.update_drawing_info(drawing_id, data)
+        success = drawing_service.update_drawing_info(drawing_id, data, flush=flush)
         if not success:
             return jsonify({"error": "Drawing not found"}), 404
-        return jsonify({"message": "Drawing updated successfully"})
+        drawing = drawing_service.get_drawing_info(drawing_id) or {}
+        return jsonify({"message": "Drawing updated successfully", "revision": drawing.get("revision", 0)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/drawings/<drawing_id>', methods=['PATCH'])
+def patch_drawing(drawing_id: str):
+    """Apply node operations to a drawing: {"base_revision": n, "operations": [...]}
+
+    A stale base_revision is rejected with 409 and the current revision, so the
+    client can reload (or send the whole drawing with PUT) and retry.
+    """
+    data = request.get_json() or {}
+    flush = request.args.get('flush', '').lower() in ('1', 'true')
+    
+    try:
+        revision = drawing_service.patch_drawing_nodes(
+            drawing_id, data.get('base_revision'), data.get('operations'), flush=flush
+        )
+        return jsonify({"message": "Drawing patched successfully", "revision": revision})
+    except RevisionConflict as e:
+        return jsonify({"error": str(e), "revision": e.current_revision}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404 if str(e) == "Drawing not found" else 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -108,13 +136,28 @@ def delete_drawing(drawing_id: str):
 
 @drawings_bp.route('/drawings/<drawing_id>/execute', methods=['POST'])
 def execute_drawing(drawing_id: str):
-    """Start executing a drawing"""
+    """Start executing a drawing, or simulate it when mode is 'simulate'"""
     data = request.get_json() or {}
     loop = data.get('loop', False)
     speed = data.get('speed', 1.0)
+    turbo = data.get('turbo', False)
+    runtime = data.get('runtime', 'thread')
     
     try:
-        result = drawing_service.start_drawing_execution(drawing_id, loop, speed)
+        if data.get('mode') == 'simulate':
+            result = simulation_service.simulate_drawing(
+                drawing_id,
+                iterations=data.get('iterations', 1),
+                speed=speed,
+                turbo=turbo,
+                outcomes=data.get('outcomes'),
+                trace=data.get('trace'),
+                default_outcome=data.get('default_outcome', True),
+                costs=data.get('costs')
+            )
+            return jsonify(result)
+
+        result = drawing_service.start_drawing_execution(drawing_id, loop, speed, turbo, runtime)
         return jsonify(result)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -145,10 +188,61 @@ def get_drawing_status(drawing_id: str):
 
 @drawings_bp.route('/drawings/status', methods=['GET'])
 def get_all_drawing_statuses():
-    """Get execution status of all drawings"""
+    """Get execution status of all drawings; with ?since=<version>&wait=<seconds> only the changed ones, long-polling until one changes"""
     try:
-        statuses = drawing_service.get_all_drawing_statuses()
-        return jsonify({"statuses": statuses})
+        since = request.args.get('since')
+        if since is None:
+            version = drawing_service.get_status_version()
+            statuses = drawing_service.get_all_drawing_statuses()
+            return jsonify({"statuses": statuses, "version": version})
+
+        try:
+            since_version = int(since)
+            wait = float(request.args.get('wait', 0))
+        except ValueError:
+            return jsonify({"error": "since must be an integer and wait a number of seconds"}), 400
+        return jsonify(drawing_service.get_drawing_statuses_since(since_version, wait))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/drawings/using-image', methods=['GET'])
+def get_drawings_using_image():
+    """Drawings with a node that uses the image ?path=<image_path>"""
+    image_path = request.args.get('path')
+    if not image_path:
+        return jsonify({"error": "path is required"}), 400
+    try:
+        return jsonify({"drawings": find_drawings_using_image(image_path)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/drawings/recent', methods=['GET'])
+def get_recently_run_drawings():
+    """Most recently run drawings, ?limit=<n> (default 20)"""
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        return jsonify({"drawings": recently_run_drawings(max(1, min(limit, 500)))})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/drawings/<drawing_id>/runs', methods=['GET'])
+def get_drawing_runs(drawing_id: str):
+    """Run history of a drawing, ?limit=<n> (default 50) &outcome=<completed|stopped|error> &since=<iso time>"""
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        runs = drawing_service.get_drawing_runs(drawing_id, max(1, min(limit, 1000)), request.args.get('outcome'),
+                                                request.args.get('since'))
+        return jsonify({"runs": runs})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -190,9 +284,11 @@ def execute_all_drawings():
     data = request.get_json() or {}
     loop = data.get('loop', False)
     speed = data.get('speed', 1.0)
+    turbo = data.get('turbo', False)
+    runtime = data.get('runtime', 'thread')
     
     try:
-        result = drawing_service.start_all_drawings_execution(loop, speed)
+        result = drawing_service.start_all_drawings_execution(loop, speed, turbo, runtime)
         return jsonify(result)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -225,16 +321,15 @@ def move_drawing_up_api(drawing_id: str):
         if not project_id:
             return jsonify({"error": "No active project"}), 400
 
-        print(f"DEBUG: Moving drawing {drawing_id} up in project {project_id}")
         success = move_drawing_up(project_id, drawing_id)
-        print(f"DEBUG: Move up result: {success}")
+        log.debug(drawing_id, "move drawing up", project=project_id, success=success)
 
         if success:
             return jsonify({"message": "Drawing moved up successfully"})
         else:
             return jsonify({"error": "Cannot move drawing up (already at top or not found)"}), 400
     except Exception as e:
-        print(f"ERROR: Move up API error: {e}")
+        log.error("move drawing up failed", drawing=drawing_id, error=str(e))
         return jsonify({"error": str(e)}), 500
 
 @drawings_bp.route('/drawings/<drawing_id>/move-down', methods=['POST'])
@@ -245,16 +340,15 @@ def move_drawing_down_api(drawing_id: str):
         if not project_id:
             return jsonify({"error": "No active project"}), 400
 
-        print(f"DEBUG: Moving drawing {drawing_id} down in project {project_id}")
         success = move_drawing_down(project_id, drawing_id)
-        print(f"DEBUG: Move down result: {success}")
+        log.debug(drawing_id, "move drawing down", project=project_id, success=success)
 
         if success:
             return jsonify({"message": "Drawing moved down successfully"})
         else:
             return jsonify({"error": "Cannot move drawing down (already at bottom or not found)"}), 400
     except Exception as e:
-        print(f"ERROR: Move down API error: {e}")
+        log.error("move drawing down failed", drawing=drawing_id, error=str(e))
         return jsonify({"error": str(e)}), 500
 
 @drawings_bp.route('/drawings/<drawing_id>/copy', methods=['POST'])
@@ -277,4 +371,88 @@ def copy_drawing_api(drawing_id: str):
         else:
             return jsonify({"error": "Failed to copy drawing"}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/runtime/stats', methods=['GET'])
+def get_runtime_stats():
+    """Get async execution runtime statistics"""
+    try:
+        return jsonify(get_async_runtime_stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/prefetch/stats', methods=['GET'])
+def get_prefetch_stats():
+    """Get speculative image match statistics"""
+    try:
+        return jsonify(drawing_service.prefetch.stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/workers/stats', methods=['GET'])
+def get_worker_stats():
+    """Get run worker pool occupancy and queue wait times"""
+    try:
+        return jsonify(get_worker_pool_stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/cache/stats', methods=['GET'])
+def get_drawing_cache_stats():
+    """Get drawing cache occupancy, memory use and hit/miss counts"""
+    try:
+        return jsonify(get_cache_stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/drawings/<drawing_id>/debug', methods=['GET', 'POST'])
+def drawing_debug(drawing_id: str):
+    """Get or toggle per-action debug logging for a drawing"""
+    try:
+        if not drawing_service.get_drawing_info(drawing_id):
+            return jsonify({"error": "Drawing not found"}), 404
+
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            set_debug(drawing_id, bool(data.get('enabled', True)))
+        return jsonify({"drawing_id": drawing_id, "debug": debug_enabled(drawing_id)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@drawings_bp.route('/drawings/<drawing_id>/trace', methods=['GET'])
+def export_drawing_trace(drawing_id: str):
+    """Export the latest run's execution trace (binary file, or decoded with ?format=json)"""
+    trace = get_trace(drawing_id)
+    if trace is None:
+        return jsonify({"error": "No execution trace recorded for this drawing"}), 404
+
+    if request.args.get('format') == 'json':
+        return jsonify({"drawing_id": drawing_id, "stats": trace.stats(), "records": trace.records()})
+
+    return Response(trace.to_bytes(), mimetype='application/octet-stream', headers={
+        "Content-Disposition": f"attachment; filename={drawing_id}.trace"
+    })
+
+@drawings_bp.route('/drawings/<drawing_id>/trace/replay', methods=['POST'])
+def replay_drawing_trace(drawing_id: str):
+    """Replay a trace offline through the simulator; uses an uploaded trace file or the latest run"""
+    try:
+        if request.mimetype == 'application/octet-stream' and request.data:
+            trace = ExecutionTrace.from_bytes(request.data)
+            options = request.args
+        else:
+            trace = get_trace(drawing_id)
+            options = request.get_json(silent=True) or {}
+        if trace is None:
+            return jsonify({"error": "No execution trace recorded for this drawing"}), 404
+
+        result = simulation_service.replay_trace(
+            drawing_id, trace,
+            speed=float(options.get('speed', 1.0)),
+            turbo=str(options.get('turbo', False)).lower() in ('1', 'true', 'yes')
+        )
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
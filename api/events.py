@@ -0,0 +1,60 @@
+import json
+from flask import Blueprint, Response, request, stream_with_context
+from core.events import get_event_bus
+from core.state import get_execution_snapshot
+
+events_bp = Blueprint('events', __name__, url_prefix='/api')
+
+# Idle streams send a comment this often so proxies and browsers keep them open
+KEEPALIVE_SECONDS = 15
+
+def format_event(event_id: int, event_type: str, data) -> str:
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+@events_bp.route('/events', methods=['GET'])
+def stream_events():
+    """Server-sent execution state changes; resumes from Last-Event-ID when the buffer still covers it"""
+    bus = get_event_bus()
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_id = None
+
+    def generate():
+        cursor = last_id
+        # Tell the browser how long to wait before reconnecting
+        yield "retry: 2000\n\n"
+
+        if cursor is not None:
+            events, complete = bus.since(cursor)
+            if not complete:
+                cursor = None
+            else:
+                for event in events:
+                    yield format_event(event.id, event.type, event.data)
+                    cursor = event.id
+
+        if cursor is None:
+            # New client, or it fell too far behind: start from a full snapshot
+            cursor = bus.last_id
+            yield format_event(cursor, "snapshot", get_execution_snapshot())
+
+        while True:
+            events, complete = bus.wait(cursor, KEEPALIVE_SECONDS)
+            if not complete:
+                cursor = bus.last_id
+                yield format_event(cursor, "snapshot", get_execution_snapshot())
+                continue
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                yield format_event(event.id, event.type, event.data)
+                cursor = event.id
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
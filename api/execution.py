@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from services.execution_service import ExecutionService
 from core.state import current_project
+from core.log import get_level, set_level, set_debug, debug_enabled, get_debug_scopes, WORKFLOW_SCOPE
 
 execution_bp = Blueprint('execution', __name__, url_prefix='/api')
 execution_service = ExecutionService()
@@ -10,9 +11,10 @@ def execute_workflow():
     data = request.get_json()
     loop = data.get('loop', False)
     speed = data.get('speed', 1.0)
+    turbo = data.get('turbo', False)
     
     try:
-        result = execution_service.start_workflow(current_project["nodes"], loop, speed)
+        result = execution_service.start_workflow(current_project["nodes"], loop, speed, turbo)
         return jsonify(result)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -25,4 +27,26 @@ def stop_execution():
 @execution_bp.route('/status', methods=['GET'])
 def get_status():
     status = execution_service.get_status()
-    return jsonify(status)
\ No newline at end of file
+    return jsonify(status)
+
+@execution_bp.route('/execute/debug', methods=['GET', 'POST'])
+def workflow_debug():
+    """Get or toggle per-action debug logging for the workflow"""
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        set_debug(WORKFLOW_SCOPE, bool(data.get('enabled', True)))
+    return jsonify({"debug": debug_enabled(WORKFLOW_SCOPE)})
+
+@execution_bp.route('/logging', methods=['GET'])
+def get_logging():
+    return jsonify({"level": get_level(), "debug_scopes": get_debug_scopes()})
+
+@execution_bp.route('/logging', methods=['POST'])
+def update_logging():
+    data = request.get_json() or {}
+    try:
+        if 'level' in data:
+            set_level(data['level'])
+        return jsonify({"level": get_level(), "debug_scopes": get_debug_scopes()})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
@@ -0,0 +1,74 @@
+from flask import Blueprint, jsonify, request
+from services.job_queue import get_job_queue
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api')
+
+@jobs_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a drawing or project run"""
+    data = request.get_json() or {}
+    if data.get('drawing_id'):
+        kind, target = "drawing", data['drawing_id']
+    elif data.get('project_id'):
+        kind, target = "project", data['project_id']
+    else:
+        return jsonify({"error": "drawing_id or project_id is required"}), 400
+
+    params = {
+        "loop": data.get('loop', False),
+        "speed": data.get('speed', 1.0),
+        "turbo": data.get('turbo', False),
+        "runtime": data.get('runtime', 'thread')
+    }
+    
+    try:
+        job = get_job_queue().submit(kind, target, params, data.get('priority', 0))
+        return jsonify(job), 201
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@jobs_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List jobs in queue order, optionally filtered by state"""
+    try:
+        job_queue = get_job_queue()
+        jobs = job_queue.list_jobs(request.args.get('state'))
+        return jsonify({"jobs": jobs, "stats": job_queue.stats()})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """Get a job's state, queue position and timing"""
+    try:
+        return jsonify(get_job_queue().get(job_id))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@jobs_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id: str):
+    """Cancel a queued job or stop a running one"""
+    try:
+        return jsonify(get_job_queue().cancel(job_id))
+    except ValueError as e:
+        status = 404 if "not found" in str(e) else 409
+        return jsonify({"error": str(e)}), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@jobs_bp.route('/jobs/limits', methods=['GET', 'POST'])
+def job_limits():
+    """Get or change the global concurrent job limit"""
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        try:
+            get_job_queue().set_max_concurrent(data.get('max_concurrent'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    return jsonify({"max_concurrent": get_job_queue().max_concurrent})
@@ -0,0 +1,23 @@
+import time
+from flask import Blueprint, Response, g, request
+from core.metrics import REGISTRY, CONTENT_TYPE, HTTP_REQUEST_SECONDS
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.before_app_request
+def start_request_timer():
+    g.metrics_started = time.perf_counter()
+
+@metrics_bp.after_app_request
+def observe_request(response):
+    started = g.pop('metrics_started', None)
+    if started is not None:
+        # Label by route pattern, not path, so drawing ids do not become series
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method, response.status_code)
+    return response
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Process metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
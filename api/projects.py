@@ -41,6 +41,22 @@ def get_project_info(project_id: str):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@projects_bp.route('/projects/<project_id>/runs', methods=['GET'])
+def get_project_runs(project_id: str):
+    """Run history of a project, ?limit=<n> (default 50) &outcome=<completed|stopped|error> &since=<iso time> &drawing_id=<id>"""
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        runs = project_service.get_project_runs(project_id, max(1, min(limit, 1000)), request.args.get('outcome'),
+                                                request.args.get('since'), request.args.get('drawing_id'))
+        if runs is None:
+            return jsonify({"error": "Project not found"}), 404
+        return jsonify({"runs": runs})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @projects_bp.route('/projects/<project_id>', methods=['PUT'])
 def update_project(project_id: str):
     """Update project information"""
@@ -51,6 +67,8 @@ def update_project(project_id: str):
         if not success:
             return jsonify({"error": "Project not found"}), 404
         return jsonify({"message": "Project updated successfully"})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -91,9 +109,8 @@ def get_active_project():
 def list_project_drawings(project_id: str):
     """List all drawings in a project"""
     try:
-        from services.drawing_service import DrawingService
-        drawing_service = DrawingService()
-        drawings = drawing_service.list_project_drawings(project_id)
+        from services.drawing_service import get_drawing_service
+        drawings = get_drawing_service().list_project_drawings(project_id)
         return jsonify({"drawings": drawings})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
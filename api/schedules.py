@@ -0,0 +1,66 @@
+from flask import Blueprint, jsonify, request
+from services.scheduler_service import get_scheduler
+
+schedules_bp = Blueprint('schedules', __name__, url_prefix='/api')
+
+@schedules_bp.route('/schedules', methods=['GET'])
+def list_all_schedules():
+    """List every schedule with its next fire time"""
+    try:
+        scheduler = get_scheduler()
+        return jsonify({"schedules": scheduler.list_schedules(), "stats": scheduler.stats()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@schedules_bp.route('/projects/<project_id>/schedules', methods=['GET'])
+def list_project_schedules(project_id: str):
+    """List a project's schedules"""
+    try:
+        return jsonify({"schedules": get_scheduler().list_schedules(project_id)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@schedules_bp.route('/projects/<project_id>/schedules', methods=['POST'])
+def create_schedule(project_id: str):
+    """Create an interval or cron schedule for a drawing or the whole project"""
+    data = request.get_json() or {}
+    try:
+        return jsonify(get_scheduler().create_schedule(project_id, data)), 201
+    except ValueError as e:
+        status = 404 if "not found" in str(e) else 400
+        return jsonify({"error": str(e)}), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@schedules_bp.route('/schedules/<schedule_id>', methods=['GET'])
+def get_schedule(schedule_id: str):
+    """Get a schedule"""
+    try:
+        return jsonify(get_scheduler().get_schedule(schedule_id))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@schedules_bp.route('/schedules/<schedule_id>', methods=['PUT'])
+def update_schedule(schedule_id: str):
+    """Change a schedule, e.g. its timing or enabled flag"""
+    data = request.get_json() or {}
+    try:
+        return jsonify(get_scheduler().update_schedule(schedule_id, data))
+    except ValueError as e:
+        status = 404 if "not found" in str(e) else 400
+        return jsonify({"error": str(e)}), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@schedules_bp.route('/schedules/<schedule_id>', methods=['DELETE'])
+def delete_schedule(schedule_id: str):
+    """Delete a schedule"""
+    try:
+        get_scheduler().delete_schedule(schedule_id)
+        return jsonify({"message": "Schedule deleted successfully"})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,66 @@
+from flask import Blueprint, jsonify, request
+from services.watcher_service import get_watcher
+
+watchers_bp = Blueprint('watchers', __name__, url_prefix='/api')
+
+@watchers_bp.route('/watchers', methods=['GET'])
+def list_all_triggers():
+    """List every screen trigger with its current match state"""
+    try:
+        watcher = get_watcher()
+        return jsonify({"triggers": watcher.list_triggers(), "stats": watcher.stats()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@watchers_bp.route('/projects/<project_id>/watchers', methods=['GET'])
+def list_project_triggers(project_id: str):
+    """List a project's screen triggers"""
+    try:
+        return jsonify({"triggers": get_watcher().list_triggers(project_id)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@watchers_bp.route('/projects/<project_id>/watchers', methods=['POST'])
+def create_trigger(project_id: str):
+    """Create a trigger that runs a drawing when an image appears"""
+    data = request.get_json() or {}
+    try:
+        return jsonify(get_watcher().create_trigger(project_id, data)), 201
+    except ValueError as e:
+        status = 404 if "not found" in str(e) else 400
+        return jsonify({"error": str(e)}), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@watchers_bp.route('/watchers/<trigger_id>', methods=['GET'])
+def get_trigger(trigger_id: str):
+    """Get a screen trigger"""
+    try:
+        return jsonify(get_watcher().get_trigger(trigger_id))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@watchers_bp.route('/watchers/<trigger_id>', methods=['PUT'])
+def update_trigger(trigger_id: str):
+    """Change a screen trigger"""
+    data = request.get_json() or {}
+    try:
+        return jsonify(get_watcher().update_trigger(trigger_id, data))
+    except ValueError as e:
+        status = 404 if "not found" in str(e) else 400
+        return jsonify({"error": str(e)}), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@watchers_bp.route('/watchers/<trigger_id>', methods=['DELETE'])
+def delete_trigger(trigger_id: str):
+    """Delete a screen trigger"""
+    try:
+        get_watcher().delete_trigger(trigger_id)
+        return jsonify({"message": "Trigger deleted successfully"})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
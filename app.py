@@ -7,6 +7,11 @@ try:
     from api.execution import execution_bp
     from api.upload import upload_bp
     from api.drawings import drawings_bp
+    from api.jobs import jobs_bp
+    from api.schedules import schedules_bp
+    from api.watchers import watchers_bp
+    from api.events import events_bp
+    from api.metrics import metrics_bp
 
     app = Flask(__name__, static_folder=WEB_DIR, static_url_path='')
     CORS(app)
@@ -16,6 +21,24 @@ try:
     app.register_blueprint(execution_bp)
     app.register_blueprint(upload_bp)
     app.register_blueprint(drawings_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(schedules_bp)
+    app.register_blueprint(watchers_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(metrics_bp)
+
+    # Apply drawing edits a previous run journaled but did not write
+    from core.state import recover_pending_writes
+    recover_pending_writes()
+
+    def start_background_services():
+        """Restore the job queue and start the scheduler and watchers; call once, in the serving process"""
+        from services.job_queue import get_job_queue
+        from services.scheduler_service import get_scheduler
+        from services.watcher_service import get_watcher
+        get_job_queue()
+        get_scheduler()
+        get_watcher()
     
 except Exception as e:
     print(f"\n[IMPORT ERROR] Failed to import modules: {e}")
@@ -38,6 +61,38 @@ except Exception as e:
 def index():
     return send_from_directory(WEB_DIR, 'index.html')
 
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CopilotNode Web Server")
+    parser.add_argument('port', nargs='?', type=int, default=5000)
+    parser.add_argument('--host', default=None,
+                        help="Bind address (default 0.0.0.0 for the dev server, 127.0.0.1 otherwise)")
+    parser.add_argument('--server', choices=('dev', 'production'), default=None,
+                        help="dev: Werkzeug with debug and reloader; production: multi-threaded waitress "
+                             "(default production when packaged, dev otherwise)")
+    parser.add_argument('--threads', type=int, default=16,
+                        help="Request worker threads in production mode; each open event stream holds one")
+    parser.add_argument('--connection-limit', type=int, default=100,
+                        help="Open connections accepted at once in production mode")
+    parser.add_argument('--channel-timeout', type=int, default=120,
+                        help="Seconds an idle keep-alive connection or stalled request is kept before closing")
+    parser.add_argument('--no-browser', action='store_true', help="Do not open the browser on start")
+    return parser.parse_args(argv)
+
+def serve_production(app, host: str, port: int, threads: int, connection_limit: int, channel_timeout: int) -> bool:
+    """Serve through waitress; returns False when it is not installed"""
+    try:
+        from waitress import serve
+    except ImportError:
+        return False
+    print(f"[INFO] Production server: {threads} threads, {connection_limit} connections, "
+          f"{channel_timeout}s channel timeout")
+    # HTTP/1.1 keep-alive is on by default; channel_timeout closes idle or stalled connections
+    serve(app, host=host, port=port, threads=threads, connection_limit=connection_limit,
+          channel_timeout=channel_timeout, ident='CopilotNode')
+    return True
+
 if __name__ == '__main__':
     try:
         import sys
@@ -45,8 +100,9 @@ if __name__ == '__main__':
         import time
         import webbrowser
         import os
-        
-        port = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+        args = parse_args()
+        port = args.port
         url = f"http://localhost:{port}"
         
         print(f"CopilotNode Web Server starting...")
@@ -63,21 +119,29 @@ if __name__ == '__main__':
                 print(f"Please manually open {url} in your browser")
         
         # Only open browser in main process (not in reloader process)
-        if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        if not args.no_browser and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
             # Start browser opening in background thread
             threading.Timer(2.0, open_browser).start()
         
         # Detect if running as executable (packaged)
         is_packaged = getattr(sys, 'frozen', False)
-        
-        if is_packaged:
-            # In packaged mode, disable debug and use production settings
-            print("[INFO] Running in packaged mode")
-            app.run(debug=False, host='127.0.0.1', port=port, use_reloader=False)
+        server = args.server or ('production' if is_packaged else 'dev')
+
+        # With the reloader, this script also runs in a watcher parent that never serves;
+        # only the serving child (WERKZEUG_RUN_MAIN) may start background threads
+        if server == 'production' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+            start_background_services()
+
+        if server == 'production':
+            print("[INFO] Running in production mode")
+            host = args.host or '127.0.0.1'
+            if not serve_production(app, host, port, args.threads, args.connection_limit, args.channel_timeout):
+                print("[WARN] waitress is not installed, falling back to the threaded Werkzeug server")
+                app.run(debug=False, host=host, port=port, use_reloader=False, threaded=True)
         else:
             # In development mode
             print("[INFO] Running in development mode")
-            app.run(debug=True, host='0.0.0.0', port=port)
+            app.run(debug=True, host=args.host or '0.0.0.0', port=port)
             
     except Exception as e:
         print(f"\n[ERROR] Application failed to start: {e}")
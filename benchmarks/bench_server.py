@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+服务器吞吐基准测试：对比 Werkzeug 开发服务器与 waitress 生产服务器
+
+Starts each server in-process on a free port, creates a throwaway project
+with a few drawings, then hammers the status and drawing endpoints from
+concurrent keep-alive clients.
+
+Usage: python benchmarks/bench_server.py [--clients N] [--duration S] [--threads N] [--drawings N]
+"""
+import argparse
+import http.client
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+
+def create_fixture(drawing_count: int):
+    client = app.test_client()
+    project = client.post('/api/projects', json={"name": "bench-server"}).get_json()
+    drawing_ids = []
+    for i in range(drawing_count):
+        nodes = [{"id": str(n), "action_type": "wait", "params": {"duration": 1}, "connections": []}
+                 for n in range(20)]
+        response = client.post('/api/drawings', json={"name": f"bench-{i}", "nodes": nodes}).get_json()
+        drawing_ids.append(response["drawing_id"])
+    return project["id"], drawing_ids
+
+def start_dev_server():
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.port, server.shutdown
+
+def start_production_server(threads: int):
+    from waitress.server import create_server
+    server = create_server(app, host='127.0.0.1', port=0, threads=threads)
+    threading.Thread(target=server.run, daemon=True).start()
+    return server.effective_port, server.close
+
+def run_load(port: int, paths, clients: int, duration: float):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset: int):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        local = []
+        local_errors = 0
+        i = offset
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                continue
+            local.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    workers = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Dev vs production server throughput")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=16, help="waitress worker threads")
+    parser.add_argument("--drawings", type=int, default=10)
+    args = parser.parse_args()
+
+    project_id, drawing_ids = create_fixture(args.drawings)
+    paths = ['/api/drawings/status', '/api/drawings'] + [f'/api/drawings/{d}' for d in drawing_ids[:3]]
+    try:
+        servers = [("werkzeug (dev)", start_dev_server)]
+        try:
+            import waitress  # noqa: F401
+            servers.append((f"waitress ({args.threads} threads)", lambda: start_production_server(args.threads)))
+        except ImportError:
+            print("waitress is not installed; only the dev server is measured")
+
+        print(f"clients: {args.clients}, duration: {args.duration}s, drawings: {args.drawings}")
+        print(f"{'server':<24} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, start in servers:
+            port, stop = start()
+            try:
+                result = run_load(port, paths, args.clients, args.duration)
+            finally:
+                stop()
+            print(f"{name:<24} {result['requests']:>9} {result['errors']:>7} {result['rps']:>9.1f} "
+                  f"{result['p50']:>8.2f} {result['p95']:>8.2f}")
+    finally:
+        app.test_client().delete(f'/api/projects/{project_id}')
+
+if __name__ == "__main__":
+    main()
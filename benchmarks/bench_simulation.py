@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+引擎开销基准测试：用虚拟时间模拟执行合成画图
+
+Usage: python benchmarks/bench_simulation.py [--nodes N] [--iterations N]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.simulation_service import SimulationService
+
+def build_drawing(node_count: int):
+    """Chain of click / wait / IF nodes, each IF branching back into the chain"""
+    action_cycle = ["click", "wait", "clickimg", "if"]
+    nodes = []
+    for i in range(node_count):
+        action_type = action_cycle[i % len(action_cycle)]
+        next_id = str(i + 1) if i + 1 < node_count else None
+        connections = [next_id] if next_id else []
+        if action_type == "if" and next_id:
+            connections = [next_id, str(max(0, i - 2))]
+        nodes.append({
+            "id": str(i),
+            "action_type": action_type,
+            "params": {"x": 100, "y": 100, "duration": 0.5, "image_path": "bench.png"},
+            "connections": connections
+        })
+    return nodes
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated engine overhead benchmark")
+    parser.add_argument("--nodes", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    service = SimulationService()
+    nodes = build_drawing(args.nodes)
+    result = service.simulate_nodes(nodes, iterations=args.iterations, outcomes={})
+
+    print(f"nodes:                 {args.nodes}")
+    print(f"iterations:            {result['iterations']}")
+    print(f"node visits:           {sum(result['visit_counts'].values())}")
+    print(f"predicted run time:    {result['predicted_duration']:.2f}s (virtual)")
+    print(f"engine wall time:      {result['engine']['wall_time']:.3f}s")
+    print(f"iterations per second: {result['engine']['iterations_per_second']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+状态缓存竞争基准测试：多个并发运行 + 持续状态轮询
+
+Runs N simulated drawing executions (each node step checks should_stop and
+publishes its progress, like the executor does) while poller threads read
+every drawing's status in a loop and a long-poller waits on state versions.
+Compares the old single global lock with in-place updates against the
+current per-drawing locks with copy-on-write entries.
+
+Usage: python benchmarks/bench_state_contention.py [--runs 32] [--pollers 4] [--duration 3] [--nodes 200]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import state
+from core.events import publish, public_state
+
+def idle_state():
+    return {"is_running": True, "current_node": None, "status": "running", "progress": 0,
+            "thread": None, "should_stop": False}
+
+class GlobalLockState:
+    """The previous scheme: one lock around every read and in-place update"""
+
+    def __init__(self):
+        self.drawings = {}
+        self.lock = threading.Lock()
+        self.version = 0
+        self.versions = {}
+        self.changed = threading.Condition(self.lock)
+
+    def add(self, drawing_id, nodes):
+        with self.lock:
+            self.drawings[drawing_id] = {"id": drawing_id, "nodes": nodes, "execution_state": idle_state()}
+
+    def remove(self, drawing_id):
+        with self.lock:
+            self.drawings.pop(drawing_id, None)
+
+    def get_drawing(self, drawing_id):
+        with self.lock:
+            drawing = self.drawings.get(drawing_id)
+            return drawing.copy() if drawing else None
+
+    def get_all_drawings(self):
+        with self.lock:
+            return self.drawings.copy()
+
+    def get_execution_state(self, drawing_id):
+        with self.lock:
+            drawing = self.drawings.get(drawing_id)
+            return drawing["execution_state"].copy() if drawing else None
+
+    def update_execution_state(self, drawing_id, updates):
+        with self.lock:
+            self.drawings[drawing_id]["execution_state"].update(updates)
+            self.version += 1
+            self.versions[drawing_id] = self.version
+            self.changed.notify_all()
+        delta = public_state(updates)
+        if delta:
+            publish("drawing", drawing_id=drawing_id, **delta)
+
+    def wait(self, since, timeout):
+        with self.changed:
+            self.changed.wait_for(lambda: self.version > since, timeout)
+            self.last_changed = [d for d, v in self.versions.items() if v > since and d in self.drawings]
+            return self.version
+
+class CurrentState:
+    """core.state as it is"""
+
+    def add(self, drawing_id, nodes):
+        with state._drawing_lock(drawing_id):
+            state.active_drawings[drawing_id] = {"id": drawing_id, "nodes": nodes, "execution_state": idle_state()}
+
+    def remove(self, drawing_id):
+        with state._drawing_lock(drawing_id):
+            state.active_drawings.pop(drawing_id, None)
+
+    get_drawing = staticmethod(state.get_drawing)
+    get_all_drawings = staticmethod(state.get_all_drawings)
+    get_execution_state = staticmethod(state.get_drawing_execution_state)
+    update_execution_state = staticmethod(state.update_drawing_execution_state)
+
+    def wait(self, since, timeout):
+        return state.wait_for_state_changes(since, timeout)[0]
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    samples.sort()
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1e6
+
+def run_scenario(store, runs: int, pollers: int, duration: float, node_count: int, step_delay: float,
+                 poll_interval: float):
+    drawing_ids = [f"bench-contention-{i}" for i in range(runs)]
+    nodes = [{"id": str(n), "action_type": "wait", "params": {}, "connections": []} for n in range(node_count)]
+    for drawing_id in drawing_ids:
+        store.add(drawing_id, nodes)
+
+    stop = threading.Event()
+    update_times = [[] for _ in range(runs)]
+    poll_times = [[] for _ in range(pollers)]
+
+    def runner(index, drawing_id):
+        while not stop.is_set():
+            run_nodes = store.get_drawing(drawing_id)["nodes"]
+            for position, node in enumerate(run_nodes):
+                if stop.is_set() or store.get_execution_state(drawing_id)["should_stop"]:
+                    break
+                started = time.perf_counter()
+                store.update_execution_state(drawing_id, {
+                    "current_node": node["id"],
+                    "progress": int(position / len(run_nodes) * 100)
+                })
+                update_times[index].append(time.perf_counter() - started)
+                # The node's own work (input, screenshots, waits) releases the GIL
+                time.sleep(step_delay)
+
+    def poller(index):
+        while not stop.is_set():
+            started = time.perf_counter()
+            for drawing_id in store.get_all_drawings():
+                store.get_drawing(drawing_id)
+                store.get_execution_state(drawing_id)
+            poll_times[index].append(time.perf_counter() - started)
+            time.sleep(poll_interval)
+
+    def long_poller():
+        version = 0
+        while not stop.is_set():
+            version = store.wait(version, 0.1)
+
+    threads = [threading.Thread(target=runner, args=(i, d)) for i, d in enumerate(drawing_ids)]
+    threads += [threading.Thread(target=poller, args=(i,)) for i in range(pollers)]
+    threads.append(threading.Thread(target=long_poller))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    for drawing_id in drawing_ids:
+        store.remove(drawing_id)
+
+    updates = [t for times in update_times for t in times]
+    polls = [t for times in poll_times for t in times]
+    return {
+        "steps": len(updates) / duration,
+        "update_p50": percentile(updates, 0.5),
+        "update_p99": percentile(updates, 0.99),
+        "polls": len(polls) / duration,
+        "poll_p50": percentile(polls, 0.5),
+        "poll_p99": percentile(polls, 0.99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Active drawing cache contention benchmark")
+    parser.add_argument("--runs", type=int, default=32)
+    parser.add_argument("--pollers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--step-delay", type=float, default=0.001, help="Seconds each simulated node takes")
+    parser.add_argument("--poll-interval", type=float, default=0.001, help="Pause between one poller's requests")
+    args = parser.parse_args()
+
+    print(f"{args.runs} runs ({args.step_delay * 1000:g}ms nodes), {args.pollers} status pollers"
+          f" (every {args.poll_interval * 1000:g}ms) + 1 long-poller, {args.duration:g}s each")
+    print(f"{'scheme':<20} {'steps/s':>9} {'update p50/p99 us':>19} {'polls/s':>9} {'poll p50/p99 us':>17}")
+    for name, store in (("global lock (old)", GlobalLockState()), ("per-drawing + COW", CurrentState())):
+        r = run_scenario(store, args.runs, args.pollers, args.duration, args.nodes, args.step_delay,
+                         args.poll_interval)
+        print(f"{name:<20} {r['steps']:>9.0f} {r['update_p50']:>9.1f}/{r['update_p99']:<9.1f}"
+              f" {r['polls']:>9.0f} {r['poll_p50']:>8.1f}/{r['poll_p99']:<8.1f}")
+
+if __name__ == "__main__":
+    main()
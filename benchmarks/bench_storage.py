@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+存储格式基准测试：画图文件的保存、读取耗时与文件大小
+
+Compares the old in-place pretty-printed JSON with the atomic compact JSON
+writer and, when msgpack is installed, the binary encoding.
+
+Usage: python benchmarks/bench_storage.py [--sizes 10 1000 10000] [--repeat N]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import storage
+
+def build_drawing(node_count: int):
+    nodes = []
+    for i in range(node_count):
+        nodes.append({
+            "id": str(i),
+            "action_type": "clickimg" if i % 3 else "wait",
+            "params": {"x": 100 + i, "y": 200 + i, "duration": 0.5, "image_path": "uploads/button.png",
+                       "threshold": 0.8, "button": "left"},
+            "connections": [str(i + 1)] if i + 1 < node_count else [],
+            "position": [i * 40.0, (i % 10) * 60.0]
+        })
+    return {"id": "bench", "project_id": "bench", "name": f"bench-{node_count}", "nodes": nodes,
+            "boundary": {"x": 0, "y": 0, "width": 1920, "height": 1080}, "order": 1}
+
+def legacy_save(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def legacy_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Drawing save/load benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    formats = [
+        ("json indent=2 (old)", legacy_save, legacy_load),
+        ("json compact atomic", lambda p, d: storage.write_document(p, d, "json"), storage.read_document),
+    ]
+    if storage.msgpack is not None:
+        formats.append(("msgpack atomic", lambda p, d: storage.write_document(p, d, "msgpack"), storage.read_document))
+    else:
+        print("msgpack is not installed; binary format skipped")
+
+    print(f"{'nodes':>6} {'format':<22} {'save ms':>9} {'load ms':>9} {'size KB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            drawing = build_drawing(size)
+            repeat = max(1, args.repeat if size < 10000 else args.repeat // 4)
+            for name, save, load in formats:
+                path = os.path.join(directory, f"{size}.json")
+                save_ms = timed(lambda: save(path, drawing), repeat)
+                load_ms = timed(lambda: load(path), repeat)
+                assert load(path) == drawing
+                print(f"{size:>6} {name:<22} {save_ms:>9.2f} {load_ms:>9.2f} {os.path.getsize(path) / 1024:>9.1f}")
+
+if __name__ == "__main__":
+    main()
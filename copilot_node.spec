@@ -79,6 +79,7 @@ a = Analysis(
         'markupsafe',
         'itsdangerous',
         'click',
+        'waitress',
         # 自动化相关
         'pyautogui',
         'pyscreeze',
@@ -2,7 +2,8 @@ import os
 import pyautogui
 
 pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 0.1
+# Built-in delays are applied by core.timing.TimingPolicy, scaled per run
+pyautogui.PAUSE = 0
 
 PROJECTS_DIR = 'projects'
 UPLOADS_DIR = 'uploads'
@@ -11,6 +12,18 @@ WEB_DIR = 'web'
 # New hierarchical storage structure
 DRAWINGS_SUBDIR = 'drawings'  # Subdirectory within each project
 METADATA_FILE = 'project.json'  # Project metadata file
+MANIFEST_FILE = 'manifest.json'  # Per-project drawing summaries for listings
+RUN_HISTORY_FILE = 'runs.jsonl'  # Per-project append-only log of drawing runs
+JOBS_FILE = os.path.join(PROJECTS_DIR, 'jobs.json')  # Persistent run job queue
+DRAWING_INDEX_FILE = os.path.join(PROJECTS_DIR, 'drawing_index.json')  # drawing id -> project id
+JOURNAL_FILE = os.path.join(PROJECTS_DIR, 'drawings.journal')  # Drawing edits not yet written to their files
+SAVE_DELAY = float(os.environ.get('COPILOTNODE_SAVE_DELAY', '1.0'))  # Seconds an edited drawing waits before it is written
+STORAGE_FORMAT = os.environ.get('COPILOTNODE_STORAGE_FORMAT', 'json')  # Drawing file encoding: json or msgpack
+STORAGE_BACKEND = os.environ.get('COPILOTNODE_STORAGE_BACKEND', 'json')  # json (project directories) or sqlite
+DATABASE_FILE = os.path.join(PROJECTS_DIR, 'copilotnode.db')  # SQLite store for the sqlite backend
+DRAWING_CACHE_ENTRIES = int(os.environ.get('COPILOTNODE_DRAWING_CACHE_ENTRIES', '200'))  # Most drawings kept in memory
+DRAWING_CACHE_BYTES = int(float(os.environ.get('COPILOTNODE_DRAWING_CACHE_MB', '256')) * 1024 * 1024)  # Approximate memory budget for cached drawings
+RUN_HISTORY_LIMIT = int(os.environ.get('COPILOTNODE_RUN_HISTORY_LIMIT', '1000'))  # Runs kept per project
 
 os.makedirs(PROJECTS_DIR, exist_ok=True)
 os.makedirs(UPLOADS_DIR, exist_ok=True)
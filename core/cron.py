@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from typing import List, Set
+
+# (name, low, high) for the five standard fields
+FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7)
+)
+
+# Give up looking for a match after this long (e.g. "0 0 31 2 *" never fires)
+SEARCH_LIMIT = timedelta(days=366 * 5)
+
+class CronExpression:
+    """Five-field cron expression: minute hour day month weekday.
+
+    Each field accepts ``*``, numbers, ranges ``a-b``, steps ``*/n`` or
+    ``a-b/n`` and comma separated lists. Weekday 0 and 7 are both Sunday.
+    As in cron, when both day and weekday are restricted a time matches
+    if either one does.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = " ".join(str(expression).split())
+        parts = self.expression.split(" ")
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"Cron expression needs {len(FIELDS)} fields: '{expression}'")
+
+        values: List[Set[int]] = [self._parse_field(part, *field) for part, field in zip(parts, FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        # Python weekday(): Monday = 0; cron: Sunday = 0 (or 7)
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def matches(self, moment: datetime) -> bool:
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months and self._day_matches(moment))
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after ``moment``"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + SEARCH_LIMIT
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                # Jump to the first minute of the next month
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    @staticmethod
+    def _parse_field(text: str, name: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for item in text.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                if not step_text.isdigit() or int(step_text) < 1:
+                    raise ValueError(f"Invalid step in cron {name} field: '{text}'")
+                step = int(step_text)
+
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start_text, end_text = item.split("-", 1)
+                if not (start_text.isdigit() and end_text.isdigit()):
+                    raise ValueError(f"Invalid range in cron {name} field: '{text}'")
+                start, end = int(start_text), int(end_text)
+            elif item.isdigit():
+                start = int(item)
+                # "5/15" means every 15 starting at 5
+                end = high if step > 1 else start
+            else:
+                raise ValueError(f"Invalid cron {name} field: '{text}'")
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron {name} field out of range {low}-{high}: '{text}'")
+            values.update(range(start, end + 1, step))
+        return values
@@ -0,0 +1,259 @@
+"""Optional SQLite storage for projects, drawings and run history.
+
+Enabled with ``COPILOTNODE_STORAGE_BACKEND=sqlite``; the per-project JSON
+directory layout stays the default. The database runs in WAL mode so status
+reads never wait on a drawing write. Each drawing is kept whole in the
+``drawings`` table (encoded like a drawing file, see ``core.storage``) next to
+the columns listings and queries need, and its nodes are mirrored into a
+``nodes`` table so "which drawings use this image" is an index lookup.
+"""
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+from core.storage import decode, encode
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    created_at TEXT,
+    last_modified TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_last_modified ON projects(last_modified);
+
+CREATE TABLE IF NOT EXISTS drawings (
+    id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT,
+    sort_order,
+    created_at TEXT,
+    last_modified TEXT,
+    last_executed TEXT,
+    node_count INTEGER,
+    boundary TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS drawings_project_order ON drawings(project_id, sort_order);
+CREATE INDEX IF NOT EXISTS drawings_last_executed ON drawings(last_executed);
+
+CREATE TABLE IF NOT EXISTS nodes (
+    drawing_id TEXT NOT NULL REFERENCES drawings(id) ON DELETE CASCADE,
+    node_id TEXT NOT NULL,
+    action_type TEXT,
+    image_path TEXT,
+    PRIMARY KEY (drawing_id, node_id)
+);
+CREATE INDEX IF NOT EXISTS nodes_image_path ON nodes(image_path) WHERE image_path IS NOT NULL;
+CREATE INDEX IF NOT EXISTS nodes_action_type ON nodes(action_type);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    drawing_id TEXT NOT NULL,
+    project_id TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    outcome TEXT,
+    node_count INTEGER,
+    duration REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_drawing_started ON runs(drawing_id, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs(started_at);
+CREATE INDEX IF NOT EXISTS runs_project ON runs(project_id, id);
+"""
+
+RUN_FIELDS = ("drawing_id", "project_id", "started_at", "finished_at", "outcome", "node_count", "duration", "error")
+
+class DrawingDatabase:
+    """Thread-safe access to the SQLite store; one connection per thread"""
+
+    def __init__(self, path: str, storage_format: str = "json"):
+        self.path = path
+        self.storage_format = storage_format
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL with NORMAL sync survives an application crash; only a power loss can drop the last commits
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Projects
+    def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT data FROM projects WHERE id = ?", (project_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def list_projects(self) -> List[Dict[str, Any]]:
+        rows = self._connect().execute("SELECT data FROM projects ORDER BY last_modified DESC")
+        return [json.loads(row["data"]) for row in rows]
+
+    def put_project(self, metadata: Dict[str, Any]):
+        with self._connect() as conn:
+            self._put_project(conn, metadata)
+
+    def update_project(self, project_id: str, updates: Dict[str, Any]) -> bool:
+        """Merge ``updates`` into a project's metadata; False when there is no such project"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM projects WHERE id = ?", (project_id,)).fetchone()
+            if row is None:
+                return False
+            metadata = json.loads(row["data"])
+            metadata.update(updates)
+            self._put_project(conn, metadata)
+            return True
+
+    def delete_project(self, project_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM projects WHERE id = ?", (project_id,)).rowcount > 0
+
+    def _put_project(self, conn: sqlite3.Connection, metadata: Dict[str, Any]):
+        # An upsert rather than INSERT OR REPLACE: replacing deletes the row, cascading to its drawings
+        conn.execute(
+            "INSERT INTO projects (id, name, created_at, last_modified, data) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT(id) DO UPDATE SET name = excluded.name, created_at = excluded.created_at,"
+            " last_modified = excluded.last_modified, data = excluded.data",
+            (metadata["id"], metadata.get("name"), metadata.get("created_at"), metadata.get("last_modified"),
+             json.dumps(metadata, ensure_ascii=False))
+        )
+
+    # Drawings
+    def get_drawing(self, drawing_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT data FROM drawings WHERE id = ?", (drawing_id,)).fetchone()
+        return decode(row["data"]) if row else None
+
+    def put_drawing(self, drawing: Dict[str, Any]):
+        """Insert or replace a drawing (without execution state) and its node rows"""
+        nodes = drawing.get("nodes") or []
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO drawings (id, project_id, name, sort_order, created_at, last_modified, last_executed,"
+                " node_count, boundary, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(id) DO UPDATE SET project_id = excluded.project_id, name = excluded.name,"
+                " sort_order = excluded.sort_order, created_at = excluded.created_at,"
+                " last_modified = excluded.last_modified,"
+                # Runs set last_executed on the row only; a drawing saved since must not roll it back
+                " last_executed = CASE WHEN drawings.last_executed IS NULL"
+                " OR excluded.last_executed > drawings.last_executed"
+                " THEN excluded.last_executed ELSE drawings.last_executed END,"
+                " node_count = excluded.node_count, boundary = excluded.boundary, data = excluded.data",
+                (drawing["id"], drawing.get("project_id"), drawing.get("name"), drawing.get("order"),
+                 drawing.get("created_at"), drawing.get("last_modified"), drawing.get("last_executed"),
+                 len(nodes), json.dumps(drawing.get("boundary")), encode(drawing, self.storage_format))
+            )
+            conn.execute("DELETE FROM nodes WHERE drawing_id = ?", (drawing["id"],))
+            conn.executemany(
+                "INSERT OR REPLACE INTO nodes (drawing_id, node_id, action_type, image_path) VALUES (?, ?, ?, ?)",
+                [(drawing["id"], str(node.get("id")), node.get("action_type"),
+                  (node.get("params") or {}).get("image_path") or None) for node in nodes]
+            )
+
+    def delete_drawing(self, drawing_id: str) -> Optional[str]:
+        """Delete a drawing; returns the project it belonged to, or None if there was none"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT project_id FROM drawings WHERE id = ?", (drawing_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM drawings WHERE id = ?", (drawing_id,))
+            return row["project_id"]
+
+    def drawing_rows(self, project_id: str) -> List[Dict[str, Any]]:
+        """Listing rows of a project's drawings (see ``core.manifest.drawing_summary``), in order"""
+        rows = self._connect().execute(
+            "SELECT id, name, created_at, last_modified, sort_order, node_count, boundary FROM drawings"
+            " WHERE project_id = ? ORDER BY sort_order", (project_id,)
+        )
+        return [{
+            "id": row["id"],
+            "name": row["name"] or "",
+            "created_at": row["created_at"],
+            "last_modified": row["last_modified"],
+            "order": row["sort_order"] if row["sort_order"] is not None else 0,
+            "node_count": row["node_count"],
+            "boundary": json.loads(row["boundary"]) if row["boundary"] else None
+        } for row in rows]
+
+    def drawing_counts(self) -> Dict[str, int]:
+        """Number of drawings in each project that has any"""
+        rows = self._connect().execute("SELECT project_id, COUNT(*) AS drawings FROM drawings GROUP BY project_id")
+        return {row["project_id"]: row["drawings"] for row in rows}
+
+    def drawings_using_image(self, image_path: str) -> List[Dict[str, Any]]:
+        """Drawings with a node whose ``image_path`` is ``image_path``, with the matching node ids"""
+        rows = self._connect().execute(
+            "SELECT d.id, d.project_id, d.name, n.node_id FROM nodes n JOIN drawings d ON d.id = n.drawing_id"
+            " WHERE n.image_path = ? ORDER BY d.project_id, d.sort_order", (image_path,)
+        )
+        found: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            entry = found.setdefault(row["id"], {
+                "id": row["id"], "project_id": row["project_id"], "name": row["name"], "nodes": []
+            })
+            entry["nodes"].append(row["node_id"])
+        return list(found.values())
+
+    def recently_run_drawings(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT id, project_id, name, last_executed FROM drawings WHERE last_executed IS NOT NULL"
+            " ORDER BY last_executed DESC LIMIT ?", (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    # Run history
+    def add_run(self, run: Dict[str, Any], keep: Optional[int] = None) -> int:
+        """Record a run and mark its drawing's ``last_executed``; keeps only the newest ``keep`` runs of the project"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"INSERT INTO runs ({', '.join(RUN_FIELDS)}) VALUES ({', '.join('?' * len(RUN_FIELDS))})",
+                tuple(run.get(field) for field in RUN_FIELDS)
+            )
+            if run.get("finished_at"):
+                conn.execute(
+                    "UPDATE drawings SET last_executed = ? WHERE id = ?"
+                    " AND (last_executed IS NULL OR last_executed < ?)",
+                    (run["finished_at"], run.get("drawing_id"), run["finished_at"])
+                )
+            if keep is not None:
+                conn.execute(
+                    "DELETE FROM runs WHERE project_id IS ? AND id <= (SELECT id FROM runs WHERE project_id IS ?"
+                    " ORDER BY id DESC LIMIT 1 OFFSET ?)", (run.get("project_id"), run.get("project_id"), keep)
+                )
+            return cursor.lastrowid
+
+    def runs(self, drawing_id: Optional[str] = None, limit: int = 50, project_id: Optional[str] = None,
+             outcome: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent runs first: of one drawing or project, or of all; optionally one outcome or started since ``since``"""
+        conditions, params = [], []
+        for column, value in (("drawing_id", drawing_id), ("project_id", project_id), ("outcome", outcome)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(since)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connect().execute(
+            f"SELECT * FROM runs{where} ORDER BY started_at DESC, id DESC LIMIT ?", (*params, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def last_executed(self, project_id: str) -> Dict[str, str]:
+        """When each of a project's drawings last finished a run"""
+        rows = self._connect().execute(
+            "SELECT id, last_executed FROM drawings WHERE project_id = ? AND last_executed IS NOT NULL", (project_id,)
+        )
+        return {row["id"]: row["last_executed"] for row in rows}
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+from core.log import get_logger
+from core.storage import read_document, write_document
+
+log = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+# A lookup for an unknown id rescans the projects at most this often, so a
+# drawing copied in by hand is found without every bad id costing a full scan
+MISS_RESCAN_INTERVAL = 5.0
+
+class DrawingIndex:
+    """Persistent map from drawing id to the project that stores it.
+
+    Loaded (or built by scanning every project) on first use and updated in
+    place as drawings and projects are created and deleted. An entry whose
+    file has gone, or an unreadable index file, triggers a rebuild.
+    """
+
+    def __init__(self, projects_dir: str, drawings_subdir: str, index_path: Optional[str] = None):
+        self.projects_dir = projects_dir
+        self.drawings_subdir = drawings_subdir
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._projects: Optional[Dict[str, str]] = None
+        self._last_scan = 0.0
+        self.rebuilds = 0
+
+    def drawing_path(self, project_id: str, drawing_id: str) -> str:
+        return os.path.join(self.projects_dir, project_id, self.drawings_subdir, f"{drawing_id}.json")
+
+    def project_for(self, drawing_id: str) -> Optional[str]:
+        """Id of the project holding a drawing, or None if no project holds it"""
+        with self._lock:
+            self._ensure_loaded()
+            project_id = self._projects.get(drawing_id)
+            if project_id is not None:
+                if os.path.exists(self.drawing_path(project_id, drawing_id)):
+                    return project_id
+                log.warning("drawing index stale, rebuilding", drawing=drawing_id, project=project_id)
+                self._rebuild()
+            elif time.monotonic() - self._last_scan >= MISS_RESCAN_INTERVAL:
+                self._rebuild()
+            return self._projects.get(drawing_id)
+
+    def path_for(self, drawing_id: str) -> Optional[str]:
+        """Path of a drawing's JSON file, or None if no project holds it"""
+        project_id = self.project_for(drawing_id)
+        return self.drawing_path(project_id, drawing_id) if project_id is not None else None
+
+    def add(self, drawing_id: str, project_id: str):
+        with self._lock:
+            self._ensure_loaded()
+            self._projects[drawing_id] = project_id
+            self._save()
+
+    def remove(self, drawing_id: str):
+        with self._lock:
+            self._ensure_loaded()
+            if self._projects.pop(drawing_id, None) is not None:
+                self._save()
+
+    def remove_project(self, project_id: str):
+        with self._lock:
+            self._ensure_loaded()
+            drawing_ids = [d for d, p in self._projects.items() if p == project_id]
+            for drawing_id in drawing_ids:
+                del self._projects[drawing_id]
+            if drawing_ids:
+                self._save()
+
+    def rebuild(self):
+        with self._lock:
+            self._rebuild()
+
+    def _ensure_loaded(self):
+        if self._projects is not None:
+            return
+        if self.index_path and os.path.exists(self.index_path):
+            try:
+                data = read_document(self.index_path)
+                if data.get("version") == INDEX_VERSION and isinstance(data.get("drawings"), dict):
+                    self._projects = dict(data["drawings"])
+                    return
+            except Exception as e:
+                log.warning("drawing index unreadable, rebuilding", path=self.index_path, error=str(e))
+        self._rebuild()
+
+    def _rebuild(self):
+        projects: Dict[str, str] = {}
+        if os.path.isdir(self.projects_dir):
+            for project_id in os.listdir(self.projects_dir):
+                drawings_dir = os.path.join(self.projects_dir, project_id, self.drawings_subdir)
+                if not os.path.isdir(drawings_dir):
+                    continue
+                for filename in os.listdir(drawings_dir):
+                    if filename.endswith('.json'):
+                        projects[filename[:-5]] = project_id
+        self._projects = projects
+        self._last_scan = time.monotonic()
+        self.rebuilds += 1
+        self._save()
+        log.info("drawing index rebuilt", drawings=len(projects))
+
+    def _save(self):
+        if not self.index_path:
+            return
+        try:
+            write_document(self.index_path, {"version": INDEX_VERSION, "drawings": self._projects})
+        except Exception as e:
+            log.error("drawing index save failed", path=self.index_path, error=str(e))
@@ -0,0 +1,73 @@
+import itertools
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_CAPACITY = 2048
+
+# Execution-state keys that never leave the process
+PRIVATE_KEYS = ("thread", "should_stop")
+
+class Event:
+    __slots__ = ("id", "type", "data")
+
+    def __init__(self, event_id: int, event_type: str, data: Dict[str, Any]):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+class EventBus:
+    """In-process event log with sequential ids, for the SSE stream.
+
+    Publishers append to a bounded ring buffer and wake waiting readers.
+    A reader remembers the last id it saw and asks for everything after it;
+    if that id has already been overwritten it is told to resync.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._events: deque = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._cond = threading.Condition()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> int:
+        with self._cond:
+            event_id = next(self._ids)
+            self._events.append(Event(event_id, event_type, data))
+            self._last_id = event_id
+            self._cond.notify_all()
+            return event_id
+
+    def since(self, last_id: int) -> Tuple[List[Event], bool]:
+        """Events after ``last_id``, and whether the buffer still covered that point"""
+        with self._cond:
+            return self._since(last_id)
+
+    def wait(self, last_id: int, timeout: Optional[float] = None) -> Tuple[List[Event], bool]:
+        """Like ``since`` but blocks until there is something newer than ``last_id`` or the timeout"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._last_id > last_id, timeout)
+            return self._since(last_id)
+
+    def _since(self, last_id: int) -> Tuple[List[Event], bool]:
+        if last_id >= self._last_id:
+            return [], True
+        oldest = self._events[0].id if self._events else self._last_id + 1
+        complete = last_id >= oldest - 1
+        return [event for event in self._events if event.id > last_id], complete
+
+_bus = EventBus()
+
+def get_event_bus() -> EventBus:
+    return _bus
+
+def publish(event_type: str, **data) -> int:
+    return _bus.publish(event_type, data)
+
+def public_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Execution state (or a delta of it) without the process-local keys"""
+    return {key: value for key, value in state.items() if key not in PRIVATE_KEYS}
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+class DrawingGraph:
+    """Indexed view of a drawing's node list used by the execution engines.
+
+    Holds its own copy of each node: runs record per-run results on them
+    (``_found``, ``_condition_result``, ``_branch_results``), which must not
+    reach the cached drawing and from there its file.
+    """
+
+    def __init__(self, nodes: List[Dict[str, Any]]):
+        self.nodes = [dict(node) for node in nodes]
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        targets = set()
+        for node in self.nodes:
+            # First node wins on duplicate ids, matching the old linear lookup
+            self.by_id.setdefault(node["id"], node)
+            targets.update(node.get("connections", []))
+
+        self.start_nodes = [node for node in self.nodes if node["id"] not in targets]
+        if not self.start_nodes and self.nodes:
+            self.start_nodes = [self.nodes[0]]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def get(self, node_id: str) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(node_id)
+
+    def next_ids(self, node: Dict[str, Any], condition_result: bool = False) -> List[str]:
+        """Successors to run after a node; IF nodes take connections[0] when true, [1] when false"""
+        connections = node.get("connections", [])
+        if node["action_type"] == "if":
+            index = 0 if condition_result else 1
+            return list(connections[index:index + 1])
+        return list(connections)
+
+    def find_join(self, fork_node: Dict[str, Any], _active: Optional[set] = None) -> Optional[str]:
+        """Nearest join node downstream of a fork's branches, skipping nested fork/join pairs"""
+        active = set(_active or ())
+        if fork_node["id"] in active:
+            return None
+        active.add(fork_node["id"])
+
+        seen = {fork_node["id"]}
+        queue = deque(fork_node.get("connections", []))
+        while queue:
+            node_id = queue.popleft()
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+
+            node = self.get(node_id)
+            if not node:
+                continue
+            if node["action_type"] == "join":
+                return node_id
+            if node["action_type"] == "fork":
+                inner_join = self.find_join(node, active)
+                if inner_join:
+                    seen.add(inner_join)
+                    queue.extend(self.by_id[inner_join].get("connections", []))
+                continue
+            queue.extend(node.get("connections", []))
+        return None
+
+    @staticmethod
+    def join_mode(join_node: Optional[Dict[str, Any]]) -> str:
+        """'all' waits for every branch, 'any' continues after the first one finishes"""
+        mode = (join_node or {}).get("params", {}).get("mode", "all")
+        return "any" if mode == "any" else "all"
+
+class ForkBranch:
+    """Bookkeeping for one branch of a fork node"""
+
+    def __init__(self, head_id: str, join_id: Optional[str], parent: Optional['ForkBranch'] = None):
+        self.head_id = head_id
+        self.join_id = join_id
+        self.parent = parent
+        self.nodes: List[str] = []
+        self.results: Dict[str, bool] = {}
+        self.error: Optional[str] = None
+        self.winner = False
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or (self.parent is not None and self.parent.cancelled)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def stops_at(self, node_id: str) -> bool:
+        """Branches end where they reach their join, or at the next node once cancelled"""
+        return node_id == self.join_id or self.cancelled
+
+    def record(self, node: Dict[str, Any]):
+        self.nodes.append(node["id"])
+        if "_found" in node:
+            self.results[node["id"]] = bool(node["_found"])
+        elif node["action_type"] == "if" and "_condition_result" in node:
+            self.results[node["id"]] = bool(node["_condition_result"])
+
+    def finish(self, error: Optional[str] = None):
+        self._finished = time.perf_counter()
+        self.error = error
+
+    def result(self) -> Dict[str, Any]:
+        if self.error:
+            status = "error"
+        elif self._finished is None:
+            status = "running"
+        elif self._cancelled.is_set():
+            status = "cancelled"
+        else:
+            status = "completed"
+        finished = self._finished if self._finished is not None else time.perf_counter()
+        return {
+            "branch": self.head_id,
+            "status": status,
+            "winner": self.winner,
+            "nodes": list(self.nodes),
+            "results": dict(self.results),
+            "duration": round(finished - self._started, 4),
+            "error": self.error
+        }
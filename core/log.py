@@ -0,0 +1,145 @@
+"""Structured logging with a queue-backed background handler.
+
+Call sites log a short event name plus keyword fields. Records are handed to a
+queue untouched and formatted and written by a listener thread, so the
+executing thread never blocks on console I/O.
+
+Per-action debug output is off by default and gated per scope (a drawing id,
+or ``WORKFLOW_SCOPE`` for the single workflow); a disabled debug call costs a
+set lookup and nothing is formatted.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from typing import Dict, Any, List, Optional
+
+ROOT_LOGGER = "copilotnode"
+WORKFLOW_SCOPE = "workflow"
+DEFAULT_LEVEL = os.environ.get("COPILOTNODE_LOG_LEVEL", "INFO").upper()
+
+_setup_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_debug_scopes = frozenset()
+
+class StructuredFormatter(logging.Formatter):
+    """``HH:MM:SS LEVEL logger event key=value ...``"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.name} {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={self._format_value(value)}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+    @staticmethod
+    def _format_value(value: Any) -> str:
+        text = str(value)
+        if not text or any(ch.isspace() for ch in text):
+            return repr(text)
+        return text
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class StructuredLogger:
+    """Thin wrapper that turns keyword arguments into record fields"""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def debug(self, scope: Optional[str], event: str, **fields):
+        """Per-action debug record, emitted when debug is on for the scope or globally"""
+        if scope in _debug_scopes or self.logger.isEnabledFor(logging.DEBUG):
+            if scope is not None:
+                fields = {"scope": scope, **fields}
+            self._emit(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields):
+        if self.logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, event, fields)
+
+    def error(self, event: str, exc_info: bool = False, **fields):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, event, fields, sys.exc_info() if exc_info else None)
+
+    def _emit(self, level: int, event: str, fields: Dict[str, Any], exc_info=None):
+        # handle() skips the level check so scoped debug records get through an INFO logger
+        record = self.logger.makeRecord(self.logger.name, level, "", 0, event, (), exc_info,
+                                        extra={"fields": fields})
+        self.logger.handle(record)
+
+def setup_logging(level: Optional[str] = None, stream=None):
+    """Install the queue handler and start the listener thread (idempotent)"""
+    global _listener
+    with _setup_lock:
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(level or DEFAULT_LEVEL)
+        if _listener is not None:
+            return
+
+        log_queue: queue.Queue = queue.Queue(-1)
+        console = logging.StreamHandler(stream or sys.stderr)
+        console.setFormatter(StructuredFormatter())
+
+        root.addHandler(_DeferredQueueHandler(log_queue))
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+            root = logging.getLogger(ROOT_LOGGER)
+            for handler in [h for h in root.handlers if isinstance(h, _DeferredQueueHandler)]:
+                root.removeHandler(handler)
+
+def get_logger(name: str) -> StructuredLogger:
+    """Get a structured logger under the application root logger"""
+    if _listener is None:
+        setup_logging()
+    return StructuredLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"))
+
+def get_level() -> str:
+    return logging.getLevelName(logging.getLogger(ROOT_LOGGER).getEffectiveLevel())
+
+def set_level(level: str):
+    """Change the global log level at runtime"""
+    level = str(level).upper()
+    if level not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+        raise ValueError(f"Invalid log level: {level}")
+    logging.getLogger(ROOT_LOGGER).setLevel(level)
+
+def set_debug(scope: str, enabled: bool = True):
+    """Turn per-action debug output on or off for one drawing (or the workflow)"""
+    global _debug_scopes
+    with _setup_lock:
+        # Swap in a new frozenset so readers never need the lock
+        if enabled:
+            _debug_scopes = _debug_scopes | {scope}
+        else:
+            _debug_scopes = _debug_scopes - {scope}
+
+def debug_enabled(scope: str) -> bool:
+    return scope in _debug_scopes
+
+def get_debug_scopes() -> List[str]:
+    return sorted(_debug_scopes)
@@ -0,0 +1,184 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from core.log import get_logger
+from core.storage import read_document, write_document
+
+log = get_logger(__name__)
+
+# 2 added the drawing file stamps; older manifests are rebuilt
+MANIFEST_VERSION = 2
+
+Rows = Dict[str, Dict[str, Any]]
+Stamps = Dict[str, List[int]]
+
+def drawing_summary(drawing: Dict[str, Any]) -> Dict[str, Any]:
+    """The listing row for a drawing; everything a project listing needs except execution state"""
+    return {
+        "id": drawing["id"],
+        "name": drawing.get("name", ""),
+        "created_at": drawing.get("created_at"),
+        "last_modified": drawing.get("last_modified"),
+        "order": drawing.get("order", 0),
+        "node_count": len(drawing.get("nodes", [])),
+        "boundary": drawing.get("boundary")
+    }
+
+class ManifestStore:
+    """Per-project ``manifest.json`` with a summary row for each drawing.
+
+    Every write of a drawing file updates its row, so listings read one small
+    file per project instead of parsing every drawing. The drawing file and
+    the manifest are two separate writes, so each row also records the
+    mtime and size of the file it was made from. Reads stat the drawing files
+    and re-summarise only those whose stamp no longer matches. That covers a
+    crash between the two writes, a failed manifest write and files edited
+    by hand. A project without a manifest (or with an unreadable one) gets it
+    rebuilt from its drawing files.
+    """
+
+    def __init__(self, projects_dir: str, drawings_subdir: str, manifest_file: str = "manifest.json"):
+        self.projects_dir = projects_dir
+        self.drawings_subdir = drawings_subdir
+        self.manifest_file = manifest_file
+        self._lock = threading.Lock()
+
+    def rows(self, project_id: str) -> List[Dict[str, Any]]:
+        """Summary rows of a project's drawings, unsorted"""
+        manifest = self._read(project_id)
+        if manifest is not None and manifest[1] == self._scan(project_id):
+            return list(manifest[0].values())
+        with self._lock:
+            manifest = self._read(project_id)
+            rows = self._rebuild(project_id) if manifest is None else self._refresh(project_id, *manifest)
+        return list(rows.values())
+
+    def count(self, project_id: str) -> int:
+        """Number of drawings in a project, straight from its manifest without checking the drawing files"""
+        manifest = self._read(project_id)
+        if manifest is not None:
+            return len(manifest[0])
+        return len(self.rows(project_id))
+
+    def upsert(self, project_id: str, drawing: Dict[str, Any]):
+        summary = drawing_summary(drawing)
+        stamp = self._stamp(self._drawing_path(project_id, summary["id"]))
+
+        def change(rows: Rows, stamps: Stamps):
+            rows[summary["id"]] = summary
+            if stamp is not None:
+                stamps[summary["id"]] = stamp
+        self._update(project_id, change)
+
+    def remove(self, project_id: str, drawing_id: str):
+        def change(rows: Rows, stamps: Stamps):
+            rows.pop(drawing_id, None)
+            stamps.pop(drawing_id, None)
+        self._update(project_id, change)
+
+    def rebuild(self, project_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._rebuild(project_id).values())
+
+    def _update(self, project_id: str, change: Callable[[Rows, Stamps], Any]):
+        with self._lock:
+            manifest = self._read(project_id)
+            if manifest is None:
+                # The rebuild already reflects the drawing file just written
+                self._rebuild(project_id)
+                return
+            change(*manifest)
+            self._write(project_id, *manifest)
+
+    def _path(self, project_id: str) -> str:
+        return os.path.join(self.projects_dir, project_id, self.manifest_file)
+
+    def _drawings_dir(self, project_id: str) -> str:
+        return os.path.join(self.projects_dir, project_id, self.drawings_subdir)
+
+    def _drawing_path(self, project_id: str, drawing_id: str) -> str:
+        return os.path.join(self._drawings_dir(project_id), f"{drawing_id}.json")
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[List[int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _scan(self, project_id: str) -> Stamps:
+        """Stamp of every drawing file in a project, by drawing id"""
+        stamps: Stamps = {}
+        drawings_dir = self._drawings_dir(project_id)
+        if not os.path.isdir(drawings_dir):
+            return stamps
+        for filename in os.listdir(drawings_dir):
+            if filename.endswith('.json'):
+                stamp = self._stamp(os.path.join(drawings_dir, filename))
+                if stamp is not None:
+                    stamps[filename[:-5]] = stamp
+        return stamps
+
+    def _summarise(self, project_id: str, drawing_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            drawing = read_document(self._drawing_path(project_id, drawing_id))
+        except Exception:
+            return None
+        drawing.setdefault("id", drawing_id)
+        return drawing_summary(drawing)
+
+    def _refresh(self, project_id: str, rows: Rows, stamps: Stamps) -> Rows:
+        """Re-summarise drawings whose file changed since their row was written; hold ``_lock``"""
+        current = self._scan(project_id)
+        stale = [drawing_id for drawing_id, stamp in current.items() if stamps.get(drawing_id) != stamp]
+        gone = [drawing_id for drawing_id in set(rows) | set(stamps) if drawing_id not in current]
+        if not stale and not gone:
+            return rows
+        for drawing_id in gone:
+            rows.pop(drawing_id, None)
+            stamps.pop(drawing_id, None)
+        for drawing_id in stale:
+            # Stamp before reading, so a write racing the read leaves the row stale again
+            summary = self._summarise(project_id, drawing_id)
+            stamps[drawing_id] = current[drawing_id]
+            if summary is None:
+                rows.pop(drawing_id, None)
+            else:
+                rows[drawing_id] = summary
+        self._write(project_id, rows, stamps)
+        log.info("manifest rows refreshed", project=project_id, stale=len(stale), gone=len(gone))
+        return rows
+
+    def _read(self, project_id: str) -> Optional[Tuple[Rows, Stamps]]:
+        path = self._path(project_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            data = read_document(path)
+        except Exception as e:
+            log.warning("manifest unreadable, rebuilding", project=project_id, error=str(e))
+            return None
+        if (data.get("version") != MANIFEST_VERSION or not isinstance(data.get("drawings"), dict)
+                or not isinstance(data.get("stamps"), dict)):
+            return None
+        return data["drawings"], data["stamps"]
+
+    def _rebuild(self, project_id: str) -> Rows:
+        rows: Rows = {}
+        stamps: Stamps = {}
+        for drawing_id, stamp in self._scan(project_id).items():
+            summary = self._summarise(project_id, drawing_id)
+            stamps[drawing_id] = stamp
+            if summary is not None:
+                rows[drawing_id] = summary
+        if os.path.isdir(os.path.join(self.projects_dir, project_id)):
+            self._write(project_id, rows, stamps)
+        log.info("manifest rebuilt", project=project_id, drawings=len(rows))
+        return rows
+
+    def _write(self, project_id: str, rows: Rows, stamps: Stamps):
+        try:
+            write_document(self._path(project_id), {"version": MANIFEST_VERSION, "drawings": rows, "stamps": stamps})
+        except Exception as e:
+            log.error("manifest save failed", project=project_id, error=str(e))
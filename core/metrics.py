@@ -0,0 +1,249 @@
+"""Process metrics in the Prometheus text exposition format.
+
+Counters and histograms are sharded per thread: an update touches only the
+calling thread's own dict, so hot paths (screen capture, template matching,
+node execution) never contend on a lock. A scrape copies every shard and sums
+them. Shards of finished threads are folded into one retired total (on scrape
+or when a new thread first writes), so short-lived threads do not pile up
+shards. Gauges are computed on scrape from a callback.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Nodes include waits and image waits, which run far longer than a capture or a match
+NODE_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+
+    def _key(self, label_values: Tuple[str, ...]) -> Tuple[str, ...]:
+        if len(label_values) != len(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {label_values}")
+        return tuple(str(value) for value in label_values)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+class _ShardedMetric(_Metric):
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            # Once per thread
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._retire_finished()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_finished(self):
+        """Fold shards of finished threads into the retired total; hold ``_shards_lock``"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                # Its thread is gone, so nothing writes to this shard any more
+                for key, value in shard.items():
+                    self._merge(self._retired, key, value)
+        self._shards = live
+
+    def _merge(self, totals: dict, key: Tuple[str, ...], value):
+        raise NotImplementedError
+
+    def _snapshots(self) -> List[dict]:
+        with self._shards_lock:
+            self._retire_finished()
+            shards = [shard for _, shard in self._shards]
+            retired = {}
+            for key, value in self._retired.items():
+                self._merge(retired, key, value)
+        return [retired] + [dict(shard) for shard in shards]
+
+class Counter(_ShardedMetric):
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1.0):
+        key = self._key(label_values)
+        shard = self._shard()
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def _merge(self, totals: dict, key: Tuple[str, ...], value: float):
+        totals[key] = totals.get(key, 0.0) + value
+
+    def value(self, *label_values) -> float:
+        key = self._key(label_values)
+        return sum(shard.get(key, 0.0) for shard in self._snapshots())
+
+    def samples(self) -> List[str]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return [f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in sorted(totals.items())]
+
+class Histogram(_ShardedMetric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values):
+        key = self._key(label_values)
+        shard = self._shard()
+        # One slot per bucket plus +Inf, then sum and count
+        slots = shard.get(key)
+        if slots is None:
+            slots = shard[key] = [0.0] * (len(self.buckets) + 3)
+        slots[bisect_left(self.buckets, value)] += 1
+        slots[-2] += value
+        slots[-1] += 1
+
+    def _merge(self, totals: dict, key: Tuple[str, ...], slots: List[float]):
+        merged = totals.setdefault(key, [0.0] * len(slots))
+        for i, value in enumerate(list(slots)):
+            merged[i] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def count(self, *label_values) -> float:
+        key = self._key(label_values)
+        return sum(shard[key][-1] for shard in self._snapshots() if key in shard)
+
+    def samples(self) -> List[str]:
+        totals: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in self._snapshots():
+            for key, slots in shard.items():
+                self._merge(totals, key, slots)
+
+        lines = []
+        bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+        for key, slots in sorted(totals.items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, slots):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + (bound,))} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(slots[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {_number(slots[-1])}")
+        return lines
+
+class Gauge(_Metric):
+    """A value read from a callback at scrape time"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text)
+        self._function = function
+
+    def set_function(self, function: Callable[[], float]):
+        self._function = function
+
+    def samples(self) -> List[str]:
+        if self._function is None:
+            return []
+        return [f"{self.name} {_number(self._function())}"]
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name: str, help_text: str, function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, help_text, function))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+REGISTRY = Registry()
+
+SCREENSHOT_SECONDS = REGISTRY.histogram(
+    "copilotnode_screenshot_seconds", "Time to capture the screen or a region of it")
+TEMPLATE_MATCH_SECONDS = REGISTRY.histogram(
+    "copilotnode_template_match_seconds", "Time to match a template against a captured frame")
+TEMPLATE_LOAD_SECONDS = REGISTRY.histogram(
+    "copilotnode_template_load_seconds", "Time to read a template image from disk on a cache miss")
+TEMPLATE_CACHE = REGISTRY.counter(
+    "copilotnode_template_cache_total", "Template lookups by cache result", ("result",))
+NODE_SECONDS = REGISTRY.histogram(
+    "copilotnode_node_duration_seconds", "Node execution time by action type", ("action_type",), NODE_BUCKETS)
+RUNS = REGISTRY.counter(
+    "copilotnode_runs_total", "Finished runs by kind (drawing, workflow) and outcome", ("kind", "outcome"))
+FAILSAFE = REGISTRY.counter(
+    "copilotnode_failsafe_total", "Runs stopped by the pyautogui failsafe (cursor in a screen corner)")
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "copilotnode_http_request_seconds", "API request latency by route", ("route", "method", "status"))
+DRAWING_CACHE_SIZE = REGISTRY.gauge(
+    "copilotnode_drawing_cache_size", "Drawings held in the in-memory cache")
+DRAWING_CACHE_BYTES = REGISTRY.gauge(
+    "copilotnode_drawing_cache_bytes", "Approximate encoded size of the drawings in the in-memory cache")
+DRAWING_CACHE = REGISTRY.counter(
+    "copilotnode_drawing_cache_total", "Drawing lookups by cache result (hit, miss)", ("result",))
+DRAWING_CACHE_EVICTIONS = REGISTRY.counter(
+    "copilotnode_drawing_cache_evictions_total", "Drawings evicted from the in-memory cache")
+
+def run_outcome(state: Dict) -> str:
+    """Outcome of a finished run from its execution state"""
+    if state.get("error"):
+        return "error"
+    if state.get("should_stop"):
+        return "stopped"
+    return "completed"
@@ -0,0 +1,75 @@
+"""Copy the JSON project directories into the SQLite store.
+
+Usage: python -m core.migrate [--projects-dir projects] [--database projects/copilotnode.db]
+
+Safe to run again: projects and drawings are upserted by id. The JSON files
+are left in place, so switching ``COPILOTNODE_STORAGE_BACKEND`` back to
+``json`` returns to them (without any edits made in the meantime).
+"""
+import argparse
+import os
+from typing import Dict
+from core.database import DrawingDatabase
+from core.log import get_logger
+from core.storage import read_document
+
+log = get_logger(__name__)
+
+DEFAULT_PROJECTS_DIR = 'projects'
+DEFAULT_DATABASE = os.path.join(DEFAULT_PROJECTS_DIR, 'copilotnode.db')
+
+def migrate_directory(projects_dir: str, database: DrawingDatabase, drawings_subdir: str = 'drawings',
+                      metadata_file: str = 'project.json') -> Dict[str, int]:
+    """Import every project and drawing under ``projects_dir``; returns counts of what was imported and skipped"""
+    counts = {"projects": 0, "drawings": 0, "skipped": 0}
+    if not os.path.isdir(projects_dir):
+        return counts
+    for project_id in sorted(os.listdir(projects_dir)):
+        metadata_path = os.path.join(projects_dir, project_id, metadata_file)
+        if not os.path.isfile(metadata_path):
+            continue
+        try:
+            metadata = read_document(metadata_path)
+        except Exception as e:
+            log.warning("project unreadable, skipped", project=project_id, error=str(e))
+            counts["skipped"] += 1
+            continue
+        metadata.setdefault("id", project_id)
+        database.put_project(metadata)
+        counts["projects"] += 1
+
+        drawings_dir = os.path.join(projects_dir, project_id, drawings_subdir)
+        if not os.path.isdir(drawings_dir):
+            continue
+        for filename in sorted(os.listdir(drawings_dir)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                drawing = read_document(os.path.join(drawings_dir, filename))
+            except Exception as e:
+                log.warning("drawing unreadable, skipped", project=project_id, file=filename, error=str(e))
+                counts["skipped"] += 1
+                continue
+            drawing.setdefault("id", filename[:-5])
+            # The directory a drawing sits in decides its project, as it does for the JSON backend
+            drawing["project_id"] = metadata["id"]
+            drawing.pop("execution_state", None)
+            database.put_drawing(drawing)
+            counts["drawings"] += 1
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Import JSON projects into the SQLite store")
+    parser.add_argument("--projects-dir", default=DEFAULT_PROJECTS_DIR)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--format", default="json", help="Encoding of stored drawings: json or msgpack")
+    args = parser.parse_args()
+
+    database = DrawingDatabase(args.database, args.format)
+    counts = migrate_directory(args.projects_dir, database)
+    print(f"Imported {counts['projects']} projects and {counts['drawings']} drawings into {args.database}"
+          f" ({counts['skipped']} unreadable files skipped)")
+    print("Set COPILOTNODE_STORAGE_BACKEND=sqlite to use it")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Rank strings that order a project's drawings.
+
+Ranks are base-62 strings compared as plain strings. A rank can always be
+made between any two others (or before the first / after the last), so
+moving a drawing changes only its own rank. Ranks never end in the lowest
+digit, which keeps room below every one of them.
+
+Repeated moves into the same gap make ranks longer; once one grows past
+``REBALANCE_LENGTH`` the whole order is respread into short, evenly spaced
+ranks.
+"""
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+REBALANCE_LENGTH = 8
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """A rank sorting after ``before`` and before ``after``; None means no bound on that side"""
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} does not sort before {after!r}")
+    before = before or ""
+    rank = ""
+    i = 0
+    while True:
+        low = DIGITS.index(before[i]) if i < len(before) else 0
+        high = DIGITS.index(after[i]) if after is not None and i < len(after) else BASE
+        if high - low > 1:
+            return rank + DIGITS[(low + high) // 2]
+        rank += DIGITS[low]
+        if high > low:
+            # Any suffix now sorts below ``after``; only ``before`` still bounds us
+            after = None
+        i += 1
+
+def spread_ranks(count: int) -> List[str]:
+    """``count`` short, evenly spaced ranks in ascending order"""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for position in range(1, count + 1):
+        value, digits = position * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+    return ranks
+
+def needs_rebalance(rank: str) -> bool:
+    return len(rank) > REBALANCE_LENGTH
@@ -0,0 +1,134 @@
+"""Fine-grained edits to a drawing's node list.
+
+A patch is a list of operations applied in order against an id index of the
+nodes, all or nothing:
+
+- ``{"op": "add", "node": {...}}`` adds a node (its ``id`` must be new)
+- ``{"op": "update", "id": ..., "fields": {...}}`` replaces top-level fields
+  other than ``id`` (e.g. ``title``, ``pos``, ``size``, ``action_type``)
+- ``{"op": "remove", "id": ...}`` removes a node and every connection to it
+- ``{"op": "set_params", "id": ..., "params": {...}}`` merges into ``params``;
+  a ``null`` value deletes the key
+- ``{"op": "connect", "id": ..., "target": ...}`` adds a connection
+- ``{"op": "disconnect", "id": ..., "target": ...}`` drops one if present
+
+Nodes are copied on write: the returned list shares every untouched node
+with the input and the input list is never modified, so a run holding the
+old node list keeps seeing a consistent graph.
+"""
+import copy
+from typing import Any, Dict, List
+
+OPERATIONS = ("add", "update", "remove", "set_params", "connect", "disconnect")
+
+class RevisionConflict(ValueError):
+    """The patch was based on a revision other than the drawing's current one"""
+
+    def __init__(self, base_revision: int, current_revision: int):
+        super().__init__(f"Revision conflict: patch is based on revision {base_revision}, "
+                         f"drawing is at revision {current_revision}")
+        self.base_revision = base_revision
+        self.current_revision = current_revision
+
+def _node_id(value: Any) -> str:
+    if value is None or value == "":
+        raise ValueError("Operation is missing a node id")
+    return str(value)
+
+class _NodeList:
+    """Copy-on-write view of a node list with an id index"""
+
+    def __init__(self, nodes: List[Dict[str, Any]]):
+        self.nodes = list(nodes)
+        self.index = {str(node.get("id")): position for position, node in enumerate(self.nodes)}
+        self.copied = set()
+        self.removed = False
+
+    def get(self, node_id: str) -> Dict[str, Any]:
+        if node_id not in self.index:
+            raise ValueError(f"Node {node_id} not found")
+        position = self.index[node_id]
+        if node_id not in self.copied:
+            node = dict(self.nodes[position])
+            node["params"] = dict(node.get("params") or {})
+            node["connections"] = list(node.get("connections") or [])
+            self.nodes[position] = node
+            self.copied.add(node_id)
+        return self.nodes[position]
+
+    def add(self, node: Dict[str, Any]):
+        node_id = _node_id(node.get("id"))
+        if node_id in self.index:
+            raise ValueError(f"Node {node_id} already exists")
+        node = copy.deepcopy(node)
+        node.setdefault("params", {})
+        node.setdefault("connections", [])
+        self.index[node_id] = len(self.nodes)
+        self.nodes.append(node)
+        self.copied.add(node_id)
+
+    def remove(self, node_id: str):
+        if node_id not in self.index:
+            raise ValueError(f"Node {node_id} not found")
+        # Leave a hole rather than shifting the index; holes are dropped in ``result``
+        self.nodes[self.index.pop(node_id)] = None
+        self.removed = True
+        for other_id, position in self.index.items():
+            if node_id in map(str, self.nodes[position].get("connections") or []):
+                node = self.get(other_id)
+                node["connections"] = [c for c in node["connections"] if str(c) != node_id]
+
+    def result(self) -> List[Dict[str, Any]]:
+        if self.removed:
+            return [node for node in self.nodes if node is not None]
+        return self.nodes
+
+def apply_operations(nodes: List[Dict[str, Any]], operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply a patch and return the new node list; raises ValueError on an invalid operation"""
+    if not isinstance(operations, list):
+        raise ValueError("operations must be a list")
+    view = _NodeList(nodes)
+    for number, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise ValueError(f"Operation {number} must be an object")
+        kind = operation.get("op")
+        try:
+            if kind == "add":
+                if not isinstance(operation.get("node"), dict):
+                    raise ValueError("add needs a node object")
+                view.add(operation["node"])
+            elif kind == "update":
+                fields = operation.get("fields")
+                if not isinstance(fields, dict):
+                    raise ValueError("update needs a fields object")
+                if "id" in fields and str(fields["id"]) != str(operation.get("id")):
+                    raise ValueError("update cannot change a node id")
+                view.get(_node_id(operation.get("id"))).update(copy.deepcopy(fields))
+            elif kind == "remove":
+                view.remove(_node_id(operation.get("id")))
+            elif kind == "set_params":
+                params = operation.get("params")
+                if not isinstance(params, dict):
+                    raise ValueError("set_params needs a params object")
+                node_params = view.get(_node_id(operation.get("id")))["params"]
+                for key, value in params.items():
+                    if value is None:
+                        node_params.pop(key, None)
+                    else:
+                        node_params[key] = copy.deepcopy(value)
+            elif kind == "connect":
+                target = _node_id(operation.get("target"))
+                if target not in view.index:
+                    raise ValueError(f"Node {target} not found")
+                connections = view.get(_node_id(operation.get("id")))["connections"]
+                if target not in map(str, connections):
+                    connections.append(target)
+            elif kind == "disconnect":
+                target = _node_id(operation.get("target"))
+                node = view.get(_node_id(operation.get("id")))
+                node["connections"] = [c for c in node["connections"] if str(c) != target]
+            else:
+                raise ValueError(f"Unknown operation '{kind}', expected one of {list(OPERATIONS)}")
+        except ValueError as e:
+            raise ValueError(f"Operation {number} ({kind}): {e}") from None
+    return view.result()
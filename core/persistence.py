@@ -0,0 +1,170 @@
+"""Write-behind persistence for drawing edits.
+
+A mutation updates the in-memory drawing, appends its field changes (or, for
+a node patch, just the patch operations) to a small journal (fsynced, so it
+survives a crash) and marks the drawing dirty. A background flusher writes
+the dirty drawings, all in one batch, once the oldest has waited ``delay``
+seconds, so a burst of edits becomes one file write per drawing. ``flush``
+writes immediately (explicit save, shutdown). ``save`` returns the ids it
+could not write (or raises, failing the whole batch); those stay dirty and are
+retried ``delay`` seconds later. The journal is emptied only once everything
+has been written; on startup any records still in it are replayed.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_DELAY = 1.0
+
+class WriteBehind:
+    def __init__(self, save: Callable[[List[str]], Optional[Iterable[str]]], journal_path: Optional[str] = None,
+                 delay: float = DEFAULT_DELAY, clock: Callable[[], float] = time.monotonic):
+        self.save = save
+        self.journal_path = journal_path
+        self.delay = delay
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty: Dict[str, float] = {}
+        # Taken for writing but not yet written; still unsafe to drop from memory
+        self._writing: Dict[str, int] = {}
+        self._pending = 0
+        self._journal = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"marked": 0, "writes": 0, "flushes": 0, "failed": 0}
+
+    def mark_dirty(self, drawing_id: str, updates: Optional[Dict[str, Any]] = None,
+                   patch: Optional[List[Dict[str, Any]]] = None, revision: Optional[int] = None):
+        """Journal a change (replaced fields, or node patch operations) and schedule the drawing for writing"""
+        record: Dict[str, Any] = {"updates": updates or {}} if patch is None else {"patch": patch}
+        if revision is not None:
+            record["revision"] = revision
+        with self._cond:
+            self._append(drawing_id, record)
+            # Keep the first-dirty time: a drawing edited non-stop is still written every ``delay``
+            self._dirty.setdefault(drawing_id, self.clock())
+            self._stats["marked"] += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def discard(self, drawing_id: str):
+        """Forget pending writes of a drawing that no longer exists"""
+        with self._cond:
+            self._dirty.pop(drawing_id, None)
+
+    def is_dirty(self, drawing_id: str) -> bool:
+        """Whether the drawing has edits not yet on disk, including ones being written right now"""
+        with self._cond:
+            return drawing_id in self._dirty or drawing_id in self._writing
+
+    def flush(self, drawing_ids: Optional[Iterable[str]] = None):
+        """Write pending drawings now: the given ones, or all"""
+        with self._cond:
+            ids = list(self._dirty) if drawing_ids is None else [d for d in drawing_ids if d in self._dirty]
+            self._take(ids)
+            self._stats["flushes"] += 1
+        self._write(ids)
+
+    def pending_records(self) -> List[Dict[str, Any]]:
+        """Journal records left by a previous process, oldest first"""
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return []
+        records = []
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A torn final line from a crash mid-append
+                    break
+        return records
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["dirty"] = len(self._dirty)
+            stats["delay"] = self.delay
+            return stats
+
+    def _take(self, ids: List[str]):
+        for drawing_id in ids:
+            del self._dirty[drawing_id]
+            self._writing[drawing_id] = self._writing.get(drawing_id, 0) + 1
+        self._pending += len(ids)
+
+    def _write(self, ids: List[str]):
+        if not ids:
+            return
+        failed = set(ids)
+        try:
+            with self._write_lock:
+                failed = set(self.save(ids) or ())
+            if failed:
+                log.error("write-behind save failed", drawings=len(failed))
+        except Exception as e:
+            log.error("write-behind save failed", drawings=len(ids), error=str(e))
+        finally:
+            with self._cond:
+                for drawing_id in ids:
+                    if self._writing[drawing_id] == 1:
+                        del self._writing[drawing_id]
+                    else:
+                        self._writing[drawing_id] -= 1
+                # Still dirty, so retried after ``delay`` and its journal records are kept
+                for drawing_id in failed:
+                    self._dirty.setdefault(drawing_id, self.clock())
+                self._pending -= len(ids)
+                self._stats["writes"] += len(ids) - len(failed)
+                self._stats["failed"] += len(failed)
+                if not self._dirty and not self._pending:
+                    self._truncate()
+                elif failed:
+                    self._ensure_thread()
+                    self._cond.notify_all()
+
+    def _append(self, drawing_id: str, change: Dict[str, Any]):
+        if not self.journal_path:
+            return
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        record = {"id": drawing_id, "at": datetime.now().isoformat(), **change}
+        self._journal.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _truncate(self):
+        if not self.journal_path:
+            return
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        try:
+            open(self.journal_path, 'w', encoding='utf-8').close()
+        except OSError as e:
+            log.error("journal truncate failed", path=self.journal_path, error=str(e))
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+                now = self.clock()
+                due = min(self._dirty.values()) + self.delay
+                if now < due:
+                    self._cond.wait(due - now)
+                    continue
+                # Write everything pending in one batch so each project's metadata is touched once
+                ids = list(self._dirty)
+                self._take(ids)
+            self._write(ids)
@@ -0,0 +1,134 @@
+"""Append-only history of drawing runs for the JSON backend.
+
+Each project gets a ``runs.jsonl`` next to its ``project.json`` with one
+compact line per finished run::
+
+    {"drawing_id": ..., "started_at": ..., "finished_at": ..., "outcome": "completed",
+     "node_count": 12, "duration": 3.4, "error": ...}
+
+Recording a run appends one line; no drawing file is touched. A project's
+log is read once and then kept in memory with an index by drawing, so
+queries and "last executed" lookups never scan the file. Once a log holds a
+quarter more runs than the retention limit it is rewritten (atomically) with
+the newest ``limit`` runs. A torn last line from a crash is dropped the same
+way on the next load.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from core.log import get_logger
+from core.storage import atomic_write
+
+log = get_logger(__name__)
+
+RUN_FIELDS = ("drawing_id", "started_at", "finished_at", "outcome", "node_count", "duration", "error")
+
+def _line(run: Dict[str, Any]) -> str:
+    compact = {field: run[field] for field in RUN_FIELDS if run.get(field) is not None}
+    return json.dumps(compact, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+class _ProjectRuns:
+    """A project's runs in the order they were recorded, indexed by drawing"""
+
+    def __init__(self, runs: List[Dict[str, Any]]):
+        self.runs: List[Dict[str, Any]] = []
+        self.by_drawing: Dict[str, List[int]] = {}
+        self.last_executed: Dict[str, str] = {}
+        for run in runs:
+            self.add(run)
+
+    def add(self, run: Dict[str, Any]):
+        drawing_id = run.get("drawing_id")
+        self.by_drawing.setdefault(drawing_id, []).append(len(self.runs))
+        self.runs.append(run)
+        finished_at = run.get("finished_at")
+        if finished_at and finished_at > self.last_executed.get(drawing_id, ""):
+            self.last_executed[drawing_id] = finished_at
+
+class RunHistory:
+    """Per-project ``runs.jsonl`` logs with bounded retention"""
+
+    def __init__(self, projects_dir: str, limit: int = 1000, log_file: str = "runs.jsonl"):
+        self.projects_dir = projects_dir
+        self.limit = max(limit, 1)
+        self.log_file = log_file
+        self._lock = threading.Lock()
+        self._projects: Dict[str, _ProjectRuns] = {}
+
+    def append(self, project_id: str, run: Dict[str, Any]) -> bool:
+        """Record a finished run; False when the project does not exist"""
+        if not os.path.isdir(os.path.join(self.projects_dir, project_id)):
+            return False
+        with self._lock:
+            runs = self._load(project_id)
+            line = _line(run)
+            with open(self._path(project_id), 'a', encoding='utf-8') as f:
+                f.write(line)
+            runs.add(json.loads(line))
+            if len(runs.runs) > self.limit + max(self.limit // 4, 1):
+                self._compact(project_id, runs.runs[-self.limit:])
+        return True
+
+    def runs(self, project_id: str, drawing_id: Optional[str] = None, limit: int = 50,
+             outcome: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """A project's runs, most recent first, optionally of one drawing, one outcome or started since ``since``"""
+        with self._lock:
+            runs = self._load(project_id)
+            positions = runs.by_drawing.get(drawing_id, []) if drawing_id is not None else range(len(runs.runs))
+            found = []
+            for position in reversed(positions):
+                run = runs.runs[position]
+                if outcome is not None and run.get("outcome") != outcome:
+                    continue
+                if since is not None and run.get("started_at", "") < since:
+                    continue
+                found.append({**run, "project_id": project_id})
+                if len(found) >= limit:
+                    break
+            return found
+
+    def last_executed(self, project_id: str) -> Dict[str, str]:
+        """When each of a project's drawings last finished a run"""
+        with self._lock:
+            return dict(self._load(project_id).last_executed)
+
+    def forget(self, project_id: str):
+        """Drop a deleted project's runs from memory"""
+        with self._lock:
+            self._projects.pop(project_id, None)
+
+    def _path(self, project_id: str) -> str:
+        return os.path.join(self.projects_dir, project_id, self.log_file)
+
+    def _load(self, project_id: str) -> _ProjectRuns:
+        runs = self._projects.get(project_id)
+        if runs is not None:
+            return runs
+        records, damaged = [], False
+        path = self._path(project_id)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    # A last line without its newline would swallow the next append
+                    damaged = damaged or not line.endswith("\n")
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        damaged = True
+        if damaged or len(records) > self.limit:
+            if damaged:
+                log.warning("run history had unreadable lines, rewriting", project=project_id)
+            records = records[-self.limit:]
+            self._compact(project_id, records)
+        runs = self._projects[project_id] = _ProjectRuns(records)
+        return runs
+
+    def _compact(self, project_id: str, records: List[Dict[str, Any]]):
+        try:
+            atomic_write(self._path(project_id), "".join(_line(run) for run in records).encode('utf-8'))
+        except OSError as e:
+            log.error("run history compaction failed", project=project_id, error=str(e))
+            return
+        if project_id in self._projects:
+            self._projects[project_id] = _ProjectRuns(records)
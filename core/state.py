@@ -1,17 +1,228 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+import atexit
+import itertools
 import uuid
 import threading
 import os
-import json
 from datetime import datetime
+from core.trace import get_trace, discard_trace
+from core.events import publish, public_state
+from core.metrics import DRAWING_CACHE_SIZE, DRAWING_CACHE_BYTES, DRAWING_CACHE, DRAWING_CACHE_EVICTIONS
+from core.database import DrawingDatabase
+from core.drawing_index import DrawingIndex
+from core.manifest import ManifestStore
+from core.ordering import rank_between, spread_ranks, needs_rebalance
+from core.patch import RevisionConflict, apply_operations
+from core.persistence import WriteBehind
+from core.run_history import RunHistory
+from core.storage import write_document, read_document, encode
 
 # Current active project and drawing
 current_project_id: Optional[str] = None
 current_drawing_id: Optional[str] = None
 
-# In-memory cache for active sessions
+# In-memory cache for active sessions. Entries are never modified in place:
+# a writer builds a new dict (and a new execution_state or node list when
+# those change) and swaps it in while holding that drawing's lock, so
+# readers take an entry without locking and always see a consistent one.
+# Node dicts are shared with every reader and are read-only; runs record
+# their results on DrawingGraph's own copies.
 active_drawings: Dict[str, Dict[str, Any]] = {}
+_drawing_locks: Dict[str, threading.Lock] = {}
+# Serializes evictions (and callers that batch direct cache edits); reads
+# and single-drawing writes only need the per-drawing locks
 drawings_lock = threading.Lock()
+DRAWING_CACHE_SIZE.set_function(lambda: len(active_drawings))
+
+# LRU bookkeeping: approximate encoded size and last access of each cached
+# drawing, and the ids evicted since they were last loaded. Writes to an
+# evicted drawing load it back; writes to a deleted or unknown one are dropped.
+_cache_sizes: Dict[str, int] = {}
+_last_access: Dict[str, int] = {}
+_access_clock = itertools.count()
+_evicted_drawings = set()
+_cache_limits: Optional[Tuple[int, int]] = None
+DRAWING_CACHE_BYTES.set_function(lambda: sum(_cache_sizes.values()))
+
+# Bumped on every drawing execution-state change so status pollers can ask
+# for what changed since the version they last saw
+state_version = 0
+state_changed = threading.Condition()
+drawing_state_versions: Dict[str, int] = {}
+
+def _drawing_lock(drawing_id: str) -> threading.Lock:
+    """The lock serializing writers of one drawing's cache entry"""
+    lock = _drawing_locks.get(drawing_id)
+    if lock is None:
+        lock = _drawing_locks.setdefault(drawing_id, threading.Lock())
+    return lock
+
+def _replace_drawing(drawing_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Swap in a copy of a cached drawing with ``changes``; caller holds the drawing's lock"""
+    drawing = active_drawings.get(drawing_id)
+    if drawing is None:
+        return None
+    if "nodes" in changes and drawing_id in _cache_sizes:
+        # Scale the size estimate rather than re-encoding a large drawing on every edit
+        old_count, new_count = len(drawing.get("nodes") or []), len(changes["nodes"] or [])
+        if old_count:
+            _cache_sizes[drawing_id] = int(_cache_sizes[drawing_id] * max(new_count, 1) / old_count)
+    drawing = {**drawing, **changes}
+    active_drawings[drawing_id] = drawing
+    return drawing
+
+def get_cache_limits() -> Tuple[int, int]:
+    """Most drawings and approximate bytes the cache holds before evicting"""
+    global _cache_limits
+    if _cache_limits is None:
+        from core.config import DRAWING_CACHE_ENTRIES, DRAWING_CACHE_BYTES as max_bytes
+        _cache_limits = (DRAWING_CACHE_ENTRIES, max_bytes)
+    return _cache_limits
+
+def _cache_insert(drawing_id: str, drawing: Dict[str, Any]) -> Dict[str, Any]:
+    """Cache a drawing read from storage with an idle execution state; caller holds the drawing's lock"""
+    drawing = {k: v for k, v in drawing.items() if k != "execution_state"}
+    _cache_sizes[drawing_id] = len(encode(drawing))
+    entry = active_drawings[drawing_id] = {
+        **drawing,
+        "execution_state": {
+            "is_running": False,
+            "current_node": None,
+            "status": "idle",
+            "progress": 0,
+            "thread": None,
+            "should_stop": False
+        }
+    }
+    _last_access[drawing_id] = next(_access_clock)
+    _evicted_drawings.discard(drawing_id)
+    _evict_over_budget(keep=drawing_id)
+    return entry
+
+def _cached_entry(drawing_id: str, load: bool = False) -> Optional[Dict[str, Any]]:
+    """A drawing's cache entry; caller holds the drawing's lock.
+
+    On a miss an evicted drawing is loaded back from storage, as is any
+    drawing when ``load`` is set.
+    """
+    drawing = active_drawings.get(drawing_id)
+    if drawing is None and (load or drawing_id in _evicted_drawings):
+        data = load_drawing_from_file(drawing_id)
+        if data:
+            drawing = _cache_insert(drawing_id, data)
+    return drawing
+
+def _evictable(drawing_id: str, drawing: Dict[str, Any]) -> bool:
+    # A running drawing's state is live, and a dirty one holds edits not yet on disk
+    return not drawing.get("execution_state", {}).get("is_running") and not get_write_behind().is_dirty(drawing_id)
+
+def _evict_over_budget(keep: str):
+    """Drop least recently used drawings until the cache is within its limits"""
+    max_entries, max_bytes = get_cache_limits()
+    if len(active_drawings) <= max_entries and sum(_cache_sizes.values()) <= max_bytes:
+        return
+    with drawings_lock:
+        total = sum(_cache_sizes.values())
+        for drawing_id in sorted(list(active_drawings), key=lambda d: _last_access.get(d, -1)):
+            if len(active_drawings) <= max_entries and total <= max_bytes:
+                break
+            if drawing_id == keep:
+                continue
+            # Never wait for a drawing's lock here: its holder may be waiting to evict too
+            lock = _drawing_lock(drawing_id)
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                drawing = active_drawings.get(drawing_id)
+                if drawing is None or not _evictable(drawing_id, drawing):
+                    continue
+                del active_drawings[drawing_id]
+                _evicted_drawings.add(drawing_id)
+                total -= _cache_sizes.pop(drawing_id, 0)
+                _last_access.pop(drawing_id, None)
+                DRAWING_CACHE_EVICTIONS.inc()
+            finally:
+                lock.release()
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Drawing cache occupancy, limits and hit/miss/eviction counts"""
+    max_entries, max_bytes = get_cache_limits()
+    return {
+        "entries": len(active_drawings),
+        "bytes": sum(_cache_sizes.values()),
+        "max_entries": max_entries,
+        "max_bytes": max_bytes,
+        "running": sum(1 for d in list(active_drawings.values())
+                       if d.get("execution_state", {}).get("is_running")),
+        "hits": int(DRAWING_CACHE.value("hit")),
+        "misses": int(DRAWING_CACHE.value("miss")),
+        "evictions": int(DRAWING_CACHE_EVICTIONS.value())
+    }
+
+# Which project stores each drawing, created on first use
+_drawing_index: Optional[DrawingIndex] = None
+_drawing_index_lock = threading.Lock()
+
+def get_drawing_index() -> DrawingIndex:
+    global _drawing_index
+    with _drawing_index_lock:
+        if _drawing_index is None:
+            from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR, DRAWING_INDEX_FILE
+            _drawing_index = DrawingIndex(PROJECTS_DIR, DRAWINGS_SUBDIR, DRAWING_INDEX_FILE)
+        return _drawing_index
+
+# Summary rows of each project's drawings, created on first use
+_manifests: Optional[ManifestStore] = None
+
+def get_manifest_store() -> ManifestStore:
+    global _manifests
+    with _drawing_index_lock:
+        if _manifests is None:
+            from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR, MANIFEST_FILE
+            _manifests = ManifestStore(PROJECTS_DIR, DRAWINGS_SUBDIR, MANIFEST_FILE)
+        return _manifests
+
+# Coalesces drawing writes; created on first use
+_write_behind: Optional[WriteBehind] = None
+
+def get_write_behind() -> WriteBehind:
+    global _write_behind
+    with _drawing_index_lock:
+        if _write_behind is None:
+            from core.config import JOURNAL_FILE, SAVE_DELAY
+            _write_behind = WriteBehind(_save_dirty_drawings, JOURNAL_FILE, SAVE_DELAY)
+            atexit.register(_write_behind.flush)
+        return _write_behind
+
+# SQLite store when COPILOTNODE_STORAGE_BACKEND=sqlite, opened on first use
+_database: Optional[DrawingDatabase] = None
+_database_checked = False
+
+# Per-project run logs for the JSON backend, created on first use
+_run_history: Optional[RunHistory] = None
+
+def get_run_history() -> RunHistory:
+    global _run_history
+    with _drawing_index_lock:
+        if _run_history is None:
+            from core.config import PROJECTS_DIR, RUN_HISTORY_FILE, RUN_HISTORY_LIMIT
+            _run_history = RunHistory(PROJECTS_DIR, RUN_HISTORY_LIMIT, RUN_HISTORY_FILE)
+        return _run_history
+
+def get_database() -> Optional[DrawingDatabase]:
+    """The SQLite store, or None when projects live in JSON directories (the default)"""
+    global _database, _database_checked
+    if _database_checked:
+        return _database
+    with _drawing_index_lock:
+        if not _database_checked:
+            from core.config import STORAGE_BACKEND, DATABASE_FILE, STORAGE_FORMAT
+            if STORAGE_BACKEND == "sqlite":
+                _database = DrawingDatabase(DATABASE_FILE, STORAGE_FORMAT)
+            elif STORAGE_BACKEND != "json":
+                raise ValueError(f"Unknown storage backend '{STORAGE_BACKEND}', expected 'json' or 'sqlite'")
+            _database_checked = True
+        return _database
 
 # Legacy support for backward compatibility
 current_project: Dict[str, Any] = {"nodes": []}
@@ -24,6 +235,9 @@ execution_state = {
     "should_stop": False
 }
 
+# Execute-all run of the current project
+all_drawings_execution_state: Dict[str, Any] = {}
+
 def set_current_project(project_id: str):
     """Set the current active project"""
     global current_project_id
@@ -51,9 +265,6 @@ def create_project(name: str, description: str = "") -> str:
     project_dir = os.path.join(PROJECTS_DIR, project_id)
     drawings_dir = os.path.join(project_dir, DRAWINGS_SUBDIR)
     
-    # Create directories
-    os.makedirs(drawings_dir, exist_ok=True)
-    
     # Create project metadata
     project_metadata = {
         "id": project_id,
@@ -64,14 +275,25 @@ def create_project(name: str, description: str = "") -> str:
         "version": "1.0"
     }
     
+    database = get_database()
+    if database is not None:
+        database.put_project(project_metadata)
+        return project_id
+    
+    # Create directories
+    os.makedirs(drawings_dir, exist_ok=True)
+    
     metadata_path = os.path.join(project_dir, METADATA_FILE)
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(project_metadata, f, ensure_ascii=False, indent=2)
+    write_document(metadata_path, project_metadata)
     
     return project_id
 
 def get_project_metadata(project_id: str) -> Optional[Dict[str, Any]]:
     """Get project metadata"""
+    database = get_database()
+    if database is not None:
+        return database.get_project(project_id)
+    
     from core.config import PROJECTS_DIR, METADATA_FILE
     
     metadata_path = os.path.join(PROJECTS_DIR, project_id, METADATA_FILE)
@@ -79,13 +301,16 @@ def get_project_metadata(project_id: str) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_document(metadata_path)
     except Exception:
         return None
 
 def list_projects() -> List[Dict[str, Any]]:
     """List all projects"""
+    database = get_database()
+    if database is not None:
+        return database.list_projects()
+    
     from core.config import PROJECTS_DIR
     
     projects = []
@@ -102,8 +327,19 @@ def list_projects() -> List[Dict[str, Any]]:
     
     return sorted(projects, key=lambda x: x.get('last_modified', ''), reverse=True)
 
-def update_project_metadata(project_id: str, updates: Dict[str, Any]) -> bool:
-    """Update project metadata"""
+# Serializes read-modify-write of project.json files; drawing ranks are
+# computed under their own lock so two moves cannot pick the same gap
+_project_metadata_lock = threading.Lock()
+_ranks_lock = threading.Lock()
+
+def update_project_metadata(project_id: str, updates: Dict[str, Any], touch: bool = True) -> bool:
+    """Update project metadata; ``touch=False`` keeps last_modified for bookkeeping that is not an edit"""
+    if touch:
+        updates = {**updates, "last_modified": datetime.now().isoformat()}
+    database = get_database()
+    if database is not None:
+        return database.update_project(project_id, updates)
+    
     from core.config import PROJECTS_DIR, METADATA_FILE
     
     metadata_path = os.path.join(PROJECTS_DIR, project_id, METADATA_FILE)
@@ -111,14 +347,12 @@ def update_project_metadata(project_id: str, updates: Dict[str, Any]) -> bool:
         return False
     
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        
-        metadata.update(updates)
-        metadata['last_modified'] = datetime.now().isoformat()
-        
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        with _project_metadata_lock:
+            metadata = read_document(metadata_path)
+            
+            metadata.update(updates)
+            
+            write_document(metadata_path, metadata)
         
         return True
     except Exception:
@@ -126,6 +360,10 @@ def update_project_metadata(project_id: str, updates: Dict[str, Any]) -> bool:
 
 def delete_project(project_id: str) -> bool:
     """Delete a project and all its drawings"""
+    database = get_database()
+    if database is not None:
+        return database.delete_project(project_id)
+    
     from core.config import PROJECTS_DIR
     import shutil
     
@@ -135,6 +373,8 @@ def delete_project(project_id: str) -> bool:
     
     try:
         shutil.rmtree(project_dir)
+        get_drawing_index().remove_project(project_id)
+        get_run_history().forget(project_id)
         return True
     except Exception:
         return False
@@ -147,7 +387,7 @@ def create_drawing(project_id: str, name: str, nodes: list = None, boundary: Dic
     drawing_id = str(uuid.uuid4())
     drawings_dir = os.path.join(PROJECTS_DIR, project_id, DRAWINGS_SUBDIR)
 
-    if not os.path.exists(drawings_dir):
+    if get_database() is None and not os.path.exists(drawings_dir):
         os.makedirs(drawings_dir, exist_ok=True)
 
     # Calculate next order number
@@ -166,205 +406,419 @@ def create_drawing(project_id: str, name: str, nodes: list = None, boundary: Dic
         "project_id": project_id,
         "name": name,
         "nodes": nodes or [],
+        "revision": 0,
         "boundary": boundary or default_boundary,
         "order": next_order,
         "created_at": datetime.now().isoformat(),
-        "last_modified": datetime.now().isoformat(),
-        "execution_history": []
+        "last_modified": datetime.now().isoformat()
     }
     
     # Save drawing to file
-    drawing_path = os.path.join(drawings_dir, f"{drawing_id}.json")
-    with open(drawing_path, 'w', encoding='utf-8') as f:
-        json.dump(drawing_data, f, ensure_ascii=False, indent=2)
+    store_drawing(drawing_data)
+    if get_database() is None:
+        get_drawing_index().add(drawing_id, project_id)
     
     # Cache in memory with execution state
-    with drawings_lock:
-        active_drawings[drawing_id] = {
-            **drawing_data,
-            "execution_state": {
-                "is_running": False,
-                "current_node": None,
-                "status": "idle",
-                "progress": 0,
-                "thread": None,
-                "should_stop": False
-            }
-        }
+    with _drawing_lock(drawing_id):
+        _cache_insert(drawing_id, drawing_data)
     
-    # Update project metadata
-    update_project_metadata(project_id, {"last_modified": datetime.now().isoformat()})
+    # Update project metadata, ranking the drawing last once the project uses ranks
+    with _ranks_lock:
+        ranks = (get_project_metadata(project_id) or {}).get("drawing_ranks")
+        updates: Dict[str, Any] = {"last_modified": datetime.now().isoformat()}
+        if ranks:
+            updates["drawing_ranks"] = {**ranks, drawing_id: rank_between(max(ranks.values()), None)}
+        update_project_metadata(project_id, updates)
     
     return drawing_id
 
 def get_drawing(drawing_id: str) -> Optional[Dict[str, Any]]:
     """Get a drawing by ID"""
-    with drawings_lock:
-        # Check memory cache first
-        if drawing_id in active_drawings:
-            return active_drawings[drawing_id].copy()
+    # Check memory cache first
+    cached = active_drawings.get(drawing_id)
+    if cached is not None:
+        _last_access[drawing_id] = next(_access_clock)
+        DRAWING_CACHE.inc("hit")
+        return cached.copy()
     
-    # Load from file
-    drawing = load_drawing_from_file(drawing_id)
-    if drawing:
-        # Cache in memory with execution state
-        with drawings_lock:
-            active_drawings[drawing_id] = {
-                **drawing,
-                "execution_state": {
-                    "is_running": False,
-                    "current_node": None,
-                    "status": "idle",
-                    "progress": 0,
-                    "thread": None,
-                    "should_stop": False
-                }
-            }
-        return active_drawings[drawing_id].copy()
+    # Load from file and cache it, unless another thread got there first
+    DRAWING_CACHE.inc("miss")
+    with _drawing_lock(drawing_id):
+        cached = _cached_entry(drawing_id, load=True)
+    return cached.copy() if cached is not None else None
+
+def write_drawing_document(drawing_path: str, drawing_data: Dict[str, Any]):
+    """Atomically write a drawing file in the configured storage format"""
+    from core.config import STORAGE_FORMAT
+    write_document(drawing_path, drawing_data, STORAGE_FORMAT)
+
+def store_drawing(drawing_data: Dict[str, Any]):
+    """Persist a drawing (without execution state) and its listing row in the configured backend"""
+    database = get_database()
+    if database is not None:
+        database.put_drawing(drawing_data)
+        return
     
-    return None
+    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
+    project_id = drawing_data["project_id"]
+    drawing_path = os.path.join(PROJECTS_DIR, project_id, DRAWINGS_SUBDIR, f"{drawing_data['id']}.json")
+    write_drawing_document(drawing_path, drawing_data)
+    get_manifest_store().upsert(project_id, drawing_data)
 
 def load_drawing_from_file(drawing_id: str) -> Optional[Dict[str, Any]]:
     """Load drawing data from file"""
-    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
+    database = get_database()
+    if database is not None:
+        return database.get_drawing(drawing_id)
     
-    # Search all projects for this drawing
-    for project_id in os.listdir(PROJECTS_DIR):
-        project_path = os.path.join(PROJECTS_DIR, project_id)
-        if not os.path.isdir(project_path):
-            continue
-            
-        drawing_path = os.path.join(project_path, DRAWINGS_SUBDIR, f"{drawing_id}.json")
-        if os.path.exists(drawing_path):
-            try:
-                with open(drawing_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                continue
-    
-    return None
+    drawing_path = get_drawing_index().path_for(drawing_id)
+    if drawing_path is None:
+        return None
 
-def save_drawing_to_file(drawing_id: str) -> bool:
+    try:
+        return read_document(drawing_path)
+    except Exception:
+        return None
+
+def save_drawing_to_file(drawing_id: str, touch_project: bool = True) -> bool:
     """Save drawing data to file"""
-    with drawings_lock:
+    with _drawing_lock(drawing_id):
         if drawing_id not in active_drawings:
             return False
         
         drawing_data = active_drawings[drawing_id].copy()
+        # Stamped under the lock: journaled edits later than this are not in the copy
+        drawing_data["last_modified"] = datetime.now().isoformat()
         
     # Remove execution state before saving
     if "execution_state" in drawing_data:
         del drawing_data["execution_state"]
     
-    drawing_data["last_modified"] = datetime.now().isoformat()
-    
-    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
     project_id = drawing_data.get("project_id")
     if not project_id:
         return False
     
-    drawing_path = os.path.join(PROJECTS_DIR, project_id, DRAWINGS_SUBDIR, f"{drawing_id}.json")
-    
     try:
-        with open(drawing_path, 'w', encoding='utf-8') as f:
-            json.dump(drawing_data, f, ensure_ascii=False, indent=2)
+        store_drawing(drawing_data)
         
         # Update project metadata
-        update_project_metadata(project_id, {"last_modified": datetime.now().isoformat()})
+        if touch_project:
+            update_project_metadata(project_id, {"last_modified": datetime.now().isoformat()})
         
         return True
     except Exception:
         return False
 
-def list_project_drawings(project_id: str) -> List[Dict[str, Any]]:
-    """List all drawings in a project"""
-    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
+def _save_dirty_drawings(drawing_ids: List[str]) -> List[str]:
+    """Write-behind batch: each drawing once, each touched project's metadata once; returns the ids not written"""
+    projects = set()
+    failed = []
+    for drawing_id in drawing_ids:
+        if save_drawing_to_file(drawing_id, touch_project=False):
+            projects.add(active_drawings.get(drawing_id, {}).get("project_id"))
+        elif drawing_id in active_drawings:
+            # Still there, so the write itself failed (disk full, permissions); keep it for a retry
+            failed.append(drawing_id)
+    for project_id in projects - {None}:
+        update_project_metadata(project_id, {"last_modified": datetime.now().isoformat()})
+    return failed
+
+def flush_drawings(drawing_ids: Optional[List[str]] = None):
+    """Write pending drawing edits to disk now: the given drawings, or all"""
+    get_write_behind().flush(drawing_ids)
+
+def recover_pending_writes() -> int:
+    """Replay journaled edits a previous process did not get to write; returns how many were applied"""
+    write_behind = get_write_behind()
+    applied = 0
+    for record in write_behind.pending_records():
+        drawing_id = record.get("id")
+        drawing = get_drawing(drawing_id) if drawing_id else None
+        # The file already holds anything written after the edit was journaled
+        if not drawing or record.get("at", "") <= drawing.get("last_modified", ""):
+            continue
+        with _drawing_lock(drawing_id):
+            drawing = active_drawings[drawing_id]
+            if "patch" in record:
+                if record.get("revision", 0) <= drawing.get("revision", 0):
+                    continue
+                try:
+                    nodes = apply_operations(drawing.get("nodes", []), record["patch"])
+                except ValueError:
+                    continue
+                _replace_drawing(drawing_id, {
+                    "nodes": nodes,
+                    "revision": record.get("revision", drawing.get("revision", 0) + 1)
+                })
+            else:
+                _replace_drawing(drawing_id, record.get("updates", {}))
+        write_behind.mark_dirty(drawing_id, record.get("updates"), patch=record.get("patch"),
+                                revision=record.get("revision"))
+        applied += 1
+    write_behind.flush()
+    return applied
+
+def project_drawing_counts(project_ids: List[str]) -> Dict[str, int]:
+    """Drawing count of each project, from the manifests (or one query) rather than full listings"""
+    database = get_database()
+    if database is not None:
+        counts = database.drawing_counts()
+        return {project_id: counts.get(project_id, 0) for project_id in project_ids}
+    manifests = get_manifest_store()
+    return {project_id: manifests.count(project_id) for project_id in project_ids}
 
-    drawings = []
-    drawings_dir = os.path.join(PROJECTS_DIR, project_id, DRAWINGS_SUBDIR)
+def list_project_drawings(project_id: str) -> List[Dict[str, Any]]:
+    """List all drawings in a project from its manifest, without loading the drawings"""
+    database = get_database()
+    drawings = database.drawing_rows(project_id) if database is not None else get_manifest_store().rows(project_id)
+
+    for drawing in drawings:
+        cached = active_drawings.get(drawing["id"])
+        drawing["execution_state"] = cached.get("execution_state", {}) if cached else {
+            "is_running": False,
+            "current_node": None,
+            "status": "idle",
+            "progress": 0,
+            "thread": None,
+            "should_stop": False
+        }
 
-    if not os.path.exists(drawings_dir):
-        return drawings
-
-    for filename in os.listdir(drawings_dir):
-        if filename.endswith('.json'):
-            drawing_id = filename[:-5]  # Remove .json extension
-            drawing = get_drawing(drawing_id)
-            if drawing:
-                drawings.append({
-                    "id": drawing["id"],
-                    "name": drawing["name"],
-                    "created_at": drawing.get("created_at"),
-                    "last_modified": drawing.get("last_modified"),
-                    "order": drawing.get("order", 0),  # Include order field
-                    "node_count": len(drawing.get("nodes", [])),
-                    "boundary": drawing.get("boundary"),
-                    "execution_state": drawing.get("execution_state", {})
-                })
+    # Ranked drawings first, by rank; then any the project has not ranked yet by their
+    # stored order, falling back to last_modified. ``order`` becomes the position.
+    ranks = (get_project_metadata(project_id) or {}).get("drawing_ranks") or {}
+    last_executed = last_executed_times(project_id)
+    for drawing in drawings:
+        drawing["last_executed"] = last_executed.get(drawing["id"])
+    drawings.sort(key=lambda x: (0, ranks[x["id"]], 0, "") if x["id"] in ranks
+                  else (1, "", x.get('order', 999999), x.get('last_modified') or ''))
+    for position, drawing in enumerate(drawings, 1):
+        drawing["order"] = position
+    return drawings
+
+def _peek_drawing(drawing_id: str) -> Optional[Dict[str, Any]]:
+    """A drawing from the cache or storage, without adding it to the cache"""
+    cached = active_drawings.get(drawing_id)
+    if cached is not None:
+        return cached.copy()
+    return load_drawing_from_file(drawing_id)
+
+def find_drawings_using_image(image_path: str) -> List[Dict[str, Any]]:
+    """Drawings with a node whose ``image_path`` is ``image_path``, with the ids of those nodes"""
+    database = get_database()
+    if database is not None:
+        return database.drawings_using_image(image_path)
+
+    # The JSON layout has no node index, so this reads every drawing
+    found = []
+    for project in list_projects():
+        for row in list_project_drawings(project["id"]):
+            drawing = _peek_drawing(row["id"])
+            if not drawing:
+                continue
+            nodes = [str(node.get("id")) for node in drawing.get("nodes", [])
+                     if (node.get("params") or {}).get("image_path") == image_path]
+            if nodes:
+                found.append({"id": drawing["id"], "project_id": project["id"],
+                              "name": drawing.get("name"), "nodes": nodes})
+    return found
+
+def recently_run_drawings(limit: int = 20) -> List[Dict[str, Any]]:
+    """Drawings by ``last_executed``, most recent first"""
+    database = get_database()
+    if database is not None:
+        return database.recently_run_drawings(limit)
 
-    # Sort by order field (ascending), with fallback to last_modified for drawings without order
-    return sorted(drawings, key=lambda x: (x.get('order', 999999), x.get('last_modified', '')))
+    drawings = []
+    for project in list_projects():
+        for row in list_project_drawings(project["id"]):
+            if row.get("last_executed"):
+                drawings.append({"id": row["id"], "project_id": project["id"],
+                                 "name": row.get("name"), "last_executed": row["last_executed"]})
+    drawings.sort(key=lambda d: d["last_executed"], reverse=True)
+    return drawings[:limit]
+
+def record_run(run: Dict[str, Any]) -> bool:
+    """Append a finished run (``drawing_id``, ``project_id``, ``started_at``, ``finished_at``,
+    ``outcome``, ``node_count``, ``duration``, ``error``) to its project's history"""
+    database = get_database()
+    if database is not None:
+        from core.config import RUN_HISTORY_LIMIT
+        database.add_run(run, keep=RUN_HISTORY_LIMIT)
+        return True
+    if not run.get("project_id"):
+        return False
+    return get_run_history().append(run["project_id"], run)
+
+def list_runs(project_id: Optional[str] = None, drawing_id: Optional[str] = None, limit: int = 50,
+              outcome: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Recorded runs, most recent first, of a project, of one drawing, or (without either) of every project"""
+    database = get_database()
+    if database is not None:
+        return database.runs(drawing_id, limit, project_id=project_id, outcome=outcome, since=since)
+
+    if project_id is None and drawing_id is not None:
+        project_id = get_drawing_index().project_for(drawing_id)
+        if project_id is None:
+            return []
+    history = get_run_history()
+    if project_id is not None:
+        return history.runs(project_id, drawing_id, limit, outcome, since)
+    runs = [run for project in list_projects()
+            for run in history.runs(project["id"], None, limit, outcome, since)]
+    runs.sort(key=lambda run: run.get("started_at", ""), reverse=True)
+    return runs[:limit]
+
+def last_executed_times(project_id: str) -> Dict[str, str]:
+    """When each of a project's drawings last finished a run"""
+    database = get_database()
+    if database is not None:
+        return database.last_executed(project_id)
+    return get_run_history().last_executed(project_id)
 
 def get_all_drawings() -> Dict[str, Dict[str, Any]]:
     """Get all active drawings (for backward compatibility)"""
-    with drawings_lock:
-        return active_drawings.copy()
+    return active_drawings.copy()
 
 def update_drawing(drawing_id: str, updates: Dict[str, Any]):
-    """Update a drawing"""
-    with drawings_lock:
-        if drawing_id in active_drawings:
-            active_drawings[drawing_id].update(updates)
-            
-    # Auto-save to file
-    save_drawing_to_file(drawing_id)
+    """Update a drawing; the file is written shortly after by the write-behind flusher"""
+    with _drawing_lock(drawing_id):
+        drawing = _cached_entry(drawing_id)
+        if drawing is None:
+            return
+        if "nodes" in updates:
+            # Replacing the nodes invalidates patches based on the old ones
+            updates = dict(updates, revision=drawing.get("revision", 0) + 1)
+        _replace_drawing(drawing_id, updates)
+        # Journaled under the lock so a drawing's records replay in the order they were applied
+        get_write_behind().mark_dirty(drawing_id, updates)
+
+def patch_drawing(drawing_id: str, base_revision: int, operations: List[Dict[str, Any]]) -> Optional[int]:
+    """Apply node operations to a drawing at ``base_revision``; returns the new revision.
+
+    Returns None when the drawing does not exist, raises RevisionConflict when
+    it has moved past ``base_revision`` and ValueError for an invalid patch.
+    Only the operations are journaled; the file is rewritten by the
+    write-behind flusher.
+    """
+    with _drawing_lock(drawing_id):
+        drawing = _cached_entry(drawing_id)
+        if drawing is None:
+            return None
+        current = drawing.get("revision", 0)
+        if base_revision != current:
+            raise RevisionConflict(base_revision, current)
+        revision = current + 1
+        _replace_drawing(drawing_id, {
+            "nodes": apply_operations(drawing.get("nodes", []), operations),
+            "revision": revision
+        })
+        get_write_behind().mark_dirty(drawing_id, patch=operations, revision=revision)
+    return revision
 
 def delete_drawing(drawing_id: str) -> bool:
     """Delete a drawing"""
-    # Remove from memory cache
-    with drawings_lock:
-        if drawing_id in active_drawings:
-            drawing = active_drawings[drawing_id]
-            # Stop execution if running
-            if drawing.get("execution_state", {}).get("is_running"):
-                drawing["execution_state"]["should_stop"] = True
-            del active_drawings[drawing_id]
+    # Remove from memory cache; a run of it finds no state left and stops
+    with _drawing_lock(drawing_id):
+        _evicted_drawings.discard(drawing_id)
+        _cache_sizes.pop(drawing_id, None)
+        _last_access.pop(drawing_id, None)
+        if active_drawings.pop(drawing_id, None) is not None:
+            _bump_state_version(drawing_id)
+    discard_trace(drawing_id)
+    get_write_behind().discard(drawing_id)
     
     # Delete file
-    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
-    
-    # Search all projects for this drawing
-    for project_id in os.listdir(PROJECTS_DIR):
-        project_path = os.path.join(PROJECTS_DIR, project_id)
-        if not os.path.isdir(project_path):
-            continue
-            
-        drawing_path = os.path.join(project_path, DRAWINGS_SUBDIR, f"{drawing_id}.json")
-        if os.path.exists(drawing_path):
-            try:
-                os.remove(drawing_path)
-                # Update project metadata
-                update_project_metadata(project_id, {"last_modified": datetime.now().isoformat()})
-                return True
-            except Exception:
-                pass
-    
-    return False
+    database = get_database()
+    if database is not None:
+        project_id = database.delete_drawing(drawing_id)
+        if project_id is None:
+            return False
+    else:
+        index = get_drawing_index()
+        project_id = index.project_for(drawing_id)
+        if project_id is None:
+            return False
 
-def update_drawing_execution_state(drawing_id: str, updates: Dict[str, Any]):
-    """Update execution state for a specific drawing"""
-    with drawings_lock:
-        if drawing_id in active_drawings:
-            if "execution_state" not in active_drawings[drawing_id]:
-                active_drawings[drawing_id]["execution_state"] = {}
-            active_drawings[drawing_id]["execution_state"].update(updates)
+        try:
+            os.remove(index.drawing_path(project_id, drawing_id))
+        except Exception:
+            return False
+        index.remove(drawing_id)
+        get_manifest_store().remove(project_id, drawing_id)
+    # Update project metadata
+    update_project_metadata(project_id, {"last_modified": datetime.now().isoformat()})
+    return True
+
+def update_drawing_execution_state(drawing_id: str, updates: Dict[str, Any], merge: Sequence[str] = ()):
+    """Update execution state for a specific drawing
+
+    Keys listed in ``merge`` hold dicts whose entries are added to the current
+    ones under the drawing's lock, so concurrent writers (e.g. sibling forks
+    reporting branch results) never drop each other's entries.
+    """
+    with _drawing_lock(drawing_id):
+        drawing = _cached_entry(drawing_id)
+        if drawing is not None:
+            current = drawing.get("execution_state", {})
+            if merge:
+                updates = {**updates, **{key: {**current.get(key, {}), **updates[key]} for key in merge}}
+            _replace_drawing(drawing_id, {"execution_state": {**current, **updates}})
+            _bump_state_version(drawing_id)
+
+    delta = public_state(updates)
+    if delta:
+        publish("drawing", drawing_id=drawing_id, **delta)
+    if updates.get("is_running") is False:
+        publish("run_finished", drawing_id=drawing_id)
+
+    if "status" in updates:
+        trace = get_trace(drawing_id)
+        if trace is not None:
+            trace.state(updates["status"])
+
+def _bump_state_version(drawing_id: str):
+    """Record a change to a drawing's state"""
+    global state_version
+    with state_changed:
+        state_version += 1
+        drawing_state_versions[drawing_id] = state_version
+        state_changed.notify_all()
+
+def get_state_version() -> int:
+    return state_version
+
+def wait_for_state_changes(since: int, timeout: float = 0) -> Tuple[int, List[str], List[str]]:
+    """Drawings whose execution state changed after version ``since``.
+
+    Blocks up to ``timeout`` seconds when nothing has changed yet. Returns the
+    current version, the changed drawing ids and the ids of drawings deleted
+    since then; drawings evicted from the cache count as changed. A ``since``
+    ahead of the current version (the server restarted) reports every active
+    drawing.
+    """
+    with state_changed:
+        if since > state_version:
+            return state_version, list(active_drawings), []
+        if timeout > 0:
+            state_changed.wait_for(lambda: state_version > since, timeout)
+        changed, removed = [], []
+        for drawing_id, version in drawing_state_versions.items():
+            if version > since:
+                # Evicted drawings count as changed; reading their status loads them again
+                (changed if drawing_id in active_drawings or drawing_id in _evicted_drawings
+                 else removed).append(drawing_id)
+        return state_version, changed, removed
 
 def get_drawing_execution_state(drawing_id: str) -> Optional[Dict[str, Any]]:
     """Get execution state for a specific drawing"""
-    with drawings_lock:
-        if drawing_id in active_drawings:
-            return active_drawings[drawing_id].get("execution_state", {}).copy()
-        return None
+    drawing = active_drawings.get(drawing_id)
+    if drawing is None and drawing_id in _evicted_drawings:
+        # Evicted while idle: reload it, so the state reads as idle rather than missing
+        with _drawing_lock(drawing_id):
+            drawing = _cached_entry(drawing_id)
+    if drawing is not None:
+        return drawing.get("execution_state", {}).copy()
+    return None
 
 def set_drawing_boundary(drawing_id: str, boundary: Dict[str, int]):
     """Set operation boundary for a drawing"""
@@ -378,80 +832,34 @@ def get_drawing_boundary(drawing_id: str) -> Optional[Dict[str, int]]:
     return None
 
 def reorder_drawing(project_id: str, drawing_id: str, new_order: int) -> bool:
-    """Reorder a drawing in a project"""
-    try:
-        drawings_list = list_project_drawings(project_id)
-
-        # Create a map to track order changes
-        order_changes = {}
-
-        # Initialize order field for drawings that don't have it
-        for i, drawing_info in enumerate(drawings_list):
-            if 'order' not in drawing_info:
-                order_changes[drawing_info['id']] = i + 1
-
-        target_drawing_info = None
+    """Move a drawing to position ``new_order`` (1-based) in its project.
 
-        # Find the target drawing
-        for drawing_info in drawings_list:
-            if drawing_info['id'] == drawing_id:
-                target_drawing_info = drawing_info
-                break
-
-        if not target_drawing_info:
-            return False
+    Only the project's rank map in project.json is written; drawing files are
+    left alone. A project without ranks gets them for its current order first.
+    """
+    try:
+        with _ranks_lock:
+            drawing_ids = [d["id"] for d in list_project_drawings(project_id)]
+            if drawing_id not in drawing_ids:
+                return False
 
-        old_order = target_drawing_info.get('order', 0)
+            ranks = (get_project_metadata(project_id) or {}).get("drawing_ranks") or {}
+            # Drop ranks of deleted drawings
+            ranks = {d: ranks[d] for d in drawing_ids if d in ranks}
+            if len(ranks) < len(drawing_ids):
+                ranks = dict(zip(drawing_ids, spread_ranks(len(drawing_ids))))
 
-        # Adjust orders of other drawings
-        for drawing_info in drawings_list:
-            if drawing_info['id'] == drawing_id:
-                continue
+            drawing_ids.remove(drawing_id)
+            position = min(max(new_order - 1, 0), len(drawing_ids))
+            before = ranks[drawing_ids[position - 1]] if position > 0 else None
+            after = ranks[drawing_ids[position]] if position < len(drawing_ids) else None
+            ranks[drawing_id] = rank_between(before, after)
 
-            current_order = drawing_info.get('order', 0)
+            if needs_rebalance(ranks[drawing_id]):
+                drawing_ids.insert(position, drawing_id)
+                ranks = dict(zip(drawing_ids, spread_ranks(len(drawing_ids))))
 
-            if old_order < new_order:
-                # Moving down: shift up drawings between old and new position
-                if old_order < current_order <= new_order:
-                    order_changes[drawing_info['id']] = current_order - 1
-            else:
-                # Moving up: shift down drawings between new and old position
-                if new_order <= current_order < old_order:
-                    order_changes[drawing_info['id']] = current_order + 1
-
-        # Set new order for target drawing
-        order_changes[drawing_id] = new_order
-
-        # Apply order changes to full drawing objects and save
-        for drawing_info in drawings_list:
-            drawing_id_to_update = drawing_info['id']
-            if drawing_id_to_update in order_changes:
-                # Get the full drawing object
-                full_drawing = get_drawing(drawing_id_to_update)
-                if full_drawing:
-                    # Update order and last_modified
-                    full_drawing['order'] = order_changes[drawing_id_to_update]
-                    full_drawing['last_modified'] = datetime.now().isoformat()
-
-                    # Save the full drawing object
-                    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
-                    drawings_dir = os.path.join(PROJECTS_DIR, project_id, DRAWINGS_SUBDIR)
-                    drawing_path = os.path.join(drawings_dir, f"{drawing_id_to_update}.json")
-
-                    # Remove execution_state before saving to file
-                    drawing_to_save = full_drawing.copy()
-                    if "execution_state" in drawing_to_save:
-                        del drawing_to_save["execution_state"]
-
-                    with open(drawing_path, 'w', encoding='utf-8') as f:
-                        json.dump(drawing_to_save, f, ensure_ascii=False, indent=2)
-
-                    # Update memory cache with full object
-                    with drawings_lock:
-                        if drawing_id_to_update in active_drawings:
-                            active_drawings[drawing_id_to_update].update(full_drawing)
-
-        return True
+            return update_project_metadata(project_id, {"drawing_ranks": ranks})
 
     except Exception as e:
         print(f"Error reordering drawing: {e}")
@@ -482,55 +890,21 @@ def copy_drawing(project_id: str, source_drawing_id: str, new_name: str = None)
         print(f"Error copying drawing: {e}")
         return None
 
+def _drawing_position(project_id: str, drawing_id: str) -> Tuple[Optional[int], int]:
+    """A drawing's 1-based position in its project (None if absent) and the project's drawing count"""
+    drawing_ids = [d["id"] for d in list_project_drawings(project_id)]
+    if drawing_id not in drawing_ids:
+        return None, len(drawing_ids)
+    return drawing_ids.index(drawing_id) + 1, len(drawing_ids)
+
 def move_drawing_up(project_id: str, drawing_id: str) -> bool:
     """Move a drawing up one position"""
     try:
-        drawings = list_project_drawings(project_id)
-
-        # Initialize order field for drawings that don't have it
-        for i, drawing in enumerate(drawings):
-            if 'order' not in drawing:
-                # Get full drawing object and update it
-                full_drawing = get_drawing(drawing['id'])
-                if full_drawing:
-                    full_drawing['order'] = i + 1
-                    full_drawing['last_modified'] = datetime.now().isoformat()
-
-                    # Save the full drawing with order field
-                    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
-                    drawings_dir = os.path.join(PROJECTS_DIR, project_id, DRAWINGS_SUBDIR)
-                    drawing_path = os.path.join(drawings_dir, f"{drawing['id']}.json")
-
-                    # Remove execution_state before saving
-                    drawing_to_save = full_drawing.copy()
-                    if "execution_state" in drawing_to_save:
-                        del drawing_to_save["execution_state"]
-
-                    with open(drawing_path, 'w', encoding='utf-8') as f:
-                        json.dump(drawing_to_save, f, ensure_ascii=False, indent=2)
-
-                    # Update memory cache
-                    with drawings_lock:
-                        if drawing['id'] in active_drawings:
-                            active_drawings[drawing['id']].update(full_drawing)
-
-        drawings.sort(key=lambda x: x.get('order', 0))
-
-        # Find current position
-        current_index = None
-        for i, drawing in enumerate(drawings):
-            if drawing['id'] == drawing_id:
-                current_index = i
-                break
-
-        if current_index is None or current_index == 0:
+        position, _ = _drawing_position(project_id, drawing_id)
+        if position is None or position == 1:
             return False  # Already at top or not found
 
-        # Swap orders with previous drawing
-        current_order = drawings[current_index].get('order', 0)
-        prev_order = drawings[current_index - 1].get('order', 0)
-
-        return reorder_drawing(project_id, drawing_id, prev_order)
+        return reorder_drawing(project_id, drawing_id, position - 1)
 
     except Exception as e:
         print(f"Error moving drawing up: {e}")
@@ -539,52 +913,11 @@ def move_drawing_up(project_id: str, drawing_id: str) -> bool:
 def move_drawing_down(project_id: str, drawing_id: str) -> bool:
     """Move a drawing down one position"""
     try:
-        drawings = list_project_drawings(project_id)
-
-        # Initialize order field for drawings that don't have it
-        for i, drawing in enumerate(drawings):
-            if 'order' not in drawing:
-                # Get full drawing object and update it
-                full_drawing = get_drawing(drawing['id'])
-                if full_drawing:
-                    full_drawing['order'] = i + 1
-                    full_drawing['last_modified'] = datetime.now().isoformat()
-
-                    # Save the full drawing with order field
-                    from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR
-                    drawings_dir = os.path.join(PROJECTS_DIR, project_id, DRAWINGS_SUBDIR)
-                    drawing_path = os.path.join(drawings_dir, f"{drawing['id']}.json")
-
-                    # Remove execution_state before saving
-                    drawing_to_save = full_drawing.copy()
-                    if "execution_state" in drawing_to_save:
-                        del drawing_to_save["execution_state"]
-
-                    with open(drawing_path, 'w', encoding='utf-8') as f:
-                        json.dump(drawing_to_save, f, ensure_ascii=False, indent=2)
-
-                    # Update memory cache
-                    with drawings_lock:
-                        if drawing['id'] in active_drawings:
-                            active_drawings[drawing['id']].update(full_drawing)
-
-        drawings.sort(key=lambda x: x.get('order', 0))
-
-        # Find current position
-        current_index = None
-        for i, drawing in enumerate(drawings):
-            if drawing['id'] == drawing_id:
-                current_index = i
-                break
-
-        if current_index is None or current_index == len(drawings) - 1:
+        position, count = _drawing_position(project_id, drawing_id)
+        if position is None or position == count:
             return False  # Already at bottom or not found
 
-        # Swap orders with next drawing
-        current_order = drawings[current_index].get('order', 0)
-        next_order = drawings[current_index + 1].get('order', 0)
-
-        return reorder_drawing(project_id, drawing_id, next_order)
+        return reorder_drawing(project_id, drawing_id, position + 1)
 
     except Exception as e:
         print(f"Error moving drawing down: {e}")
@@ -602,4 +935,26 @@ def reset_execution_state():
     })
 
 def update_execution_state(updates: Dict[str, Any]):
-    execution_state.update(updates)
\ No newline at end of file
+    execution_state.update(updates)
+    delta = public_state(updates)
+    if delta:
+        publish("workflow", **delta)
+
+def update_all_drawings_execution_state(updates: Dict[str, Any]):
+    """Update the execute-all run state and announce the change"""
+    all_drawings_execution_state.update(updates)
+    delta = public_state(updates)
+    if delta:
+        publish("execute_all", **delta)
+
+def get_execution_snapshot() -> Dict[str, Any]:
+    """Public execution state of every active drawing, the execute-all run and the workflow"""
+    drawings = {
+        drawing_id: public_state(drawing.get("execution_state", {}))
+        for drawing_id, drawing in active_drawings.copy().items()
+    }
+    return {
+        "drawings": drawings,
+        "execute_all": public_state(all_drawings_execution_state),
+        "workflow": public_state(execution_state)
+    }
\ No newline at end of file
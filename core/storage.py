@@ -0,0 +1,76 @@
+"""On-disk encoding of drawings and project metadata.
+
+Every write goes to a temp file in the same directory and is moved over the
+target with ``os.replace``, so a crash leaves either the old file or the new
+one, never half of each. JSON is written without indentation. Drawings can
+instead be stored as msgpack (``COPILOTNODE_STORAGE_FORMAT=msgpack``, needs the
+``msgpack`` package); readers detect the encoding from the content, so both
+kinds of file load whatever the current setting.
+"""
+import json
+import os
+import threading
+from typing import Any, Optional
+from core.log import get_logger
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+log = get_logger(__name__)
+
+FORMATS = ("json", "msgpack")
+
+_warned_fallback = False
+
+def resolve_format(requested: Optional[str]) -> str:
+    """The format to write with: the requested one, or JSON when msgpack is unavailable"""
+    global _warned_fallback
+    fmt = (requested or "json").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown storage format '{requested}', expected one of {list(FORMATS)}")
+    if fmt == "msgpack" and msgpack is None:
+        if not _warned_fallback:
+            log.warning("msgpack not installed, storing drawings as JSON")
+            _warned_fallback = True
+        return "json"
+    return fmt
+
+def encode(data: Any, fmt: str = "json") -> bytes:
+    if resolve_format(fmt) == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def decode(raw: bytes) -> Any:
+    """Decode a stored document, telling JSON from msgpack by its first byte"""
+    text_start = raw.lstrip()[:1]
+    if raw.startswith(b'\xef\xbb\xbf') or text_start in (b'{', b'['):
+        return json.loads(raw.decode('utf-8-sig'))
+    if msgpack is None:
+        raise ValueError("File is not JSON and msgpack is not installed to read it")
+    return msgpack.unpackb(raw, raw=False)
+
+def atomic_write(path: str, payload: bytes):
+    """Replace ``path`` with ``payload`` in one step; on failure ``path`` is untouched and no temp file is left"""
+    # Per-thread temp name so concurrent saves of one file never share a temp file
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def write_document(path: str, data: Any, fmt: str = "json"):
+    atomic_write(path, encode(data, fmt))
+
+def read_document(path: str) -> Any:
+    with open(path, 'rb') as f:
+        return decode(f.read())
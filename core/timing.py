@@ -0,0 +1,93 @@
+import time
+from typing import Dict, Any, Optional
+
+# Built-in delays (seconds) at speed 1.0
+MOVE_DURATION = 0.1      # Cursor travel before click / press / release / scroll
+FOLLOW_DURATION = 0.2    # Cursor travel for followimg
+SETTLE_DELAY = 0.1       # Pause between cursor travel and the button event
+ACTION_PAUSE = 0.1       # Pause after each input call (formerly pyautogui.PAUSE)
+WAIT_FLOOR = 0.1         # Minimum duration of a wait node
+LOOP_DELAY = 0.5         # Pause between loop iterations of a drawing
+EXECUTE_ALL_LOOP_DELAY = 1.0  # Pause between loop iterations of execute-all
+
+MIN_SPEED = 0.1
+MAX_SPEED = 100.0
+
+class TimingPolicy:
+    """Scales every built-in execution delay by 1 / speed; turbo skips them.
+
+    A policy is created per run. Nodes can override it through the ``speed``
+    and ``turbo`` params; overrides share the run's overhead accounting so the
+    reported per-action overhead covers the whole run.
+    """
+
+    def __init__(self, speed: float = 1.0, turbo: bool = False, _parent: Optional['TimingPolicy'] = None):
+        try:
+            speed = float(speed)
+        except (TypeError, ValueError):
+            speed = 1.0
+        self.speed = min(MAX_SPEED, max(MIN_SPEED, speed))
+        self.turbo = _as_bool(turbo)
+        self._parent = _parent
+        self._overhead = 0.0
+        self._actions = 0
+
+    @property
+    def mode(self) -> str:
+        return "turbo" if self.turbo else "scaled"
+
+    def for_node(self, node: Dict[str, Any]) -> 'TimingPolicy':
+        """Return the policy for a node, honouring its ``speed``/``turbo`` params"""
+        params = node.get("params") or {}
+        if "speed" not in params and "turbo" not in params:
+            return self
+        root = self._root()
+        return TimingPolicy(
+            speed=params.get("speed", root.speed),
+            turbo=params.get("turbo", root.turbo),
+            _parent=root
+        )
+
+    def scaled(self, base: float) -> float:
+        """Scaled length of a built-in delay"""
+        if self.turbo or base <= 0:
+            return 0.0
+        return base / self.speed
+
+    def duration(self, base: float) -> float:
+        """Scaled duration for a blocking call such as ``pyautogui.moveTo``"""
+        seconds = self.scaled(base)
+        self._root()._overhead += seconds
+        return seconds
+
+    def sleep(self, base: float):
+        """Sleep for a scaled built-in delay"""
+        seconds = self.duration(base)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def pause(self):
+        """Pause after an input call"""
+        self.sleep(ACTION_PAUSE)
+
+    def count_action(self):
+        self._root()._actions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        root = self._root()
+        per_action = root._overhead / root._actions if root._actions else 0.0
+        return {
+            "mode": root.mode,
+            "speed": root.speed,
+            "actions": root._actions,
+            "overhead_total": round(root._overhead, 4),
+            "overhead_per_action_ms": round(per_action * 1000, 2)
+        }
+
+    def _root(self) -> 'TimingPolicy':
+        return self._parent or self
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
@@ -0,0 +1,244 @@
+import struct
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+# One fixed-width record per event:
+#   t (float64, seconds since the trace started), kind (uint8), flag (uint8),
+#   node (uint16 string index), x (int32), y (int32), value (float32),
+#   label (uint16 string index)
+RECORD = struct.Struct("<dBBHiifH")
+RECORD_SIZE = RECORD.size
+
+# File header: magic, version, record size, record count, dropped records, string count
+HEADER = struct.Struct("<4sHHIII")
+MAGIC = b"CNTR"
+VERSION = 1
+
+DEFAULT_CAPACITY = 16384
+MAX_STRINGS = 0xFFFF
+
+# Event kinds
+STATE = 1        # label = status
+ITERATION = 2    # x = iteration number
+NODE_ENTER = 3   # label = action type
+NODE_EXIT = 4    # label = action type, value = seconds spent in the node
+MATCH = 5        # flag = found, value = confidence, x/y = match position
+INPUT = 6        # label = input kind, x/y = position
+
+KIND_NAMES = {
+    STATE: "state",
+    ITERATION: "iteration",
+    NODE_ENTER: "enter",
+    NODE_EXIT: "exit",
+    MATCH: "match",
+    INPUT: "input"
+}
+
+class ExecutionTrace:
+    """Bounded binary ring buffer of execution events for one run.
+
+    Records are packed into a preallocated bytearray; strings (node ids,
+    action types, states) are interned once in a string table. When the
+    buffer is full the oldest records are overwritten and counted as dropped.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity * RECORD_SIZE)
+        self._next = 0
+        self._count = 0
+        self.dropped = 0
+        self._strings: List[str] = [""]
+        self._string_index: Dict[str, int] = {"": 0}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def state(self, status: str):
+        self._record(STATE, label=status)
+
+    def iteration(self, number: int):
+        self._record(ITERATION, x=number)
+
+    def node_enter(self, node_id: str, action_type: str):
+        self._record(NODE_ENTER, node=node_id, label=action_type)
+
+    def node_exit(self, node_id: str, action_type: str, duration: float):
+        self._record(NODE_EXIT, node=node_id, label=action_type, value=duration)
+
+    def match(self, node_id: str, found: bool, confidence: float = 0.0, x: int = 0, y: int = 0):
+        self._record(MATCH, flag=1 if found else 0, node=node_id, x=x, y=y, value=confidence)
+
+    def input(self, node_id: str, kind: str, x: int = 0, y: int = 0):
+        self._record(INPUT, node=node_id, label=kind, x=x, y=y)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Decode the buffer, oldest record first"""
+        with self._lock:
+            raw = self._ordered_bytes()
+            strings = list(self._strings)
+
+        records = []
+        for t, kind, flag, node, x, y, value, label in RECORD.iter_unpack(raw):
+            record = {"t": round(t, 6), "kind": KIND_NAMES.get(kind, kind)}
+            if node:
+                record["node_id"] = strings[node]
+            if label:
+                record["label"] = strings[label]
+            if kind == MATCH:
+                record.update({"found": bool(flag), "confidence": round(value, 4), "x": x, "y": y})
+            elif kind == INPUT:
+                record.update({"x": x, "y": y})
+            elif kind == NODE_EXIT:
+                record["duration"] = round(value, 6)
+            elif kind == ITERATION:
+                record["iteration"] = x
+            records.append(record)
+        return records
+
+    def outcomes(self) -> List[Dict[str, Any]]:
+        """Recorded match results in order, in the simulator's ``trace`` format"""
+        return [
+            {"node_id": record["node_id"], "found": record["found"], "confidence": record["confidence"]}
+            for record in self.records() if record["kind"] == "match" and "node_id" in record
+        ]
+
+    def iterations(self) -> int:
+        return sum(1 for record in self.records() if record["kind"] == "iteration")
+
+    def node_durations(self) -> Dict[str, Dict[str, Any]]:
+        """Per-node count / total / max time spent, from exit records"""
+        durations: Dict[str, Dict[str, Any]] = {}
+        for record in self.records():
+            if record["kind"] != "exit" or "node_id" not in record:
+                continue
+            entry = durations.setdefault(record["node_id"], {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] = round(entry["total"] + record["duration"], 6)
+            entry["max"] = max(entry["max"], record["duration"])
+        return durations
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": self._count,
+            "capacity": self.capacity,
+            "dropped": self.dropped,
+            "strings": len(self._strings),
+            "bytes": self._count * RECORD_SIZE
+        }
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the export file format"""
+        with self._lock:
+            raw = self._ordered_bytes()
+            strings = list(self._strings)
+            count, dropped = self._count, self.dropped
+
+        parts = [HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count, dropped, len(strings))]
+        for text in strings:
+            encoded = text.encode("utf-8")
+            parts.append(struct.pack("<H", len(encoded)))
+            parts.append(encoded)
+        parts.append(raw)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ExecutionTrace':
+        """Load an exported trace"""
+        if len(data) < HEADER.size:
+            raise ValueError("Trace file is truncated")
+        magic, version, record_size, count, dropped, string_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an execution trace file")
+        if version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"Unsupported trace format version {version}")
+
+        offset = HEADER.size
+        strings = []
+        for _ in range(string_count):
+            if offset + 2 > len(data):
+                raise ValueError("Trace file is truncated")
+            (length,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            if offset + length > len(data):
+                raise ValueError("Trace file is truncated")
+            try:
+                strings.append(data[offset:offset + length].decode("utf-8"))
+            except UnicodeDecodeError:
+                raise ValueError("Trace file is corrupt: string table is not UTF-8")
+            offset += length
+
+        raw = data[offset:offset + count * RECORD_SIZE]
+        if len(raw) != count * RECORD_SIZE:
+            raise ValueError("Trace file is truncated")
+        # Records name nodes and labels by index; an index past the table would fail on read
+        for record in RECORD.iter_unpack(raw):
+            if max(record[3], record[7]) >= max(len(strings), 1):
+                raise ValueError("Trace file is corrupt: record refers to a missing string")
+
+        trace = cls(max(count, 1))
+        trace._buffer[:len(raw)] = raw
+        trace._count = count
+        trace._next = count % trace.capacity
+        trace.dropped = dropped
+        trace._strings = strings or [""]
+        trace._string_index = {text: index for index, text in enumerate(trace._strings)}
+        return trace
+
+    def _record(self, kind: int, flag: int = 0, node: str = "", x: int = 0, y: int = 0,
+                value: float = 0.0, label: str = ""):
+        t = time.perf_counter() - self._started
+        with self._lock:
+            RECORD.pack_into(
+                self._buffer, self._next * RECORD_SIZE,
+                t, kind, flag, self._intern(node), self._clamp(x), self._clamp(y), value, self._intern(label)
+            )
+            self._next = (self._next + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+            else:
+                self.dropped += 1
+
+    def _intern(self, text: str) -> int:
+        text = str(text) if text is not None else ""
+        index = self._string_index.get(text)
+        if index is None:
+            if len(self._strings) >= MAX_STRINGS:
+                return 0
+            index = len(self._strings)
+            self._strings.append(text)
+            self._string_index[text] = index
+        return index
+
+    @staticmethod
+    def _clamp(value: int) -> int:
+        return max(-0x80000000, min(0x7FFFFFFF, int(value)))
+
+    def _ordered_bytes(self) -> bytes:
+        if self._count < self.capacity:
+            return bytes(self._buffer[:self._count * RECORD_SIZE])
+        split = self._next * RECORD_SIZE
+        return bytes(self._buffer[split:] + self._buffer[:split])
+
+# Latest run's trace per drawing; kept after the run ends so it can be exported
+_traces: Dict[str, ExecutionTrace] = {}
+_traces_lock = threading.Lock()
+
+def start_trace(drawing_id: str, capacity: int = DEFAULT_CAPACITY) -> ExecutionTrace:
+    """Begin a fresh trace for a drawing run, replacing the previous one"""
+    trace = ExecutionTrace(capacity)
+    with _traces_lock:
+        _traces[drawing_id] = trace
+    return trace
+
+def get_trace(drawing_id: str) -> Optional[ExecutionTrace]:
+    return _traces.get(drawing_id)
+
+def discard_trace(drawing_id: str):
+    with _traces_lock:
+        _traces.pop(drawing_id, None)
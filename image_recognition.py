@@ -4,58 +4,63 @@ import pyautogui
 import pyscreeze
 from PIL import Image, ImageGrab
 import os
+import threading
 import time
+from collections import OrderedDict
 from typing import Tuple, Dict, Any, Optional
+from core.metrics import SCREENSHOT_SECONDS, TEMPLATE_MATCH_SECONDS, TEMPLATE_LOAD_SECONDS, TEMPLATE_CACHE
+
+# 模板图像缓存上限（按路径）
+TEMPLATE_CACHE_SIZE = 64
 
 class ImageRecognition:
-    def __init__(self, screen_scale=1):
+    def __init__(self, screen_scale=1, template_cache_size=TEMPLATE_CACHE_SIZE):
         self.screen_scale = screen_scale
         pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.1
         self.screenshot_cache = None
         self.cache_time = 0
+        self.template_cache_size = template_cache_size
+        self._templates = OrderedDict()  # path -> (mtime, grayscale image)
+        self._templates_lock = threading.Lock()
         
     def capture_screen(self, save_path="screenshot.png"):
-        screenshot = pyscreeze.screenshot(save_path)
+        with SCREENSHOT_SECONDS.time():
+            screenshot = pyscreeze.screenshot(save_path)
         return save_path
         
     def load_target_image(self, image_path):
-        if not os.path.exists(image_path):
+        """读取灰度模板图像，按路径缓存，文件修改后自动重新读取"""
+        try:
+            mtime = os.path.getmtime(image_path)
+        except OSError:
             raise FileNotFoundError(f"Target image not found: {image_path}")
-        return cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+
+        with self._templates_lock:
+            cached = self._templates.get(image_path)
+            if cached and cached[0] == mtime:
+                self._templates.move_to_end(image_path)
+                TEMPLATE_CACHE.inc("hit")
+                return cached[1]
+
+        TEMPLATE_CACHE.inc("miss")
+        with TEMPLATE_LOAD_SECONDS.time():
+            image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return image
+        with self._templates_lock:
+            self._templates[image_path] = (mtime, image)
+            self._templates.move_to_end(image_path)
+            while len(self._templates) > self.template_cache_size:
+                self._templates.popitem(last=False)
+        return image
         
     def find_image_on_screen(self, target_image_path, threshold=0.8):
-        screenshot_path = self.capture_screen()
-        target = self.load_target_image(target_image_path)
-        temp = cv2.imread(screenshot_path, cv2.IMREAD_GRAYSCALE)
-        
-        theight, twidth = target.shape[:2]
-        tempheight, tempwidth = temp.shape[:2]
-        
+        # 在内存中截取全屏，不写共享的 screenshot.png，多个分支或线程可以同时查找
+        frame, captured_at = self.capture_region(None)
         if self.screen_scale != 1:
-            scaleTemp = cv2.resize(temp, (int(tempwidth / self.screen_scale), int(tempheight / self.screen_scale)))
-        else:
-            scaleTemp = temp
-            
-        res = cv2.matchTemplate(scaleTemp, target, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
-        
-        if max_val >= threshold:
-            top_left = max_loc
-            center_x = top_left[0] + twidth // 2
-            center_y = top_left[1] + theight // 2
-            
-            os.remove(screenshot_path)
-            return {
-                'found': True,
-                'confidence': max_val,
-                'position': (center_x, center_y),
-                'top_left': top_left,
-                'bottom_right': (top_left[0] + twidth, top_left[1] + theight)
-            }
-        else:
-            os.remove(screenshot_path)
-            return {'found': False, 'confidence': max_val}
+            height, width = frame.shape[:2]
+            frame = cv2.resize(frame, (int(width / self.screen_scale), int(height / self.screen_scale)))
+        return self.match_in_frame(target_image_path, frame, None, threshold, captured_at)
             
     def click_image(self, target_image_path, threshold=0.8, button='left'):
         result = self.find_image_on_screen(target_image_path, threshold)
@@ -121,49 +126,66 @@ class ImageRecognition:
             查找结果字典，包含found, confidence, position等信息
         """
         if region_bbox is None:
-            # 如果没有指定区域，使用原有的全屏搜索
+            # 如果没有指定区域，使用全屏搜索（同样在内存中截图）
             return self.find_image_on_screen(target_image_path, threshold)
         
-        x, y, width, height = region_bbox
+        frame, captured_at = self.capture_region(region_bbox)
+        return self.match_in_frame(target_image_path, frame, region_bbox, threshold, captured_at)
+
+    def capture_region(self, region_bbox=None):
+        """在内存中截取区域的灰度图像，不写临时文件
+        
+        Returns:
+            (灰度图像数组, 截图时间 time.perf_counter())
+        """
+        started = time.perf_counter()
+        if region_bbox is None:
+            screenshot = ImageGrab.grab()
+        else:
+            x, y, width, height = region_bbox
+            screenshot = ImageGrab.grab(bbox=(x, y, x + width, y + height))
+        captured_at = time.perf_counter()
+        frame = cv2.cvtColor(np.array(screenshot.convert("RGB")), cv2.COLOR_RGB2GRAY)
+        SCREENSHOT_SECONDS.observe(time.perf_counter() - started)
+        return frame, captured_at
+
+    def match_in_frame(self, target_image_path, frame, region_bbox=None, threshold=0.8, captured_at=None):
+        """在已截取的图像中匹配目标图像，坐标换算为全屏坐标系
         
-        # 截取指定区域的屏幕截图
-        region_screenshot = ImageGrab.grab(bbox=(x, y, x + width, y + height))
-        region_screenshot_path = "region_screenshot.png"
-        region_screenshot.save(region_screenshot_path)
+        Args:
+            target_image_path: 目标图像路径
+            frame: capture_region 返回的灰度图像
+            region_bbox: 该图像对应的屏幕区域 (x, y, width, height)，None表示全屏
+            threshold: 匹配阈值
+            captured_at: 截图时间，写入结果供调用方判断新鲜度
+        """
+        x, y = (region_bbox[0], region_bbox[1]) if region_bbox else (0, 0)
+        target = self.load_target_image(target_image_path)
+        theight, twidth = target.shape[:2]
         
-        try:
-            # 加载目标图像和区域截图
-            target = self.load_target_image(target_image_path)
-            region = cv2.imread(region_screenshot_path, cv2.IMREAD_GRAYSCALE)
-            
-            theight, twidth = target.shape[:2]
-            
-            # 进行模板匹配
-            res = cv2.matchTemplate(region, target, cv2.TM_CCOEFF_NORMED)
+        # 进行模板匹配
+        with TEMPLATE_MATCH_SECONDS.time():
+            res = cv2.matchTemplate(frame, target, cv2.TM_CCOEFF_NORMED)
             min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+        
+        if max_val >= threshold:
+            # 找到匹配，计算在全屏坐标系中的位置
+            top_left_screen = (max_loc[0] + x, max_loc[1] + y)
+            center_x = top_left_screen[0] + twidth // 2
+            center_y = top_left_screen[1] + theight // 2
             
-            if max_val >= threshold:
-                # 找到匹配，计算在全屏坐标系中的位置
-                top_left_region = max_loc
-                top_left_screen = (top_left_region[0] + x, top_left_region[1] + y)
-                center_x = top_left_screen[0] + twidth // 2
-                center_y = top_left_screen[1] + theight // 2
-                
-                return {
-                    'found': True,
-                    'confidence': max_val,
-                    'position': (center_x, center_y),
-                    'top_left': top_left_screen,
-                    'bottom_right': (top_left_screen[0] + twidth, top_left_screen[1] + theight),
-                    'search_region': region_bbox
-                }
-            else:
-                return {
-                    'found': False, 
-                    'confidence': max_val,
-                    'search_region': region_bbox
-                }
-        finally:
-            # 清理临时截图文件
-            if os.path.exists(region_screenshot_path):
-                os.remove(region_screenshot_path)
\ No newline at end of file
+            return {
+                'found': True,
+                'confidence': max_val,
+                'position': (center_x, center_y),
+                'top_left': top_left_screen,
+                'bottom_right': (top_left_screen[0] + twidth, top_left_screen[1] + theight),
+                'search_region': region_bbox,
+                'captured_at': captured_at
+            }
+        return {
+            'found': False,
+            'confidence': max_val,
+            'search_region': region_bbox,
+            'captured_at': captured_at
+        }
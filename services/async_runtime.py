@@ -0,0 +1,291 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
+from core.graph import DrawingGraph, ForkBranch
+from core.metrics import NODE_SECONDS
+from core.state import get_drawing_execution_state, update_drawing_execution_state
+from core.timing import TimingPolicy, WAIT_FLOOR, LOOP_DELAY
+from core.trace import get_trace
+from services.prefetch import PREFETCH_TRIGGERS
+
+IMAGE_WORKERS = 4
+LAG_SAMPLE_INTERVAL = 0.5
+
+# Actions that only read the screen; everything else sends input and is serialised
+IMAGE_ONLY_ACTIONS = ("findimg", "if")
+
+# Control-flow nodes with no action of their own
+FLOW_ACTIONS = ("fork", "join")
+
+class AsyncExecutionRuntime:
+    """Runs many drawings as tasks on a single asyncio event loop.
+
+    Waits and loop pauses are awaited on the loop; screen-only actions run on
+    an image worker pool and input actions on a single input worker so that
+    concurrent drawings never interleave mouse and keyboard events.
+    """
+
+    def __init__(self, image_workers: int = IMAGE_WORKERS):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._image_workers = image_workers
+        self._image_executor = ThreadPoolExecutor(max_workers=image_workers, thread_name_prefix="async-image")
+        self._input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-input")
+        self._lag_last = 0.0
+        self._lag_max = 0.0
+        self._runs_started = 0
+        self._runs_finished = 0
+
+    def submit(self, drawing_service, drawing_id: str, nodes: List[Dict[str, Any]], loop: bool,
+               timing: TimingPolicy, on_finish: Callable[[str], None]):
+        """Schedule a drawing run on the event loop"""
+        event_loop = self._ensure_loop()
+        event_loop.call_soon_threadsafe(self._spawn, drawing_service, drawing_id, nodes, loop, timing, on_finish)
+
+    def cancel(self, drawing_id: str):
+        """Cancel a running drawing task, interrupting any pending wait"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._cancel, drawing_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._loop is not None,
+            "active_tasks": len(self._tasks),
+            "runs_started": self._runs_started,
+            "runs_finished": self._runs_finished,
+            "image_workers": self._image_workers,
+            "loop_lag_ms": round(self._lag_last * 1000, 2),
+            "loop_lag_max_ms": round(self._lag_max * 1000, 2)
+        }
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+
+                def run_loop():
+                    event_loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(event_loop)
+                    self._loop = event_loop
+                    event_loop.create_task(self._monitor_lag())
+                    ready.set()
+                    event_loop.run_forever()
+
+                self._thread = threading.Thread(target=run_loop, name="async-runtime", daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    def _spawn(self, drawing_service, drawing_id, nodes, loop, timing, on_finish):
+        self._runs_started += 1
+        task = self._loop.create_task(self._run(drawing_service, drawing_id, nodes, loop, timing, on_finish))
+        self._tasks[drawing_id] = task
+
+    def _cancel(self, drawing_id: str):
+        task = self._tasks.get(drawing_id)
+        if task and not task.done():
+            task.cancel()
+
+    async def _run(self, drawing_service, drawing_id: str, nodes: List[Dict[str, Any]], loop: bool,
+                   timing: TimingPolicy, on_finish: Callable[[str], None]):
+        try:
+            await self._execute_nodes(drawing_service, drawing_id, nodes, loop, timing)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            update_drawing_execution_state(drawing_id, {
+                "status": "error",
+                "error": str(e)
+            })
+        finally:
+            self._tasks.pop(drawing_id, None)
+            self._runs_finished += 1
+            # on_finish appends to the run history, keep file I/O off the loop
+            await asyncio.get_running_loop().run_in_executor(None, on_finish, drawing_id)
+
+    async def _execute_nodes(self, drawing_service, drawing_id: str, nodes: List[Dict[str, Any]],
+                             loop: bool, timing: TimingPolicy):
+        if not nodes:
+            return
+
+        graph = DrawingGraph(nodes)
+        total_nodes = len(nodes)
+        executed_count = 0
+
+        async def execute_node_recursive(node_id: str, visited: set, branch: Optional[ForkBranch] = None):
+            nonlocal executed_count
+
+            if self._should_stop(drawing_id) or node_id in visited:
+                return
+            if branch and branch.stops_at(node_id):
+                return
+
+            visited.add(node_id)
+
+            node = graph.get(node_id)
+            if not node:
+                return
+
+            update_drawing_execution_state(drawing_id, {
+                "current_node": node_id,
+                "progress": int((executed_count / total_nodes) * 100),
+                "timing": timing.stats()
+            })
+
+            if node["action_type"] in PREFETCH_TRIGGERS:
+                drawing_service.prefetch_after(drawing_id, graph, node, timing)
+            await self._execute_action(drawing_service, drawing_id, node, timing)
+            executed_count += 1
+            if branch:
+                branch.record(node)
+
+            if node["action_type"] == "fork":
+                join_id = await self._execute_fork(drawing_id, graph, node, visited, branch, execute_node_recursive)
+                if join_id:
+                    await execute_node_recursive(join_id, visited.copy(), branch)
+                return
+
+            for next_node_id in graph.next_ids(node, node.get('_condition_result', False)):
+                if not self._should_stop(drawing_id):
+                    await execute_node_recursive(next_node_id, visited.copy(), branch)
+
+        trace = get_trace(drawing_id)
+        iteration = 0
+
+        while not self._should_stop(drawing_id):
+            iteration += 1
+            if trace is not None:
+                trace.iteration(iteration)
+
+            for start_node in graph.start_nodes:
+                if self._should_stop(drawing_id):
+                    break
+                await execute_node_recursive(start_node["id"], set())
+
+            executed_count = 0
+
+            if not loop or self._should_stop(drawing_id):
+                break
+
+            await asyncio.sleep(timing.duration(LOOP_DELAY))
+
+        update_drawing_execution_state(drawing_id, {"timing": timing.stats()})
+
+    async def _execute_fork(self, drawing_id: str, graph: DrawingGraph, fork_node: Dict[str, Any], visited: set,
+                            parent: Optional[ForkBranch], execute_branch) -> Optional[str]:
+        """Run a fork's branches as concurrent tasks up to their join; returns the join id"""
+        join_id = graph.find_join(fork_node)
+        join_node = graph.get(join_id) if join_id else None
+        mode = graph.join_mode(join_node)
+        branches = [ForkBranch(head_id, join_id, parent) for head_id in fork_node.get("connections", [])]
+        if not branches:
+            return join_id
+
+        async def run_branch(branch: ForkBranch):
+            try:
+                await execute_branch(branch.head_id, visited.copy(), branch)
+                branch.finish()
+            except asyncio.CancelledError:
+                branch.cancel()
+                branch.finish()
+                raise
+            except Exception as e:
+                branch.finish(str(e))
+            return branch
+
+        tasks = [asyncio.ensure_future(run_branch(branch)) for branch in branches]
+        try:
+            if mode == "any":
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                next(iter(done)).result().winner = True
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            else:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        results = [branch.result() for branch in branches]
+        if join_node is not None:
+            join_node["_branch_results"] = results
+        update_drawing_execution_state(drawing_id, {"branch_results": {join_id or fork_node["id"]: results}},
+                                       merge=("branch_results",))
+        return join_id
+
+    async def _execute_action(self, drawing_service, drawing_id: str, node: Dict[str, Any], timing: TimingPolicy):
+        action_type = node["action_type"]
+
+        if action_type == "wait":
+            node_timing = timing.for_node(node)
+            node_timing.count_action()
+            duration = node.get("params", {}).get("duration", 1.0)
+            trace = get_trace(drawing_id)
+            if trace is not None:
+                trace.node_enter(node["id"], action_type)
+            started = time.perf_counter()
+            try:
+                await asyncio.sleep(max(node_timing.scaled(WAIT_FLOOR), duration))
+            finally:
+                elapsed = time.perf_counter() - started
+                NODE_SECONDS.observe(elapsed, action_type)
+                if trace is not None:
+                    trace.node_exit(node["id"], action_type, elapsed)
+            return
+
+        if action_type in FLOW_ACTIONS:
+            timing.for_node(node).count_action()
+            return
+
+        executor = self._image_executor if action_type in IMAGE_ONLY_ACTIONS else self._input_executor
+        await asyncio.get_running_loop().run_in_executor(
+            executor, drawing_service.execute_drawing_action, drawing_id, node, timing
+        )
+
+    async def _monitor_lag(self):
+        """Sample how late the loop wakes up; a busy loop shows up as lag"""
+        while True:
+            expected = time.perf_counter() + LAG_SAMPLE_INTERVAL
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            lag = max(0.0, time.perf_counter() - expected)
+            self._lag_last = lag
+            self._lag_max = max(self._lag_max, lag)
+
+    @staticmethod
+    def _should_stop(drawing_id: str) -> bool:
+        execution_state = get_drawing_execution_state(drawing_id)
+        return not execution_state or execution_state["should_stop"]
+
+_runtime: Optional[AsyncExecutionRuntime] = None
+_runtime_lock = threading.Lock()
+
+def get_async_runtime() -> AsyncExecutionRuntime:
+    """Get the process-wide async runtime, creating it on first use"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AsyncExecutionRuntime()
+        return _runtime
+
+def cancel_async_run(drawing_id: str):
+    """Cancel an async run if the runtime has been started"""
+    if _runtime is not None:
+        _runtime.cancel(drawing_id)
+
+def get_async_runtime_stats() -> Dict[str, Any]:
+    if _runtime is None:
+        return {
+            "running": False,
+            "active_tasks": 0,
+            "runs_started": 0,
+            "runs_finished": 0,
+            "image_workers": IMAGE_WORKERS,
+            "loop_lag_ms": 0.0,
+            "loop_lag_max_ms": 0.0
+        }
+    return _runtime.stats()
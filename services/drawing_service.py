@@ -1,21 +1,53 @@
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
 import random
 import pyautogui
 import os
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from core.state import (
-    create_drawing, get_drawing, get_all_drawings, update_drawing,
+    create_drawing, get_drawing, get_all_drawings, update_drawing, patch_drawing,
     delete_drawing, update_drawing_execution_state, get_drawing_execution_state,
-    set_drawing_boundary, get_drawing_boundary, save_drawing_to_file,
-    list_project_drawings, get_current_project, set_current_drawing, get_current_drawing
+    set_drawing_boundary, get_drawing_boundary, flush_drawings,
+    list_project_drawings, get_current_project, set_current_drawing, get_current_drawing,
+    update_all_drawings_execution_state, get_state_version, wait_for_state_changes,
+    record_run, list_runs
+)
+from core.graph import DrawingGraph, ForkBranch
+from core.log import get_logger
+from core.metrics import NODE_SECONDS, RUNS, FAILSAFE, run_outcome
+from core.trace import start_trace, get_trace
+from core.timing import (
+    TimingPolicy, MOVE_DURATION, FOLLOW_DURATION, SETTLE_DELAY, WAIT_FLOOR,
+    LOOP_DELAY, EXECUTE_ALL_LOOP_DELAY
 )
 from image_recognition import ImageRecognition
+from services.async_runtime import get_async_runtime, cancel_async_run
+from services.prefetch import PrefetchService, PREFETCH_TRIGGERS
+from services.worker_pool import get_worker_pool, current_worker_resources
+
+log = get_logger(__name__)
+
+EXECUTION_RUNTIMES = ("thread", "async")
+
+# How often a job waiting on an async-runtime drawing checks whether it finished
+JOB_POLL_INTERVAL = 0.2
+
+# Longest a status long-poll may block before answering with no changes
+MAX_STATUS_WAIT = 60.0
+
+# Actions that send mouse or keyboard input; concurrent fork branches take turns on these
+INPUT_ACTIONS = ("click", "move", "keyboard", "mousedown", "mouseup", "mousescroll")
+
+# Fork branches may evaluate images in parallel, but only one of them drives the desktop at a time
+input_lock = threading.Lock()
 
 class DrawingService:
     def __init__(self):
         self.image_recognition = ImageRecognition()
+        self.prefetch = PrefetchService(self.image_recognition)
 
     def create_new_drawing(self, name: str, nodes: List[Dict] = None, boundary: Dict[str, int] = None) -> str:
         """Create a new drawing in the current project"""
@@ -26,10 +58,7 @@ class DrawingService:
         drawing_id = create_drawing(current_project_id, name, nodes, boundary)
         set_current_drawing(drawing_id)
         
-        # Auto-save to file
-        save_drawing_to_file(drawing_id)
-        
-        print(f"DEBUG: Created new drawing '{name}' with ID: {drawing_id} in project: {current_project_id}")
+        log.debug(None, "drawing created", drawing=drawing_id, name=name, project=current_project_id)
         return drawing_id
 
     def get_drawing_info(self, drawing_id: str) -> Optional[Dict[str, Any]]:
@@ -44,29 +73,50 @@ class DrawingService:
         """List all drawings in a specific project"""
         try:
             drawings = list_project_drawings(project_id)
-            print(f"DEBUG: Listed {len(drawings)} drawings for project: {project_id}")
+            log.debug(None, "drawings listed", project=project_id, count=len(drawings))
             return drawings
         except Exception as e:
-            print(f"ERROR: Failed to list drawings for project '{project_id}': {e}")
+            log.error("list drawings failed", project=project_id, error=str(e))
             return []
 
-    def update_drawing_info(self, drawing_id: str, updates: Dict[str, Any]) -> bool:
-        """Update drawing information and save to file"""
+    def update_drawing_info(self, drawing_id: str, updates: Dict[str, Any], flush: bool = False) -> bool:
+        """Update drawing information; written by the write-behind flusher, or right away with ``flush``"""
         try:
             drawing = get_drawing(drawing_id)
             if not drawing:
-                print(f"WARNING: Drawing '{drawing_id}' not found for update")
+                log.warning("drawing not found for update", drawing=drawing_id)
                 return False
             
             update_drawing(drawing_id, updates)
-            save_drawing_to_file(drawing_id)
+            if flush:
+                flush_drawings([drawing_id])
             
-            print(f"DEBUG: Updated and saved drawing '{drawing_id}' with: {updates}")
+            log.debug(None, "drawing updated", drawing=drawing_id, fields=",".join(updates))
             return True
         except Exception as e:
-            print(f"ERROR: Failed to update drawing '{drawing_id}': {e}")
+            log.error("update drawing failed", drawing=drawing_id, error=str(e))
             return False
 
+    def patch_drawing_nodes(self, drawing_id: str, base_revision: Any, operations: List[Dict[str, Any]],
+                            flush: bool = False) -> int:
+        """Apply node operations based on ``base_revision``; returns the drawing's new revision.
+
+        Raises ValueError when the drawing is missing or the patch is invalid,
+        and RevisionConflict (a ValueError) when the drawing has changed since
+        ``base_revision``.
+        """
+        if isinstance(base_revision, bool) or not isinstance(base_revision, int):
+            raise ValueError("base_revision must be an integer")
+        if not get_drawing(drawing_id):
+            raise ValueError("Drawing not found")
+        revision = patch_drawing(drawing_id, base_revision, operations)
+        if revision is None:
+            raise ValueError("Drawing not found")
+        if flush:
+            flush_drawings([drawing_id])
+        log.debug(None, "drawing patched", drawing=drawing_id, operations=len(operations), revision=revision)
+        return revision
+
     def delete_drawing_by_id(self, drawing_id: str) -> bool:
         """Delete a drawing"""
         return delete_drawing(drawing_id)
@@ -83,8 +133,45 @@ class DrawingService:
         """Get operation boundary for a drawing"""
         return get_drawing_boundary(drawing_id)
 
-    def start_drawing_execution(self, drawing_id: str, loop: bool = False, speed: float = 1.0) -> Dict[str, str]:
-        """Start executing a drawing"""
+    def start_drawing_execution(self, drawing_id: str, loop: bool = False, speed: float = 1.0, turbo: bool = False,
+                                runtime: str = "thread") -> Dict[str, str]:
+        """Start executing a drawing on the worker pool or on the shared async runtime"""
+        if runtime not in EXECUTION_RUNTIMES:
+            raise ValueError(f"Unknown runtime '{runtime}', expected one of {list(EXECUTION_RUNTIMES)}")
+
+        pool = get_worker_pool()
+        # A full pool queues the run; report that instead of claiming it is already running
+        queued = runtime == "thread" and pool.saturated()
+        drawing = self._begin_run(drawing_id, runtime, "queued" if queued else "running")
+
+        if runtime == "async":
+            get_async_runtime().submit(
+                self, drawing_id, drawing["nodes"], loop, TimingPolicy(speed, turbo), self._finish_drawing_run
+            )
+            return {"message": f"Drawing {drawing_id} execution started", "runtime": runtime}
+
+        ticket = pool.submit(self._run_drawing, drawing_id, drawing["nodes"], loop, speed, turbo,
+                             name=f"drawing-{drawing_id}")
+        update_drawing_execution_state(drawing_id, {"thread": ticket})
+
+        if queued:
+            return {"message": f"Drawing {drawing_id} queued, all workers are busy", "runtime": runtime, "queued": True}
+        return {"message": f"Drawing {drawing_id} execution started", "runtime": runtime}
+
+    def run_drawing_job(self, drawing_id: str, loop: bool = False, speed: float = 1.0, turbo: bool = False,
+                        runtime: str = "thread") -> Dict[str, Any]:
+        """Run a drawing to completion on the calling thread and return its final execution state"""
+        if runtime == "async":
+            self.start_drawing_execution(drawing_id, loop, speed, turbo, runtime)
+            while (get_drawing_execution_state(drawing_id) or {}).get("is_running"):
+                time.sleep(JOB_POLL_INTERVAL)
+        else:
+            drawing = self._begin_run(drawing_id, runtime)
+            self._run_drawing(drawing_id, drawing["nodes"], loop, speed, turbo)
+        return get_drawing_execution_state(drawing_id) or {}
+
+    def _begin_run(self, drawing_id: str, runtime: str, status: str = "running") -> Dict[str, Any]:
+        """Validate a drawing can start and reset its execution state"""
         drawing = get_drawing(drawing_id)
         if not drawing:
             raise ValueError(f"Drawing {drawing_id} not found")
@@ -93,35 +180,82 @@ class DrawingService:
         if execution_state and execution_state["is_running"]:
             raise ValueError(f"Drawing {drawing_id} is already running")
         
+        start_trace(drawing_id)
         update_drawing_execution_state(drawing_id, {
             "is_running": True,
             "should_stop": False,
-            "status": "running",
+            "status": status,
             "progress": 0,
-            "error": None
+            "error": None,
+            "timing": None,
+            "runtime": runtime,
+            "started_at": datetime.now().isoformat(),
+            "branch_results": {}
         })
-        
-        def run_workflow():
-            try:
-                self.execute_drawing_nodes(drawing_id, drawing["nodes"], loop, speed)
-            except Exception as e:
-                update_drawing_execution_state(drawing_id, {
-                    "status": "error",
-                    "error": str(e)
-                })
-            finally:
-                update_drawing_execution_state(drawing_id, {
-                    "is_running": False,
-                    "status": "completed",
-                    "current_node": None
-                })
-                update_drawing(drawing_id, {"last_executed": datetime.now().isoformat()})
-        
-        thread = threading.Thread(target=run_workflow, daemon=True)
-        update_drawing_execution_state(drawing_id, {"thread": thread})
-        thread.start()
-        
-        return {"message": f"Drawing {drawing_id} execution started"}
+        return drawing
+
+    def _run_drawing(self, drawing_id: str, nodes: List[Dict], loop: bool, speed: float, turbo: bool):
+        """Body of a thread-runtime run; executes on a pool worker"""
+        try:
+            execution_state = get_drawing_execution_state(drawing_id)
+            if execution_state and execution_state["should_stop"]:
+                # Stopped while still waiting for a worker
+                return
+            update_drawing_execution_state(drawing_id, {"status": "running"})
+            self.execute_drawing_nodes(drawing_id, nodes, loop, speed, turbo)
+        except Exception as e:
+            update_drawing_execution_state(drawing_id, {
+                "status": "error",
+                "error": str(e)
+            })
+        finally:
+            self._finish_drawing_run(drawing_id)
+
+    def _finish_drawing_run(self, drawing_id: str):
+        """Mark a run finished and append it to the run history"""
+        self.prefetch.cancel(drawing_id)
+        execution_state = get_drawing_execution_state(drawing_id) or {}
+        outcome = run_outcome(execution_state)
+        RUNS.inc("drawing", outcome)
+        update_drawing_execution_state(drawing_id, {
+            "is_running": False,
+            "status": "completed",
+            "current_node": None
+        })
+
+        # Deleted while running: nothing to record it against
+        drawing = get_drawing(drawing_id)
+        if not drawing:
+            return
+        finished = datetime.now()
+        started_at = execution_state.get("started_at")
+        try:
+            record_run({
+                "drawing_id": drawing_id,
+                "project_id": drawing.get("project_id"),
+                "started_at": started_at,
+                "finished_at": finished.isoformat(),
+                "outcome": outcome,
+                "node_count": len(drawing.get("nodes", [])),
+                "duration": round((finished - datetime.fromisoformat(started_at)).total_seconds(), 3)
+                            if started_at else None,
+                "error": execution_state.get("error")
+            })
+        except Exception as e:
+            log.error("run history write failed", drawing=drawing_id, error=str(e))
+
+    def get_drawing_runs(self, drawing_id: str, limit: int = 50, outcome: Optional[str] = None,
+                         since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recorded runs of a drawing, most recent first"""
+        drawing = get_drawing(drawing_id)
+        if not drawing:
+            raise ValueError(f"Drawing {drawing_id} not found")
+        return list_runs(drawing.get("project_id"), drawing_id, limit, outcome, since)
+
+    def get_last_executed(self, drawing_id: str) -> Optional[str]:
+        """When a drawing last finished a run, from the run history"""
+        runs = list_runs(drawing_id=drawing_id, limit=1)
+        return runs[0].get("finished_at") if runs else None
 
     def stop_drawing_execution(self, drawing_id: str) -> Dict[str, str]:
         """Stop executing a drawing"""
@@ -133,6 +267,7 @@ class DrawingService:
             "should_stop": True,
             "status": "stopping"
         })
+        cancel_async_run(drawing_id)
         return {"message": f"Stopping drawing {drawing_id} execution"}
 
     def get_drawing_status(self, drawing_id: str) -> Dict[str, Any]:
@@ -156,6 +291,12 @@ class DrawingService:
         
         if "error" in execution_state:
             status["error"] = execution_state["error"]
+
+        if execution_state.get("timing"):
+            status["timing"] = execution_state["timing"]
+
+        if execution_state.get("branch_results"):
+            status["branch_results"] = execution_state["branch_results"]
         
         return status
 
@@ -177,6 +318,27 @@ class DrawingService:
         
         return statuses
 
+    def get_status_version(self) -> int:
+        """Current execution-state version, for clients that long-poll status changes"""
+        return get_state_version()
+
+    def get_drawing_statuses_since(self, since: int, wait: float = 0) -> Dict[str, Any]:
+        """Statuses of the drawings that changed after version ``since``, waiting up to ``wait`` seconds for one"""
+        if since < 0:
+            raise ValueError("since must be a non-negative version")
+        if wait < 0:
+            raise ValueError("wait must be a non-negative number of seconds")
+
+        version, changed, removed = wait_for_state_changes(since, min(wait, MAX_STATUS_WAIT))
+        statuses = []
+        for drawing_id in changed:
+            try:
+                statuses.append(self.get_drawing_status(drawing_id))
+            except ValueError:
+                # Deleted between the version check and now
+                removed.append(drawing_id)
+        return {"version": version, "statuses": statuses, "removed": removed}
+
     def is_coordinate_in_boundary(self, drawing_id: str, x: int, y: int) -> bool:
         """Check if coordinates are within the drawing's boundary"""
         boundary = get_drawing_boundary(drawing_id)
@@ -186,77 +348,76 @@ class DrawingService:
         return (boundary["x"] <= x <= boundary["x"] + boundary["width"] and
                 boundary["y"] <= y <= boundary["y"] + boundary["height"])
 
-    def execute_drawing_nodes(self, drawing_id: str, nodes: List[Dict], loop: bool = False, speed: float = 1.0):
+    def execute_drawing_nodes(self, drawing_id: str, nodes: List[Dict], loop: bool = False, speed: float = 1.0, turbo: bool = False):
         """Execute nodes for a specific drawing"""
         if not nodes:
             return
+
+        timing = TimingPolicy(speed, turbo)
         
-        print(f"DEBUG: Executing drawing {drawing_id} with {len(nodes)} nodes")
-        
-        # Find start nodes (nodes without incoming connections)
-        all_connections = set()
-        for node in nodes:
-            all_connections.update(node.get("connections", []))
-        
-        start_nodes = [node for node in nodes if node["id"] not in all_connections]
+        log.debug(drawing_id, "execute drawing", nodes=len(nodes), loop=loop)
         
-        if not start_nodes:
-            start_nodes = [nodes[0]]
+        graph = DrawingGraph(nodes)
+        start_nodes = graph.start_nodes
         
         total_nodes = len(nodes)
         executed_count = 0
         
-        def execute_node_recursive(node_id: str, visited: set):
+        progress_lock = threading.Lock()
+        
+        def execute_node_recursive(node_id: str, visited: set, branch: Optional[ForkBranch] = None):
             nonlocal executed_count
             
             execution_state = get_drawing_execution_state(drawing_id)
             if not execution_state or execution_state["should_stop"] or node_id in visited:
                 return
+            if branch and branch.stops_at(node_id):
+                return
             
             visited.add(node_id)
             
-            node = next((n for n in nodes if n["id"] == node_id), None)
+            node = graph.get(node_id)
             if not node:
                 return
             
             update_drawing_execution_state(drawing_id, {
                 "current_node": node_id,
-                "progress": int((executed_count / total_nodes) * 100)
+                "progress": int((executed_count / total_nodes) * 100),
+                "timing": timing.stats()
             })
             
-            self.execute_drawing_action(drawing_id, node)
-            executed_count += 1
+            if node["action_type"] in PREFETCH_TRIGGERS:
+                self.prefetch_after(drawing_id, graph, node, timing)
+            self.execute_drawing_action(drawing_id, node, timing)
+            with progress_lock:
+                executed_count += 1
+            if branch:
+                branch.record(node)
             
-            if speed < 1.0:
-                time.sleep((1.0 - speed) * 2)
+            if node["action_type"] == "fork":
+                join_id = self._execute_fork(drawing_id, graph, node, visited, branch, execute_node_recursive)
+                if join_id:
+                    execute_node_recursive(join_id, visited.copy(), branch)
+                return
             
-            # Handle conditional nodes
-            if node["action_type"] == "if":
-                condition_result = node.get('_condition_result', False)
-                connections = node.get("connections", [])
-                if connections:
-                    if condition_result:
-                        target_id = connections[0]
-                        execution_state = get_drawing_execution_state(drawing_id)
-                        if execution_state and not execution_state["should_stop"]:
-                            execute_node_recursive(target_id, visited.copy())
-                    else:
-                        if len(connections) > 1:
-                            target_id = connections[1]
-                            execution_state = get_drawing_execution_state(drawing_id)
-                            if execution_state and not execution_state["should_stop"]:
-                                execute_node_recursive(target_id, visited.copy())
-            else:
-                for next_node_id in node.get("connections", []):
-                    execution_state = get_drawing_execution_state(drawing_id)
-                    if execution_state and not execution_state["should_stop"]:
-                        execute_node_recursive(next_node_id, visited.copy())
+            # IF nodes follow only the branch selected by their condition result
+            for next_node_id in graph.next_ids(node, node.get('_condition_result', False)):
+                execution_state = get_drawing_execution_state(drawing_id)
+                if execution_state and not execution_state["should_stop"]:
+                    execute_node_recursive(next_node_id, visited.copy(), branch)
+        
+        trace = get_trace(drawing_id)
+        iteration = 0
         
         # Main execution loop
         while True:
             execution_state = get_drawing_execution_state(drawing_id)
             if not execution_state or execution_state["should_stop"]:
                 break
+            
+            iteration += 1
+            if trace is not None:
+                trace.iteration(iteration)
                 
             for start_node in start_nodes:
                 execution_state = get_drawing_execution_state(drawing_id)
@@ -273,50 +434,141 @@ class DrawingService:
             if not execution_state or execution_state["should_stop"]:
                 break
             
-            time.sleep(0.5)
+            timing.sleep(LOOP_DELAY)
+
+        update_drawing_execution_state(drawing_id, {"timing": timing.stats()})
+
+    def prefetch_after(self, drawing_id: str, graph: DrawingGraph, node: Dict[str, Any], timing: TimingPolicy):
+        """Start speculative matches for the image nodes that follow a slow node"""
+        params = node.get("params", {})
+        if node["action_type"] == "wait":
+            expected = max(timing.for_node(node).scaled(WAIT_FLOOR), params.get("duration", 1.0))
+        else:
+            expected = params.get("duration", 0.2)
 
-    def execute_drawing_action(self, drawing_id: str, node: Dict[str, Any]):
+        boundary = get_drawing_boundary(drawing_id)
+        region_bbox = (boundary["x"], boundary["y"], boundary["width"], boundary["height"]) if boundary else None
+        self.prefetch.schedule(drawing_id, graph, node, expected, region_bbox)
+
+    def _find_image(self, drawing_id: str, node: Dict[str, Any], image_path: str, region_bbox) -> Optional[Dict[str, Any]]:
+        """Use a fresh prefetched match when available, otherwise capture and match now"""
+        result = self.prefetch.take(drawing_id, node['id'], image_path, region_bbox)
+        if result is not None:
+            log.debug(drawing_id, "prefetch hit", node=node['id'], image=image_path)
+            return result
+        return self._recognizer().find_image_in_region(image_path, region_bbox)
+
+    def _recognizer(self) -> ImageRecognition:
+        """The pool worker's warm recognizer, or the service's own off-pool"""
+        resources = current_worker_resources()
+        return resources.image_recognition if resources else self.image_recognition
+
+    def _screen_size(self):
+        resources = current_worker_resources()
+        return resources.screen_size() if resources else pyautogui.size()
+
+    def _execute_fork(self, drawing_id: str, graph: DrawingGraph, fork_node: Dict[str, Any], visited: set,
+                      parent: Optional[ForkBranch], execute_branch) -> Optional[str]:
+        """Run a fork's branches concurrently up to their join; returns the join id to continue from"""
+        join_id = graph.find_join(fork_node)
+        join_node = graph.get(join_id) if join_id else None
+        mode = graph.join_mode(join_node)
+        branches = [ForkBranch(head_id, join_id, parent) for head_id in fork_node.get("connections", [])]
+        if not branches:
+            return join_id
+
+        def run_branch(branch: ForkBranch):
+            try:
+                execute_branch(branch.head_id, visited.copy(), branch)
+                branch.finish()
+            except Exception as e:
+                branch.finish(str(e))
+            return branch
+
+        log.debug(drawing_id, "fork", node=fork_node['id'], branches=len(branches), join=join_id, mode=mode)
+
+        executor = ThreadPoolExecutor(max_workers=len(branches), thread_name_prefix=f"fork-{fork_node['id']}")
+        futures = [executor.submit(run_branch, branch) for branch in branches]
+        if mode == "any":
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            next(iter(done)).result().winner = True
+            # Losing branches stop at their next node boundary; don't wait for them
+            for branch in branches:
+                if not branch.winner:
+                    branch.cancel()
+            executor.shutdown(wait=False)
+        else:
+            executor.shutdown(wait=True)
+
+        results = [branch.result() for branch in branches]
+        result_key = join_id or fork_node["id"]
+        if join_node is not None:
+            join_node["_branch_results"] = results
+        update_drawing_execution_state(drawing_id, {"branch_results": {result_key: results}}, merge=("branch_results",))
+        return join_id
+
+    def execute_drawing_action(self, drawing_id: str, node: Dict[str, Any], timing: Optional[TimingPolicy] = None):
         """Execute a single action for a drawing"""
         action_type = node["action_type"]
         params = node["params"]
+        timing = (timing or TimingPolicy()).for_node(node)
+        timing.count_action()
         
-        print(f"DEBUG: Drawing {drawing_id} - Executing node {node['id']} - action_type: {action_type}")
+        log.debug(drawing_id, "execute node", node=node['id'], action=action_type)
+        trace = get_trace(drawing_id)
+        if trace is not None:
+            trace.node_enter(node['id'], action_type)
+        started = time.perf_counter()
         
         try:
-            if action_type == "click":
-                self._execute_bounded_click(drawing_id, node, params)
-            elif action_type == "move":
-                self._execute_bounded_move(drawing_id, node, params)
-            elif action_type == "keyboard":
-                self._execute_keyboard(params)
-            elif action_type == "wait":
-                self._execute_wait(params)
-            elif action_type in ["findimg", "followimg", "clickimg"]:
-                self._execute_bounded_image_action(drawing_id, action_type, params)
-            elif action_type == "mousedown":
-                self._execute_bounded_mouse_down(drawing_id, node, params)
-            elif action_type == "mouseup":
-                self._execute_bounded_mouse_up(drawing_id, node, params)
-            elif action_type == "mousescroll":
-                self._execute_bounded_mouse_scroll(drawing_id, node, params)
-            elif action_type == "if":
-                self._execute_if_condition(drawing_id, node, params)
+            with input_lock if action_type in INPUT_ACTIONS else nullcontext():
+                if action_type == "click":
+                    self._execute_bounded_click(drawing_id, node, params, timing)
+                elif action_type == "move":
+                    self._execute_bounded_move(drawing_id, node, params, timing)
+                elif action_type == "keyboard":
+                    self._execute_keyboard(params, timing)
+                    self._trace_input(drawing_id, node, "keyboard")
+                elif action_type == "wait":
+                    self._execute_wait(params, timing)
+                elif action_type in ["findimg", "followimg", "clickimg"]:
+                    node['_found'] = self._execute_bounded_image_action(drawing_id, node, params, timing)
+                elif action_type == "mousedown":
+                    self._execute_bounded_mouse_down(drawing_id, node, params, timing)
+                elif action_type == "mouseup":
+                    self._execute_bounded_mouse_up(drawing_id, node, params, timing)
+                elif action_type == "mousescroll":
+                    self._execute_bounded_mouse_scroll(drawing_id, node, params, timing)
+                elif action_type == "if":
+                    self._execute_if_condition(drawing_id, node, params)
                 
         except pyautogui.FailSafeException:
-            print(f"PyAutoGUI failsafe triggered for drawing {drawing_id}")
+            FAILSAFE.inc()
+            log.warning("failsafe triggered", drawing=drawing_id, action=action_type)
             update_drawing_execution_state(drawing_id, {
                 "should_stop": True,
                 "status": "error",
                 "error": "安全机制触发：鼠标移动到了屏幕角落。请将鼠标移开后重试。"
             })
         except Exception as e:
-            print(f"Error executing action {action_type} for drawing {drawing_id}: {e}")
+            log.error("action failed", drawing=drawing_id, node=node['id'], action=action_type, error=str(e))
             update_drawing_execution_state(drawing_id, {
                 "status": "error", 
                 "error": f"执行 {action_type} 动作时出错: {str(e)}"
             })
-
-    def _execute_bounded_click(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any]):
+        finally:
+            elapsed = time.perf_counter() - started
+            NODE_SECONDS.observe(elapsed, action_type)
+            if trace is not None:
+                trace.node_exit(node['id'], action_type, elapsed)
+
+    def _trace_input(self, drawing_id: str, node: Dict[str, Any], kind: str, x: int = 0, y: int = 0):
+        """Record an input event in the run's trace"""
+        trace = get_trace(drawing_id)
+        if trace is not None:
+            trace.input(node['id'], kind, x, y)
+
+    def _execute_bounded_click(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """Execute click action with boundary check"""
         position_mode = params.get("position_mode", "absolute")
         x_random = params.get("x_random", 0.0)
@@ -336,13 +588,13 @@ class DrawingService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(final_y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - Click node {node['id']} using current position ({current_x}, {current_y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "click position", node=node['id'], mode="current", x=final_x, y=final_y)
         else:
             # 使用绝对坐标
             x, y = params.get("x", 0), params.get("y", 0)
 
             if x == 0 and y == 0:
-                print(f"WARNING: Drawing {drawing_id} - Click node {node['id']} has coordinates (0,0). Skipping...")
+                log.warning("click at (0,0) skipped", drawing=drawing_id, node=node['id'])
                 return
 
             final_x, final_y = x, y
@@ -355,55 +607,58 @@ class DrawingService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - Click node {node['id']} using absolute position ({x}, {y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "click position", node=node['id'], mode="absolute", x=final_x, y=final_y)
 
         # Check boundary (对两种模式都进行边界检查)
         if not self.is_coordinate_in_boundary(drawing_id, final_x, final_y):
-            print(f"Drawing {drawing_id} - Click coordinates ({final_x}, {final_y}) outside boundary. Skipping...")
+            log.warning("click outside boundary skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
             return
 
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
             if position_mode == "current":
                 # current模式：直接在当前位置点击，如果有随机偏移则移动到偏移位置
                 if x_random > 0 or y_random > 0:
-                    pyautogui.moveTo(final_x, final_y, duration=0.1)
-                    time.sleep(0.1)
+                    self._move_and_settle(final_x, final_y, timing)
                 # else: 不移动鼠标，直接在当前位置点击
             else:
                 # absolute模式：移动到目标位置
-                pyautogui.moveTo(final_x, final_y, duration=0.1)
-                time.sleep(0.1)
+                self._move_and_settle(final_x, final_y, timing)
 
             pyautogui.click()
-            print(f"DEBUG: Drawing {drawing_id} - Successfully clicked at ({final_x}, {final_y})")
+            timing.pause()
+            log.debug(drawing_id, "clicked", node=node['id'], x=final_x, y=final_y)
+            self._trace_input(drawing_id, node, "click", final_x, final_y)
         else:
-            print(f"Drawing {drawing_id} - Click coordinates ({final_x}, {final_y}) outside screen bounds")
+            log.warning("click outside screen skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
 
-    def _execute_bounded_move(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_bounded_move(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """Execute move action with boundary check"""
         x, y = params.get("x", 0), params.get("y", 0)
         
         if x == 0 and y == 0:
-            print(f"WARNING: Drawing {drawing_id} - Move node {node['id']} has coordinates (0,0). Skipping...")
+            log.warning("move to (0,0) skipped", drawing=drawing_id, node=node['id'])
             return
         
         # Check boundary
         if not self.is_coordinate_in_boundary(drawing_id, x, y):
-            print(f"Drawing {drawing_id} - Move coordinates ({x}, {y}) outside boundary. Skipping...")
+            log.warning("move outside boundary skipped", drawing=drawing_id, node=node['id'], x=x, y=y)
             return
         
         duration = params.get("duration", 0.2)
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         
         if 0 <= x <= screen_width and 0 <= y <= screen_height:
             pyautogui.moveTo(x, y, duration=duration)
-            print(f"DEBUG: Drawing {drawing_id} - Successfully moved to ({x}, {y})")
+            timing.pause()
+            log.debug(drawing_id, "moved", node=node['id'], x=x, y=y)
+            self._trace_input(drawing_id, node, "move", x, y)
         else:
-            print(f"Drawing {drawing_id} - Move coordinates ({x}, {y}) outside screen bounds")
+            log.warning("move outside screen skipped", drawing=drawing_id, node=node['id'], x=x, y=y)
 
-    def _execute_bounded_image_action(self, drawing_id: str, action_type: str, params: Dict[str, Any]):
-        """Execute image action with boundary check - now searches only within boundary region"""
+    def _execute_bounded_image_action(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy) -> bool:
+        """Execute image action with boundary check - now searches only within boundary region; returns whether the image was found"""
+        action_type = node["action_type"]
         image_path = params.get("image_path", "")
         if os.path.exists(image_path):
             # Get drawing boundary for region search
@@ -411,20 +666,21 @@ class DrawingService:
             region_bbox = None
             if boundary:
                 region_bbox = (boundary["x"], boundary["y"], boundary["width"], boundary["height"])
-                print(f"DEBUG: Drawing {drawing_id} - Searching for image within boundary: {region_bbox}")
+                log.debug(drawing_id, "image search", image=image_path, region=region_bbox)
             else:
-                print(f"DEBUG: Drawing {drawing_id} - No boundary set, searching full screen")
+                log.debug(drawing_id, "image search", image=image_path, region="screen")
             
             # Use region-based search
-            result = self.image_recognition.find_image_in_region(image_path, region_bbox)
+            result = self._find_image(drawing_id, node, image_path, region_bbox)
+            self._trace_match(drawing_id, node, result)
             if result and result.get('found'):
                 x, y = result['position'][0], result['position'][1]
-                print(f"DEBUG: Drawing {drawing_id} - Found image at ({x}, {y}) with confidence {result['confidence']:.2f}")
+                log.debug(drawing_id, "image found", image=image_path, x=x, y=y, confidence=round(result['confidence'], 2))
                 
                 # Double-check boundary (should already be within boundary due to region search)
                 if boundary and not self.is_coordinate_in_boundary(drawing_id, x, y):
-                    print(f"WARNING: Drawing {drawing_id} - Found image at ({x}, {y}) outside boundary after region search. This shouldn't happen!")
-                    return
+                    log.warning("image found outside boundary", drawing=drawing_id, image=image_path, x=x, y=y)
+                    return False
                 
                 if action_type == "clickimg":
                     x_random = params.get("x_random", 0.0)
@@ -442,33 +698,59 @@ class DrawingService:
                     
                     x, y = final_x, final_y
                 
-                screen_width, screen_height = pyautogui.size()
+                screen_width, screen_height = self._screen_size()
                 if 0 <= x <= screen_width and 0 <= y <= screen_height:
-                    if action_type == "followimg":
-                        pyautogui.moveTo(x, y, duration=0.2)
-                    elif action_type == "clickimg":
-                        pyautogui.moveTo(x, y, duration=0.1)
-                        time.sleep(0.1)
-                        pyautogui.click()
-                        print(f"DEBUG: Drawing {drawing_id} - Successfully clicked image at ({x}, {y})")
+                    # Matching above runs unlocked; only the input part is serialized
+                    with input_lock:
+                        if action_type == "followimg":
+                            pyautogui.moveTo(x, y, duration=timing.duration(FOLLOW_DURATION))
+                            timing.pause()
+                            self._trace_input(drawing_id, node, "move", x, y)
+                        elif action_type == "clickimg":
+                            self._move_and_settle(x, y, timing)
+                            pyautogui.click()
+                            timing.pause()
+                            log.debug(drawing_id, "clicked image", image=image_path, x=x, y=y)
+                            self._trace_input(drawing_id, node, "click", x, y)
                 else:
-                    print(f"Drawing {drawing_id} - Found image at ({x}, {y}) outside screen bounds")
+                    log.warning("image outside screen skipped", drawing=drawing_id, image=image_path, x=x, y=y)
+                return True
             else:
-                print(f"Drawing {drawing_id} - Image not found: {image_path}")
+                log.debug(drawing_id, "image not found", image=image_path)
+        else:
+            log.warning("image file missing", drawing=drawing_id, image=image_path)
+        return False
+
+    def _trace_match(self, drawing_id: str, node: Dict[str, Any], result: Optional[Dict[str, Any]]):
+        """Record a template match result in the run's trace"""
+        trace = get_trace(drawing_id)
+        if trace is None:
+            return
+        if result and result.get('found'):
+            x, y = result['position'][0], result['position'][1]
+            trace.match(node['id'], True, result.get('confidence', 0.0), x, y)
         else:
-            print(f"Drawing {drawing_id} - Image file does not exist: {image_path}")
+            trace.match(node['id'], False, (result or {}).get('confidence', 0.0))
 
-    def _execute_keyboard(self, params: Dict[str, Any]):
+    def _execute_keyboard(self, params: Dict[str, Any], timing: TimingPolicy):
         """Execute keyboard action"""
         if "key" in params and params["key"]:
             pyautogui.press(params["key"])
+            timing.pause()
         elif "text" in params and params["text"]:
             pyautogui.write(params["text"])
+            timing.pause()
 
-    def _execute_wait(self, params: Dict[str, Any]):
+    def _execute_wait(self, params: Dict[str, Any], timing: TimingPolicy):
         """Execute wait action"""
         duration = params.get("duration", 1.0)
-        time.sleep(max(0.1, duration))
+        time.sleep(max(timing.scaled(WAIT_FLOOR), duration))
+
+    def _move_and_settle(self, x: int, y: int, timing: TimingPolicy):
+        """Move the cursor to (x, y) and let it settle before a button event"""
+        pyautogui.moveTo(x, y, duration=timing.duration(MOVE_DURATION))
+        timing.pause()
+        timing.sleep(SETTLE_DELAY)
 
     def _execute_if_condition(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any]):
         """Execute if condition - now uses boundary region for image detection"""
@@ -482,18 +764,19 @@ class DrawingService:
                 region_bbox = None
                 if boundary:
                     region_bbox = (boundary["x"], boundary["y"], boundary["width"], boundary["height"])
-                    print(f"DEBUG: Drawing {drawing_id} - Checking image condition within boundary: {region_bbox}")
+                    log.debug(drawing_id, "if image search", node=node['id'], image=image_path, region=region_bbox)
                 else:
-                    print(f"DEBUG: Drawing {drawing_id} - Checking image condition on full screen")
+                    log.debug(drawing_id, "if image search", node=node['id'], image=image_path, region="screen")
                 
                 # Use region-based search for condition
-                result = self.image_recognition.find_image_in_region(image_path, region_bbox)
+                result = self._find_image(drawing_id, node, image_path, region_bbox)
+                self._trace_match(drawing_id, node, result)
                 condition_result = result is not None and result.get('found', False)
                 
                 if condition_result:
-                    print(f"DEBUG: Drawing {drawing_id} - Image condition TRUE: found image with confidence {result['confidence']:.2f}")
+                    log.debug(drawing_id, "if condition", node=node['id'], result=True, confidence=round(result['confidence'], 2))
                 else:
-                    print(f"DEBUG: Drawing {drawing_id} - Image condition FALSE: image not found")
+                    log.debug(drawing_id, "if condition", node=node['id'], result=False)
             else:
                 condition_result = False
                 
@@ -501,12 +784,13 @@ class DrawingService:
             target_node_id = params.get("target_node_id", "")
             expected_result = params.get("expected_result", "true") == "true"
             condition_result = expected_result
+            self._trace_match(drawing_id, node, {"found": condition_result, "position": (0, 0)})
         else:
             condition_result = False
         
         node['_condition_result'] = condition_result
 
-    def _execute_bounded_mouse_down(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_bounded_mouse_down(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """Execute mouse down action with boundary check"""
         position_mode = params.get("position_mode", "absolute")
         button = params.get("button", "left")
@@ -527,13 +811,13 @@ class DrawingService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(final_y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - MouseDown node {node['id']} using current position ({current_x}, {current_y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "mousedown position", node=node['id'], mode="current", x=final_x, y=final_y)
         else:
             # 使用绝对坐标
             x, y = params.get("x", 0), params.get("y", 0)
 
             if x == 0 and y == 0:
-                print(f"WARNING: Drawing {drawing_id} - MouseDown node {node['id']} has coordinates (0,0). Using current position instead...")
+                log.warning("mousedown at (0,0), using current position", drawing=drawing_id, node=node['id'])
                 current_x, current_y = pyautogui.position()
                 final_x, final_y = current_x, current_y
             else:
@@ -547,32 +831,32 @@ class DrawingService:
                     random_y_offset = random.uniform(-y_random, y_random)
                     final_y = int(y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - MouseDown node {node['id']} using absolute position ({x}, {y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "mousedown position", node=node['id'], mode="absolute", x=final_x, y=final_y)
 
         # Check boundary
         if not self.is_coordinate_in_boundary(drawing_id, final_x, final_y):
-            print(f"Drawing {drawing_id} - MouseDown coordinates ({final_x}, {final_y}) outside boundary. Skipping...")
+            log.warning("mousedown outside boundary skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
             return
 
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
             if position_mode == "current":
                 # current模式：如果有随机偏移则移动到偏移位置
                 if x_random > 0 or y_random > 0:
-                    pyautogui.moveTo(final_x, final_y, duration=0.1)
-                    time.sleep(0.1)
+                    self._move_and_settle(final_x, final_y, timing)
                 # else: 不移动鼠标，直接在当前位置按下
             else:
                 # absolute模式：移动到目标位置
-                pyautogui.moveTo(final_x, final_y, duration=0.1)
-                time.sleep(0.1)
+                self._move_and_settle(final_x, final_y, timing)
 
             pyautogui.mouseDown(button=button)
-            print(f"DEBUG: Drawing {drawing_id} - Successfully pressed {button} mouse button at ({final_x}, {final_y})")
+            timing.pause()
+            log.debug(drawing_id, "mouse pressed", node=node['id'], button=button, x=final_x, y=final_y)
+            self._trace_input(drawing_id, node, "mousedown", final_x, final_y)
         else:
-            print(f"Drawing {drawing_id} - MouseDown coordinates ({final_x}, {final_y}) outside screen bounds")
+            log.warning("mousedown outside screen skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
 
-    def _execute_bounded_mouse_up(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_bounded_mouse_up(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """Execute mouse up action with boundary check"""
         position_mode = params.get("position_mode", "absolute")
         button = params.get("button", "left")
@@ -593,7 +877,7 @@ class DrawingService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(final_y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - MouseUp node {node['id']} using current position ({current_x}, {current_y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "mouseup position", node=node['id'], mode="current", x=final_x, y=final_y)
         else:
             # 使用绝对坐标
             x, y = params.get("x", 0), params.get("y", 0)
@@ -607,32 +891,32 @@ class DrawingService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - MouseUp node {node['id']} using absolute position ({x}, {y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "mouseup position", node=node['id'], mode="absolute", x=final_x, y=final_y)
 
         # Check boundary
         if not self.is_coordinate_in_boundary(drawing_id, final_x, final_y):
-            print(f"Drawing {drawing_id} - MouseUp coordinates ({final_x}, {final_y}) outside boundary. Skipping...")
+            log.warning("mouseup outside boundary skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
             return
 
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
             if position_mode == "current":
                 # current模式：如果有随机偏移则移动到偏移位置
                 if x_random > 0 or y_random > 0:
-                    pyautogui.moveTo(final_x, final_y, duration=0.1)
-                    time.sleep(0.1)
+                    self._move_and_settle(final_x, final_y, timing)
                 # else: 不移动鼠标，直接在当前位置松开
             else:
                 # absolute模式：移动到目标位置
-                pyautogui.moveTo(final_x, final_y, duration=0.1)
-                time.sleep(0.1)
+                self._move_and_settle(final_x, final_y, timing)
 
             pyautogui.mouseUp(button=button)
-            print(f"DEBUG: Drawing {drawing_id} - Successfully released {button} mouse button at ({final_x}, {final_y})")
+            timing.pause()
+            log.debug(drawing_id, "mouse released", node=node['id'], button=button, x=final_x, y=final_y)
+            self._trace_input(drawing_id, node, "mouseup", final_x, final_y)
         else:
-            print(f"Drawing {drawing_id} - MouseUp coordinates ({final_x}, {final_y}) outside screen bounds")
+            log.warning("mouseup outside screen skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
 
-    def _execute_bounded_mouse_scroll(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_bounded_mouse_scroll(self, drawing_id: str, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """Execute mouse scroll action with boundary check"""
         position_mode = params.get("position_mode", "absolute")
         direction = params.get("direction", "up")
@@ -654,13 +938,13 @@ class DrawingService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(final_y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - MouseScroll node {node['id']} using current position ({current_x}, {current_y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "mousescroll position", node=node['id'], mode="current", x=final_x, y=final_y)
         else:
             # 使用绝对坐标
             x, y = params.get("x", 0), params.get("y", 0)
 
             if x == 0 and y == 0:
-                print(f"WARNING: Drawing {drawing_id} - MouseScroll node {node['id']} has coordinates (0,0). Using current position instead...")
+                log.warning("mousescroll at (0,0), using current position", drawing=drawing_id, node=node['id'])
                 current_x, current_y = pyautogui.position()
                 final_x, final_y = current_x, current_y
             else:
@@ -674,35 +958,36 @@ class DrawingService:
                     random_y_offset = random.uniform(-y_random, y_random)
                     final_y = int(y + random_y_offset)
 
-            print(f"DEBUG: Drawing {drawing_id} - MouseScroll node {node['id']} using absolute position ({x}, {y}) -> final: ({final_x}, {final_y})")
+            log.debug(drawing_id, "mousescroll position", node=node['id'], mode="absolute", x=final_x, y=final_y)
 
         # Check boundary
         if not self.is_coordinate_in_boundary(drawing_id, final_x, final_y):
-            print(f"Drawing {drawing_id} - MouseScroll coordinates ({final_x}, {final_y}) outside boundary. Skipping...")
+            log.warning("mousescroll outside boundary skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
             return
 
         # 确定滚轮方向
         scroll_amount = clicks if direction == "up" else -clicks
 
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
             if position_mode == "current":
                 # current模式：如果有随机偏移则移动到偏移位置
                 if x_random > 0 or y_random > 0:
-                    pyautogui.moveTo(final_x, final_y, duration=0.1)
-                    time.sleep(0.1)
+                    self._move_and_settle(final_x, final_y, timing)
                 # else: 不移动鼠标，直接在当前位置滚动
             else:
                 # absolute模式：移动到目标位置
-                pyautogui.moveTo(final_x, final_y, duration=0.1)
-                time.sleep(0.1)
+                self._move_and_settle(final_x, final_y, timing)
 
             pyautogui.scroll(scroll_amount)
-            print(f"DEBUG: Drawing {drawing_id} - Successfully scrolled {direction} {clicks} clicks at ({final_x}, {final_y})")
+            timing.pause()
+            log.debug(drawing_id, "scrolled", node=node['id'], direction=direction, clicks=clicks, x=final_x, y=final_y)
+            self._trace_input(drawing_id, node, "scroll", final_x, final_y)
         else:
-            print(f"Drawing {drawing_id} - MouseScroll coordinates ({final_x}, {final_y}) outside screen bounds")
+            log.warning("mousescroll outside screen skipped", drawing=drawing_id, node=node['id'], x=final_x, y=final_y)
 
-    def start_all_drawings_execution(self, loop: bool = False, speed: float = 1.0):
+    def start_all_drawings_execution(self, loop: bool = False, speed: float = 1.0, turbo: bool = False,
+                                     runtime: str = "thread"):
         """Start executing all drawings in the current project sequentially"""
         from core.state import get_current_project
         
@@ -727,27 +1012,25 @@ class DrawingService:
                 raise ValueError(f"Drawing '{drawing['name']}' is already running")
         
         # Start execution of all drawings in sequence
-        import threading
-        from core.state import get_drawing_execution_state, update_drawing_execution_state
+        import core.state as state
+        from core.state import get_drawing_execution_state
         
         def execute_all_drawings_thread():
-            print(f"DEBUG: Starting execution of all drawings - loop: {loop}, speed: {speed}")
+            log.info("execute all started", loop=loop, speed=speed, turbo=turbo, runtime=runtime)
+            timing = TimingPolicy(speed, turbo)
             
-            # Create a master execution state to track overall progress
-            master_state = {
-                "is_running": True,
-                "should_stop": False,
+            # The global state doubles as the master state, so stop_all_drawings_execution reaches this loop
+            master_state = state.all_drawings_execution_state
+            update_all_drawings_execution_state({
                 "status": "running",
-                "progress": 0,
-                "current_drawing": None,
                 "drawings_completed": 0,
                 "total_drawings": len(drawings_list)
-            }
+            })
             
             try:
                 while True:
                     if master_state["should_stop"]:
-                        print("DEBUG: All drawings execution stopped by user")
+                        log.info("execute all stopped by user")
                         break
                     
                     drawings_completed = 0
@@ -756,69 +1039,74 @@ class DrawingService:
                             break
                         
                         drawing_id = drawing["id"]
-                        master_state["current_drawing"] = drawing["name"]
-                        master_state["progress"] = int((i / len(drawings_list)) * 100)
+                        update_all_drawings_execution_state({
+                            "current_drawing": drawing["name"],
+                            "progress": int((i / len(drawings_list)) * 100)
+                        })
 
-                        print(f"DEBUG: Executing drawing {i+1}/{len(drawings_list)}: {drawing['name']}")
+                        log.debug(drawing_id, "execute all drawing", index=i + 1, total=len(drawings_list), name=drawing['name'])
 
                         # Execute this drawing
                         try:
-                            self.start_drawing_execution(drawing_id, loop=False, speed=speed)
-                            
-                            # Wait for this drawing to complete
-                            while True:
-                                if master_state["should_stop"]:
-                                    break
-                                
-                                execution_state = get_drawing_execution_state(drawing_id)
-                                if not execution_state or not execution_state["is_running"]:
-                                    break
+                            if runtime == "thread":
+                                # Already on a pool worker; run inline rather than waiting on a second worker
+                                started = self._begin_run(drawing_id, runtime)
+                                self._run_drawing(drawing_id, started["nodes"], False, speed, turbo)
+                            else:
+                                self.start_drawing_execution(drawing_id, loop=False, speed=speed, turbo=turbo, runtime=runtime)
                                 
-                                time.sleep(0.5)
+                                # Wait for this drawing to complete
+                                while True:
+                                    if master_state["should_stop"]:
+                                        break
+                                    
+                                    execution_state = get_drawing_execution_state(drawing_id)
+                                    if not execution_state or not execution_state["is_running"]:
+                                        break
+                                    
+                                    time.sleep(0.5)
                             
                             drawings_completed += 1
-                            print(f"DEBUG: Completed drawing: {drawing['name']}")
+                            log.debug(drawing_id, "execute all drawing completed", name=drawing['name'])
                             
                         except Exception as e:
-                            print(f"ERROR: Failed to execute drawing {drawing['name']}: {e}")
+                            log.error("execute all drawing failed", drawing=drawing_id, name=drawing['name'], error=str(e))
                             if not loop:  # If not looping, stop on error
                                 break
                     
-                    master_state["drawings_completed"] = drawings_completed
-                    master_state["progress"] = 100
+                    update_all_drawings_execution_state({"drawings_completed": drawings_completed, "progress": 100})
                     
                     if not loop or master_state["should_stop"]:
                         break
                     
-                    print("DEBUG: Restarting all drawings execution (loop mode)")
-                    time.sleep(1)
+                    log.debug(None, "execute all restarting loop")
+                    timing.sleep(EXECUTE_ALL_LOOP_DELAY)
                 
             except Exception as e:
-                print(f"ERROR: All drawings execution failed: {e}")
-                master_state["status"] = "error"
+                log.error("execute all failed", error=str(e))
+                update_all_drawings_execution_state({"status": "error"})
             finally:
-                master_state["is_running"] = False
-                master_state["status"] = "completed" if not master_state["should_stop"] else "stopped"
-                print(f"DEBUG: All drawings execution finished - Status: {master_state['status']}")
+                update_all_drawings_execution_state({
+                    "is_running": False,
+                    "status": "completed" if not master_state["should_stop"] else "stopped"
+                })
+                log.info("execute all finished", status=master_state['status'])
         
         # Store the master state globally for tracking
-        import core.state as state
-        if not hasattr(state, 'all_drawings_execution_state'):
-            state.all_drawings_execution_state = {}
-        
-        state.all_drawings_execution_state = {
+        state.all_drawings_execution_state = {}
+        update_all_drawings_execution_state({
             "is_running": True,
             "should_stop": False,
             "status": "starting",
             "progress": 0,
             "current_drawing": None,
             "thread": None
-        }
+        })
         
-        # Start the execution thread
-        thread = threading.Thread(target=execute_all_drawings_thread, daemon=True)
-        state.all_drawings_execution_state["thread"] = thread
-        thread.start()
+        # Run the sequence on the worker pool
+        update_all_drawings_execution_state({
+            "thread": get_worker_pool().submit(execute_all_drawings_thread, name="execute-all")
+        })
         
         return {"message": "Started executing all drawings", "total_drawings": len(drawings_list)}
 
@@ -834,8 +1122,7 @@ class DrawingService:
             raise ValueError("All drawings execution is not running")
         
         # Stop the master execution
-        execution_state["should_stop"] = True
-        execution_state["status"] = "stopping"
+        update_all_drawings_execution_state({"should_stop": True, "status": "stopping"})
         
         # Stop all individual drawings
         drawings = self.list_drawings()
@@ -844,14 +1131,13 @@ class DrawingService:
                 if drawing["execution_state"]["is_running"]:
                     self.stop_drawing_execution(drawing_id)
             except Exception as e:
-                print(f"DEBUG: Failed to stop drawing {drawing_id}: {e}")
+                log.warning("stop drawing failed", drawing=drawing_id, error=str(e))
         
         # Wait for thread to complete
         if execution_state.get("thread"):
             execution_state["thread"].join(timeout=2)
         
-        execution_state["is_running"] = False
-        execution_state["status"] = "stopped"
+        update_all_drawings_execution_state({"is_running": False, "status": "stopped"})
         
         return {"message": "Stopped all drawings execution"}
 
@@ -877,4 +1163,15 @@ class DrawingService:
             "current_drawing": execution_state.get("current_drawing"),
             "drawings_completed": execution_state.get("drawings_completed", 0),
             "total_drawings": execution_state.get("total_drawings", 0)
-        }
\ No newline at end of file
+        }
+
+_drawing_service: Optional[DrawingService] = None
+_drawing_service_lock = threading.Lock()
+
+def get_drawing_service() -> DrawingService:
+    """The process-wide drawing service, shared by the API and the job queue"""
+    global _drawing_service
+    with _drawing_service_lock:
+        if _drawing_service is None:
+            _drawing_service = DrawingService()
+        return _drawing_service
@@ -1,17 +1,22 @@
-import threading
 import time
 import random
 import pyautogui
 import os
 from typing import Dict, List, Any
 from core.state import execution_state, update_execution_state
+from core.timing import TimingPolicy, MOVE_DURATION, FOLLOW_DURATION, SETTLE_DELAY, WAIT_FLOOR, LOOP_DELAY
+from core.log import get_logger, WORKFLOW_SCOPE
+from core.metrics import NODE_SECONDS, RUNS, FAILSAFE, run_outcome
 from image_recognition import ImageRecognition
+from services.worker_pool import get_worker_pool, current_worker_resources
+
+log = get_logger(__name__)
 
 class ExecutionService:
     def __init__(self):
         self.image_recognition = ImageRecognition()
 
-    def start_workflow(self, nodes: List[Dict], loop: bool = False, speed: float = 1.0) -> Dict[str, str]:
+    def start_workflow(self, nodes: List[Dict], loop: bool = False, speed: float = 1.0, turbo: bool = False) -> Dict[str, str]:
         if execution_state["is_running"]:
             raise ValueError("Workflow already running")
         
@@ -19,29 +24,40 @@ class ExecutionService:
             "is_running": True,
             "should_stop": False,
             "status": "running",
-            "progress": 0
+            "progress": 0,
+            "error": None,
+            "timing": None
         })
         
         def run_workflow():
             try:
-                self.execute_nodes(nodes, loop, speed)
+                self.execute_nodes(nodes, loop, speed, turbo)
             except Exception as e:
                 update_execution_state({
                     "status": "error",
                     "error": str(e)
                 })
             finally:
+                RUNS.inc("workflow", run_outcome(execution_state))
                 update_execution_state({
                     "is_running": False,
                     "status": "completed",
                     "current_node": None
                 })
         
-        execution_state["thread"] = threading.Thread(target=run_workflow, daemon=True)
-        execution_state["thread"].start()
+        execution_state["thread"] = get_worker_pool().submit(run_workflow, name="workflow")
         
         return {"message": "Workflow execution started"}
 
+    def _recognizer(self) -> ImageRecognition:
+        """The pool worker's warm recognizer, or the service's own off-pool"""
+        resources = current_worker_resources()
+        return resources.image_recognition if resources else self.image_recognition
+
+    def _screen_size(self):
+        resources = current_worker_resources()
+        return resources.screen_size() if resources else pyautogui.size()
+
     def stop_workflow(self) -> Dict[str, str]:
         update_execution_state({
             "should_stop": True,
@@ -59,12 +75,17 @@ class ExecutionService:
         
         if "error" in execution_state:
             status["error"] = execution_state["error"]
+
+        if execution_state.get("timing"):
+            status["timing"] = execution_state["timing"]
         
         return status
 
-    def execute_nodes(self, nodes: List[Dict], loop: bool = False, speed: float = 1.0):
+    def execute_nodes(self, nodes: List[Dict], loop: bool = False, speed: float = 1.0, turbo: bool = False):
         if not nodes:
             return
+
+        timing = TimingPolicy(speed, turbo)
         
         all_connections = set()
         for node in nodes:
@@ -75,7 +96,7 @@ class ExecutionService:
         if not start_nodes:
             start_nodes = [nodes[0]]
 
-        print(f"🚀 开始执行工作流，共{len(nodes)}个节点，起始节点：{[node['id'] for node in start_nodes]}")
+        log.debug(WORKFLOW_SCOPE, "execute workflow", nodes=len(nodes), start_nodes=",".join(node['id'] for node in start_nodes))
         
         total_nodes = len(nodes)
         executed_count = 0
@@ -94,28 +115,26 @@ class ExecutionService:
             
             update_execution_state({
                 "current_node": node_id,
-                "progress": int((executed_count / total_nodes) * 100)
+                "progress": int((executed_count / total_nodes) * 100),
+                "timing": timing.stats()
             })
             
-            self.execute_action(node)
+            self.execute_action(node, timing)
             executed_count += 1
             
-            if speed < 1.0:
-                time.sleep((1.0 - speed) * 2)
-            
             if node["action_type"] == "if":
                 condition_result = node.get('_condition_result', False)
                 connections = node.get("connections", [])
                 if connections:
                     if condition_result:
                         target_id = connections[0]
-                        print(f"   🔀 条件为真，执行分支: {target_id}")
+                        log.debug(WORKFLOW_SCOPE, "if branch", node=node_id, result=True, target=target_id)
                         if not execution_state["should_stop"]:
                             execute_node_recursive(target_id, visited.copy())
                     else:
                         if len(connections) > 1:
                             target_id = connections[1]
-                            print(f"   🔀 条件为假，执行分支: {target_id}")
+                            log.debug(WORKFLOW_SCOPE, "if branch", node=node_id, result=False, target=target_id)
                             if not execution_state["should_stop"]:
                                 execute_node_recursive(target_id, visited.copy())
             else:
@@ -137,53 +156,61 @@ class ExecutionService:
             if not loop or execution_state["should_stop"]:
                 break
             
-            time.sleep(0.5)
+            timing.sleep(LOOP_DELAY)
 
-    def execute_action(self, node: Dict[str, Any]):
+        update_execution_state({"timing": timing.stats()})
+
+    def execute_action(self, node: Dict[str, Any], timing: TimingPolicy = None):
         action_type = node["action_type"]
         params = node["params"]
+        timing = (timing or TimingPolicy()).for_node(node)
+        timing.count_action()
         
-        print(f"📍 执行节点 {node['id']} ({action_type})")
+        log.debug(WORKFLOW_SCOPE, "execute node", node=node['id'], action=action_type)
+        started = time.perf_counter()
         
         try:
             if action_type == "click":
-                self._execute_click(node, params)
+                self._execute_click(node, params, timing)
             elif action_type == "move":
-                self._execute_move(node, params)
+                self._execute_move(node, params, timing)
             elif action_type == "keyboard":
-                self._execute_keyboard(params)
+                self._execute_keyboard(params, timing)
             elif action_type == "wait":
-                self._execute_wait(params)
+                self._execute_wait(params, timing)
             elif action_type == "mousedown":
-                self._execute_mouse_down(node, params)
+                self._execute_mouse_down(node, params, timing)
             elif action_type == "mouseup":
-                self._execute_mouse_up(node, params)
+                self._execute_mouse_up(node, params, timing)
             elif action_type == "mousescroll":
-                self._execute_mouse_scroll(node, params)
+                self._execute_mouse_scroll(node, params, timing)
             elif action_type in ["findimg", "followimg", "clickimg"]:
-                self._execute_image_action(action_type, params)
+                self._execute_image_action(action_type, params, timing)
             elif action_type == "if":
                 self._execute_if_condition(node, params)
             else:
-                print(f"WARNING: Unknown action type: {action_type}. Skipping node {node['id']}")
+                log.warning("unknown action type skipped", node=node['id'], action=action_type)
             
             pass
                 
         except pyautogui.FailSafeException:
-            print(f"PyAutoGUI failsafe triggered for action {action_type}. Move mouse away from screen corners.")
+            FAILSAFE.inc()
+            log.warning("failsafe triggered", action=action_type)
             update_execution_state({
                 "should_stop": True,
                 "status": "error",
                 "error": "安全机制触发：鼠标移动到了屏幕角落。请将鼠标移开后重试。"
             })
         except Exception as e:
-            print(f"Error executing action {action_type}: {e}")
+            log.error("action failed", node=node['id'], action=action_type, error=str(e))
             update_execution_state({
                 "status": "error", 
                 "error": f"执行 {action_type} 动作时出错: {str(e)}"
             })
+        finally:
+            NODE_SECONDS.observe(time.perf_counter() - started, action_type)
 
-    def _execute_click(self, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_click(self, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         position_mode = params.get("position_mode", "absolute")
 
         # 添加随机偏移
@@ -217,66 +244,40 @@ class ExecutionService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(final_y + random_y_offset)
         
-        print(f"🖱️  点击操作详情：")
-        print(f"   位置模式: {position_mode}")
-        if position_mode == "current":
-            print(f"   使用当前鼠标位置 (无视节点xy设置)")
-        else:
-            print(f"   绝对坐标: ({params.get('x', 0)}, {params.get('y', 0)})")
-        print(f"   随机偏移: X±{x_random}, Y±{y_random}")
-        print(f"   最终点击位置: ({final_x}, {final_y})")
+        log.debug(WORKFLOW_SCOPE, "click position", node=node['id'], mode=position_mode,
+                  x_random=x_random, y_random=y_random, x=final_x, y=final_y)
 
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
-            # 显示安全模式状态
-            print(f"   🛡️ PyAutoGUI安全模式: {pyautogui.FAILSAFE}")
+            if position_mode == "current":
+                # current模式：直接在当前位置点击，如果有随机偏移则移动到偏移位置
+                if x_random > 0 or y_random > 0:
+                    self._move_and_settle(final_x, final_y, timing)
+            else:
+                # absolute模式：移动到目标位置
+                self._move_and_settle(final_x, final_y, timing)
 
-            try:
-                if position_mode == "current":
-                    # current模式：直接在当前位置点击，如果有随机偏移则移动到偏移位置
-                    if x_random > 0 or y_random > 0:
-                        print(f"   🎯 应用随机偏移，移动到 ({final_x}, {final_y})")
-                        pyautogui.moveTo(final_x, final_y, duration=0.1)
-                        time.sleep(0.1)
-                    else:
-                        print(f"   📍 直接在当前位置点击")
-                else:
-                    # absolute模式：移动到目标位置
-                    print(f"   🎯 移动鼠标到 ({final_x}, {final_y})")
-                    pyautogui.moveTo(final_x, final_y, duration=0.1)
-                    time.sleep(0.1)
-
-                # 验证最终鼠标位置
-                actual_x, actual_y = pyautogui.position()
-                print(f"   📍 实际鼠标位置: ({actual_x}, {actual_y})")
-
-                print(f"   👆 执行点击操作")
-                pyautogui.click()
-                print(f"   ✅ 点击成功完成")
-
-            except pyautogui.FailSafeException:
-                print(f"   ⚠️ 安全机制触发：鼠标位于屏幕角落，点击被阻止")
-                raise
-            except Exception as e:
-                print(f"   ❌ 点击执行失败: {e}")
-                raise
+            pyautogui.click()
+            timing.pause()
+            log.debug(WORKFLOW_SCOPE, "clicked", node=node['id'], x=final_x, y=final_y)
         else:
-            print(f"   ❌ 点击坐标 ({final_x}, {final_y}) 超出屏幕范围 ({screen_width}x{screen_height})")
+            log.warning("click outside screen skipped", node=node['id'], x=final_x, y=final_y,
+                        screen=f"{screen_width}x{screen_height}")
 
-    def _execute_move(self, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_move(self, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         x, y = params.get("x", 0), params.get("y", 0)
         duration = params.get("duration", 0.2)
         duration_random = params.get("duration_random", 0.0)
         speed_factor = params.get("speed_factor", 1.0)
         speed_random = params.get("speed_random", 0.0)
         
-        print(f"🎯 移动操作：目标({x}, {y}), 时长{duration}s")
+        log.debug(WORKFLOW_SCOPE, "move", node=node['id'], x=x, y=y, duration=duration)
         
         try:
             x = int(float(x)) if x is not None else 0
             y = int(float(y)) if y is not None else 0
         except (ValueError, TypeError) as e:
-            print(f"   ❌ 坐标转换失败: {e}")
+            log.warning("move coordinates invalid", node=node['id'], error=str(e))
             return
         
         
@@ -295,14 +296,16 @@ class ExecutionService:
         final_duration = final_duration / final_speed_factor
         final_duration = max(0.05, final_duration)
         
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= x <= screen_width and 0 <= y <= screen_height:
             pyautogui.moveTo(x, y, duration=final_duration)
-            print(f"   ✅ 移动完成到 ({x}, {y})")
+            timing.pause()
+            log.debug(WORKFLOW_SCOPE, "moved", node=node['id'], x=x, y=y)
         else:
-            print(f"   ❌ 移动坐标 ({x}, {y}) 超出屏幕范围")
+            log.warning("move outside screen skipped", node=node['id'], x=x, y=y)
 
-    def _execute_keyboard(self, params: Dict[str, Any]):
+    def _execute_keyboard(self, params: Dict[str, Any], timing: TimingPolicy):
+        # Every key call pauses, as pyautogui.PAUSE used to, so held keys and combos keep their spacing
         input_type = params.get("input_type", "text")
         hold_duration = params.get("hold_duration", 0.1)
 
@@ -312,6 +315,7 @@ class ExecutionService:
                 text = params.get("text", "")
                 if text:
                     pyautogui.write(text)
+                    timing.pause()
 
             elif input_type == "key":
                 # 单个按键
@@ -320,10 +324,13 @@ class ExecutionService:
                     if hold_duration > 0.1:
                         # 按住指定时间
                         pyautogui.keyDown(key)
+                        timing.pause()
                         time.sleep(hold_duration)
                         pyautogui.keyUp(key)
+                        timing.pause()
                     else:
                         pyautogui.press(key)
+                        timing.pause()
 
             elif input_type == "special":
                 # 特殊按键
@@ -364,10 +371,13 @@ class ExecutionService:
                     mapped_key = key_mapping.get(special_key, special_key)
                     if hold_duration > 0.1:
                         pyautogui.keyDown(mapped_key)
+                        timing.pause()
                         time.sleep(hold_duration)
                         pyautogui.keyUp(mapped_key)
+                        timing.pause()
                     else:
                         pyautogui.press(mapped_key)
+                        timing.pause()
 
             elif input_type == "combo":
                 # 组合按键
@@ -394,23 +404,29 @@ class ExecutionService:
                             # 按住所有键
                             for k in all_keys:
                                 pyautogui.keyDown(k)
+                                timing.pause()
                             time.sleep(hold_duration)
                             # 释放所有键（逆序）
                             for k in reversed(all_keys):
                                 pyautogui.keyUp(k)
+                                timing.pause()
                         else:
                             pyautogui.hotkey(*all_keys)
+                            timing.pause()
                     else:
                         # 没有修饰键，就是单个按键
                         if hold_duration > 0.1:
                             pyautogui.keyDown(key)
+                            timing.pause()
                             time.sleep(hold_duration)
                             pyautogui.keyUp(key)
+                            timing.pause()
                         else:
                             pyautogui.press(key)
+                            timing.pause()
 
         except Exception as e:
-            print(f"键盘操作执行失败: {e}")
+            log.error("keyboard action failed", error=str(e))
             # 确保所有按键都被释放
             try:
                 pyautogui.keyUp('ctrl')
@@ -421,15 +437,21 @@ class ExecutionService:
             except:
                 pass
 
-    def _execute_wait(self, params: Dict[str, Any]):
+    def _execute_wait(self, params: Dict[str, Any], timing: TimingPolicy):
         duration = params.get("duration", 1.0)
-        print(f"⏱️ 等待 {duration}s")
-        time.sleep(max(0.1, duration))
+        log.debug(WORKFLOW_SCOPE, "wait", duration=duration)
+        time.sleep(max(timing.scaled(WAIT_FLOOR), duration))
 
-    def _execute_image_action(self, action_type: str, params: Dict[str, Any]):
+    def _move_and_settle(self, x: int, y: int, timing: TimingPolicy):
+        """Move the cursor to (x, y) and let it settle before a button event"""
+        pyautogui.moveTo(x, y, duration=timing.duration(MOVE_DURATION))
+        timing.pause()
+        timing.sleep(SETTLE_DELAY)
+
+    def _execute_image_action(self, action_type: str, params: Dict[str, Any], timing: TimingPolicy):
         image_path = params.get("image_path", "")
         if os.path.exists(image_path):
-            result = self.image_recognition.find_image_on_screen(image_path)
+            result = self._recognizer().find_image_on_screen(image_path)
             if result and result.get('found'):
                 x, y = result['position'][0], result['position'][1]
                 
@@ -447,24 +469,25 @@ class ExecutionService:
                         random_y_offset = random.uniform(-y_random, y_random)
                         final_y = int(y + random_y_offset)
                     
-                    print(f"DEBUG: ClickImg node - base_coords: ({x}, {y}), x_random: ±{x_random}, y_random: ±{y_random}, final_coords: ({final_x}, {final_y})")
+                    log.debug(WORKFLOW_SCOPE, "clickimg position", x=x, y=y, x_random=x_random, y_random=y_random, final_x=final_x, final_y=final_y)
                     x, y = final_x, final_y
                 
-                screen_width, screen_height = pyautogui.size()
+                screen_width, screen_height = self._screen_size()
                 if 0 <= x <= screen_width and 0 <= y <= screen_height:
                     if action_type == "followimg":
-                        pyautogui.moveTo(x, y, duration=0.2)
+                        pyautogui.moveTo(x, y, duration=timing.duration(FOLLOW_DURATION))
+                        timing.pause()
                     elif action_type == "clickimg":
-                        pyautogui.moveTo(x, y, duration=0.1)
-                        time.sleep(0.1)
+                        self._move_and_settle(x, y, timing)
                         pyautogui.click()
-                        print(f"DEBUG: Successfully clicked image at ({x}, {y})")
+                        timing.pause()
+                        log.debug(WORKFLOW_SCOPE, "clicked image", image=image_path, x=x, y=y)
                 else:
-                    print(f"Found image at ({x}, {y}) is outside screen bounds")
+                    log.warning("image outside screen skipped", image=image_path, x=x, y=y)
             else:
-                print(f"Image not found: {image_path}")
+                log.debug(WORKFLOW_SCOPE, "image not found", image=image_path)
         else:
-            print(f"Image file does not exist: {image_path}")
+            log.warning("image file missing", image=image_path)
 
     def _execute_if_condition(self, node: Dict[str, Any], params: Dict[str, Any]):
         condition_type = params.get("condition_type", "image_exists")
@@ -472,26 +495,26 @@ class ExecutionService:
         if condition_type == "image_exists":
             image_path = params.get("image_path", "")
             if os.path.exists(image_path):
-                result = self.image_recognition.find_image_on_screen(image_path)
+                result = self._recognizer().find_image_on_screen(image_path)
                 condition_result = result is not None and result.get('found', False)
-                print(f"DEBUG: IF node {node['id']} - image condition: {'TRUE' if condition_result else 'FALSE'}")
+                log.debug(WORKFLOW_SCOPE, "if condition", node=node['id'], condition="image_exists", result=condition_result)
             else:
                 condition_result = False
-                print(f"DEBUG: IF node {node['id']} - image file not found: {image_path}")
+                log.warning("if image file missing", node=node['id'], image=image_path)
                 
         elif condition_type == "node_result":
             target_node_id = params.get("target_node_id", "")
             expected_result = params.get("expected_result", "true") == "true"
             condition_result = expected_result
-            print(f"DEBUG: IF node {node['id']} - node result condition: {'TRUE' if condition_result else 'FALSE'}")
+            log.debug(WORKFLOW_SCOPE, "if condition", node=node['id'], condition="node_result", result=condition_result)
         
         else:
             condition_result = False
-            print(f"DEBUG: IF node {node['id']} - unknown condition type: {condition_type}")
+            log.warning("unknown condition type", node=node['id'], condition=condition_type)
         
         node['_condition_result'] = condition_result
 
-    def _execute_mouse_down(self, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_mouse_down(self, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """执行鼠标按下操作"""
         position_mode = params.get("position_mode", "absolute")
         button = params.get("button", "left")
@@ -519,7 +542,7 @@ class ExecutionService:
 
             # 检查是否为默认的(0,0)坐标，如果是则跳过移动
             if x == 0 and y == 0:
-                print(f"WARNING: MouseDown node {node['id']} has coordinates (0,0). Using current position instead...")
+                log.warning("mousedown at (0,0), using current position", node=node['id'])
                 current_x, current_y = pyautogui.position()
                 final_x, final_y = current_x, current_y
             else:
@@ -534,28 +557,21 @@ class ExecutionService:
                     random_y_offset = random.uniform(-y_random, y_random)
                     final_y = int(y + random_y_offset)
         
-        print(f"🖱️  鼠标按下操作详情：")
-        print(f"   位置模式: {position_mode}")
-        if position_mode == "current":
-            print(f"   使用当前鼠标位置 (无视节点xy设置)")
-        else:
-            print(f"   绝对坐标: ({params.get('x', 0)}, {params.get('y', 0)})")
-        print(f"   随机偏移: X±{x_random}, Y±{y_random}")
-        print(f"   最终按下位置: ({final_x}, {final_y})")
-        print(f"   鼠标按键: {button}")
+        log.debug(WORKFLOW_SCOPE, "mousedown position", node=node['id'], mode=position_mode,
+                  button=button, x=final_x, y=final_y)
         
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
             # 移动到目标位置
-            pyautogui.moveTo(final_x, final_y, duration=0.1)
-            time.sleep(0.1)
+            self._move_and_settle(final_x, final_y, timing)
             # 按下鼠标按钮
             pyautogui.mouseDown(button=button)
-            print(f"DEBUG: Successfully pressed {button} mouse button at ({final_x}, {final_y})")
+            timing.pause()
+            log.debug(WORKFLOW_SCOPE, "mouse pressed", node=node['id'], button=button, x=final_x, y=final_y)
         else:
-            print(f"MouseDown coordinates ({final_x}, {final_y}) are outside screen bounds")
+            log.warning("mousedown outside screen skipped", node=node['id'], x=final_x, y=final_y)
 
-    def _execute_mouse_up(self, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_mouse_up(self, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """执行鼠标松开操作"""
         position_mode = params.get("position_mode", "absolute")
         button = params.get("button", "left")
@@ -591,28 +607,21 @@ class ExecutionService:
                 random_y_offset = random.uniform(-y_random, y_random)
                 final_y = int(final_y + random_y_offset)
 
-        print(f"🖱️  鼠标松开操作详情：")
-        print(f"   位置模式: {position_mode}")
-        if position_mode == "current":
-            print(f"   使用当前鼠标位置 (无视节点xy设置)")
-        else:
-            print(f"   绝对坐标: ({params.get('x', 0)}, {params.get('y', 0)})")
-        print(f"   随机偏移: X±{x_random}, Y±{y_random}")
-        print(f"   最终松开位置: ({final_x}, {final_y})")
-        print(f"   鼠标按键: {button}")
+        log.debug(WORKFLOW_SCOPE, "mouseup position", node=node['id'], mode=position_mode,
+                  button=button, x=final_x, y=final_y)
         
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
             # 移动到目标位置
-            pyautogui.moveTo(final_x, final_y, duration=0.1)
-            time.sleep(0.1)
+            self._move_and_settle(final_x, final_y, timing)
             # 松开鼠标按钮
             pyautogui.mouseUp(button=button)
-            print(f"DEBUG: Successfully released {button} mouse button at ({final_x}, {final_y})")
+            timing.pause()
+            log.debug(WORKFLOW_SCOPE, "mouse released", node=node['id'], button=button, x=final_x, y=final_y)
         else:
-            print(f"MouseUp coordinates ({final_x}, {final_y}) are outside screen bounds")
+            log.warning("mouseup outside screen skipped", node=node['id'], x=final_x, y=final_y)
 
-    def _execute_mouse_scroll(self, node: Dict[str, Any], params: Dict[str, Any]):
+    def _execute_mouse_scroll(self, node: Dict[str, Any], params: Dict[str, Any], timing: TimingPolicy):
         """执行鼠标滚轮操作"""
         position_mode = params.get("position_mode", "absolute")
         direction = params.get("direction", "up")
@@ -641,7 +650,7 @@ class ExecutionService:
 
             # 检查是否为默认的(0,0)坐标，如果是则使用当前位置
             if x == 0 and y == 0:
-                print(f"WARNING: MouseScroll node {node['id']} has coordinates (0,0). Using current position instead...")
+                log.warning("mousescroll at (0,0), using current position", node=node['id'])
                 current_x, current_y = pyautogui.position()
                 final_x, final_y = current_x, current_y
             else:
@@ -659,23 +668,16 @@ class ExecutionService:
         # 确定滚轮方向
         scroll_amount = clicks if direction == "up" else -clicks
 
-        print(f"🖱️  鼠标滚轮操作详情：")
-        print(f"   位置模式: {position_mode}")
-        if position_mode == "current":
-            print(f"   使用当前鼠标位置 (无视节点xy设置)")
-        else:
-            print(f"   绝对坐标: ({params.get('x', 0)}, {params.get('y', 0)})")
-        print(f"   随机偏移: X±{x_random}, Y±{y_random}")
-        print(f"   最终滚轮位置: ({final_x}, {final_y})")
-        print(f"   滚轮方向: {direction}, 次数: {clicks}")
+        log.debug(WORKFLOW_SCOPE, "mousescroll position", node=node['id'], mode=position_mode,
+                  direction=direction, clicks=clicks, x=final_x, y=final_y)
         
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = self._screen_size()
         if 0 <= final_x <= screen_width and 0 <= final_y <= screen_height:
             # 移动到目标位置
-            pyautogui.moveTo(final_x, final_y, duration=0.1)
-            time.sleep(0.1)
+            self._move_and_settle(final_x, final_y, timing)
             # 滚动鼠标滚轮
             pyautogui.scroll(scroll_amount)
-            print(f"DEBUG: Successfully scrolled {direction} {clicks} clicks at ({final_x}, {final_y})")
+            timing.pause()
+            log.debug(WORKFLOW_SCOPE, "scrolled", node=node['id'], direction=direction, clicks=clicks, x=final_x, y=final_y)
         else:
-            print(f"MouseScroll coordinates ({final_x}, {final_y}) are outside screen bounds")
\ No newline at end of file
+            log.warning("mousescroll outside screen skipped", node=node['id'], x=final_x, y=final_y)
\ No newline at end of file
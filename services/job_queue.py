@@ -0,0 +1,404 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+from core.state import (
+    get_drawing, get_drawing_execution_state, get_project_metadata, list_project_drawings
+)
+from core.log import get_logger
+from core.storage import write_document, read_document
+from services.worker_pool import get_worker_pool
+
+log = get_logger(__name__)
+
+JOB_KINDS = ("drawing", "project")
+JOB_STATES = ("queued", "running", "completed", "failed", "cancelled")
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+MAX_CONCURRENT_JOBS = int(os.environ.get("COPILOTNODE_MAX_JOBS", "2"))
+
+# Finished jobs kept in the store for inspection
+HISTORY_LIMIT = 200
+
+# How often a job waiting on a drawing started outside the queue is re-checked
+BUSY_RECHECK = 1.0
+
+STORE_VERSION = 1
+
+class Job:
+    """A queued request to run a drawing or every drawing of a project"""
+
+    def __init__(self, job_id: str, kind: str, target: str, params: Dict[str, Any], priority: int, seq: int):
+        self.id = job_id
+        self.kind = kind
+        self.target = target
+        self.params = params
+        self.priority = priority
+        self.seq = seq
+        self.state = "queued"
+        self.error: Optional[str] = None
+        self.drawings: List[str] = []
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+
+    @property
+    def sort_key(self):
+        # Higher priority first, then first come first served
+        return (-self.priority, self.seq)
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        started = self.started_at or self.finished_at or now
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "target": self.target,
+            "params": dict(self.params),
+            "priority": self.priority,
+            "seq": self.seq,
+            "state": self.state,
+            "error": self.error,
+            "drawings": list(self.drawings),
+            "submitted_at": self._iso(self.submitted_at),
+            "started_at": self._iso(self.started_at),
+            "finished_at": self._iso(self.finished_at),
+            "wait_seconds": round(started - self.submitted_at, 3),
+            "run_seconds": round((self.finished_at or now) - self.started_at, 3) if self.started_at else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
+        job = cls(data["id"], data["kind"], data["target"], data.get("params", {}),
+                  int(data.get("priority", 0)), int(data.get("seq", 0)))
+        job.state = data.get("state", "queued")
+        job.error = data.get("error")
+        job.drawings = list(data.get("drawings", []))
+        job.submitted_at = cls._epoch(data.get("submitted_at")) or job.submitted_at
+        job.started_at = cls._epoch(data.get("started_at"))
+        job.finished_at = cls._epoch(data.get("finished_at"))
+        return job
+
+    @staticmethod
+    def _iso(value: Optional[float]) -> Optional[str]:
+        return datetime.fromtimestamp(value).isoformat() if value else None
+
+    @staticmethod
+    def _epoch(value: Optional[str]) -> Optional[float]:
+        return datetime.fromisoformat(value).timestamp() if value else None
+
+class DrawingJobRunner:
+    """Runs jobs through a DrawingService, on the calling pool worker"""
+
+    def __init__(self, drawing_service, runtimes=("thread", "async")):
+        self.drawing_service = drawing_service
+        self.runtimes = runtimes
+
+    def validate(self, job: Job):
+        if job.kind == "drawing" and not get_drawing(job.target):
+            raise ValueError(f"Drawing {job.target} not found")
+        if job.kind == "project" and not get_project_metadata(job.target):
+            raise ValueError(f"Project {job.target} not found")
+        runtime = job.params.get("runtime", "thread")
+        if runtime not in self.runtimes:
+            raise ValueError(f"Unknown runtime '{runtime}', expected one of {list(self.runtimes)}")
+
+    def drawings_for(self, job: Job) -> List[str]:
+        if job.kind == "drawing":
+            return [job.target]
+        drawings = sorted(list_project_drawings(job.target), key=lambda d: d.get("order", 0))
+        return [drawing["id"] for drawing in drawings]
+
+    def is_busy(self, drawing_id: str) -> bool:
+        execution_state = get_drawing_execution_state(drawing_id)
+        return bool(execution_state and execution_state.get("is_running"))
+
+    def run(self, job: Job, cancelled: Callable[[], bool]):
+        params = job.params
+        # A drawing job loops inside the drawing; a project job loops over the whole sequence
+        drawing_loop = params.get("loop", False) and job.kind == "drawing"
+        while True:
+            for drawing_id in job.drawings:
+                if cancelled():
+                    return
+                final_state = self.drawing_service.run_drawing_job(
+                    drawing_id, drawing_loop, params.get("speed", 1.0), params.get("turbo", False),
+                    params.get("runtime", "thread")
+                )
+                if final_state.get("error"):
+                    raise RuntimeError(f"Drawing {drawing_id} failed: {final_state['error']}")
+            if job.kind == "drawing" or not params.get("loop", False) or cancelled():
+                return
+
+    def stop(self, job: Job):
+        for drawing_id in job.drawings:
+            if self.is_busy(drawing_id):
+                self.drawing_service.stop_drawing_execution(drawing_id)
+
+class JobQueue:
+    """Priority job queue with a global concurrency limit and per-drawing exclusivity.
+
+    A job starts when a slot is free and none of its drawings is held by
+    another running job or running outside the queue. Jobs run on the worker
+    pool; the queue and recent history are persisted to a JSON store so
+    queued work survives a restart.
+    """
+
+    def __init__(self, runner, store_path: Optional[str] = None, max_concurrent: int = MAX_CONCURRENT_JOBS):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.runner = runner
+        self.store_path = store_path
+        self.max_concurrent = max_concurrent
+        self._cond = threading.Condition()
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List[tuple] = []
+        self._held: set = set()
+        self._running = 0
+        self._seq = itertools.count(1)
+        self._dispatcher: Optional[threading.Thread] = None
+
+        self._load()
+        if self._heap:
+            with self._cond:
+                self._ensure_dispatcher()
+
+    def submit(self, kind: str, target: str, params: Optional[Dict[str, Any]] = None, priority: int = 0) -> Dict[str, Any]:
+        """Queue a drawing or project run"""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}', expected one of {list(JOB_KINDS)}")
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            raise ValueError("priority must be an integer")
+
+        job = Job(uuid.uuid4().hex[:12], kind, target, dict(params or {}), priority, 0)
+        self.runner.validate(job)
+
+        with self._cond:
+            job.seq = next(self._seq)
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, (job.sort_key, job.id))
+            self._save()
+            self._ensure_dispatcher()
+            self._cond.notify_all()
+            log.info("job submitted", job=job.id, kind=kind, target=target, priority=priority)
+            return self._describe(job)
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued job, or stop a running one"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if not job:
+                raise ValueError(f"Job {job_id} not found")
+            if job.state in FINISHED_STATES:
+                raise ValueError(f"Job {job_id} already {job.state}")
+
+            job.cancel_requested = True
+            if job.state == "queued":
+                job.state = "cancelled"
+                job.finished_at = time.time()
+                self._save()
+                self._cond.notify_all()
+                log.info("job cancelled", job=job_id)
+                return self._describe(job)
+
+        # Running: the job finishes as cancelled once its drawing stops
+        self.runner.stop(job)
+        log.info("job stopping", job=job_id)
+        with self._cond:
+            return self._describe(job)
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if not job:
+                raise ValueError(f"Job {job_id} not found")
+            return self._describe(job)
+
+    def list_jobs(self, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Jobs in queue order: running, then queued by position, then finished newest first"""
+        if state is not None and state not in JOB_STATES:
+            raise ValueError(f"Unknown job state '{state}', expected one of {list(JOB_STATES)}")
+        with self._cond:
+            positions = self._positions()
+            jobs = [job for job in self._jobs.values() if state is None or job.state == state]
+            jobs.sort(key=lambda job: (
+                JOB_STATES.index(job.state) if job.state in ("running", "queued") else 2,
+                job.sort_key if job.state == "queued" else (0, -(job.finished_at or job.seq))
+            ))
+            return [self._describe(job, positions) for job in jobs]
+
+    def is_busy(self, kind: str, target: str) -> bool:
+        """True if the target has a queued or running job, or a drawing target is running outside the queue"""
+        with self._cond:
+            if any(job.kind == kind and job.target == target and job.state in ("queued", "running")
+                   for job in self._jobs.values()):
+                return True
+        return kind == "drawing" and self.runner.is_busy(target)
+
+    def set_max_concurrent(self, max_concurrent: int):
+        if not isinstance(max_concurrent, int) or isinstance(max_concurrent, bool) or max_concurrent < 1:
+            raise ValueError("max_concurrent must be a positive integer")
+        with self._cond:
+            self.max_concurrent = max_concurrent
+            self._save()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            counts = {state: 0 for state in JOB_STATES}
+            for job in self._jobs.values():
+                counts[job.state] += 1
+            return {
+                "max_concurrent": self.max_concurrent,
+                "running": self._running,
+                "held_drawings": sorted(self._held),
+                "counts": counts
+            }
+
+    def _describe(self, job: Job, positions: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        data = job.to_dict()
+        if job.state == "queued":
+            data["position"] = (positions or self._positions()).get(job.id)
+        return data
+
+    def _positions(self) -> Dict[str, int]:
+        queued = sorted((job for job in self._jobs.values() if job.state == "queued"), key=lambda job: job.sort_key)
+        return {job.id: index + 1 for index, job in enumerate(queued)}
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                started, blocked = self._take_ready()
+                if not started:
+                    # Jobs blocked by drawings started outside the queue have no event to wake on
+                    self._cond.wait(BUSY_RECHECK if blocked else None)
+                    continue
+            for job in started:
+                get_worker_pool().submit(self._run, job, name=f"job-{job.id}")
+
+    def _take_ready(self):
+        """Claim as many startable jobs as the limit allows; called with the lock held"""
+        started, blocked = [], []
+        while self._heap and self._running < self.max_concurrent:
+            entry = heapq.heappop(self._heap)
+            job = self._jobs.get(entry[1])
+            if not job or job.state != "queued":
+                continue
+
+            try:
+                drawings = self.runner.drawings_for(job)
+            except Exception as e:
+                self._finish(job, "failed", str(e))
+                continue
+
+            if self._held.intersection(drawings) or any(self.runner.is_busy(d) for d in drawings):
+                blocked.append(entry)
+                continue
+
+            job.drawings = drawings
+            job.state = "running"
+            job.started_at = time.time()
+            self._held.update(drawings)
+            self._running += 1
+            started.append(job)
+
+        for entry in blocked:
+            heapq.heappush(self._heap, entry)
+        if started:
+            self._save()
+        return started, blocked
+
+    def _run(self, job: Job):
+        log.info("job started", job=job.id, kind=job.kind, target=job.target,
+                 waited=round(job.started_at - job.submitted_at, 3))
+        state, error = "completed", None
+        try:
+            self.runner.run(job, lambda: job.cancel_requested)
+            if job.cancel_requested:
+                state = "cancelled"
+        except Exception as e:
+            state, error = "failed", str(e)
+            log.error("job failed", job=job.id, error=error)
+        finally:
+            with self._cond:
+                self._held.difference_update(job.drawings)
+                self._running -= 1
+                self._finish(job, state, error)
+                self._cond.notify_all()
+            log.info("job finished", job=job.id, state=state)
+
+    def _finish(self, job: Job, state: str, error: Optional[str] = None):
+        job.state = state
+        job.error = error
+        job.finished_at = time.time()
+        self._trim_history()
+        self._save()
+
+    def _trim_history(self):
+        finished = sorted((job for job in self._jobs.values() if job.state in FINISHED_STATES),
+                          key=lambda job: job.finished_at or 0)
+        for job in finished[:max(0, len(finished) - HISTORY_LIMIT)]:
+            del self._jobs[job.id]
+
+    def _save(self):
+        if not self.store_path:
+            return
+        data = {
+            "version": STORE_VERSION,
+            "max_concurrent": self.max_concurrent,
+            "jobs": [job.to_dict() for job in sorted(self._jobs.values(), key=lambda job: job.seq)]
+        }
+        try:
+            directory = os.path.dirname(self.store_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            write_document(self.store_path, data)
+        except Exception as e:
+            log.error("job store save failed", path=self.store_path, error=str(e))
+
+    def _load(self):
+        if not self.store_path or not os.path.exists(self.store_path):
+            return
+        try:
+            data = read_document(self.store_path)
+        except Exception as e:
+            log.error("job store load failed", path=self.store_path, error=str(e))
+            return
+
+        self.max_concurrent = int(data.get("max_concurrent", self.max_concurrent))
+        last_seq = 0
+        for entry in data.get("jobs", []):
+            job = Job.from_dict(entry)
+            if job.state == "running":
+                # Interrupted by the restart; run it again from the start
+                job.state = "queued"
+                job.started_at = None
+                log.info("job requeued after restart", job=job.id)
+            self._jobs[job.id] = job
+            last_seq = max(last_seq, job.seq)
+            if job.state == "queued":
+                heapq.heappush(self._heap, (job.sort_key, job.id))
+        self._seq = itertools.count(last_seq + 1)
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue backed by the drawing service and the jobs store"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            from core.config import JOBS_FILE
+            from services.drawing_service import get_drawing_service, EXECUTION_RUNTIMES
+            _queue = JobQueue(DrawingJobRunner(get_drawing_service(), EXECUTION_RUNTIMES), store_path=JOBS_FILE)
+        return _queue
@@ -1,6 +1,9 @@
 import uuid
 from typing import Dict, Any, List
 from core.state import current_project
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 class NodeService:
     @staticmethod
@@ -22,7 +25,7 @@ class NodeService:
 
     @staticmethod
     def bulk_update_nodes(nodes: List[Dict[str, Any]]) -> Dict[str, str]:
-        print(f"DEBUG: Received bulk nodes update with {len(nodes)} nodes")
+        log.debug(None, "bulk nodes update", count=len(nodes))
         current_project["nodes"] = nodes
         return {"message": f"Updated {len(nodes)} nodes"}
 
@@ -0,0 +1,191 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from core.graph import DrawingGraph
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+# A prefetched match is used only if its frame is at most this old when the node runs
+PREFETCH_MAX_AGE = 0.25
+
+# Initial estimate of capture + match time, refined from measurements
+DEFAULT_LEAD = 0.1
+LEAD_SMOOTHING = 0.2
+
+# Only slow nodes are worth speculating behind
+PREFETCH_TRIGGERS = ("wait", "move")
+
+# Nodes that never change the screen; lookahead passes through them
+PASSTHROUGH_ACTIONS = ("fork", "join")
+
+class PrefetchJob:
+    def __init__(self, drawing_id: str, region_bbox: Optional[Tuple[int, int, int, int]],
+                 candidates: List[Tuple[str, str]]):
+        self.drawing_id = drawing_id
+        self.region_bbox = region_bbox
+        self.candidates = candidates  # (node_id, image_path)
+
+class PrefetchService:
+    """Speculative template matching for image nodes that follow a slow node.
+
+    When a wait or move starts, the image nodes that can run right after it
+    are queued. A single worker captures one frame of the drawing's region
+    just before the slow node is due to finish, matches every candidate
+    against it and parks the results. The image node takes the parked result
+    if its frame is still fresh, otherwise it captures from scratch.
+    """
+
+    def __init__(self, image_recognition, max_age: float = PREFETCH_MAX_AGE):
+        self.image_recognition = image_recognition
+        self.max_age = max_age
+        self._cond = threading.Condition()
+        self._jobs: List[Tuple[float, int, PrefetchJob]] = []
+        self._seq = itertools.count()
+        self._results: Dict[Tuple[str, str], Tuple[str, Any, Dict[str, Any]]] = {}
+        self._inflight: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._lead = DEFAULT_LEAD
+        self._stats = {"scheduled": 0, "captures": 0, "hits": 0, "misses": 0, "stale": 0, "errors": 0}
+
+    def upcoming_image_nodes(self, graph: DrawingGraph, node: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Image nodes that can run directly after ``node``, looking through fork/join"""
+        found, seen = [], {node["id"]}
+        stack = list(node.get("connections", []))
+        while stack:
+            node_id = stack.pop(0)
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+            candidate = graph.get(node_id)
+            if not candidate:
+                continue
+            action_type = candidate["action_type"]
+            if action_type in PASSTHROUGH_ACTIONS:
+                stack.extend(candidate.get("connections", []))
+            elif self._image_path(candidate):
+                found.append(candidate)
+        return found
+
+    def schedule(self, drawing_id: str, graph: DrawingGraph, node: Dict[str, Any], expected_duration: float,
+                 region_bbox: Optional[Tuple[int, int, int, int]] = None):
+        """Queue matches for the image nodes after ``node``, timed to land as it finishes"""
+        candidates = [(c["id"], self._image_path(c)) for c in self.upcoming_image_nodes(graph, node)]
+        if not candidates:
+            return
+
+        # Too short to hide a capture behind; the node would just wait on the worker
+        if expected_duration < self._lead:
+            return
+
+        due = time.perf_counter() + expected_duration - self._lead
+        with self._cond:
+            heapq.heappush(self._jobs, (due, next(self._seq), PrefetchJob(drawing_id, region_bbox, candidates)))
+            self._stats["scheduled"] += len(candidates)
+            self._ensure_worker()
+            self._cond.notify()
+        log.debug(drawing_id, "prefetch scheduled", node=node["id"], candidates=len(candidates),
+                  due_in=round(expected_duration - self._lead, 3))
+
+    def take(self, drawing_id: str, node_id: str, image_path: str,
+             region_bbox: Optional[Tuple[int, int, int, int]] = None) -> Optional[Dict[str, Any]]:
+        """Claim a prefetched match for a node that is about to run, if one is fresh enough"""
+        key = (drawing_id, node_id)
+        with self._cond:
+            self._drop_queued(key)
+            if key in self._inflight:
+                # The capture is already under way; it is at least as fresh as a new one
+                self._cond.wait_for(lambda: key not in self._inflight, timeout=self._lead * 4)
+            entry = self._results.pop(key, None)
+
+            if entry is None or entry[0] != image_path or entry[1] != region_bbox:
+                self._stats["misses"] += 1
+                return None
+
+            result = entry[2]
+            if time.perf_counter() - result["captured_at"] > self.max_age:
+                self._stats["stale"] += 1
+                return None
+
+            self._stats["hits"] += 1
+            return result
+
+    def cancel(self, drawing_id: str):
+        """Forget queued jobs and parked results for a drawing"""
+        with self._cond:
+            self._jobs = [job for job in self._jobs if job[2].drawing_id != drawing_id]
+            heapq.heapify(self._jobs)
+            for key in [key for key in self._results if key[0] == drawing_id]:
+                del self._results[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queued"] = len(self._jobs)
+            stats["parked"] = len(self._results)
+        claimed = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = round(stats["hits"] / claimed, 3) if claimed else None
+        stats["lead_ms"] = round(self._lead * 1000, 1)
+        stats["max_age_ms"] = round(self.max_age * 1000, 1)
+        return stats
+
+    @staticmethod
+    def _image_path(node: Dict[str, Any]) -> Optional[str]:
+        params = node.get("params", {})
+        if node["action_type"] in ("findimg", "clickimg", "followimg"):
+            return params.get("image_path") or None
+        if node["action_type"] == "if" and params.get("condition_type", "image_exists") == "image_exists":
+            return params.get("image_path") or None
+        return None
+
+    def _drop_queued(self, key: Tuple[str, str]):
+        for _, _, job in self._jobs:
+            if job.drawing_id == key[0]:
+                job.candidates = [c for c in job.candidates if c[0] != key[1]]
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._jobs or self._jobs[0][0] > time.perf_counter():
+                    timeout = self._jobs[0][0] - time.perf_counter() if self._jobs else None
+                    self._cond.wait(timeout)
+                _, _, job = heapq.heappop(self._jobs)
+                if not job.candidates:
+                    continue
+                keys = [(job.drawing_id, node_id) for node_id, _ in job.candidates]
+                self._inflight.update(keys)
+
+            results = self._run(job)
+
+            with self._cond:
+                self._inflight.difference_update(keys)
+                self._results.update(results)
+                self._cond.notify_all()
+
+    def _run(self, job: PrefetchJob) -> Dict[Tuple[str, str], Tuple[str, Any, Dict[str, Any]]]:
+        started = time.perf_counter()
+        results = {}
+        try:
+            # One capture serves every candidate; they share the drawing's region
+            frame, captured_at = self.image_recognition.capture_region(job.region_bbox)
+            for node_id, image_path in job.candidates:
+                result = self.image_recognition.match_in_frame(image_path, frame, job.region_bbox, captured_at=captured_at)
+                results[(job.drawing_id, node_id)] = (image_path, job.region_bbox, result)
+        except Exception as e:
+            with self._cond:
+                self._stats["errors"] += 1
+            log.warning("prefetch failed", drawing=job.drawing_id, error=str(e))
+            return results
+
+        elapsed = time.perf_counter() - started
+        with self._cond:
+            self._stats["captures"] += 1
+            self._lead += LEAD_SMOOTHING * (elapsed - self._lead)
+        return results
@@ -2,13 +2,17 @@ import json
 import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR, METADATA_FILE
+from core.config import PROJECTS_DIR, DRAWINGS_SUBDIR, METADATA_FILE, JOBS_FILE, DRAWING_INDEX_FILE
 from core.state import (
     create_project, get_project_metadata, list_projects, 
     update_project_metadata, delete_project,
-    list_project_drawings, set_current_project, get_current_project
+    list_project_drawings, project_drawing_counts, set_current_project, get_current_project, list_runs
 )
 
+# Fields a client may change; the rest of project.json (drawing_ranks, schedules,
+# triggers, timestamps) is managed by the server
+EDITABLE_PROJECT_FIELDS = ("name", "description")
+
 class ProjectService:
     
     def __init__(self):
@@ -38,13 +42,13 @@ class ProjectService:
         try:
             projects = list_projects()
             
-            # Add drawing count to each project
+            # Add drawing count to each project; counting needs no full drawing listing
+            try:
+                counts = project_drawing_counts([project["id"] for project in projects])
+            except Exception:
+                counts = {}
             for project in projects:
-                try:
-                    drawings = list_project_drawings(project["id"])
-                    project["drawing_count"] = len(drawings)
-                except Exception:
-                    project["drawing_count"] = 0
+                project["drawing_count"] = counts.get(project["id"], 0)
             
             print(f"DEBUG: Listed {len(projects)} projects")
             return projects
@@ -70,8 +74,21 @@ class ProjectService:
             print(f"ERROR: Failed to get project info for '{project_id}': {e}")
             return None
     
+    def get_project_runs(self, project_id: str, limit: int = 50, outcome: Optional[str] = None,
+                         since: Optional[str] = None, drawing_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Recorded runs of a project's drawings, most recent first; None when the project does not exist"""
+        if not get_project_metadata(project_id):
+            return None
+        return list_runs(project_id, drawing_id, limit, outcome, since)
+    
     def update_project_info(self, project_id: str, updates: Dict[str, Any]) -> bool:
-        """Update project information"""
+        """Update a project's name and description; other fields in ``updates`` are ignored"""
+        updates = {key: value for key, value in (updates or {}).items() if key in EDITABLE_PROJECT_FIELDS}
+        if not updates:
+            raise ValueError(f"Nothing to update, editable fields are {list(EDITABLE_PROJECT_FIELDS)}")
+        for key, value in updates.items():
+            if not isinstance(value, str):
+                raise ValueError(f"{key} must be a string")
         try:
             success = update_project_metadata(project_id, updates)
             if success:
@@ -128,8 +145,12 @@ class ProjectService:
         try:
             # Check for old-style projects (JSON files directly in projects dir)
             old_projects = []
+            # Stores the server keeps next to the projects, not projects themselves
+            internal_files = {os.path.basename(JOBS_FILE), os.path.basename(DRAWING_INDEX_FILE)}
             if os.path.exists(PROJECTS_DIR):
                 for file in os.listdir(PROJECTS_DIR):
+                    if file in internal_files:
+                        continue
                     if file.endswith('.json') or file.endswith('.acp'):
                         # Check if it's not a new-style project directory
                         full_path = os.path.join(PROJECTS_DIR, file)
@@ -0,0 +1,330 @@
+import heapq
+import math
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from core.cron import CronExpression
+from core.state import list_projects, get_project_metadata, update_project_metadata
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+SCHEDULE_TYPES = ("interval", "cron")
+
+# skip: drop fire times missed while the server was down
+# once: run a single catch-up for any number of missed fire times
+# all:  run every missed fire time, up to MAX_CATCH_UP
+CATCH_UP_POLICIES = ("skip", "once", "all")
+MAX_CATCH_UP = 10
+
+# A fire time no older than this counts as on time rather than missed
+MISS_GRACE = 60.0
+
+MIN_INTERVAL = 1.0
+
+class ProjectMetadataStore:
+    """Keeps a per-project list (e.g. ``schedules``) in each project.json"""
+
+    def __init__(self, field: str = "schedules"):
+        self.field = field
+
+    def load(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {project["id"]: list(project.get(self.field, [])) for project in list_projects()}
+
+    def exists(self, project_id: str) -> bool:
+        return get_project_metadata(project_id) is not None
+
+    def save(self, project_id: str, items: List[Dict[str, Any]], touch: bool = True):
+        if not update_project_metadata(project_id, {self.field: items}, touch=touch):
+            log.error("project metadata save failed", project=project_id, field=self.field)
+
+def normalize_schedule(data: Dict[str, Any], existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Validate a schedule definition and fill in defaults"""
+    schedule = dict(existing or {})
+    schedule.update(data)
+
+    drawing_id, project_id = schedule.pop("drawing_id", None), schedule.pop("project_id", None)
+    if drawing_id:
+        schedule["kind"], schedule["target"] = "drawing", drawing_id
+    elif project_id:
+        schedule["kind"], schedule["target"] = "project", project_id
+    if schedule.get("kind") not in ("drawing", "project") or not schedule.get("target"):
+        raise ValueError("Schedule needs a drawing_id or project_id")
+
+    schedule_type = schedule.get("type", "interval")
+    if schedule_type not in SCHEDULE_TYPES:
+        raise ValueError(f"Unknown schedule type '{schedule_type}', expected one of {list(SCHEDULE_TYPES)}")
+    schedule["type"] = schedule_type
+    if schedule_type == "interval":
+        try:
+            schedule["interval"] = float(schedule.get("interval"))
+        except (TypeError, ValueError):
+            raise ValueError("Interval schedules need 'interval' in seconds")
+        if schedule["interval"] < MIN_INTERVAL:
+            raise ValueError(f"interval must be at least {MIN_INTERVAL} seconds")
+    else:
+        schedule["cron"] = str(CronExpression(schedule.get("cron", "")))
+
+    catch_up = schedule.get("catch_up", "skip")
+    if catch_up not in CATCH_UP_POLICIES:
+        raise ValueError(f"Unknown catch_up policy '{catch_up}', expected one of {list(CATCH_UP_POLICIES)}")
+    schedule["catch_up"] = catch_up
+
+    jitter = schedule.get("jitter", 0)
+    if not isinstance(jitter, (int, float)) or isinstance(jitter, bool) or jitter < 0:
+        raise ValueError("jitter must be a non-negative number of seconds")
+    priority = schedule.get("priority", 0)
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        raise ValueError("priority must be an integer")
+
+    schedule["jitter"] = jitter
+    schedule["priority"] = priority
+    schedule["skip_if_running"] = bool(schedule.get("skip_if_running", True))
+    schedule["enabled"] = bool(schedule.get("enabled", True))
+    schedule["params"] = dict(schedule.get("params") or {})
+    schedule.setdefault("name", "")
+    schedule.setdefault("id", uuid.uuid4().hex[:12])
+    schedule.setdefault("created_at", datetime.now().isoformat())
+    return schedule
+
+def next_fire(schedule: Dict[str, Any], after: datetime) -> datetime:
+    """First fire time strictly after ``after``, without jitter"""
+    if schedule["type"] == "cron":
+        return CronExpression(schedule["cron"]).next_after(after)
+    # Interval fire times stay on a fixed grid anchored at creation, so jitter and late runs never drift it
+    anchor = datetime.fromisoformat(schedule["created_at"])
+    interval = schedule["interval"]
+    if after < anchor:
+        return anchor
+    steps = math.floor((after - anchor).total_seconds() / interval) + 1
+    return anchor + timedelta(seconds=steps * interval)
+
+class SchedulerService:
+    """Triggers drawing and project runs on interval or cron schedules.
+
+    One timer thread sleeps until the earliest due schedule; due runs are
+    submitted to the job queue rather than executed here.
+    """
+
+    def __init__(self, job_queue, store=None, rng=random.random):
+        self.job_queue = job_queue
+        self.store = store or ProjectMetadataStore()
+        self.rng = rng
+        self._cond = threading.Condition()
+        self._schedules: Dict[str, Dict[str, Any]] = {}
+        self._projects: Dict[str, str] = {}       # schedule id -> project id
+        self._next: Dict[str, datetime] = {}      # schedule id -> next unjittered fire time
+        self._heap: List[tuple] = []              # (due epoch, schedule id, generation)
+        self._generation: Dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"fired": 0, "skipped": 0, "missed": 0, "errors": 0}
+
+    def load(self, now: Optional[datetime] = None):
+        """Read schedules from the store, resuming each from its last run"""
+        now = now or datetime.now()
+        with self._cond:
+            for project_id, schedules in self.store.load().items():
+                for schedule in schedules:
+                    self._schedules[schedule["id"]] = schedule
+                    self._projects[schedule["id"]] = project_id
+                    self._arm(schedule, now, resume=True)
+            self._cond.notify()
+
+    def start(self):
+        """Load schedules and start the timer thread"""
+        self.load()
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._timer, name="scheduler", daemon=True)
+                self._thread.start()
+        log.info("scheduler started", schedules=len(self._schedules))
+
+    def list_schedules(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._cond:
+            return [self._describe(schedule_id) for schedule_id in self._schedules
+                    if project_id is None or self._projects[schedule_id] == project_id]
+
+    def get_schedule(self, schedule_id: str) -> Dict[str, Any]:
+        with self._cond:
+            if schedule_id not in self._schedules:
+                raise ValueError(f"Schedule {schedule_id} not found")
+            return self._describe(schedule_id)
+
+    def create_schedule(self, project_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.store.exists(project_id):
+            raise ValueError(f"Project {project_id} not found")
+        for key in ("id", "created_at", "last_run", "last_job_id"):
+            data.pop(key, None)
+        if not data.get("drawing_id"):
+            # Without a drawing, a schedule runs its whole project
+            data["project_id"] = project_id
+        schedule = normalize_schedule(data)
+        with self._cond:
+            self._schedules[schedule["id"]] = schedule
+            self._projects[schedule["id"]] = project_id
+            self._arm(schedule, datetime.now())
+            self._persist(project_id)
+            self._cond.notify()
+            log.info("schedule created", schedule=schedule["id"], project=project_id, type=schedule["type"])
+            return self._describe(schedule["id"])
+
+    def update_schedule(self, schedule_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._cond:
+            existing = self._schedules.get(schedule_id)
+            if not existing:
+                raise ValueError(f"Schedule {schedule_id} not found")
+            for key in ("id", "created_at", "last_run", "last_job_id"):
+                data.pop(key, None)
+            schedule = normalize_schedule(data, existing)
+            self._schedules[schedule_id] = schedule
+            self._arm(schedule, datetime.now())
+            self._persist(self._projects[schedule_id])
+            self._cond.notify()
+            return self._describe(schedule_id)
+
+    def delete_schedule(self, schedule_id: str):
+        with self._cond:
+            if schedule_id not in self._schedules:
+                raise ValueError(f"Schedule {schedule_id} not found")
+            del self._schedules[schedule_id]
+            self._next.pop(schedule_id, None)
+            self._generation[schedule_id] = self._generation.get(schedule_id, 0) + 1
+            self._persist(self._projects.pop(schedule_id))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["schedules"] = len(self._schedules)
+            stats["armed"] = len(self._next)
+            stats["next_due"] = min(self._next.values()).isoformat() if self._next else None
+            return stats
+
+    def run_due(self, now: Optional[datetime] = None) -> int:
+        """Fire every schedule that is due at ``now``; returns the number of runs submitted"""
+        now = now or datetime.now()
+        submitted = 0
+        with self._cond:
+            due = []
+            while self._heap and self._heap[0][0] <= now.timestamp():
+                _, schedule_id, generation = heapq.heappop(self._heap)
+                if generation == self._generation.get(schedule_id) and schedule_id in self._next:
+                    due.append(schedule_id)
+            for schedule_id in due:
+                submitted += self._fire(schedule_id, now)
+        return submitted
+
+    def _describe(self, schedule_id: str) -> Dict[str, Any]:
+        data = dict(self._schedules[schedule_id])
+        data["project_id"] = self._projects[schedule_id]
+        next_run = self._next.get(schedule_id)
+        data["next_run"] = next_run.isoformat() if next_run else None
+        return data
+
+    def _arm(self, schedule: Dict[str, Any], now: datetime, resume: bool = False):
+        """Compute the next fire time; on resume, start from the last run so missed times are caught up"""
+        schedule_id = schedule["id"]
+        self._generation[schedule_id] = self._generation.get(schedule_id, 0) + 1
+        if not schedule.get("enabled", True):
+            self._next.pop(schedule_id, None)
+            return
+        try:
+            last_run = schedule.get("last_run")
+            after = datetime.fromisoformat(last_run) if resume and last_run else now
+            base = next_fire(schedule, after)
+        except ValueError as e:
+            log.error("schedule disarmed", schedule=schedule_id, error=str(e))
+            self._next.pop(schedule_id, None)
+            return
+        self._next[schedule_id] = base
+        due = base.timestamp() + schedule.get("jitter", 0) * self.rng()
+        heapq.heappush(self._heap, (due, schedule_id, self._generation[schedule_id]))
+
+    def _fire(self, schedule_id: str, now: datetime) -> int:
+        schedule = self._schedules[schedule_id]
+        base = self._next[schedule_id]
+
+        # Every fire time up to now; only the first MAX_CATCH_UP + 1 matter
+        pending = []
+        while base <= now and len(pending) <= MAX_CATCH_UP:
+            pending.append(base)
+            base = next_fire(schedule, base)
+        if base <= now:
+            base = next_fire(schedule, now)
+
+        on_time = [t for t in pending if (now - t).total_seconds() <= MISS_GRACE]
+        missed = len(pending) - len(on_time)
+        policy = schedule["catch_up"]
+        if policy == "all":
+            runs = min(len(pending), MAX_CATCH_UP)
+        elif policy == "once":
+            runs = 1 if pending else 0
+        else:
+            runs = 1 if on_time else 0
+        if missed:
+            self._stats["missed"] += missed
+            log.info("schedule missed runs", schedule=schedule_id, missed=missed, policy=policy, runs=runs)
+
+        submitted = 0
+        for _ in range(runs):
+            if self._submit(schedule):
+                submitted += 1
+
+        schedule["last_run"] = pending[-1].isoformat() if pending else schedule.get("last_run")
+        # Run bookkeeping, not an edit: the project's last_modified stays put
+        self._persist(self._projects[schedule_id], touch=False)
+
+        self._generation[schedule_id] += 1
+        self._next[schedule_id] = base
+        due = base.timestamp() + schedule.get("jitter", 0) * self.rng()
+        heapq.heappush(self._heap, (due, schedule_id, self._generation[schedule_id]))
+        return submitted
+
+    def _submit(self, schedule: Dict[str, Any]) -> bool:
+        kind, target = schedule["kind"], schedule["target"]
+        if schedule["skip_if_running"] and self.job_queue.is_busy(kind, target):
+            self._stats["skipped"] += 1
+            log.info("schedule skipped, target busy", schedule=schedule["id"], target=target)
+            return False
+        try:
+            job = self.job_queue.submit(kind, target, schedule["params"], schedule["priority"])
+        except Exception as e:
+            self._stats["errors"] += 1
+            log.error("schedule submit failed", schedule=schedule["id"], error=str(e))
+            return False
+        schedule["last_job_id"] = job["id"]
+        self._stats["fired"] += 1
+        log.info("schedule fired", schedule=schedule["id"], job=job["id"], target=target)
+        return True
+
+    def _persist(self, project_id: str, touch: bool = True):
+        schedules = [schedule for schedule_id, schedule in self._schedules.items()
+                     if self._projects[schedule_id] == project_id]
+        self.store.save(project_id, schedules, touch=touch)
+
+    def _timer(self):
+        while True:
+            with self._cond:
+                timeout = self._heap[0][0] - time.time() if self._heap else None
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+                    continue
+            try:
+                self.run_due()
+            except Exception as e:
+                log.error("scheduler tick failed", exc_info=True, error=str(e))
+
+_scheduler: Optional[SchedulerService] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> SchedulerService:
+    """Get the process-wide scheduler, loading schedules and starting its timer on first use"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from services.job_queue import get_job_queue
+            _scheduler = SchedulerService(get_job_queue())
+            _scheduler.start()
+        return _scheduler
@@ -0,0 +1,267 @@
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Any, Optional, Tuple
+from core.graph import DrawingGraph
+from core.state import get_drawing
+from core.trace import ExecutionTrace
+from core.timing import (
+    TimingPolicy, MOVE_DURATION, FOLLOW_DURATION, SETTLE_DELAY, ACTION_PAUSE,
+    WAIT_FLOOR, LOOP_DELAY
+)
+
+# Virtual cost (seconds) of work that is not a built-in delay
+DEFAULT_COSTS = {
+    "capture": 0.05,   # Screenshot of the search region
+    "match": 0.02,     # Template match against the capture
+    "input": 0.0       # The input event itself
+}
+
+MAX_ITERATIONS = 100000
+TIMELINE_LIMIT = 1000
+
+IMAGE_ACTIONS = ("findimg", "followimg", "clickimg")
+POINTER_ACTIONS = ("click", "mousedown", "mouseup", "mousescroll")
+
+class OutcomeSource:
+    """Scripted results for image and IF nodes.
+
+    ``outcomes`` maps node ids to a result or a list of results consumed one
+    per visit (the last one repeats). ``trace`` is a recorded list of
+    ``{"node_id": ..., "found": ...}`` events replayed in order per node and
+    takes precedence until it runs out.
+    """
+
+    def __init__(self, outcomes: Optional[Dict[str, Any]] = None, trace: Optional[List[Dict[str, Any]]] = None,
+                 default: bool = True):
+        self.default = default
+        self.table: Dict[str, List[Dict[str, Any]]] = {}
+        for node_id, value in (outcomes or {}).items():
+            values = value if isinstance(value, list) else [value]
+            self.table[str(node_id)] = [self._normalize(v) for v in values]
+
+        self.recorded: Dict[str, deque] = defaultdict(deque)
+        for event in trace or []:
+            if "node_id" in event and "found" in event:
+                self.recorded[str(event["node_id"])].append(self._normalize(event))
+
+        self._cursor: Dict[str, int] = defaultdict(int)
+
+    def next(self, node_id: str, fallback: Optional[bool] = None) -> Dict[str, Any]:
+        recorded = self.recorded.get(node_id)
+        if recorded:
+            return recorded.popleft()
+
+        values = self.table.get(node_id)
+        if values:
+            index = min(self._cursor[node_id], len(values) - 1)
+            self._cursor[node_id] += 1
+            return values[index]
+
+        return {"found": self.default if fallback is None else fallback}
+
+    @staticmethod
+    def _normalize(value: Any) -> Dict[str, Any]:
+        if isinstance(value, dict):
+            result = dict(value)
+            result["found"] = OutcomeSource._as_bool(value.get("found", True))
+            return result
+        return {"found": OutcomeSource._as_bool(value)}
+
+    @staticmethod
+    def _as_bool(value: Any) -> bool:
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "found")
+        return bool(value)
+
+class SimulationService:
+    """Runs a drawing's graph against a virtual clock without touching the desktop"""
+
+    def simulate_drawing(self, drawing_id: str, iterations: int = 1, speed: float = 1.0, turbo: bool = False,
+                         outcomes: Optional[Dict[str, Any]] = None, trace: Optional[List[Dict[str, Any]]] = None,
+                         default_outcome: bool = True, costs: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Simulate a stored drawing"""
+        drawing = get_drawing(drawing_id)
+        if not drawing:
+            raise ValueError(f"Drawing {drawing_id} not found")
+
+        result = self.simulate_nodes(
+            drawing.get("nodes", []), iterations=iterations, speed=speed, turbo=turbo,
+            outcomes=outcomes, trace=trace, default_outcome=default_outcome, costs=costs
+        )
+        result["drawing_id"] = drawing_id
+        return result
+
+    def replay_trace(self, drawing_id: str, trace: ExecutionTrace, speed: float = 1.0, turbo: bool = False,
+                     costs: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Re-run a drawing offline with the match outcomes of a recorded trace"""
+        iterations = max(1, min(trace.iterations(), MAX_ITERATIONS))
+        result = self.simulate_drawing(drawing_id, iterations=iterations, speed=speed, turbo=turbo,
+                                       trace=trace.outcomes(), costs=costs)
+        result["recorded"] = {
+            "trace": trace.stats(),
+            "node_durations": trace.node_durations()
+        }
+        return result
+
+    def simulate_nodes(self, nodes: List[Dict[str, Any]], iterations: int = 1, speed: float = 1.0,
+                       turbo: bool = False, outcomes: Optional[Dict[str, Any]] = None,
+                       trace: Optional[List[Dict[str, Any]]] = None, default_outcome: bool = True,
+                       costs: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Simulate a node list and return timeline, visit counts and critical path"""
+        iterations = int(iterations)
+        if iterations < 1 or iterations > MAX_ITERATIONS:
+            raise ValueError(f"iterations must be between 1 and {MAX_ITERATIONS}")
+
+        costs = {**DEFAULT_COSTS, **(costs or {})}
+        graph = DrawingGraph(nodes)
+        timing = TimingPolicy(speed, turbo)
+        source = OutcomeSource(outcomes, trace, default_outcome)
+
+        clock = 0.0
+        visit_counts = {node_id: 0 for node_id in graph.by_id}
+        timeline: List[Dict[str, Any]] = []
+        critical: Tuple[float, List[str]] = (0.0, [])
+
+        def visit(node_id: str, visited: set, stop_at: Optional[str] = None) -> Tuple[float, List[str]]:
+            nonlocal clock
+            if node_id in visited or node_id == stop_at:
+                return 0.0, []
+            visited.add(node_id)
+
+            node = graph.get(node_id)
+            if not node:
+                return 0.0, []
+
+            node_timing = timing.for_node(node)
+            node_timing.count_action()
+            outcome = self._resolve_outcome(node, source)
+            cost = self._action_cost(node, node_timing, outcome, costs)
+
+            start = clock
+            clock += cost
+            visit_counts[node_id] += 1
+            if len(timeline) < TIMELINE_LIMIT:
+                entry = {
+                    "node_id": node_id,
+                    "action_type": node["action_type"],
+                    "start": round(start, 6),
+                    "end": round(clock, 6)
+                }
+                if outcome is not None:
+                    entry["found"] = outcome["found"]
+                timeline.append(entry)
+
+            if node["action_type"] == "fork":
+                tail = fork(node, visited, stop_at)
+                return cost + tail[0], [node_id] + tail[1]
+
+            found = bool(outcome and outcome["found"])
+            longest: Tuple[float, List[str]] = (0.0, [])
+            for next_node_id in graph.next_ids(node, found):
+                branch = visit(next_node_id, visited.copy(), stop_at)
+                if branch[0] > longest[0] or not longest[1]:
+                    longest = branch
+            return cost + longest[0], [node_id] + longest[1]
+
+        def fork(node: Dict[str, Any], visited: set, stop_at: Optional[str]) -> Tuple[float, List[str]]:
+            """Branches start together; the join is reached at the slowest (all) or fastest (any) branch end"""
+            nonlocal clock
+            join_id = graph.find_join(node)
+            mode = graph.join_mode(graph.get(join_id) if join_id else None)
+
+            fork_start = clock
+            branches = []
+            for head_id in node.get("connections", []):
+                clock = fork_start
+                path = visit(head_id, visited.copy(), join_id)
+                branches.append((clock, path))
+
+            if branches:
+                pick = max if mode == "all" else min
+                clock, path = pick(branches, key=lambda branch: branch[0])
+            else:
+                path = (0.0, [])
+
+            if not join_id:
+                return path
+            after = visit(join_id, visited.copy(), stop_at)
+            return path[0] + after[0], path[1] + after[1]
+
+        started = time.perf_counter()
+        for iteration in range(iterations):
+            for start_node in graph.start_nodes:
+                path = visit(start_node["id"], set())
+                if path[0] > critical[0] or not critical[1]:
+                    critical = path
+            if iteration < iterations - 1:
+                clock += timing.duration(LOOP_DELAY)
+        wall_time = time.perf_counter() - started
+
+        return {
+            "iterations": iterations,
+            "predicted_duration": round(clock, 6),
+            "iteration_duration": round(clock / iterations, 6),
+            "timeline": timeline,
+            "timeline_truncated": sum(visit_counts.values()) > len(timeline),
+            "visit_counts": visit_counts,
+            "unreached_nodes": [node_id for node_id, count in visit_counts.items() if count == 0],
+            "critical_path": {"nodes": critical[1], "duration": round(critical[0], 6)},
+            "timing": timing.stats(),
+            "engine": {
+                "wall_time": round(wall_time, 6),
+                "iterations_per_second": round(iterations / wall_time, 1) if wall_time > 0 else None
+            }
+        }
+
+    def _resolve_outcome(self, node: Dict[str, Any], source: OutcomeSource) -> Optional[Dict[str, Any]]:
+        action_type = node["action_type"]
+        if action_type in IMAGE_ACTIONS:
+            return source.next(node["id"])
+        if action_type == "if":
+            params = node.get("params", {})
+            if params.get("condition_type", "image_exists") == "node_result":
+                return source.next(node["id"], params.get("expected_result", "true") == "true")
+            return source.next(node["id"])
+        return None
+
+    def _action_cost(self, node: Dict[str, Any], timing: TimingPolicy, outcome: Optional[Dict[str, Any]],
+                     costs: Dict[str, float]) -> float:
+        """Virtual duration of a node, mirroring the delays of the live engine"""
+        action_type = node["action_type"]
+        params = node.get("params", {})
+
+        if action_type in POINTER_ACTIONS:
+            moves = (params.get("position_mode", "absolute") != "current"
+                     or params.get("x_random", 0) > 0 or params.get("y_random", 0) > 0)
+            cost = self._move_cost(timing) if moves else 0.0
+            return cost + costs["input"] + timing.duration(ACTION_PAUSE)
+
+        if action_type == "move":
+            return float(params.get("duration", 0.2)) + timing.duration(ACTION_PAUSE)
+
+        if action_type == "keyboard":
+            return costs["input"] + timing.duration(ACTION_PAUSE)
+
+        if action_type == "wait":
+            return max(timing.scaled(WAIT_FLOOR), float(params.get("duration", 1.0)))
+
+        if action_type in IMAGE_ACTIONS:
+            cost = costs["capture"] + costs["match"]
+            if outcome and outcome["found"]:
+                if action_type == "followimg":
+                    cost += timing.duration(FOLLOW_DURATION) + timing.duration(ACTION_PAUSE)
+                elif action_type == "clickimg":
+                    cost += self._move_cost(timing) + costs["input"] + timing.duration(ACTION_PAUSE)
+            return cost
+
+        if action_type == "if":
+            if params.get("condition_type", "image_exists") == "image_exists":
+                return costs["capture"] + costs["match"]
+            return 0.0
+
+        return 0.0
+
+    @staticmethod
+    def _move_cost(timing: TimingPolicy) -> float:
+        return (timing.duration(MOVE_DURATION) + timing.duration(ACTION_PAUSE)
+                + timing.duration(SETTLE_DELAY))
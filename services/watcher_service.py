@@ -0,0 +1,318 @@
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from services.scheduler_service import ProjectMetadataStore
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_TICK = 0.25
+
+# A region counts as changed when any pixel moved by more than this many gray levels
+PIXEL_TOLERANCE = 8
+
+def normalize_trigger(data: Dict[str, Any], existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Validate a trigger definition and fill in defaults"""
+    trigger = dict(existing or {})
+    trigger.update(data)
+
+    if not trigger.get("image_path"):
+        raise ValueError("Trigger needs an image_path")
+    if not trigger.get("drawing_id"):
+        raise ValueError("Trigger needs a drawing_id to run")
+
+    region = trigger.get("region")
+    if region is not None:
+        if isinstance(region, dict):
+            region = [region.get("x"), region.get("y"), region.get("width"), region.get("height")]
+        if (not isinstance(region, (list, tuple)) or len(region) != 4
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in region)
+                or region[2] <= 0 or region[3] <= 0 or region[0] < 0 or region[1] < 0):
+            raise ValueError("region must be [x, y, width, height] with positive size")
+        region = list(region)
+    trigger["region"] = region
+
+    for key, default in (("threshold", 0.8), ("debounce", 0.0), ("cooldown", 5.0)):
+        value = trigger.get(key, default)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"{key} must be a non-negative number")
+        trigger[key] = value
+    if trigger["threshold"] > 1:
+        raise ValueError("threshold must be between 0 and 1")
+
+    priority = trigger.get("priority", 0)
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        raise ValueError("priority must be an integer")
+    trigger["priority"] = priority
+    trigger["enabled"] = bool(trigger.get("enabled", True))
+    trigger["params"] = dict(trigger.get("params") or {})
+    trigger.setdefault("name", "")
+    trigger.setdefault("id", uuid.uuid4().hex[:12])
+    return trigger
+
+class TriggerState:
+    """Per-trigger runtime state between ticks"""
+
+    def __init__(self):
+        self.signature: Optional[np.ndarray] = None
+        self.present = False
+        self.confidence = 0.0
+        self.seen_since: Optional[float] = None
+        self.fired = False
+        self.last_fired: Optional[float] = None
+        self.last_job_id: Optional[str] = None
+        self.error: Optional[str] = None
+
+class WatcherService:
+    """Starts drawings when a template appears on screen.
+
+    Every tick captures the union of all trigger regions once, then checks
+    each trigger against its crop of that frame. A crop that has not changed
+    since the previous tick keeps its previous result without matching. A
+    trigger fires on the rising edge of a match that has lasted ``debounce``
+    seconds, and not again until ``cooldown`` has passed and the template
+    has disappeared in between.
+    """
+
+    def __init__(self, image_recognition, job_queue, store=None, tick: float = DEFAULT_TICK, clock=time.monotonic):
+        self.image_recognition = image_recognition
+        self.job_queue = job_queue
+        self.store = store or ProjectMetadataStore("watchers")
+        self.tick = tick
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._triggers: Dict[str, Dict[str, Any]] = {}
+        self._projects: Dict[str, str] = {}
+        self._states: Dict[str, TriggerState] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"ticks": 0, "captures": 0, "matches": 0, "unchanged": 0, "fired": 0,
+                       "skipped": 0, "errors": 0, "last_tick_ms": 0.0}
+
+    def load(self):
+        with self._lock:
+            for project_id, triggers in self.store.load().items():
+                for trigger in triggers:
+                    self._triggers[trigger["id"]] = trigger
+                    self._projects[trigger["id"]] = project_id
+                    self._states[trigger["id"]] = TriggerState()
+
+    def start(self):
+        """Load triggers and start the capture loop"""
+        self.load()
+        with self._lock:
+            self._ensure_thread()
+        log.info("watcher started", triggers=len(self._triggers))
+
+    def list_triggers(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._describe(trigger_id) for trigger_id in self._triggers
+                    if project_id is None or self._projects[trigger_id] == project_id]
+
+    def get_trigger(self, trigger_id: str) -> Dict[str, Any]:
+        with self._lock:
+            if trigger_id not in self._triggers:
+                raise ValueError(f"Trigger {trigger_id} not found")
+            return self._describe(trigger_id)
+
+    def create_trigger(self, project_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.store.exists(project_id):
+            raise ValueError(f"Project {project_id} not found")
+        data.pop("id", None)
+        trigger = normalize_trigger(data)
+        with self._lock:
+            self._triggers[trigger["id"]] = trigger
+            self._projects[trigger["id"]] = project_id
+            self._states[trigger["id"]] = TriggerState()
+            self._persist(project_id)
+            self._ensure_thread()
+            log.info("trigger created", trigger=trigger["id"], project=project_id, drawing=trigger["drawing_id"])
+            return self._describe(trigger["id"])
+
+    def update_trigger(self, trigger_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            existing = self._triggers.get(trigger_id)
+            if not existing:
+                raise ValueError(f"Trigger {trigger_id} not found")
+            data.pop("id", None)
+            self._triggers[trigger_id] = normalize_trigger(data, existing)
+            self._states[trigger_id] = TriggerState()
+            self._persist(self._projects[trigger_id])
+            self._ensure_thread()
+            return self._describe(trigger_id)
+
+    def delete_trigger(self, trigger_id: str):
+        with self._lock:
+            if trigger_id not in self._triggers:
+                raise ValueError(f"Trigger {trigger_id} not found")
+            del self._triggers[trigger_id]
+            del self._states[trigger_id]
+            self._persist(self._projects.pop(trigger_id))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["triggers"] = len(self._triggers)
+            stats["enabled"] = sum(1 for trigger in self._triggers.values() if trigger["enabled"])
+            stats["tick_ms"] = round(self.tick * 1000, 1)
+            return stats
+
+    def check(self) -> int:
+        """Run one tick: one capture, then every enabled trigger; returns the number of runs dispatched"""
+        started = time.perf_counter()
+        with self._lock:
+            triggers = [dict(trigger) for trigger in self._triggers.values() if trigger["enabled"]]
+        if not triggers:
+            return 0
+
+        union = self._union([trigger["region"] for trigger in triggers])
+        try:
+            frame, captured_at = self.image_recognition.capture_region(union)
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            log.warning("watcher capture failed", error=str(e))
+            return 0
+        origin = (union[0], union[1]) if union else (0, 0)
+
+        now = self.clock()
+        dispatched = 0
+        matches = unchanged = 0
+        for trigger in triggers:
+            state = self._states.get(trigger["id"])
+            if state is None:
+                continue
+            crop, region = self._crop(frame, origin, trigger["region"])
+
+            if state.signature is not None and self._same(state.signature, crop):
+                unchanged += 1
+            else:
+                state.signature = crop.copy()
+                matches += 1
+                try:
+                    result = self.image_recognition.match_in_frame(
+                        trigger["image_path"], crop, region, trigger["threshold"], captured_at
+                    )
+                    state.present = bool(result.get("found"))
+                    state.confidence = float(result.get("confidence", 0.0))
+                    state.error = None
+                except Exception as e:
+                    state.present = False
+                    state.error = str(e)
+                    with self._lock:
+                        self._stats["errors"] += 1
+
+            if self._should_fire(trigger, state, now) and self._dispatch(trigger, state, now):
+                dispatched += 1
+
+        with self._lock:
+            self._stats["ticks"] += 1
+            self._stats["captures"] += 1
+            self._stats["matches"] += matches
+            self._stats["unchanged"] += unchanged
+            self._stats["last_tick_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return dispatched
+
+    def _should_fire(self, trigger: Dict[str, Any], state: TriggerState, now: float) -> bool:
+        if not state.present:
+            # Re-arm once the template is gone
+            state.seen_since = None
+            state.fired = False
+            return False
+        if state.seen_since is None:
+            state.seen_since = now
+        if state.fired or now - state.seen_since < trigger["debounce"]:
+            return False
+        return state.last_fired is None or now - state.last_fired >= trigger["cooldown"]
+
+    def _dispatch(self, trigger: Dict[str, Any], state: TriggerState, now: float) -> bool:
+        state.fired = True
+        state.last_fired = now
+        drawing_id = trigger["drawing_id"]
+        if self.job_queue.is_busy("drawing", drawing_id):
+            with self._lock:
+                self._stats["skipped"] += 1
+            log.info("trigger skipped, drawing busy", trigger=trigger["id"], drawing=drawing_id)
+            return False
+        try:
+            job = self.job_queue.submit("drawing", drawing_id, trigger["params"], trigger["priority"])
+        except Exception as e:
+            state.error = str(e)
+            with self._lock:
+                self._stats["errors"] += 1
+            log.error("trigger submit failed", trigger=trigger["id"], error=str(e))
+            return False
+        state.last_job_id = job["id"]
+        with self._lock:
+            self._stats["fired"] += 1
+        log.info("trigger fired", trigger=trigger["id"], drawing=drawing_id, job=job["id"],
+                 confidence=round(state.confidence, 3))
+        return True
+
+    @staticmethod
+    def _union(regions: List[Optional[List[int]]]) -> Optional[Tuple[int, int, int, int]]:
+        if not regions or any(region is None for region in regions):
+            return None
+        left = min(region[0] for region in regions)
+        top = min(region[1] for region in regions)
+        right = max(region[0] + region[2] for region in regions)
+        bottom = max(region[1] + region[3] for region in regions)
+        return (left, top, right - left, bottom - top)
+
+    @staticmethod
+    def _crop(frame, origin: Tuple[int, int], region: Optional[List[int]]):
+        if region is None:
+            return frame, (origin[0], origin[1], frame.shape[1], frame.shape[0])
+        x, y = region[0] - origin[0], region[1] - origin[1]
+        return frame[y:y + region[3], x:x + region[2]], tuple(region)
+
+    @staticmethod
+    def _same(previous: np.ndarray, current: np.ndarray) -> bool:
+        if previous.shape != current.shape:
+            return False
+        # Far cheaper than a template match; sensor noise below the tolerance is ignored
+        return int(np.abs(previous.astype(np.int16) - current.astype(np.int16)).max(initial=0)) <= PIXEL_TOLERANCE
+
+    def _describe(self, trigger_id: str) -> Dict[str, Any]:
+        data = dict(self._triggers[trigger_id])
+        state = self._states[trigger_id]
+        data["project_id"] = self._projects[trigger_id]
+        data["present"] = state.present
+        data["confidence"] = round(state.confidence, 4)
+        data["last_job_id"] = state.last_job_id
+        data["error"] = state.error
+        return data
+
+    def _persist(self, project_id: str):
+        triggers = [trigger for trigger_id, trigger in self._triggers.items()
+                    if self._projects[trigger_id] == project_id]
+        self.store.save(project_id, triggers)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="watcher", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.check()
+            except Exception as e:
+                log.error("watcher tick failed", exc_info=True, error=str(e))
+            time.sleep(max(0.0, self.tick - (time.monotonic() - started)))
+
+_watcher: Optional[WatcherService] = None
+_watcher_lock = threading.Lock()
+
+def get_watcher() -> WatcherService:
+    """Get the process-wide watcher, loading triggers and starting its loop on first use"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            from image_recognition import ImageRecognition
+            from services.job_queue import get_job_queue
+            _watcher = WatcherService(ImageRecognition(), get_job_queue())
+            _watcher.start()
+        return _watcher
@@ -0,0 +1,197 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Optional
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+POOL_SIZE = int(os.environ.get("COPILOTNODE_WORKERS", "8"))
+
+# Screen geometry rarely changes; re-read it at most this often
+SCREEN_SIZE_TTL = 5.0
+
+# Recent queue waits kept for percentiles
+WAIT_WINDOW = 256
+
+_local = threading.local()
+
+class WorkerResources:
+    """Warm per-worker state, kept for the lifetime of the worker thread.
+
+    The ImageRecognition instance (with its template cache) is created on
+    first use so a worker never fails to start because of the desktop stack.
+    """
+
+    def __init__(self, image_recognition=None):
+        self._image_recognition = image_recognition
+        self._screen_size = None
+        self._screen_checked = 0.0
+
+    @property
+    def image_recognition(self):
+        if self._image_recognition is None:
+            from image_recognition import ImageRecognition
+            self._image_recognition = ImageRecognition()
+        return self._image_recognition
+
+    def screen_size(self):
+        now = time.monotonic()
+        if self._screen_size is None or now - self._screen_checked > SCREEN_SIZE_TTL:
+            self._screen_size = tuple(self.image_recognition.get_screen_size())
+            self._screen_checked = now
+        return self._screen_size
+
+def current_worker_resources() -> Optional[WorkerResources]:
+    """Resources of the pool worker running the caller, or None off-pool"""
+    return getattr(_local, "resources", None)
+
+class RunTicket:
+    """Handle for a submitted run; supports join()/is_alive() like the Thread it replaces"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._done = threading.Event()
+
+    @property
+    def started(self) -> bool:
+        return self.started_at is not None
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def is_alive(self) -> bool:
+        return not self._done.is_set()
+
+class WorkerPool:
+    """Persistent, bounded pool of run workers.
+
+    Workers are started on demand up to ``size`` and then live for the
+    process. When every worker is busy, runs wait in a FIFO queue.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, resource_factory: Callable[[], WorkerResources] = WorkerResources):
+        if size < 1:
+            raise ValueError("Worker pool size must be at least 1")
+        self.size = size
+        self._resource_factory = resource_factory
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = []
+        self._busy = 0
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+        self._waits = deque(maxlen=WAIT_WINDOW)
+
+    def submit(self, fn: Callable, *args, name: str = "run", **kwargs) -> RunTicket:
+        """Queue a run; it starts as soon as a worker is free"""
+        ticket = RunTicket(name)
+        with self._lock:
+            self._submitted += 1
+            self._pending += 1
+            if self._free_workers() < 0 and len(self._workers) < self.size:
+                self._spawn()
+        self._queue.put((ticket, fn, args, kwargs))
+        return ticket
+
+    def saturated(self) -> bool:
+        """True when a new run would have to wait in the queue"""
+        with self._lock:
+            return len(self._workers) >= self.size and self._free_workers() <= 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            started = self._submitted - self._pending
+            return {
+                "size": self.size,
+                "workers": len(self._workers),
+                "busy": self._busy,
+                "queued": self._pending,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "queue_wait_ms": {
+                    "last": round(self._wait_last * 1000, 2),
+                    "avg": round(self._wait_total / started * 1000, 2) if started else 0.0,
+                    "p50": round(self._percentile(waits, 0.5) * 1000, 2),
+                    "p95": round(self._percentile(waits, 0.95) * 1000, 2),
+                    "max": round(self._wait_max * 1000, 2)
+                }
+            }
+
+    def _free_workers(self) -> int:
+        return len(self._workers) - self._busy - self._pending
+
+    def _spawn(self):
+        worker = threading.Thread(target=self._worker, name=f"run-worker-{len(self._workers) + 1}", daemon=True)
+        self._workers.append(worker)
+        worker.start()
+
+    def _worker(self):
+        _local.resources = self._resource_factory()
+        while True:
+            ticket, fn, args, kwargs = self._queue.get()
+            ticket.started_at = time.perf_counter()
+            wait = ticket.queue_wait
+            with self._lock:
+                self._pending -= 1
+                self._busy += 1
+                self._wait_last = wait
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._waits.append(wait)
+
+            failed = False
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                failed = True
+                ticket.error = str(e)
+                log.error("worker run failed", run=ticket.name, exc_info=True, error=str(e))
+            finally:
+                ticket.finished_at = time.perf_counter()
+                with self._lock:
+                    self._busy -= 1
+                    self._completed += 1
+                    if failed:
+                        self._failed += 1
+                ticket._done.set()
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+        return values[index]
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+def get_worker_pool() -> WorkerPool:
+    """Get the process-wide run pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+        return _pool
+
+def get_worker_pool_stats() -> Dict[str, Any]:
+    return get_worker_pool().stats()
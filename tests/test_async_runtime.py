@@ -0,0 +1,101 @@
+import threading
+import time
+from core.state import active_drawings, drawings_lock
+from services.async_runtime import AsyncExecutionRuntime
+from core.timing import TimingPolicy
+
+class RecordingDrawingService:
+    """Stands in for DrawingService; records actions instead of sending input."""
+
+    def __init__(self):
+        self.executed = []
+        self.lock = threading.Lock()
+
+    def execute_drawing_action(self, drawing_id, node, timing=None):
+        with self.lock:
+            self.executed.append((drawing_id, node["id"]))
+
+    def prefetch_after(self, drawing_id, graph, node, timing):
+        pass
+
+def register_drawing(drawing_id):
+    with drawings_lock:
+        active_drawings[drawing_id] = {
+            "id": drawing_id,
+            "execution_state": {"is_running": True, "should_stop": False, "status": "running",
+                                "progress": 0, "current_node": None}
+        }
+
+class TestAsyncExecutionRuntime:
+    def teardown_method(self):
+        with drawings_lock:
+            for key in [k for k in active_drawings if k.startswith("async-test-")]:
+                del active_drawings[key]
+
+    def test_waits_run_concurrently(self):
+        """Test many drawings with waits share one loop instead of queueing."""
+        runtime = AsyncExecutionRuntime()
+        service = RecordingDrawingService()
+        finished = []
+        done = threading.Event()
+        count = 50
+
+        def on_finish(drawing_id):
+            finished.append(drawing_id)
+            if len(finished) == count:
+                done.set()
+
+        nodes = [
+            {"id": "1", "action_type": "wait", "params": {"duration": 0.3}, "connections": ["2"]},
+            {"id": "2", "action_type": "click", "params": {}, "connections": []}
+        ]
+        started = time.perf_counter()
+        for i in range(count):
+            drawing_id = f"async-test-{i}"
+            register_drawing(drawing_id)
+            runtime.submit(service, drawing_id, nodes, False, TimingPolicy(), on_finish)
+
+        assert done.wait(5)
+        assert time.perf_counter() - started < 2.0
+        assert len(service.executed) == count
+        assert runtime.stats()["active_tasks"] == 0
+        assert runtime.stats()["runs_finished"] == count
+
+    def test_cancel_interrupts_wait(self):
+        """Test cancelling a run interrupts a pending wait node."""
+        runtime = AsyncExecutionRuntime()
+        service = RecordingDrawingService()
+        done = threading.Event()
+        nodes = [{"id": "1", "action_type": "wait", "params": {"duration": 30}, "connections": []}]
+
+        register_drawing("async-test-cancel")
+        runtime.submit(service, "async-test-cancel", nodes, False, TimingPolicy(), lambda _: done.set())
+        time.sleep(0.1)
+        assert runtime.stats()["active_tasks"] == 1
+        runtime.cancel("async-test-cancel")
+        assert done.wait(2)
+        assert runtime.stats()["active_tasks"] == 0
+
+    def test_fork_branches_overlap(self):
+        """Test fork branches wait concurrently and the join runs once with branch results."""
+        runtime = AsyncExecutionRuntime()
+        service = RecordingDrawingService()
+        done = threading.Event()
+        nodes = [
+            {"id": "f", "action_type": "fork", "params": {}, "connections": ["a", "b"]},
+            {"id": "a", "action_type": "wait", "params": {"duration": 0.3}, "connections": ["j"]},
+            {"id": "b", "action_type": "wait", "params": {"duration": 0.3}, "connections": ["j"]},
+            {"id": "j", "action_type": "join", "params": {"mode": "all"}, "connections": ["end"]},
+            {"id": "end", "action_type": "click", "params": {}, "connections": []}
+        ]
+
+        register_drawing("async-test-fork")
+        started = time.perf_counter()
+        runtime.submit(service, "async-test-fork", nodes, False, TimingPolicy(), lambda _: done.set())
+        assert done.wait(2)
+        assert time.perf_counter() - started < 0.55
+        assert service.executed == [("async-test-fork", "end")]
+        results = active_drawings["async-test-fork"]["execution_state"]["branch_results"]["j"]
+        assert "_branch_results" not in nodes[3]
+        assert [r["branch"] for r in results] == ["a", "b"]
+        assert all(r["status"] == "completed" for r in results)
@@ -0,0 +1,107 @@
+import pytest
+from core import state
+from core.database import DrawingDatabase
+from core.manifest import drawing_summary
+from core.migrate import migrate_directory
+from core.persistence import WriteBehind
+from core.storage import write_document
+
+def make_project(project_id, **fields):
+    return {"id": project_id, "name": project_id, "created_at": "2024-01-01T00:00:00",
+            "last_modified": "2024-01-01T00:00:00", **fields}
+
+def make_drawing(drawing_id, project_id, order, images=(), **fields):
+    nodes = [{"id": str(i), "action_type": "clickimg", "params": {"image_path": image}, "connections": []}
+             for i, image in enumerate(images)]
+    return {"id": drawing_id, "project_id": project_id, "name": drawing_id, "nodes": nodes, "order": order,
+            "boundary": {"x": 0, "y": 0, "width": 10, "height": 10}, "created_at": "2024-01-01T00:00:00",
+            "last_modified": "2024-01-02T00:00:00", **fields}
+
+@pytest.fixture
+def database(tmp_path):
+    database = DrawingDatabase(str(tmp_path / "store.db"))
+    yield database
+    database.close()
+
+class TestDrawingDatabase:
+    def test_drawings_round_trip_and_list_in_order(self, database):
+        """Test stored drawings read back whole and list as manifest-style rows ordered by order."""
+        database.put_project(make_project("p"))
+        second, first = make_drawing("b", "p", 2), make_drawing("a", "p", 1, images=["x.png"])
+        database.put_drawing(second)
+        database.put_drawing(first)
+
+        assert database.get_drawing("a") == first
+        assert database.drawing_rows("p") == [drawing_summary(first), drawing_summary(second)]
+        assert database._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_updating_a_project_keeps_its_drawings(self, database):
+        """Test project metadata updates do not cascade, while deleting the project removes its drawings."""
+        database.put_project(make_project("p"))
+        database.put_drawing(make_drawing("a", "p", 1, images=["x.png"]))
+
+        assert database.update_project("p", {"name": "renamed"})
+        assert database.get_project("p")["name"] == "renamed"
+        assert database.get_drawing("a") is not None
+        assert not database.update_project("missing", {"name": "x"})
+
+        assert database.delete_project("p")
+        assert database.get_drawing("a") is None
+        assert database.drawings_using_image("x.png") == []
+
+    def test_queries(self, database):
+        """Test the image-usage, recently-run and run-history queries."""
+        database.put_project(make_project("p"))
+        database.put_drawing(make_drawing("a", "p", 1, images=["x.png", "y.png", "x.png"],
+                                          last_executed="2024-03-01T00:00:00"))
+        database.put_drawing(make_drawing("b", "p", 2, images=["y.png"], last_executed="2024-04-01T00:00:00"))
+        database.put_drawing(make_drawing("c", "p", 3))
+
+        assert database.drawings_using_image("x.png") == [{"id": "a", "project_id": "p", "name": "a", "nodes": ["0", "2"]}]
+        assert [d["id"] for d in database.drawings_using_image("y.png")] == ["a", "b"]
+        assert [d["id"] for d in database.recently_run_drawings()] == ["b", "a"]
+
+        # Editing a drawing replaces its node rows
+        database.put_drawing(make_drawing("a", "p", 1))
+        assert database.drawings_using_image("x.png") == []
+
+        database.add_run({"drawing_id": "a", "started_at": "2024-01-01T00:00:00", "outcome": "completed"})
+        database.add_run({"drawing_id": "a", "started_at": "2024-01-02T00:00:00", "outcome": "error", "error": "boom"})
+        assert [run["outcome"] for run in database.runs("a")] == ["error", "completed"]
+        assert database.delete_drawing("a") == "p"
+        assert database.delete_drawing("a") is None
+
+class TestMigration:
+    def test_directory_layout_is_imported(self, tmp_path, database):
+        """Test migration imports readable projects and drawings, skips broken files and can be rerun."""
+        projects = tmp_path / "projects"
+        (projects / "p" / "drawings").mkdir(parents=True)
+        write_document(str(projects / "p" / "project.json"), make_project("p"))
+        write_document(str(projects / "p" / "drawings" / "a.json"), make_drawing("a", "p", 1, images=["x.png"]))
+        (projects / "p" / "drawings" / "broken.json").write_text("{")
+        (projects / "jobs.json").write_text("[]")
+
+        assert migrate_directory(str(projects), database) == {"projects": 1, "drawings": 1, "skipped": 1}
+        assert migrate_directory(str(projects), database)["drawings"] == 1
+        assert database.get_drawing("a")["nodes"][0]["params"]["image_path"] == "x.png"
+        assert [row["id"] for row in database.drawing_rows("p")] == ["a"]
+
+class TestSqliteBackend:
+    def test_state_functions_use_the_database(self, database, monkeypatch):
+        """Test the state storage functions read and write through the database when it is configured."""
+        monkeypatch.setattr(state, "_database", database)
+        monkeypatch.setattr(state, "_database_checked", True)
+        monkeypatch.setattr(state, "_write_behind", WriteBehind(lambda ids: None))
+        database.put_project(make_project("sp"))
+        state.store_drawing(make_drawing("sa", "sp", 1, images=["z.png"]))
+
+        assert [p["id"] for p in state.list_projects()] == ["sp"]
+        assert state.load_drawing_from_file("sa")["name"] == "sa"
+        assert [row["id"] for row in state.list_project_drawings("sp")] == ["sa"]
+        assert state.project_drawing_counts(["sp", "empty"]) == {"sp": 1, "empty": 0}
+        assert [d["id"] for d in state.find_drawings_using_image("z.png")] == ["sa"]
+        assert state.update_project_metadata("sp", {"description": "d"})
+        assert state.get_project_metadata("sp")["description"] == "d"
+
+        assert state.delete_drawing("sa")
+        assert state.load_drawing_from_file("sa") is None
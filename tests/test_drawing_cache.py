@@ -0,0 +1,207 @@
+import copy
+import threading
+import pytest
+from core import state
+from core.timing import TimingPolicy
+from services.async_runtime import AsyncExecutionRuntime
+from core.persistence import WriteBehind
+
+def add_drawing(drawing_id, **fields):
+    with state._drawing_lock(drawing_id):
+        state.active_drawings[drawing_id] = {"id": drawing_id, "name": drawing_id, "nodes": [],
+                                             "execution_state": {"progress": 0}, **fields}
+
+class TestCopyOnWriteEntries:
+    def teardown_method(self):
+        for drawing_id in [d for d in state.active_drawings if d.startswith("cow-")]:
+            state.active_drawings.pop(drawing_id, None)
+
+    def test_updates_swap_entries_instead_of_mutating(self, monkeypatch):
+        """Test a writer replaces the cached entry, so a reader's earlier reference never changes under it."""
+        monkeypatch.setattr(state, "_write_behind", WriteBehind(lambda ids: None))
+        add_drawing("cow-1")
+        before = state.active_drawings["cow-1"]
+        before_state = before["execution_state"]
+
+        state.update_drawing_execution_state("cow-1", {"progress": 50})
+        state.update_drawing("cow-1", {"name": "renamed", "nodes": [{"id": "1"}]})
+
+        assert before_state == {"progress": 0}
+        assert before["name"] == "cow-1" and before["nodes"] == []
+        current = state.get_drawing("cow-1")
+        assert current["execution_state"] == {"progress": 50}
+        assert current["name"] == "renamed"
+
+    def test_merged_branch_results_from_concurrent_forks(self):
+        """Test forks finishing at once each add their join's results without dropping the others'."""
+        add_drawing("cow-forks", execution_state={"branch_results": {"old": []}})
+
+        def finish(join_id):
+            state.update_drawing_execution_state("cow-forks", {"branch_results": {join_id: [join_id]}},
+                                                 merge=("branch_results",))
+
+        threads = [threading.Thread(target=finish, args=(f"j{n}",)) for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        results = state.get_drawing_execution_state("cow-forks")["branch_results"]
+        assert results == {"old": [], **{f"j{n}": [f"j{n}"] for n in range(16)}}
+
+    def test_concurrent_writers_lose_no_updates(self):
+        """Test concurrent execution-state updates to one drawing and to many drawings all land."""
+        drawing_ids = [f"cow-{i}" for i in range(8)]
+        for drawing_id in drawing_ids:
+            add_drawing(drawing_id)
+
+        def writer(drawing_id, key):
+            for i in range(200):
+                state.update_drawing_execution_state(drawing_id, {key: i})
+
+        threads = [threading.Thread(target=writer, args=(drawing_id, f"k{n}"))
+                   for drawing_id in drawing_ids for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for drawing_id in drawing_ids:
+            assert state.get_drawing_execution_state(drawing_id) == {"progress": 0, "k0": 199, "k1": 199,
+                                                                     "k2": 199, "k3": 199}
+
+    def test_runs_leave_cached_nodes_unchanged(self):
+        """Test running a drawing with image, if and fork/join nodes does not modify its cached node dicts."""
+        class ImageFindingService:
+            """Records results on the nodes it is given, as DrawingService does"""
+
+            def execute_drawing_action(self, drawing_id, node, timing=None):
+                if node["action_type"] == "findimg":
+                    node["_found"] = True
+                elif node["action_type"] == "if":
+                    node["_condition_result"] = True
+
+            def prefetch_after(self, drawing_id, graph, node, timing):
+                pass
+
+        add_drawing("cow-run", nodes=[
+            {"id": "f", "action_type": "fork", "params": {}, "connections": ["a", "b"]},
+            {"id": "a", "action_type": "findimg", "params": {}, "connections": ["j"]},
+            {"id": "b", "action_type": "if", "params": {}, "connections": ["j"]},
+            {"id": "j", "action_type": "join", "params": {}, "connections": []}
+        ])
+        state.update_drawing_execution_state("cow-run", {"is_running": True, "should_stop": False})
+        before = copy.deepcopy(state.active_drawings["cow-run"]["nodes"])
+        done = threading.Event()
+
+        AsyncExecutionRuntime().submit(ImageFindingService(), "cow-run", state.get_drawing("cow-run")["nodes"],
+                                       False, TimingPolicy(), lambda _: done.set())
+        assert done.wait(2)
+
+        assert state.active_drawings["cow-run"]["nodes"] == before
+        assert [r["results"] for r in state.get_drawing_execution_state("cow-run")["branch_results"]["j"]] == [
+            {"a": True}, {"b": True}]
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Empty cache with small limits, loading drawings from an in-memory store"""
+    store = {}
+    loads = []
+
+    def load(drawing_id):
+        loads.append(drawing_id)
+        drawing = store.get(drawing_id)
+        return {**drawing, "nodes": list(drawing["nodes"])} if drawing else None
+
+    for name, value in (("active_drawings", {}), ("_cache_sizes", {}), ("_last_access", {}),
+                        ("_evicted_drawings", set()), ("_cache_limits", (3, 10 ** 9))):
+        monkeypatch.setattr(state, name, value)
+    monkeypatch.setattr(state, "load_drawing_from_file", load)
+    monkeypatch.setattr(state, "_write_behind", WriteBehind(lambda ids: None, delay=60))
+    for drawing_id in "abcde":
+        store[drawing_id] = {"id": drawing_id, "name": drawing_id,
+                             "nodes": [{"id": str(n), "params": {"text": "x" * 100}} for n in range(10)]}
+    return store, loads
+
+class TestBoundedCache:
+    def test_least_recently_used_drawing_is_evicted(self, cache):
+        """Test loading past the entry limit evicts the least recently read drawing and counts hits and misses."""
+        before = state.get_cache_stats()
+        for drawing_id in "abc":
+            state.get_drawing(drawing_id)
+        state.get_drawing("a")
+        state.get_drawing("d")
+
+        assert sorted(state.active_drawings) == ["a", "c", "d"]
+        stats = state.get_cache_stats()
+        assert stats["entries"] == 3
+        assert stats["bytes"] == sum(state._cache_sizes.values()) > 0
+        assert stats["hits"] - before["hits"] == 1
+        assert stats["misses"] - before["misses"] == 4
+        assert stats["evictions"] - before["evictions"] == 1
+
+    def test_byte_budget_is_respected(self, cache, monkeypatch):
+        """Test the memory budget evicts drawings even when the entry limit is not reached."""
+        state.get_drawing("a")
+        budget = state._cache_sizes["a"] * 2
+        monkeypatch.setattr(state, "_cache_limits", (100, budget))
+        for drawing_id in "bcd":
+            state.get_drawing(drawing_id)
+
+        assert sorted(state.active_drawings) == ["c", "d"]
+        assert state.get_cache_stats()["bytes"] <= budget
+
+    def test_running_and_dirty_drawings_are_kept(self, cache, monkeypatch):
+        """Test drawings that are running or have unsaved edits stay cached over the limit."""
+        monkeypatch.setattr(state, "_cache_limits", (1, 10 ** 9))
+        state.get_drawing("a")
+        state.update_drawing_execution_state("a", {"is_running": True})
+        state.get_drawing("b")
+        state.update_drawing("b", {"name": "edited"})
+        state.get_drawing("c")
+        state.get_drawing("d")
+
+        assert sorted(state.active_drawings) == ["a", "b", "d"]
+
+        # Once the run ends and the edit is written, they can go
+        state.update_drawing_execution_state("a", {"is_running": False})
+        state._write_behind.flush()
+        state.get_drawing("e")
+        assert list(state.active_drawings) == ["e"]
+
+    def test_drawing_being_written_counts_as_dirty(self):
+        """Test a drawing stays dirty until its write has finished, not just until it is taken."""
+        seen = []
+        write_behind = WriteBehind(lambda ids: seen.extend(write_behind.is_dirty(d) for d in ids), delay=60)
+        write_behind.mark_dirty("w")
+        write_behind.flush()
+
+        assert seen == [True]
+        assert not write_behind.is_dirty("w")
+
+    def test_writes_to_an_evicted_drawing_reload_it(self, cache, monkeypatch):
+        """Test state updates after eviction load the drawing back instead of being dropped."""
+        monkeypatch.setattr(state, "_cache_limits", (1, 10 ** 9))
+        state.get_drawing("a")
+        state.get_drawing("b")
+        assert "a" not in state.active_drawings
+        version = state.get_state_version()
+
+        state.update_drawing_execution_state("a", {"progress": 40})
+        assert state.active_drawings["a"]["execution_state"]["progress"] == 40
+        assert state.active_drawings["a"]["execution_state"]["status"] == "idle"
+
+        _, changed, removed = state.wait_for_state_changes(version)
+        assert (changed, removed) == (["a"], [])
+
+        # b was evicted in turn; reading its state reloads it as idle
+        assert state.get_drawing_execution_state("b")["status"] == "idle"
+
+    def test_writes_to_unknown_drawings_are_dropped(self, cache):
+        """Test updates to drawings that were never loaded do not read storage or create entries."""
+        _, loads = cache
+        state.update_drawing_execution_state("zzz", {"progress": 1})
+        state.update_drawing("zzz", {"name": "x"})
+
+        assert state.get_drawing_execution_state("zzz") is None
+        assert loads == [] and "zzz" not in state.active_drawings
@@ -0,0 +1,58 @@
+import json
+from core.drawing_index import DrawingIndex
+
+def write_drawing(root, project_id, drawing_id):
+    drawings_dir = root / project_id / "drawings"
+    drawings_dir.mkdir(parents=True, exist_ok=True)
+    (drawings_dir / f"{drawing_id}.json").write_text(json.dumps({"id": drawing_id}))
+
+class TestDrawingIndex:
+    def make(self, tmp_path):
+        self.root = tmp_path / "projects"
+        self.root.mkdir()
+        self.index_path = str(self.root / "drawing_index.json")
+        return DrawingIndex(str(self.root), "drawings", self.index_path)
+
+    def test_built_lazily_and_persisted(self, tmp_path):
+        """Test the first lookup scans the projects once and later instances load the saved index."""
+        index = self.make(tmp_path)
+        write_drawing(self.root, "p1", "d1")
+        write_drawing(self.root, "p2", "d2")
+
+        assert index.project_for("d2") == "p2"
+        assert index.project_for("d1") == "p1"
+        assert index.rebuilds == 1
+
+        reloaded = DrawingIndex(str(self.root), "drawings", self.index_path)
+        assert reloaded.path_for("d1") == str(self.root / "p1" / "drawings" / "d1.json")
+        assert reloaded.rebuilds == 0
+
+    def test_updates_without_rescanning(self, tmp_path):
+        """Test add, remove and remove_project keep the index current without a scan."""
+        index = self.make(tmp_path)
+        index.rebuild()
+        write_drawing(self.root, "p1", "d1")
+        write_drawing(self.root, "p1", "d2")
+        index.add("d1", "p1")
+        index.add("d2", "p1")
+        assert index.project_for("d1") == "p1"
+
+        index.remove("d1")
+        index.remove_project("p1")
+        assert index.project_for("d1") is None
+        assert index.project_for("d2") is None
+        assert index.rebuilds == 1
+
+    def test_stale_or_corrupt_index_is_rebuilt(self, tmp_path):
+        """Test an entry pointing at a moved drawing and an unreadable index file both trigger a rebuild."""
+        index = self.make(tmp_path)
+        write_drawing(self.root, "p2", "d1")
+        index.rebuild()
+        index.add("d1", "p1")
+
+        assert index.project_for("d1") == "p2"
+        assert index.rebuilds == 2
+
+        with open(self.index_path, "w") as f:
+            f.write("{not json")
+        assert DrawingIndex(str(self.root), "drawings", self.index_path).project_for("d1") == "p2"
@@ -0,0 +1,47 @@
+import threading
+from core.events import EventBus, get_event_bus
+from core import state
+
+class TestEventBus:
+    def test_ids_and_resume(self):
+        """Test events get increasing ids and a reader resumes after its last id."""
+        bus = EventBus()
+        first = bus.publish("drawing", {"progress": 10})
+        second = bus.publish("drawing", {"progress": 20})
+        assert second == first + 1
+
+        events, complete = bus.since(first)
+        assert complete
+        assert [event.data["progress"] for event in events] == [20]
+        assert bus.since(second) == ([], True)
+
+    def test_overwritten_cursor_needs_resync(self):
+        """Test a reader whose last id fell out of the ring buffer is told it missed events."""
+        bus = EventBus(capacity=3)
+        for i in range(5):
+            bus.publish("drawing", {"i": i})
+        events, complete = bus.since(1)
+        assert not complete
+        assert [event.data["i"] for event in events] == [2, 3, 4]
+        assert bus.since(2)[1]
+
+    def test_wait_wakes_on_publish(self):
+        """Test a waiting reader is woken by the next event and times out otherwise."""
+        bus = EventBus()
+        assert bus.wait(0, timeout=0.05) == ([], True)
+
+        threading.Timer(0.05, bus.publish, args=("execute_all", {"status": "running"})).start()
+        events, _ = bus.wait(0, timeout=2)
+        assert events[0].type == "execute_all"
+
+    def test_state_updates_publish_public_deltas(self):
+        """Test execution state updates publish deltas without process-local keys."""
+        bus = get_event_bus()
+        cursor = bus.last_id
+        state.update_drawing_execution_state("sse-test", {"current_node": "n1", "thread": object()})
+        state.update_drawing_execution_state("sse-test", {"is_running": False, "should_stop": True})
+
+        events, _ = bus.since(cursor)
+        assert [event.type for event in events] == ["drawing", "drawing", "run_finished"]
+        assert events[0].data == {"drawing_id": "sse-test", "current_node": "n1"}
+        assert events[1].data == {"drawing_id": "sse-test", "is_running": False}
@@ -0,0 +1,60 @@
+from core.graph import DrawingGraph, ForkBranch
+
+def make_node(node_id, action_type, connections=None, params=None):
+    return {"id": node_id, "action_type": action_type, "params": params or {}, "connections": connections or []}
+
+class TestDrawingGraph:
+    def test_find_join(self):
+        """Test a fork resolves to the join its branches meet at."""
+        graph = DrawingGraph([
+            make_node("f", "fork", ["a", "b"]),
+            make_node("a", "findimg", ["j"]),
+            make_node("b", "wait", ["c"]),
+            make_node("c", "findimg", ["j"]),
+            make_node("j", "join", ["end"]),
+            make_node("end", "click")
+        ])
+        assert graph.find_join(graph.get("f")) == "j"
+
+    def test_find_join_skips_nested_pairs(self):
+        """Test a nested fork's join is not mistaken for the outer join."""
+        graph = DrawingGraph([
+            make_node("outer", "fork", ["inner", "x"]),
+            make_node("inner", "fork", ["a", "b"]),
+            make_node("a", "findimg", ["inner-join"]),
+            make_node("b", "findimg", ["inner-join"]),
+            make_node("inner-join", "join", ["outer-join"]),
+            make_node("x", "wait", ["outer-join"]),
+            make_node("outer-join", "join")
+        ])
+        assert graph.find_join(graph.get("inner")) == "inner-join"
+        assert graph.find_join(graph.get("outer")) == "outer-join"
+
+    def test_fork_without_join(self):
+        """Test a fork with no downstream join returns None."""
+        graph = DrawingGraph([make_node("f", "fork", ["a"]), make_node("a", "click")])
+        assert graph.find_join(graph.get("f")) is None
+        assert graph.join_mode(None) == "all"
+        assert graph.join_mode(make_node("j", "join", params={"mode": "any"})) == "any"
+
+    def test_run_results_stay_on_the_graph(self):
+        """Test results recorded on graph nodes do not reach the caller's node dicts."""
+        nodes = [make_node("a", "findimg", ["b"]), make_node("b", "if")]
+        graph = DrawingGraph(nodes)
+        graph.get("a")["_found"] = True
+        graph.start_nodes[0]["_condition_result"] = False
+
+        assert graph.get("a")["_found"] and "_condition_result" in graph.get("a")
+        assert nodes == [make_node("a", "findimg", ["b"]), make_node("b", "if")]
+
+    def test_branch_cancel_propagates(self):
+        """Test cancelling an outer branch stops nested branches at their next node."""
+        outer = ForkBranch("a", "j")
+        inner = ForkBranch("b", "k", outer)
+        assert not inner.stops_at("c")
+        outer.cancel()
+        assert inner.stops_at("c")
+        inner.finish()
+        assert inner.result()["status"] == "completed"
+        outer.finish()
+        assert outer.result()["status"] == "cancelled"
@@ -0,0 +1,33 @@
+import threading
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+cv2 = pytest.importorskip("cv2")
+image_recognition = pytest.importorskip("image_recognition")
+from PIL import Image
+
+class TestFullScreenSearch:
+    def test_parallel_branches_share_no_capture_file(self, tmp_path, monkeypatch):
+        """Test two full-screen searches running at once both find their target without a screenshot file."""
+        rng = np.random.default_rng(3)
+        screen = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+        for name, (x, y) in (("a", (10, 20)), ("b", (90, 60))):
+            cv2.imwrite(str(tmp_path / f"{name}.png"), cv2.cvtColor(screen[y:y + 20, x:x + 30], cv2.COLOR_RGB2BGR))
+
+        # Both branches wait inside the capture until the other one is there too
+        overlap = threading.Barrier(2)
+
+        def grab(bbox=None):
+            overlap.wait(timeout=5)
+            return Image.fromarray(screen)
+        monkeypatch.setattr(image_recognition.ImageGrab, "grab", grab)
+        monkeypatch.chdir(tmp_path)
+
+        recognizer = image_recognition.ImageRecognition()
+        with ThreadPoolExecutor(2) as pool:
+            found = list(pool.map(lambda name: recognizer.find_image_in_region(str(tmp_path / f"{name}.png"), None),
+                                  ("a", "b")))
+
+        assert [result["top_left"] for result in found] == [(10, 20), (90, 60)]
+        assert not (tmp_path / "screenshot.png").exists()
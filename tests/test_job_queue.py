@@ -0,0 +1,125 @@
+import threading
+import time
+from services.job_queue import JobQueue
+
+class FakeRunner:
+    """Stands in for DrawingJobRunner; each drawing blocks until released."""
+
+    def __init__(self, projects=None):
+        self.projects = projects or {}
+        self.busy = set()
+        self.started = []
+        self.release = {}
+        self.lock = threading.Lock()
+
+    def validate(self, job):
+        if job.target == "missing":
+            raise ValueError(f"Drawing {job.target} not found")
+
+    def drawings_for(self, job):
+        return self.projects.get(job.target, [job.target]) if job.kind == "project" else [job.target]
+
+    def is_busy(self, drawing_id):
+        return drawing_id in self.busy
+
+    def run(self, job, cancelled):
+        with self.lock:
+            self.started.append(job.target)
+            event = self.release.setdefault(job.id, threading.Event())
+        while not event.wait(0.01):
+            if cancelled():
+                return
+
+    def stop(self, job):
+        pass
+
+    def finish(self, job_id):
+        with self.lock:
+            self.release.setdefault(job_id, threading.Event()).set()
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+class TestJobQueue:
+    def setup_method(self):
+        self.runner = FakeRunner({"p1": ["d1", "d2"]})
+
+    def test_concurrency_limit_and_priority(self):
+        """Test jobs beyond the limit wait and the highest priority starts next."""
+        queue = JobQueue(self.runner, max_concurrent=1)
+        first = queue.submit("drawing", "a")
+        assert wait_for(lambda: queue.get(first["id"])["state"] == "running")
+        low = queue.submit("drawing", "b", priority=0)
+        high = queue.submit("drawing", "c", priority=5)
+
+        assert queue.get(high["id"])["position"] == 1
+        assert queue.get(low["id"])["position"] == 2
+
+        self.runner.finish(first["id"])
+        assert wait_for(lambda: queue.get(high["id"])["state"] == "running")
+        assert queue.get(low["id"])["state"] == "queued"
+
+        self.runner.finish(high["id"])
+        self.runner.finish(low["id"])
+        assert wait_for(lambda: queue.get(low["id"])["state"] == "completed")
+        assert self.runner.started == ["a", "c", "b"]
+
+    def test_drawing_exclusivity(self):
+        """Test a job waits while another job holds one of its drawings."""
+        queue = JobQueue(self.runner, max_concurrent=4)
+        project = queue.submit("project", "p1")
+        same = queue.submit("drawing", "d2")
+        other = queue.submit("drawing", "d3")
+
+        assert wait_for(lambda: queue.get(other["id"])["state"] == "running")
+        assert queue.get(project["id"])["state"] == "running"
+        assert queue.get(same["id"])["state"] == "queued"
+
+        self.runner.finish(project["id"])
+        assert wait_for(lambda: queue.get(same["id"])["state"] == "running")
+        self.runner.finish(same["id"])
+        self.runner.finish(other["id"])
+
+    def test_cancel_queued_and_running(self):
+        """Test cancelling a queued job drops it and a running job ends cancelled."""
+        queue = JobQueue(self.runner, max_concurrent=1)
+        running = queue.submit("drawing", "a")
+        assert wait_for(lambda: queue.get(running["id"])["state"] == "running")
+        queued = queue.submit("drawing", "b")
+
+        assert queue.cancel(queued["id"])["state"] == "cancelled"
+        queue.cancel(running["id"])
+        assert wait_for(lambda: queue.get(running["id"])["state"] == "cancelled")
+        assert self.runner.started == ["a"]
+
+    def test_invalid_submissions_are_rejected(self):
+        """Test validation errors surface as ValueError and nothing is queued."""
+        queue = JobQueue(self.runner)
+        for kind, target, priority in (("drawing", "missing", 0), ("script", "a", 0), ("drawing", "a", "high")):
+            try:
+                queue.submit(kind, target, priority=priority)
+                assert False, "expected ValueError"
+            except ValueError:
+                pass
+        assert queue.list_jobs() == []
+
+    def test_queue_survives_restart(self, tmp_path):
+        """Test queued and interrupted jobs are reloaded from the store."""
+        store = str(tmp_path / "jobs.json")
+        self.runner.busy.add("a")
+        queue = JobQueue(self.runner, store_path=store)
+        waiting = queue.submit("drawing", "a", {"speed": 2.0}, priority=3)
+
+        reloaded = JobQueue(FakeRunner(), store_path=store)
+        job = reloaded.get(waiting["id"])
+        assert job["priority"] == 3
+        assert job["params"] == {"speed": 2.0}
+        assert wait_for(lambda: reloaded.get(waiting["id"])["state"] == "running")
+        reloaded.runner.finish(waiting["id"])
+        assert wait_for(lambda: reloaded.get(waiting["id"])["state"] == "completed")
+        assert reloaded.get(waiting["id"])["wait_seconds"] >= 0
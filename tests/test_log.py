@@ -0,0 +1,47 @@
+import io
+from core.log import (
+    get_logger, setup_logging, shutdown_logging, set_debug, set_level, get_level, debug_enabled
+)
+
+class TestStructuredLogging:
+    def setup_method(self):
+        shutdown_logging()
+        self.stream = io.StringIO()
+        setup_logging("INFO", stream=self.stream)
+        self.log = get_logger("tests")
+
+    def teardown_method(self):
+        set_debug("drawing-a", False)
+        shutdown_logging()
+
+    def output(self):
+        # Stopping the listener drains the queue
+        shutdown_logging()
+        return self.stream.getvalue()
+
+    def test_fields_are_formatted(self):
+        """Test events are written with key=value fields."""
+        self.log.warning("click outside screen skipped", node="n1", x=5, name="two words")
+        line = self.output().strip()
+        assert "WARNING" in line
+        assert "copilotnode.tests click outside screen skipped" in line
+        assert "node=n1 x=5 name='two words'" in line
+
+    def test_debug_is_scoped(self):
+        """Test debug records only appear for scopes with debug enabled."""
+        self.log.debug("drawing-a", "execute node", node="1")
+        set_debug("drawing-a")
+        assert debug_enabled("drawing-a")
+        self.log.debug("drawing-a", "execute node", node="2")
+        self.log.debug("drawing-b", "execute node", node="3")
+        lines = self.output().strip().splitlines()
+        assert len(lines) == 1
+        assert "scope=drawing-a node=2" in lines[0]
+
+    def test_level_can_change_at_runtime(self):
+        """Test the global level gates debug output for every scope."""
+        set_level("debug")
+        assert get_level() == "DEBUG"
+        self.log.debug("drawing-b", "execute node", node="1")
+        set_level("INFO")
+        assert "scope=drawing-b" in self.output()
@@ -0,0 +1,83 @@
+import json
+import pytest
+from core.manifest import ManifestStore
+
+def write_drawing(root, project_id, drawing_id, **fields):
+    drawings_dir = root / project_id / "drawings"
+    drawings_dir.mkdir(parents=True, exist_ok=True)
+    drawing = {"id": drawing_id, "name": drawing_id, "order": 1, "nodes": [{"id": "1"}, {"id": "2"}], **fields}
+    (drawings_dir / f"{drawing_id}.json").write_text(json.dumps(drawing))
+    return drawing
+
+class TestManifestStore:
+    def make(self, tmp_path):
+        self.root = tmp_path / "projects"
+        self.root.mkdir()
+        return ManifestStore(str(self.root), "drawings")
+
+    def test_rebuilt_once_then_trusted(self, tmp_path):
+        """Test a project without a manifest is summarised from its drawings once, then read from the manifest."""
+        store = self.make(tmp_path)
+        write_drawing(self.root, "p1", "d1")
+        write_drawing(self.root, "p1", "d2", order=2)
+
+        rows = sorted(store.rows("p1"), key=lambda row: row["order"])
+        assert [(row["id"], row["node_count"]) for row in rows] == [("d1", 2), ("d2", 2)]
+        assert "nodes" not in rows[0]
+        assert (self.root / "p1" / "manifest.json").exists()
+
+        # Later reads parse nothing while every drawing file is unchanged
+        store._summarise = lambda project_id, drawing_id: pytest.fail("drawing was re-parsed")
+        assert len(store.rows("p1")) == 2
+
+    def test_count_reads_only_the_manifest(self, tmp_path):
+        """Test counting drawings builds a missing manifest once, then neither stats nor parses drawing files."""
+        store = self.make(tmp_path)
+        write_drawing(self.root, "p1", "d1")
+        write_drawing(self.root, "p1", "d2")
+        assert store.count("p1") == 2
+        assert store.count("empty") == 0
+
+        store._scan = lambda project_id: pytest.fail("drawing files were checked")
+        store._summarise = lambda project_id, drawing_id: pytest.fail("drawing was re-parsed")
+        assert store.count("p1") == 2
+
+    def test_stale_rows_are_refreshed(self, tmp_path):
+        """Test rows whose drawing file changed without a manifest update are re-read on the next listing."""
+        store = self.make(tmp_path)
+        write_drawing(self.root, "p1", "d1")
+        write_drawing(self.root, "p1", "d2")
+        store.rows("p1")
+
+        # A drawing written whose manifest update never landed, as after a crash between the two writes
+        write_drawing(self.root, "p1", "d1", name="renamed")
+        write_drawing(self.root, "p1", "d3")
+        (self.root / "p1" / "drawings" / "d2.json").unlink()
+
+        assert sorted((row["id"], row["name"]) for row in store.rows("p1")) == [("d1", "renamed"), ("d3", "d3")]
+        stored = json.loads((self.root / "p1" / "manifest.json").read_text())
+        assert set(stored["drawings"]) == set(stored["stamps"]) == {"d1", "d3"}
+
+    def test_writes_update_rows(self, tmp_path):
+        """Test upsert and remove keep the manifest in step with drawing writes."""
+        store = self.make(tmp_path)
+        write_drawing(self.root, "p1", "d1")
+        store.rows("p1")
+
+        store.upsert("p1", write_drawing(self.root, "p1", "d2", name="second", nodes=[]))
+        store.upsert("p1", write_drawing(self.root, "p1", "d1", order=5))
+        (self.root / "p1" / "drawings" / "d1.json").unlink()
+        store.remove("p1", "d1")
+
+        rows = ManifestStore(str(self.root), "drawings").rows("p1")
+        assert rows == [{"id": "d2", "name": "second", "created_at": None, "last_modified": None,
+                         "order": 1, "node_count": 0, "boundary": None}]
+
+    def test_corrupt_manifest_is_rebuilt(self, tmp_path):
+        """Test an unreadable manifest is replaced by one rebuilt from the drawing files."""
+        store = self.make(tmp_path)
+        write_drawing(self.root, "p1", "d1")
+        (self.root / "p1" / "manifest.json").write_text("{broken")
+
+        assert [row["id"] for row in store.rows("p1")] == ["d1"]
+        assert json.loads((self.root / "p1" / "manifest.json").read_text())["drawings"]["d1"]["node_count"] == 2
@@ -0,0 +1,71 @@
+import threading
+from core.metrics import Registry
+
+class TestMetrics:
+    def test_counter_sums_thread_shards(self):
+        """Test increments from many threads are all counted on scrape."""
+        counter = Registry().counter("runs_total", "Runs", ("outcome",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("completed")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc("error", amount=2)
+
+        assert counter.value("completed") == 8000
+        assert counter.samples() == ['runs_total{outcome="completed"} 8000', 'runs_total{outcome="error"} 2']
+
+    def test_finished_thread_shards_are_retired(self):
+        """Test shards of finished threads fold into one total instead of piling up."""
+        registry = Registry()
+        counter = registry.counter("jobs_total", "Jobs")
+        histogram = registry.histogram("job_seconds", "Jobs", buckets=(1.0,))
+
+        def work():
+            counter.inc()
+            histogram.observe(0.5)
+
+        for _ in range(50):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        assert counter.value() == 50
+        assert histogram.count() == 50
+        assert len(counter._shards) <= 1 and len(histogram._shards) <= 1
+        assert histogram.samples()[-2:] == ['job_seconds_sum 25', 'job_seconds_count 50']
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram output has cumulative buckets, +Inf, sum and count."""
+        histogram = Registry().histogram("match_seconds", "Match", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.samples() == [
+            'match_seconds_bucket{le="0.1"} 1',
+            'match_seconds_bucket{le="1"} 3',
+            'match_seconds_bucket{le="+Inf"} 4',
+            'match_seconds_sum 4.05',
+            'match_seconds_count 4',
+        ]
+
+    def test_render_format(self):
+        """Test the exposition text has HELP/TYPE headers, escaped labels and callback gauges."""
+        registry = Registry()
+        registry.counter("requests_total", "Requests", ("route",)).inc('/a"b')
+        registry.gauge("cache_size", "Cache", lambda: 3)
+        text = registry.render()
+
+        assert "# HELP requests_total Requests\n# TYPE requests_total counter\n" in text
+        assert 'requests_total{route="/a\\"b"} 1\n' in text
+        assert "# TYPE cache_size gauge\ncache_size 3\n" in text
+        try:
+            registry.counter("cache_size", "Duplicate")
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
@@ -0,0 +1,90 @@
+import random
+import pytest
+from core import state
+from core.database import DrawingDatabase
+from core.ordering import rank_between, spread_ranks, needs_rebalance, DIGITS
+from core.persistence import WriteBehind
+
+class TestRanks:
+    def test_rank_between_sorts_between_its_bounds(self):
+        """Test ranks made at random positions always sort between their neighbours and never end in the lowest digit."""
+        rng = random.Random(7)
+        ranks = []
+        for _ in range(500):
+            position = rng.randint(0, len(ranks))
+            before = ranks[position - 1] if position > 0 else None
+            after = ranks[position] if position < len(ranks) else None
+            rank = rank_between(before, after)
+            assert (before is None or before < rank) and (after is None or rank < after)
+            assert not rank.endswith(DIGITS[0])
+            ranks.insert(position, rank)
+        assert ranks == sorted(ranks)
+
+    def test_repeated_moves_into_one_gap_grow_slowly(self):
+        """Test always inserting just after the first rank needs a rebalance only after many moves."""
+        first, after = rank_between(None, None), None
+        moves = 0
+        while True:
+            after = rank_between(first, after)
+            moves += 1
+            if needs_rebalance(after):
+                break
+        assert moves > 30
+
+    def test_spread_ranks(self):
+        """Test spread ranks are ascending, distinct and short."""
+        for count in (0, 1, 2, 61, 62, 500):
+            ranks = spread_ranks(count)
+            assert len(ranks) == count
+            assert ranks == sorted(set(ranks))
+            assert all(ranks) and not any(r.endswith(DIGITS[0]) for r in ranks)
+        assert max(len(r) for r in spread_ranks(500)) == 2
+
+    def test_bounds_must_be_ordered(self):
+        """Test a before rank that does not sort before the after rank is rejected."""
+        with pytest.raises(ValueError):
+            rank_between("b", "a")
+
+class TestReorder:
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        database = DrawingDatabase(str(tmp_path / "store.db"))
+        monkeypatch.setattr(state, "_database", database)
+        monkeypatch.setattr(state, "_database_checked", True)
+        monkeypatch.setattr(state, "_write_behind", WriteBehind(lambda ids: None))
+        database.put_project({"id": "p", "name": "p", "last_modified": ""})
+        for order, drawing_id in enumerate("abcd", 1):
+            database.put_drawing({"id": drawing_id, "project_id": "p", "name": drawing_id, "nodes": [],
+                                  "order": order, "last_modified": "2024-01-01T00:00:00"})
+        stored = []
+        monkeypatch.setattr(state, "store_drawing", lambda drawing: stored.append(drawing["id"]))
+        yield database, stored
+        database.close()
+
+    def order(self):
+        return [(d["id"], d["order"]) for d in state.list_project_drawings("p")]
+
+    def test_moves_only_write_the_rank_map(self, project):
+        """Test moving drawings reorders the listing without writing any drawing."""
+        database, stored = project
+        assert state.reorder_drawing("p", "d", 1)
+        assert self.order() == [("d", 1), ("a", 2), ("b", 3), ("c", 4)]
+
+        assert state.move_drawing_down("p", "a")
+        assert state.move_drawing_up("p", "c")
+        assert [d for d, _ in self.order()] == ["d", "b", "c", "a"]
+
+        assert not state.move_drawing_up("p", "d")
+        assert not state.move_drawing_down("p", "a")
+        assert not state.reorder_drawing("p", "missing", 1)
+        assert stored == []
+        assert set(database.get_project("p")["drawing_ranks"]) == set("abcd")
+
+    def test_many_moves_rebalance(self, project):
+        """Test moving drawings back and forth many times keeps ranks short and the order right."""
+        for _ in range(100):
+            state.reorder_drawing("p", "c", 2)
+            state.reorder_drawing("p", "b", 2)
+        ranks = state.get_project_metadata("p")["drawing_ranks"]
+        assert [d for d, _ in self.order()] == ["a", "b", "c", "d"]
+        assert not any(needs_rebalance(rank) for rank in ranks.values())
@@ -0,0 +1,95 @@
+import pytest
+from core import state
+from core.patch import RevisionConflict, apply_operations
+from core.persistence import WriteBehind
+
+def make_nodes():
+    return [
+        {"id": "1", "action_type": "click", "title": "A", "params": {"x": 1}, "connections": ["2"]},
+        {"id": "2", "action_type": "wait", "title": "B", "params": {"duration": 1}, "connections": ["3"]},
+        {"id": "3", "action_type": "click", "title": "C", "params": {}, "connections": []},
+    ]
+
+class TestApplyOperations:
+    def test_operations_apply_in_order(self):
+        """Test each operation kind edits the node list as documented."""
+        nodes = apply_operations(make_nodes(), [
+            {"op": "add", "node": {"id": "4", "action_type": "keyboard", "params": {"text": "hi"}}},
+            {"op": "connect", "id": "3", "target": "4"},
+            {"op": "update", "id": "1", "fields": {"title": "Start", "pos": [10, 20]}},
+            {"op": "set_params", "id": "2", "params": {"duration": 2, "random": True}},
+            {"op": "set_params", "id": "1", "params": {"x": None}},
+            {"op": "disconnect", "id": "1", "target": "2"},
+            {"op": "disconnect", "id": "1", "target": "2"},
+        ])
+
+        by_id = {node["id"]: node for node in nodes}
+        assert [node["id"] for node in nodes] == ["1", "2", "3", "4"]
+        assert by_id["1"]["title"] == "Start" and by_id["1"]["pos"] == [10, 20]
+        assert by_id["1"]["params"] == {} and by_id["1"]["connections"] == []
+        assert by_id["2"]["params"] == {"duration": 2, "random": True}
+        assert by_id["3"]["connections"] == ["4"]
+        assert by_id["4"]["connections"] == []
+
+    def test_remove_drops_incoming_connections(self):
+        """Test removing a node also removes every connection pointing at it."""
+        nodes = apply_operations(make_nodes(), [{"op": "remove", "id": "2"}])
+        assert [node["id"] for node in nodes] == ["1", "3"]
+        assert nodes[0]["connections"] == []
+
+    def test_input_is_not_modified(self):
+        """Test untouched nodes are shared and edited nodes are copies, leaving the original list intact."""
+        original = make_nodes()
+        nodes = apply_operations(original, [{"op": "set_params", "id": "2", "params": {"duration": 5}}])
+        assert original == make_nodes()
+        assert nodes[0] is original[0]
+        assert nodes[1] is not original[1]
+
+    @pytest.mark.parametrize("operation", [
+        {"op": "add", "node": {"id": "1"}},
+        {"op": "update", "id": "9", "fields": {"title": "x"}},
+        {"op": "update", "id": "1", "fields": {"id": "7"}},
+        {"op": "connect", "id": "1", "target": "9"},
+        {"op": "remove"},
+        {"op": "rename", "id": "1"},
+    ])
+    def test_invalid_operation_rejects_whole_patch(self, operation):
+        """Test an invalid operation raises ValueError without applying earlier ones."""
+        original = make_nodes()
+        with pytest.raises(ValueError):
+            apply_operations(original, [{"op": "set_params", "id": "1", "params": {"x": 5}}, operation])
+        assert original == make_nodes()
+
+class TestPatchDrawing:
+    def setup_method(self):
+        with state.drawings_lock:
+            state.active_drawings["p1"] = {"id": "p1", "name": "p1", "nodes": make_nodes(),
+                                           "revision": 3, "execution_state": {}}
+
+    def teardown_method(self):
+        with state.drawings_lock:
+            state.active_drawings.pop("p1", None)
+
+    def test_patch_bumps_revision_and_journals_operations(self, tmp_path, monkeypatch):
+        """Test a patch at the current revision applies, bumps the revision and journals only the operations."""
+        journal = tmp_path / "drawings.journal"
+        monkeypatch.setattr(state, "_write_behind", WriteBehind(lambda ids: None, str(journal), delay=60))
+        operations = [{"op": "update", "id": "3", "fields": {"title": "End"}}]
+
+        assert state.patch_drawing("p1", 3, operations) == 4
+        assert state.get_drawing("p1")["nodes"][2]["title"] == "End"
+        records = state.get_write_behind().pending_records()
+        assert records == [{"id": "p1", "at": records[0]["at"], "patch": operations, "revision": 4}]
+
+    def test_stale_revision_is_rejected(self, tmp_path, monkeypatch):
+        """Test a patch based on an old revision raises RevisionConflict and changes nothing."""
+        monkeypatch.setattr(state, "_write_behind", WriteBehind(lambda ids: None, str(tmp_path / "j"), delay=60))
+        with pytest.raises(RevisionConflict) as conflict:
+            state.patch_drawing("p1", 2, [{"op": "remove", "id": "1"}])
+        assert conflict.value.current_revision == 3
+        assert len(state.get_drawing("p1")["nodes"]) == 3
+
+        state.update_drawing("p1", {"nodes": []})
+        assert state.get_drawing("p1")["revision"] == 4
+        with pytest.raises(RevisionConflict):
+            state.patch_drawing("p1", 3, [])
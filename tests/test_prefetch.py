@@ -0,0 +1,67 @@
+import time
+from core.graph import DrawingGraph
+from services.prefetch import PrefetchService
+
+class FakeRecognition:
+    """Stands in for ImageRecognition; counts captures instead of grabbing the screen."""
+
+    def __init__(self):
+        self.captures = 0
+
+    def capture_region(self, region_bbox=None):
+        self.captures += 1
+        return "frame", time.perf_counter()
+
+    def match_in_frame(self, target_image_path, frame, region_bbox=None, threshold=0.8, captured_at=None):
+        return {"found": True, "confidence": 0.9, "position": (10, 20), "captured_at": captured_at,
+                "image": target_image_path}
+
+def make_node(node_id, action_type, connections=None, params=None):
+    return {"id": node_id, "action_type": action_type, "params": params or {}, "connections": connections or []}
+
+class TestPrefetchService:
+    def setup_method(self):
+        self.graph = DrawingGraph([
+            make_node("wait", "wait", ["fork"], {"duration": 0.3}),
+            make_node("fork", "fork", ["a", "b", "click"]),
+            make_node("a", "clickimg", [], {"image_path": "a.png"}),
+            make_node("b", "if", [], {"condition_type": "image_exists", "image_path": "b.png"}),
+            make_node("click", "click", ["c"]),
+            make_node("c", "findimg", [], {"image_path": "c.png"})
+        ])
+        self.recognition = FakeRecognition()
+        self.service = PrefetchService(self.recognition, max_age=0.25)
+
+    def test_lookahead_stops_at_screen_changing_nodes(self):
+        """Test lookahead passes through fork/join but not through input nodes."""
+        upcoming = self.service.upcoming_image_nodes(self.graph, self.graph.get("wait"))
+        assert [node["id"] for node in upcoming] == ["a", "b"]
+
+    def test_fresh_match_is_taken(self):
+        """Test one capture serves all candidates and lands as the wait ends."""
+        self.service.schedule("d1", self.graph, self.graph.get("wait"), 0.3)
+        time.sleep(0.3)
+        result = self.service.take("d1", "a", "a.png")
+        assert result is not None and result["image"] == "a.png"
+        assert self.service.take("d1", "b", "b.png") is not None
+        assert self.recognition.captures == 1
+        assert self.service.stats()["hits"] == 2
+
+    def test_stale_or_mismatched_results_are_rejected(self):
+        """Test old frames and changed templates fall back to a live match."""
+        self.service.max_age = 0.05
+        self.service.schedule("d1", self.graph, self.graph.get("wait"), 0.15)
+        time.sleep(0.35)
+        assert self.service.take("d1", "a", "a.png") is None
+        assert self.service.take("d1", "b", "other.png") is None
+        stats = self.service.stats()
+        assert stats["stale"] == 1
+        assert stats["misses"] == 1
+
+    def test_node_running_early_drops_queued_job(self):
+        """Test a node that runs before its prefetch is due does not get a late match."""
+        self.service.schedule("d1", self.graph, self.graph.get("wait"), 5.0)
+        assert self.service.take("d1", "a", "a.png") is None
+        self.service.cancel("d1")
+        assert self.service.stats()["queued"] == 0
+        assert self.recognition.captures == 0
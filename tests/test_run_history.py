@@ -0,0 +1,92 @@
+import json
+import pytest
+from core import state
+from core.database import DrawingDatabase
+from core.run_history import RunHistory
+
+def make_run(drawing_id, minute, outcome="completed", **fields):
+    return {"drawing_id": drawing_id, "started_at": f"2024-01-01T00:{minute:02d}:00",
+            "finished_at": f"2024-01-01T00:{minute:02d}:30", "outcome": outcome, "node_count": 3,
+            "duration": 30.0, **fields}
+
+@pytest.fixture
+def projects(tmp_path):
+    (tmp_path / "p").mkdir()
+    return tmp_path
+
+class TestRunHistory:
+    def test_queries(self, projects):
+        """Test runs come back newest first, filtered by drawing, outcome and start time."""
+        history = RunHistory(str(projects))
+        history.append("p", make_run("a", 1))
+        history.append("p", make_run("b", 2, "error", error="boom"))
+        history.append("p", make_run("a", 3, "stopped"))
+
+        assert [(r["drawing_id"], r["outcome"]) for r in history.runs("p")] == [
+            ("a", "stopped"), ("b", "error"), ("a", "completed")]
+        assert [r["started_at"][-5:] for r in history.runs("p", "a")] == ["03:00", "01:00"]
+        assert history.runs("p", outcome="error")[0] == {**make_run("b", 2, "error", error="boom"), "project_id": "p"}
+        assert len(history.runs("p", since="2024-01-01T00:02:00")) == 2
+        assert len(history.runs("p", limit=1)) == 1
+        assert history.runs("p", "missing") == []
+        assert history.last_executed("p") == {"a": "2024-01-01T00:03:30", "b": "2024-01-01T00:02:30"}
+        assert not history.append("no-such-project", make_run("a", 4))
+
+        # One compact line per run, read back by a new process
+        lines = (projects / "p" / "runs.jsonl").read_text().splitlines()
+        assert len(lines) == 3 and "error" not in json.loads(lines[0])
+        assert RunHistory(str(projects)).runs("p") == history.runs("p")
+
+    def test_retention(self, projects):
+        """Test the log is trimmed to the newest runs once it outgrows the limit."""
+        history = RunHistory(str(projects), limit=4)
+        for minute in range(10):
+            history.append("p", make_run("a", minute))
+
+        assert len((projects / "p" / "runs.jsonl").read_text().splitlines()) <= 5
+        assert [r["started_at"][-5:] for r in history.runs("p")][:4] == ["09:00", "08:00", "07:00", "06:00"]
+        assert len(RunHistory(str(projects), limit=4).runs("p")) == 4
+
+    def test_torn_last_line_is_dropped(self, projects):
+        """Test a partial line left by a crash is dropped so later appends stay readable."""
+        path = projects / "p" / "runs.jsonl"
+        path.write_text(json.dumps(make_run("a", 1)) + "\n" + '{"drawing_id": "a", "sta')
+        history = RunHistory(str(projects))
+        history.append("p", make_run("a", 2))
+
+        assert len(history.runs("p")) == 2
+        assert len(RunHistory(str(projects)).runs("p")) == 2
+
+    def test_state_records_runs_without_touching_drawings(self, projects, monkeypatch):
+        """Test recording a run through the state module only appends to the history."""
+        monkeypatch.setattr(state, "_database", None)
+        monkeypatch.setattr(state, "_database_checked", True)
+        monkeypatch.setattr(state, "_run_history", RunHistory(str(projects)))
+        monkeypatch.setattr(state, "store_drawing", lambda drawing: pytest.fail("drawing was rewritten"))
+
+        assert state.record_run({**make_run("a", 1), "project_id": "p"})
+        assert not state.record_run(make_run("a", 2))
+        assert state.last_executed_times("p") == {"a": "2024-01-01T00:01:30"}
+        assert [r["drawing_id"] for r in state.list_runs("p", "a")] == ["a"]
+
+class TestDatabaseRuns:
+    def test_runs_and_last_executed(self, tmp_path):
+        """Test database runs are filtered and pruned per project and set last_executed without a drawing write."""
+        database = DrawingDatabase(str(tmp_path / "store.db"))
+        for project_id in ("p", "q"):
+            database.put_project({"id": project_id, "name": project_id})
+        database.put_drawing({"id": "a", "project_id": "p", "name": "a", "nodes": []})
+
+        for minute in range(6):
+            database.add_run({**make_run("a", minute), "project_id": "p"}, keep=3)
+        database.add_run({**make_run("b", 9, "error"), "project_id": "q"}, keep=3)
+
+        assert [r["started_at"][-5:] for r in database.runs(project_id="p")] == ["05:00", "04:00", "03:00"]
+        assert [r["drawing_id"] for r in database.runs(outcome="error")] == ["b"]
+        assert len(database.runs("a", since="2024-01-01T00:04:00")) == 2
+        assert database.last_executed("p") == {"a": "2024-01-01T00:05:30"}
+
+        # Saving the drawing again does not roll last_executed back
+        database.put_drawing({"id": "a", "project_id": "p", "name": "renamed", "nodes": []})
+        assert database.recently_run_drawings()[0]["last_executed"] == "2024-01-01T00:05:30"
+        database.close()
@@ -0,0 +1,140 @@
+from datetime import datetime
+from core import state
+from core.cron import CronExpression
+from core.database import DrawingDatabase
+from services.scheduler_service import SchedulerService, ProjectMetadataStore, normalize_schedule, next_fire
+
+class FakeJobQueue:
+    """Records submissions instead of running anything."""
+
+    def __init__(self):
+        self.submitted = []
+        self.busy = set()
+
+    def is_busy(self, kind, target):
+        return target in self.busy
+
+    def submit(self, kind, target, params=None, priority=0):
+        self.submitted.append((kind, target))
+        return {"id": f"job{len(self.submitted)}"}
+
+class MemoryStore:
+    def __init__(self, schedules=None):
+        self.projects = {"p1": list(schedules or [])}
+
+    def load(self):
+        return {project_id: list(schedules) for project_id, schedules in self.projects.items()}
+
+    def exists(self, project_id):
+        return project_id in self.projects
+
+    def save(self, project_id, schedules, touch=True):
+        self.projects[project_id] = [dict(schedule) for schedule in schedules]
+
+class TestCronExpression:
+    def test_fields(self):
+        """Test lists, ranges, steps and Sunday as 0 or 7."""
+        cron = CronExpression("*/15 9-17 * * 1-5")
+        assert cron.minutes == {0, 15, 30, 45}
+        assert cron.hours == set(range(9, 18))
+        assert cron.weekdays == {0, 1, 2, 3, 4}
+        assert CronExpression("0 0 * * 0").weekdays == CronExpression("0 0 * * 7").weekdays == {6}
+
+    def test_next_after(self):
+        """Test the next match skips ahead across hours, days and months."""
+        cron = CronExpression("30 9 * * 1-5")
+        # Friday 2024-03-01 10:00 -> Monday 2024-03-04 09:30
+        assert cron.next_after(datetime(2024, 3, 1, 10, 0)) == datetime(2024, 3, 4, 9, 30)
+        assert cron.next_after(datetime(2024, 3, 4, 9, 29, 59)) == datetime(2024, 3, 4, 9, 30)
+        assert CronExpression("0 0 29 2 *").next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+
+    def test_day_or_weekday(self):
+        """Test a restricted day and weekday match when either one does."""
+        cron = CronExpression("0 12 1 * 1")
+        assert cron.matches(datetime(2024, 3, 1, 12, 0))   # the 1st, a Friday
+        assert cron.matches(datetime(2024, 3, 4, 12, 0))   # a Monday
+        assert not cron.matches(datetime(2024, 3, 5, 12, 0))
+
+    def test_invalid_expressions(self):
+        """Test malformed expressions raise ValueError."""
+        for expression in ("* * * *", "60 * * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *"):
+            try:
+                CronExpression(expression)
+                assert False, f"expected ValueError for {expression}"
+            except ValueError:
+                pass
+
+class TestSchedulerService:
+    def schedule(self, **overrides):
+        data = {"drawing_id": "d1", "type": "interval", "interval": 60, "created_at": "2024-03-01T10:00:00"}
+        data.update(overrides)
+        return normalize_schedule(data)
+
+    def test_interval_grid(self):
+        """Test interval fire times stay on the grid anchored at creation."""
+        schedule = self.schedule()
+        assert next_fire(schedule, datetime(2024, 3, 1, 10, 0, 30)) == datetime(2024, 3, 1, 10, 1)
+        assert next_fire(schedule, datetime(2024, 3, 1, 10, 1)) == datetime(2024, 3, 1, 10, 2)
+
+    def test_catch_up_policies(self):
+        """Test skip drops missed runs, once runs one, all runs each missed time."""
+        results = {}
+        for policy in ("skip", "once", "all"):
+            schedule = self.schedule(interval=300, catch_up=policy, last_run="2024-03-01T10:00:00")
+            queue = FakeJobQueue()
+            scheduler = SchedulerService(queue, MemoryStore([schedule]), rng=lambda: 0.0)
+            scheduler.load(datetime(2024, 3, 1, 10, 0, 1))
+            # Down from 10:00 to 10:22: 10:05, 10:10, 10:15 and 10:20 were all missed
+            results[policy] = scheduler.run_due(datetime(2024, 3, 1, 10, 22))
+            assert scheduler.get_schedule(schedule["id"])["next_run"] == "2024-03-01T10:25:00"
+        assert results == {"skip": 0, "once": 1, "all": 4}
+
+    def test_skip_if_running_and_jitter(self):
+        """Test a busy target is skipped and jitter delays the due time."""
+        schedule = self.schedule(jitter=10, last_run="2024-03-01T10:00:00")
+        queue = FakeJobQueue()
+        queue.busy.add("d1")
+        scheduler = SchedulerService(queue, MemoryStore([schedule]), rng=lambda: 0.5)
+        scheduler.load(datetime(2024, 3, 1, 10, 0, 1))
+
+        assert scheduler.run_due(datetime(2024, 3, 1, 10, 1, 4)) == 0
+        assert scheduler.stats()["skipped"] == 0
+        assert scheduler.run_due(datetime(2024, 3, 1, 10, 1, 5)) == 0
+        assert scheduler.stats()["skipped"] == 1
+
+        queue.busy.clear()
+        assert scheduler.run_due(datetime(2024, 3, 1, 10, 2, 5)) == 1
+        assert queue.submitted == [("drawing", "d1")]
+
+    def test_schedules_persist_in_project_store(self):
+        """Test created schedules and their last run are written to the store."""
+        store = MemoryStore()
+        scheduler = SchedulerService(FakeJobQueue(), store)
+        created = scheduler.create_schedule("p1", {"type": "cron", "cron": "0 * * * *"})
+        assert created["kind"] == "project" and created["target"] == "p1"
+        assert store.projects["p1"][0]["cron"] == "0 * * * *"
+
+        try:
+            scheduler.create_schedule("p1", {"type": "interval", "interval": 0})
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        scheduler.delete_schedule(created["id"])
+        assert store.projects["p1"] == []
+
+    def test_firing_keeps_project_last_modified(self, tmp_path, monkeypatch):
+        """Test recording a fire saves last_run without bumping the project's last_modified."""
+        database = DrawingDatabase(str(tmp_path / "store.db"))
+        monkeypatch.setattr(state, "_database", database)
+        monkeypatch.setattr(state, "_database_checked", True)
+        database.put_project({"id": "p1", "name": "p1", "last_modified": "2024-01-01T00:00:00",
+                              "schedules": [self.schedule(last_run="2024-03-01T10:00:00")]})
+
+        scheduler = SchedulerService(FakeJobQueue(), ProjectMetadataStore(), rng=lambda: 0.0)
+        scheduler.load(datetime(2024, 3, 1, 10, 0, 1))
+        assert scheduler.run_due(datetime(2024, 3, 1, 10, 1)) == 1
+
+        project = database.get_project("p1")
+        assert project["schedules"][0]["last_run"] == "2024-03-01T10:01:00"
+        assert project["last_modified"] == "2024-01-01T00:00:00"
+        database.close()
@@ -0,0 +1,70 @@
+import pytest
+from services.simulation_service import SimulationService
+
+def make_node(node_id, action_type, params=None, connections=None):
+    return {
+        "id": node_id,
+        "action_type": action_type,
+        "params": params or {},
+        "connections": connections or []
+    }
+
+class TestSimulationService:
+    def setup_method(self):
+        self.service = SimulationService()
+        self.nodes = [
+            make_node("1", "wait", {"duration": 1.0}, ["2"]),
+            make_node("2", "if", {"condition_type": "image_exists", "image_path": "a.png"}, ["3", "4"]),
+            make_node("3", "click", {"x": 10, "y": 10}),
+            make_node("4", "wait", {"duration": 5.0})
+        ]
+
+    def test_outcome_table_selects_branch(self):
+        """Test scripted IF outcomes drive branch selection."""
+        result = self.service.simulate_nodes(self.nodes, outcomes={"2": False})
+        assert result["visit_counts"] == {"1": 1, "2": 1, "3": 0, "4": 1}
+        assert result["unreached_nodes"] == ["3"]
+        assert result["critical_path"]["nodes"] == ["1", "2", "4"]
+
+    def test_outcome_sequence_over_iterations(self):
+        """Test list outcomes are consumed one per visit."""
+        result = self.service.simulate_nodes(self.nodes, iterations=3, outcomes={"2": [True, False]})
+        assert result["visit_counts"]["3"] == 1
+        assert result["visit_counts"]["4"] == 2
+
+    def test_trace_takes_precedence(self):
+        """Test recorded trace events are replayed before the table."""
+        trace = [{"node_id": "2", "found": False}]
+        result = self.service.simulate_nodes(self.nodes, iterations=2, outcomes={"2": True}, trace=trace)
+        assert result["visit_counts"]["4"] == 1
+        assert result["visit_counts"]["3"] == 1
+
+    def test_turbo_predicts_shorter_timeline(self):
+        """Test turbo removes built-in delays from the prediction."""
+        normal = self.service.simulate_nodes(self.nodes, outcomes={"2": True})
+        turbo = self.service.simulate_nodes(self.nodes, outcomes={"2": True}, turbo=True)
+        assert turbo["predicted_duration"] < normal["predicted_duration"]
+        assert turbo["timing"]["overhead_total"] == 0
+
+    def test_invalid_iterations(self):
+        """Test iteration count is validated."""
+        with pytest.raises(ValueError):
+            self.service.simulate_nodes(self.nodes, iterations=0)
+
+    def test_fork_takes_slowest_branch(self):
+        """Test fork branches overlap instead of adding up."""
+        nodes = [
+            make_node("f", "fork", {}, ["a", "b"]),
+            make_node("a", "wait", {"duration": 1.0}, ["j"]),
+            make_node("b", "wait", {"duration": 3.0}, ["j"]),
+            make_node("j", "join", {"mode": "all"}, ["w"]),
+            make_node("w", "wait", {"duration": 0.5})
+        ]
+        result = self.service.simulate_nodes(nodes)
+        assert result["predicted_duration"] == pytest.approx(3.5)
+        assert result["critical_path"]["nodes"] == ["f", "b", "j", "w"]
+        assert result["visit_counts"]["j"] == 1
+
+        nodes[3]["params"]["mode"] = "any"
+        result = self.service.simulate_nodes(nodes)
+        assert result["predicted_duration"] == pytest.approx(1.5)
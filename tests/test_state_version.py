@@ -0,0 +1,50 @@
+import threading
+from core import state
+
+def add_drawing(drawing_id):
+    with state.drawings_lock:
+        state.active_drawings[drawing_id] = {"id": drawing_id, "name": drawing_id, "execution_state": {}}
+
+class TestStateVersion:
+    def setup_method(self):
+        for drawing_id in ("v1", "v2"):
+            add_drawing(drawing_id)
+
+    def teardown_method(self):
+        with state.drawings_lock:
+            for drawing_id in ("v1", "v2"):
+                state.active_drawings.pop(drawing_id, None)
+
+    def test_only_changed_drawings_are_reported(self):
+        """Test a poll returns just the drawings updated after the given version."""
+        version = state.get_state_version()
+        state.update_drawing_execution_state("v1", {"progress": 10})
+
+        current, changed, removed = state.wait_for_state_changes(version)
+        assert current == version + 1
+        assert changed == ["v1"]
+        assert removed == []
+        assert state.wait_for_state_changes(current) == (current, [], [])
+
+    def test_wait_blocks_until_change_or_timeout(self):
+        """Test a long-poll wakes on the next update and times out when nothing changes."""
+        version = state.get_state_version()
+        assert state.wait_for_state_changes(version, timeout=0.05) == (version, [], [])
+
+        threading.Timer(0.05, state.update_drawing_execution_state, args=("v2", {"status": "running"})).start()
+        current, changed, _ = state.wait_for_state_changes(version, timeout=2)
+        assert current > version
+        assert changed == ["v2"]
+
+    def test_deleted_and_unknown_versions(self):
+        """Test deleted drawings are reported as removed and a version from before a restart gets everything."""
+        version = state.get_state_version()
+        with state.drawings_lock:
+            del state.active_drawings["v2"]
+            state._bump_state_version("v2")
+
+        current, changed, removed = state.wait_for_state_changes(version)
+        assert (changed, removed) == ([], ["v2"])
+
+        _, changed, _ = state.wait_for_state_changes(current + 100)
+        assert "v1" in changed
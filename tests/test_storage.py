@@ -0,0 +1,59 @@
+import json
+import os
+import pytest
+from core import storage
+
+class TestStorage:
+    def test_atomic_compact_write(self, tmp_path):
+        """Test documents are written compactly and replace the old file without leaving temp files."""
+        path = str(tmp_path / "drawing.json")
+        with open(path, "w") as f:
+            f.write("old")
+        storage.write_document(path, {"id": "d1", "nodes": [{"id": "1"}]})
+
+        with open(path, "rb") as f:
+            assert f.read() == b'{"id":"d1","nodes":[{"id":"1"}]}'
+        assert os.listdir(tmp_path) == ["drawing.json"]
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path, monkeypatch):
+        """Test a write that fails before the replace keeps the old file and removes its temp file."""
+        path = str(tmp_path / "drawing.json")
+        with open(path, "w") as f:
+            f.write("old")
+
+        def fail(fd):
+            raise OSError(28, "No space left on device")
+        monkeypatch.setattr(storage.os, "fsync", fail)
+        with pytest.raises(OSError):
+            storage.write_document(path, {"id": "d1"})
+
+        assert os.listdir(tmp_path) == ["drawing.json"]
+        with open(path) as f:
+            assert f.read() == "old"
+
+    def test_reads_legacy_json(self, tmp_path):
+        """Test pretty-printed and BOM-prefixed JSON files from older versions still load."""
+        data = {"name": "画图", "nodes": []}
+        pretty = tmp_path / "pretty.json"
+        pretty.write_text("\n" + json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        bom = tmp_path / "bom.json"
+        bom.write_bytes(b"\xef\xbb\xbf" + json.dumps(data).encode("utf-8"))
+
+        assert storage.read_document(str(pretty)) == data
+        assert storage.read_document(str(bom)) == data
+
+    def test_format_selection(self):
+        """Test unknown formats are rejected and msgpack falls back to JSON when not installed."""
+        with pytest.raises(ValueError):
+            storage.resolve_format("yaml")
+        expected = "msgpack" if storage.msgpack is not None else "json"
+        assert storage.resolve_format("msgpack") == expected
+
+    def test_msgpack_round_trip(self, tmp_path):
+        """Test msgpack documents are detected by content and decoded."""
+        pytest.importorskip("msgpack")
+        path = str(tmp_path / "drawing.json")
+        storage.write_document(path, {"id": "d1", "order": 2}, "msgpack")
+        with open(path, "rb") as f:
+            assert f.read(1) not in (b"{", b"[")
+        assert storage.read_document(path) == {"id": "d1", "order": 2}
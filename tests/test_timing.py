@@ -0,0 +1,41 @@
+import pytest
+from core.timing import TimingPolicy, MOVE_DURATION, ACTION_PAUSE
+
+class TestTimingPolicy:
+    def test_speed_scales_delays(self):
+        """Test built-in delays scale with 1 / speed."""
+        assert TimingPolicy(1.0).scaled(MOVE_DURATION) == pytest.approx(MOVE_DURATION)
+        assert TimingPolicy(2.0).scaled(MOVE_DURATION) == pytest.approx(MOVE_DURATION / 2)
+        assert TimingPolicy(0.5).scaled(MOVE_DURATION) == pytest.approx(MOVE_DURATION * 2)
+
+    def test_turbo_skips_delays(self):
+        """Test turbo mode removes every built-in delay."""
+        timing = TimingPolicy(1.0, turbo=True)
+        assert timing.scaled(MOVE_DURATION) == 0.0
+        assert timing.duration(MOVE_DURATION) == 0.0
+
+    def test_node_override(self):
+        """Test per-node speed and turbo params override the run policy."""
+        timing = TimingPolicy(1.0)
+        assert timing.for_node({"params": {}}) is timing
+        assert timing.for_node({"params": {"turbo": "true"}}).turbo is True
+        assert timing.for_node({"params": {"speed": 4}}).scaled(ACTION_PAUSE) == pytest.approx(ACTION_PAUSE / 4)
+
+    def test_overhead_reported_per_action(self):
+        """Test overhead of node overrides is accounted on the run policy."""
+        timing = TimingPolicy(2.0)
+        timing.count_action()
+        timing.duration(MOVE_DURATION)
+        node_timing = timing.for_node({"params": {"speed": 1.0}})
+        node_timing.count_action()
+        node_timing.duration(MOVE_DURATION)
+
+        stats = timing.stats()
+        assert stats["actions"] == 2
+        assert stats["overhead_total"] == pytest.approx(MOVE_DURATION / 2 + MOVE_DURATION)
+        assert stats["overhead_per_action_ms"] == pytest.approx(75.0)
+
+    def test_invalid_speed_falls_back(self):
+        """Test invalid and out-of-range speeds are clamped."""
+        assert TimingPolicy("fast").speed == 1.0
+        assert TimingPolicy(0).speed == 0.1
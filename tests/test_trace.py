@@ -0,0 +1,72 @@
+import pytest
+from core.trace import ExecutionTrace, HEADER, RECORD_SIZE
+from services.simulation_service import SimulationService
+
+class TestExecutionTrace:
+    def test_records_decode_in_order(self):
+        """Test events are recorded as fixed-width records and decoded oldest first."""
+        trace = ExecutionTrace(16)
+        trace.state("running")
+        trace.iteration(1)
+        trace.node_enter("n1", "clickimg")
+        trace.match("n1", True, 0.93, 120, 45)
+        trace.input("n1", "click", 121, 44)
+        trace.node_exit("n1", "clickimg", 0.25)
+
+        records = trace.records()
+        assert [r["kind"] for r in records] == ["state", "iteration", "enter", "match", "input", "exit"]
+        assert records[0]["label"] == "running"
+        assert records[3] == {**records[3], "node_id": "n1", "found": True, "x": 120, "y": 45}
+        assert records[3]["confidence"] == pytest.approx(0.93, abs=1e-4)
+        assert records[5]["duration"] == pytest.approx(0.25)
+        assert trace.stats()["bytes"] == 6 * RECORD_SIZE
+
+    def test_ring_buffer_drops_oldest(self):
+        """Test a full buffer overwrites the oldest records and counts them."""
+        trace = ExecutionTrace(4)
+        for i in range(10):
+            trace.iteration(i)
+        assert len(trace) == 4
+        assert trace.dropped == 6
+        assert [r["iteration"] for r in trace.records()] == [6, 7, 8, 9]
+
+    def test_export_round_trip(self):
+        """Test the exported file loads back with the same records."""
+        trace = ExecutionTrace(3)
+        for i in range(5):
+            trace.match(f"node-{i}", i % 2 == 0, 0.5)
+        loaded = ExecutionTrace.from_bytes(trace.to_bytes())
+        assert loaded.records() == trace.records()
+        assert loaded.dropped == 2
+
+        with pytest.raises(ValueError):
+            ExecutionTrace.from_bytes(b"not a trace file at all")
+
+    def test_corrupt_exports_raise_value_error(self):
+        """Test truncated or corrupt trace files are rejected with ValueError rather than struct errors."""
+        trace = ExecutionTrace(4)
+        trace.match("node-a", True, 0.9)
+        data = trace.to_bytes()
+        # Cut inside the string table, inside a record, and break a string index
+        for bad in (data[:HEADER.size + 1], data[:HEADER.size + 5], data[:-1]):
+            with pytest.raises(ValueError):
+                ExecutionTrace.from_bytes(bad)
+        corrupt = bytearray(data)
+        corrupt[-2:] = b"\xff\xff"
+        with pytest.raises(ValueError):
+            ExecutionTrace.from_bytes(bytes(corrupt))
+
+    def test_replay_follows_recorded_outcomes(self):
+        """Test recorded matches drive the simulator down the same branches."""
+        nodes = [
+            {"id": "if", "action_type": "if", "params": {"condition_type": "image_exists"}, "connections": ["yes", "no"]},
+            {"id": "yes", "action_type": "click", "params": {}, "connections": []},
+            {"id": "no", "action_type": "wait", "params": {"duration": 2.0}, "connections": []}
+        ]
+        trace = ExecutionTrace()
+        for iteration, found in enumerate([False, True, False], start=1):
+            trace.iteration(iteration)
+            trace.match("if", found)
+
+        result = SimulationService().simulate_nodes(nodes, iterations=trace.iterations(), trace=trace.outcomes())
+        assert result["visit_counts"] == {"if": 3, "yes": 1, "no": 2}
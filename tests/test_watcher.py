@@ -0,0 +1,133 @@
+import numpy as np
+from services.watcher_service import WatcherService, normalize_trigger
+
+class FakeScreen:
+    """Stands in for ImageRecognition over a synthetic 200x200 screen.
+
+    A template "is on screen" when its region contains a pixel of value 255.
+    """
+
+    def __init__(self):
+        self.screen = np.zeros((200, 200), dtype=np.uint8)
+        self.captures = []
+        self.matches = 0
+
+    def capture_region(self, region_bbox=None):
+        self.captures.append(region_bbox)
+        if region_bbox is None:
+            return self.screen.copy(), 0.0
+        x, y, w, h = region_bbox
+        return self.screen[y:y + h, x:x + w].copy(), 0.0
+
+    def match_in_frame(self, target_image_path, frame, region_bbox=None, threshold=0.8, captured_at=None):
+        self.matches += 1
+        return {"found": bool((frame == 255).any()), "confidence": 1.0 if (frame == 255).any() else 0.0}
+
+class FakeJobQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def is_busy(self, kind, target):
+        return False
+
+    def submit(self, kind, target, params=None, priority=0):
+        self.submitted.append(target)
+        return {"id": f"job{len(self.submitted)}"}
+
+class MemoryStore:
+    def __init__(self, triggers):
+        self.projects = {"p1": triggers}
+
+    def load(self):
+        return {project_id: list(triggers) for project_id, triggers in self.projects.items()}
+
+    def exists(self, project_id):
+        return project_id in self.projects
+
+    def save(self, project_id, triggers):
+        self.projects[project_id] = list(triggers)
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def trigger(index, **overrides):
+    data = {"image_path": f"t{index}.png", "drawing_id": f"d{index}",
+            "region": [(index % 10) * 20, (index // 10) * 20, 20, 20], "cooldown": 0}
+    data.update(overrides)
+    return normalize_trigger(data)
+
+class TestWatcherService:
+    def make(self, triggers):
+        self.screen = FakeScreen()
+        self.queue = FakeJobQueue()
+        self.clock = Clock()
+        watcher = WatcherService(self.screen, self.queue, MemoryStore(triggers), clock=self.clock)
+        watcher.load()
+        return watcher
+
+    def test_one_capture_per_tick_for_many_triggers(self):
+        """Test 50 triggers share one capture of their union region per tick."""
+        watcher = self.make([trigger(i) for i in range(50)])
+        watcher.check()
+        watcher.check()
+        assert self.screen.captures == [(0, 0, 200, 100), (0, 0, 200, 100)]
+
+    def test_unchanged_regions_skip_matching(self):
+        """Test only regions whose pixels changed are matched again."""
+        watcher = self.make([trigger(i) for i in range(50)])
+        watcher.check()
+        assert self.screen.matches == 50
+
+        self.screen.screen[5, 5] = 255
+        assert watcher.check() == 1
+        assert self.screen.matches == 51
+        assert self.queue.submitted == ["d0"]
+        assert watcher.stats()["unchanged"] == 49
+
+    def test_debounce_and_rising_edge(self):
+        """Test a trigger fires once the image has stayed for the debounce, then waits for it to go away."""
+        watcher = self.make([trigger(0, debounce=0.5)])
+        self.screen.screen[5, 5] = 255
+        assert watcher.check() == 0
+        self.clock.now = 0.6
+        assert watcher.check() == 1
+        self.clock.now = 1.2
+        assert watcher.check() == 0
+
+        self.screen.screen[5, 5] = 0
+        watcher.check()
+        self.screen.screen[5, 5] = 255
+        self.clock.now = 1.3
+        watcher.check()
+        self.clock.now = 1.9
+        assert watcher.check() == 1
+        assert self.queue.submitted == ["d0", "d0"]
+
+    def test_cooldown(self):
+        """Test a trigger that reappears inside its cooldown does not fire again."""
+        watcher = self.make([trigger(0, cooldown=10)])
+        self.screen.screen[5, 5] = 255
+        assert watcher.check() == 1
+        self.screen.screen[5, 5] = 0
+        self.clock.now = 1
+        watcher.check()
+        self.screen.screen[5, 5] = 255
+        self.clock.now = 2
+        assert watcher.check() == 0
+        self.clock.now = 11
+        assert watcher.check() == 1
+
+    def test_invalid_triggers(self):
+        """Test incomplete or malformed triggers are rejected."""
+        for data in ({"drawing_id": "d"}, {"image_path": "a.png"},
+                     {"image_path": "a.png", "drawing_id": "d", "region": [0, 0, 0, 5]},
+                     {"image_path": "a.png", "drawing_id": "d", "threshold": 2}):
+            try:
+                normalize_trigger(data)
+                assert False, f"expected ValueError for {data}"
+            except ValueError:
+                pass
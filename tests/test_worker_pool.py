@@ -0,0 +1,86 @@
+import threading
+from services.worker_pool import WorkerPool, WorkerResources, current_worker_resources
+
+class FakeRecognition:
+    """Stands in for ImageRecognition; reports a fixed screen size."""
+
+    def get_screen_size(self):
+        return (1920, 1080)
+
+class TestWorkerPool:
+    def setup_method(self):
+        self.created = []
+
+        def factory():
+            resources = WorkerResources(FakeRecognition())
+            self.created.append(resources)
+            return resources
+
+        self.pool = WorkerPool(size=2, resource_factory=factory)
+
+    def test_runs_queue_when_all_workers_are_busy(self):
+        """Test a full pool queues runs and starts them as workers free up."""
+        release = threading.Event()
+        started = []
+
+        def blocked(name):
+            started.append(name)
+            release.wait(2)
+
+        first = self.pool.submit(blocked, "a")
+        second = self.pool.submit(blocked, "b")
+        assert self.pool.saturated()
+
+        third = self.pool.submit(blocked, "c")
+        assert not third.join(0.1)
+        assert not third.started
+        assert self.pool.stats()["queued"] == 1
+
+        release.set()
+        for ticket in (first, second, third):
+            assert ticket.join(2)
+        assert sorted(started) == ["a", "b", "c"]
+        assert self.pool.stats()["workers"] == 2
+
+    def test_queue_wait_is_measured(self):
+        """Test queue wait time is recorded per run and summarized in stats."""
+        release = threading.Event()
+        blockers = [self.pool.submit(release.wait, 2) for _ in range(2)]
+        waiting = self.pool.submit(lambda: None)
+
+        threading.Timer(0.1, release.set).start()
+        assert waiting.join(2)
+        for ticket in blockers:
+            ticket.join(2)
+
+        assert waiting.queue_wait >= 0.09
+        stats = self.pool.stats()
+        assert stats["completed"] == 3
+        assert stats["queue_wait_ms"]["max"] >= 90
+
+    def test_worker_resources_are_reused(self):
+        """Test runs on a worker see that worker's resources rather than fresh ones."""
+        seen = []
+
+        def run():
+            resources = current_worker_resources()
+            seen.append((resources, resources.screen_size()))
+
+        for _ in range(5):
+            assert self.pool.submit(run).join(2)
+
+        assert len(self.created) == 1
+        assert all(resources is self.created[0] for resources, _ in seen)
+        assert seen[0][1] == (1920, 1080)
+        assert current_worker_resources() is None
+
+    def test_failed_run_does_not_kill_worker(self):
+        """Test an exception is stored on the ticket and the worker keeps serving."""
+        def fail():
+            raise RuntimeError("boom")
+
+        failed = self.pool.submit(fail)
+        assert failed.join(2)
+        assert failed.error == "boom"
+        assert self.pool.submit(lambda: None).join(2)
+        assert self.pool.stats()["failed"] == 1
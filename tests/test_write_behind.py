@@ -0,0 +1,87 @@
+import threading
+import time
+from core.persistence import WriteBehind
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+        self.written = threading.Event()
+
+    def __call__(self, drawing_ids):
+        self.batches.append(sorted(drawing_ids))
+        self.written.set()
+
+class TestWriteBehind:
+    def test_edits_are_coalesced(self, tmp_path):
+        """Test a burst of edits to the same drawings becomes one write each after the delay."""
+        save = Recorder()
+        store = WriteBehind(save, str(tmp_path / "drawings.journal"), delay=0.1)
+        for i in range(20):
+            store.mark_dirty("d1", {"nodes": [i]})
+            store.mark_dirty("d2", {"name": f"n{i}"})
+
+        assert save.batches == []
+        assert save.written.wait(2)
+        time.sleep(0.05)
+        assert save.batches == [["d1", "d2"]]
+        assert store.stats()["marked"] == 40
+
+    def test_flush_writes_now_and_empties_journal(self, tmp_path):
+        """Test an explicit flush writes immediately and clears the journal once nothing is pending."""
+        save = Recorder()
+        journal = tmp_path / "drawings.journal"
+        store = WriteBehind(save, str(journal), delay=60)
+        store.mark_dirty("d1", {"name": "a"})
+        store.mark_dirty("d2", {"name": "b"})
+
+        store.flush(["d1"])
+        assert save.batches == [["d1"]]
+        assert [record["id"] for record in store.pending_records()] == ["d1", "d2"]
+
+        store.flush()
+        assert save.batches == [["d1"], ["d2"]]
+        assert journal.read_text() == ""
+        assert not store.is_dirty("d2")
+
+    def test_journal_survives_for_recovery(self, tmp_path):
+        """Test unwritten edits stay in the journal for the next process, ignoring a torn last line."""
+        journal = tmp_path / "drawings.journal"
+        store = WriteBehind(Recorder(), str(journal), delay=60)
+        store.mark_dirty("d1", {"name": "a"})
+        store.mark_dirty("d1", {"order": 3})
+        with open(journal, "a") as f:
+            f.write('{"id": "d1", "upd')
+
+        records = WriteBehind(Recorder(), str(journal)).pending_records()
+        assert [record["updates"] for record in records] == [{"name": "a"}, {"order": 3}]
+        assert records[0]["at"] <= records[1]["at"]
+
+    def test_failed_saves_stay_dirty_and_journaled(self, tmp_path):
+        """Test a save that raises or reports failures keeps those drawings dirty and the journal intact."""
+        journal = tmp_path / "drawings.journal"
+        outcomes = [OSError("No space left on device"), ["d2"], None]
+        batches = []
+
+        def save(drawing_ids):
+            batches.append(sorted(drawing_ids))
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        store = WriteBehind(save, str(journal), delay=60)
+        store.mark_dirty("d1", {"name": "a"})
+        store.mark_dirty("d2", {"name": "b"})
+
+        store.flush()
+        assert store.is_dirty("d1") and store.is_dirty("d2")
+        assert len(store.pending_records()) == 2
+
+        store.flush()
+        assert not store.is_dirty("d1") and store.is_dirty("d2")
+        assert len(store.pending_records()) == 2
+
+        store.flush()
+        assert batches == [["d1", "d2"], ["d1", "d2"], ["d2"]]
+        assert journal.read_text() == ""
+        assert store.stats()["failed"] == 3
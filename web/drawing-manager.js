@@ -3,11 +3,14 @@ class DrawingManager {
     constructor() {
         this.drawings = new Map();
         this.currentDrawingId = null;
+        // Nodes and revision of the last save, so later saves can send just a patch
+        this.savedNodes = null;
+        this.savedRevision = null;
         this.statusUpdateInterval = null;
         this.autoSaveInterval = null;
         this.initializeUI();
         this.checkAndLoadDrawings(); // Changed to conditional loading
-        this.startStatusPolling();
+        // 执行状态由 ExecutionManager 的事件流推送；不支持事件流时才回退到 startStatusPolling
         this.setupAutoSave();
         
         // Initialize with no drawing selected state
@@ -371,6 +374,8 @@ class DrawingManager {
             }
 
             this.currentDrawingId = drawingId;
+            this.savedNodes = null;
+            this.savedRevision = null;
             
             // Update drawing in local map
             this.drawings.set(drawingId, drawing);
@@ -496,7 +501,8 @@ class DrawingManager {
                 },
                 body: JSON.stringify({
                     loop: document.getElementById('loopCheck')?.checked || false,
-                    speed: parseFloat(document.getElementById('speedSlider')?.value || 1.0)
+                    speed: parseFloat(document.getElementById('speedSlider')?.value || 1.0),
+                    turbo: document.getElementById('turboCheck')?.checked || false
                 })
             });
 
@@ -789,7 +795,7 @@ class DrawingManager {
         }, 3000);
     }
 
-    async saveCurrentDrawing() {
+    async saveCurrentDrawing({ flush = false } = {}) {
         if (!this.currentDrawingId || !window.app) {
             return;
         }
@@ -806,26 +812,117 @@ class DrawingManager {
                 console.log(`💾 Total serialized nodes: ${nodes.length}`);
             }
 
-            const response = await fetch(`/api/drawings/${this.currentDrawingId}?_t=${Date.now()}`, {
-                method: 'PUT',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify({ nodes })
-            });
+            // Autosaves are coalesced server-side; an explicit save asks for an immediate write
+            const flushParam = flush ? '&flush=1' : '';
+            const drawingId = this.currentDrawingId;
+            const url = `/api/drawings/${drawingId}?_t=${Date.now()}${flushParam}`;
+            let result = null;
+
+            // After the first save, send only what changed since the last one
+            if (this.savedNodes) {
+                const operations = this.buildNodePatch(this.savedNodes, nodes);
+                if (operations.length === 0 && !flush) {
+                    return;
+                }
+                const response = await fetch(url, {
+                    method: 'PATCH',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({ base_revision: this.savedRevision, operations })
+                });
+                result = await response.json();
+                if (result.error) {
+                    // A conflict or rejected patch falls back to saving the whole drawing
+                    console.warn('Patch rejected, saving whole drawing:', result.error);
+                    result = null;
+                }
+            }
 
-            const result = await response.json();
+            if (!result) {
+                const response = await fetch(url, {
+                    method: 'PUT',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({ nodes })
+                });
+                result = await response.json();
+            }
             
             if (result.error) {
                 console.error('Failed to save drawing:', result.error);
             } else {
-                console.log(`Saved ${nodes.length} nodes for drawing ${this.currentDrawingId}`);
+                if (drawingId === this.currentDrawingId) {
+                    this.savedNodes = new Map(nodes.map(node => [node.id, node]));
+                    this.savedRevision = result.revision;
+                }
+                console.log(`Saved ${nodes.length} nodes for drawing ${drawingId}`);
             }
         } catch (error) {
             console.error('Failed to save drawing:', error);
         }
     }
 
+    buildNodePatch(previous, nodes) {
+        // Patch operations turning the previously saved nodes into the current ones
+        const operations = [];
+        const current = new Set(nodes.map(node => node.id));
+        previous.forEach((_, id) => {
+            if (!current.has(id)) {
+                operations.push({ op: 'remove', id });
+            }
+        });
+        nodes.forEach(node => {
+            const before = previous.get(node.id);
+            if (!before) {
+                operations.push({ op: 'add', node });
+                return;
+            }
+            const fields = {};
+            Object.keys(node).forEach(key => {
+                if (key !== 'id' && key !== 'params' && key !== 'connections' &&
+                    JSON.stringify(node[key]) !== JSON.stringify(before[key])) {
+                    fields[key] = node[key];
+                }
+            });
+            if (Object.keys(fields).length > 0) {
+                operations.push({ op: 'update', id: node.id, fields });
+            }
+            const params = {};
+            const oldParams = before.params || {};
+            const newParams = node.params || {};
+            Object.keys(oldParams).forEach(key => {
+                if (!(key in newParams)) {
+                    params[key] = null;
+                }
+            });
+            Object.keys(newParams).forEach(key => {
+                if (JSON.stringify(newParams[key]) !== JSON.stringify(oldParams[key])) {
+                    params[key] = newParams[key];
+                }
+            });
+            if (Object.keys(params).length > 0) {
+                operations.push({ op: 'set_params', id: node.id, params });
+            }
+        });
+        // Connections last, once every added node exists; added nodes carry their own
+        nodes.forEach(node => {
+            const before = previous.get(node.id);
+            if (!before) {
+                return;
+            }
+            const oldTargets = before.connections || [];
+            const newTargets = node.connections || [];
+            // Connections to removed nodes are dropped by the server along with the node
+            oldTargets.filter(target => !newTargets.includes(target) && current.has(target))
+                .forEach(target => operations.push({ op: 'disconnect', id: node.id, target }));
+            newTargets.filter(target => !oldTargets.includes(target))
+                .forEach(target => operations.push({ op: 'connect', id: node.id, target }));
+        });
+        return operations;
+    }
+
     processNodeConnections() {
         // Process pending connections after all nodes are loaded
         if (!window.app || !window.app.graph || !window.app.graph._nodes) return;
@@ -855,7 +952,9 @@ class DrawingManager {
 
                 if (targetNode && node.outputs && node.outputs[0] && targetNode.inputs && targetNode.inputs[0]) {
                     console.log(`✅ Connecting node ${node.id} to node ${targetNode.id}`);
-                    node.connect(0, targetNode, 0);
+                    // Fan-in nodes (join) take each incoming link on its own free input
+                    const freeInput = targetNode.inputs.findIndex(input => input.link == null);
+                    node.connect(0, targetNode, freeInput >= 0 ? freeInput : 0);
                     successfulConnections++;
                 } else {
                     console.warn(`❌ Failed to connect node ${node.id} to ${targetNodeId}`);
@@ -1011,6 +1110,25 @@ class DrawingManager {
         }, 1000);
     }
 
+    applyExecutionDelta(drawingId, delta) {
+        const drawing = this.drawings.get(drawingId);
+        if (!drawing) {
+            return;
+        }
+
+        drawing.execution_state = { ...(drawing.execution_state || {}), ...delta };
+        delete drawing.execution_state.drawing_id;
+
+        // 节点级事件很频繁，合并到下一帧统一重绘列表
+        if (!this._renderScheduled) {
+            this._renderScheduled = true;
+            requestAnimationFrame(() => {
+                this._renderScheduled = false;
+                this.renderDrawingList();
+            });
+        }
+    }
+
     showError(message) {
         // You can implement a proper error notification system here
         console.error(message);
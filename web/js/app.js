@@ -37,8 +37,8 @@ class CopilotNodeApp {
         // 加载项目列表
         await this.projectManager.loadProjectList();
         
-        // 开始状态轮询
-        this.executionManager.startStatusPolling();
+        // 订阅执行状态事件流（不可用时回退到轮询）
+        this.executionManager.startStatusStream();
         
         console.log('CopilotNodeApp initialized successfully');
     }
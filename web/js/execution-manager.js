@@ -2,6 +2,7 @@
 class ExecutionManager {
     constructor(app) {
         this.app = app;
+        this.eventSource = null;
     }
 
     async startCurrentExecution() {
@@ -15,13 +16,14 @@ class ExecutionManager {
             // Execute the current drawing
             const loop = document.getElementById('loopCheck').checked;
             const speed = parseFloat(document.getElementById('speedSlider').value);
+            const turbo = document.getElementById('turboCheck')?.checked || false;
             
             const response = await fetch(`/api/drawings/${window.drawingManager.currentDrawingId}/execute`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
-                body: JSON.stringify({ loop, speed })
+                body: JSON.stringify({ loop, speed, turbo })
             });
 
             if (response.ok) {
@@ -47,13 +49,14 @@ class ExecutionManager {
             // Execute all drawings in the current project
             const loop = document.getElementById('loopCheck').checked;
             const speed = parseFloat(document.getElementById('speedSlider').value);
+            const turbo = document.getElementById('turboCheck')?.checked || false;
             
             const response = await fetch('/api/drawings/execute-all', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
-                body: JSON.stringify({ loop, speed })
+                body: JSON.stringify({ loop, speed, turbo })
             });
 
             if (response.ok) {
@@ -130,10 +133,80 @@ class ExecutionManager {
         this.app.currentExecutionType = isRunning ? executionType : null;
     }
 
+    startStatusStream() {
+        if (!window.EventSource) {
+            this.startStatusPolling();
+            return;
+        }
+
+        const source = new EventSource('/api/events');
+        this.eventSource = source;
+        let opened = false;
+
+        source.onopen = () => {
+            opened = true;
+        };
+        source.onerror = () => {
+            // 从未连上时退回轮询；连上后断开由浏览器按 Last-Event-ID 自动重连续传
+            if (!opened) {
+                source.close();
+                this.eventSource = null;
+                this.startStatusPolling();
+            }
+        };
+
+        source.addEventListener('snapshot', (e) => {
+            const snapshot = JSON.parse(e.data);
+            Object.entries(snapshot.drawings || {}).forEach(([drawingId, state]) => {
+                window.drawingManager?.applyExecutionDelta(drawingId, state);
+            });
+            const current = window.drawingManager?.currentDrawingId;
+            if (this.app.currentExecutionType === 'current' && current && snapshot.drawings[current]) {
+                this.applyStatusDelta(snapshot.drawings[current]);
+            } else if (this.app.currentExecutionType === 'all') {
+                this.applyStatusDelta(snapshot.execute_all);
+            }
+        });
+
+        source.addEventListener('drawing', (e) => {
+            const delta = JSON.parse(e.data);
+            window.drawingManager?.applyExecutionDelta(delta.drawing_id, delta);
+            if (this.app.currentExecutionType === 'current' && delta.drawing_id === window.drawingManager?.currentDrawingId) {
+                this.applyStatusDelta(delta);
+            }
+        });
+
+        source.addEventListener('execute_all', (e) => {
+            if (this.app.currentExecutionType === 'all') {
+                this.applyStatusDelta(JSON.parse(e.data));
+            }
+        });
+
+        source.addEventListener('workflow', (e) => {
+            if (!this.app.currentExecutionType) {
+                this.applyStatusDelta(JSON.parse(e.data));
+            }
+        });
+    }
+
+    applyStatusDelta(delta) {
+        const { drawing_id, current_drawing, ...state } = delta;
+        this.app.executionStatus = { ...this.app.executionStatus, ...state };
+        if (current_drawing !== undefined) {
+            this.app.executionStatus.current_node = current_drawing;
+        }
+        this.updateStatusPanel();
+
+        if (delta.is_running === false && this.app.currentExecutionType) {
+            this.updateExecutionUI(false);
+        }
+    }
+
     startStatusPolling() {
         this.app.statusUpdateInterval = setInterval(() => {
             this.updateStatus();
         }, 500);
+        window.drawingManager?.startStatusPolling();
     }
 
     async updateStatus() {
@@ -180,6 +253,7 @@ class ExecutionManager {
     getStatusText(status) {
         const statusMap = {
             'idle': '空闲',
+            'queued': '排队中',
             'running': '运行中',
             'stopping': '停止中',
             'completed': '已完成',
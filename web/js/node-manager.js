@@ -78,7 +78,9 @@ class NodeManager {
             'findimg': { image_path: '', confidence: 0.8 },
             'clickimg': { image_path: '', confidence: 0.8, x_random: 0, y_random: 0 },
             'followimg': { image_path: '', confidence: 0.8 },
-            'if': { condition_type: 'image_exists', image_path: '', target_node_id: '', expected_result: 'true' }
+            'if': { condition_type: 'image_exists', image_path: '', target_node_id: '', expected_result: 'true' },
+            'fork': {},
+            'join': { mode: 'all' }
         };
 
         if (defaults[nodeType]) {
@@ -164,6 +166,12 @@ class NodeManager {
                         <option value="up" ${value === 'up' ? 'selected' : ''}>向上</option>
                         <option value="down" ${value === 'down' ? 'selected' : ''}>向下</option>
                     </select>`;
+                } else if (key === 'mode' && node.type === 'autoclick/join') {
+                    // Join mode dropdown
+                    inputHtml = `<select class="property-input" data-property="${key}">
+                        <option value="all" ${value === 'all' ? 'selected' : ''}>等待全部分支</option>
+                        <option value="any" ${value === 'any' ? 'selected' : ''}>任一分支完成</option>
+                    </select>`;
                 } else if (key === 'input_type') {
                     // Keyboard input type dropdown
                     inputHtml = `<select class="property-input" data-property="${key}">
@@ -479,6 +487,7 @@ class NodeManager {
             'condition_type': '判断条件类型',
             'target_node_id': '目标节点ID',
             'expected_result': '预期结果',
+            'mode': '汇合模式',
             'source_id': '源节点ID',
             'target_id': '目标节点ID',
             'output_type': '输出类型'
@@ -791,6 +800,14 @@ class NodeManager {
                     
                     const targetNode = nodeMap.get(targetNodeId);
                     
+                    // Fan-in nodes (join) take each incoming link on its own free input
+                    if (typeof connectionInfo === 'string' && targetNode && targetNode.inputs && targetNode.inputs.length > 1) {
+                        const freeInput = targetNode.inputs.findIndex(input => input.link == null);
+                        if (freeInput >= 0) {
+                            inputSlot = freeInput;
+                        }
+                    }
+                    
                     if (sourceNode && targetNode) {
                         if (sourceNode.outputs && sourceNode.outputs[outputSlot] &&
                             targetNode.inputs && targetNode.inputs[inputSlot]) {
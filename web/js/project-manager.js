@@ -150,7 +150,7 @@ class ProjectManager {
         // In the new architecture, projects are managed through the drawing manager
         // This method now saves the current drawing instead of the entire project
         if (window.drawingManager && window.drawingManager.currentDrawingId) {
-            await window.drawingManager.saveCurrentDrawing();
+            await window.drawingManager.saveCurrentDrawing({ flush: true });
             this.app.showNotification('当前画图已保存', 'success');
         } else {
             alert('没有选择的画图需要保存');
@@ -148,7 +148,88 @@
         }
     };
     
+    // Fork Node - 并行分支节点
+    function ForkNode() {
+        this.title = "并行分支";
+        this.addInput("", LiteGraph.EVENT);
+        // 一个输出可连接多个分支，各分支同时执行
+        this.addOutput("branches", LiteGraph.EVENT);
+        
+        this.size = [160, 80];
+        this.min_size = [140, 70];
+        this.max_size = [300, 150];
+        this.resizable = true;
+        
+        this.color = "#16a085";
+        this.bgcolor = "#0e6655";
+    }
+
+    ForkNode.title = "并行分支";
+    ForkNode.desc = "同时执行所有连接的分支，直到汇合节点";
+
+    ForkNode.prototype.onExecute = function() {
+        // Execution handled by backend
+    };
+
+    ForkNode.prototype.onDrawForeground = function(ctx) {
+        if (this.flags.collapsed) return;
+        
+        ctx.font = "12px Arial";
+        ctx.fillStyle = "#ffffff";
+        ctx.textAlign = "left";
+        
+        const output = this.outputs && this.outputs[0];
+        const branchCount = output && output.links ? output.links.length : 0;
+        ctx.fillText(`分支: ${branchCount}`, 10, 45);
+    };
+
+    LiteGraph.registerNodeType("autoclick/fork", ForkNode);
+
+    // Join Node - 汇合节点
+    function JoinNode() {
+        this.title = "汇合";
+        this.addInput("", LiteGraph.EVENT);
+        this.addInput("", LiteGraph.EVENT);
+        this.addInput("", LiteGraph.EVENT);
+        this.addInput("", LiteGraph.EVENT);
+        this.addOutput("", LiteGraph.EVENT);
+        this.addProperty("mode", "all");
+        
+        this.size = [160, 110];
+        this.min_size = [140, 100];
+        this.max_size = [300, 200];
+        this.resizable = true;
+        
+        this.color = "#16a085";
+        this.bgcolor = "#0e6655";
+    }
+
+    JoinNode.title = "汇合";
+    JoinNode.desc = "等待全部分支或最先完成的分支后继续";
+
+    JoinNode.prototype.onExecute = function() {
+        // Execution handled by backend
+    };
+
+    JoinNode.prototype.onDrawForeground = function(ctx) {
+        if (this.flags.collapsed) return;
+        
+        ctx.font = "12px Arial";
+        ctx.fillStyle = "#ffffff";
+        ctx.textAlign = "left";
+        
+        const modeNames = {
+            'all': '等待全部',
+            'any': '任一完成'
+        };
+        ctx.fillText(`模式: ${modeNames[this.properties.mode] || this.properties.mode}`, 10, 45);
+    };
+
+    LiteGraph.registerNodeType("autoclick/join", JoinNode);
+    
     // 为所有逻辑节点类型应用通用方法
     Object.assign(IfNode.prototype, commonLogicNodeMethods);
+    Object.assign(ForkNode.prototype, commonLogicNodeMethods);
+    Object.assign(JoinNode.prototype, commonLogicNodeMethods);
 
 })(this);
\ No newline at end of file